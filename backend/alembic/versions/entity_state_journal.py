@@ -0,0 +1,37 @@
+"""Create entity state journal table
+
+Revision ID: entity_state_journal_001
+Revises: notification_rollups_001
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'entity_state_journal_001'
+down_revision: Union[str, None] = 'notification_rollups_001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create entity_state_journal table
+    op.create_table(
+        'entity_state_journal',
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), autoincrement=True, nullable=False, comment='Journal sequence number'),
+        sa.Column('entity_id', sa.String(length=255), nullable=False, comment='Entity whose state changed'),
+        sa.Column('changes', sa.JSON(), nullable=False, comment='Changed state fields and their new values'),
+        sa.Column('recorded_at', sa.DateTime(timezone=True), nullable=False, comment='When the change was persisted'),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    # Create indexes for entity_state_journal
+    op.create_index('ix_entity_state_journal_entity_id', 'entity_state_journal', ['entity_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_entity_state_journal_entity_id', table_name='entity_state_journal')
+    op.drop_table('entity_state_journal')
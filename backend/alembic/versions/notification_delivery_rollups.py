@@ -0,0 +1,53 @@
+"""Create notification delivery rollups table
+
+Revision ID: notification_rollups_001
+Revises: notification_analytics_001
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'notification_rollups_001'
+down_revision: Union[str, None] = 'notification_analytics_001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create notification_delivery_rollups table
+    op.create_table(
+        'notification_delivery_rollups',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False, comment='Primary key'),
+        sa.Column('resolution', sa.String(length=10), nullable=False, comment='Bucket size (minute, hour, day)'),
+        sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False, comment='Start of bucket (UTC)'),
+        sa.Column('channel', sa.String(length=50), nullable=False, comment='Delivery channel'),
+        sa.Column('notification_type', sa.String(length=50), nullable=False, comment='Type of notification'),
+        sa.Column('delivery_count', sa.Integer(), nullable=False, server_default='0', comment='Number of delivery attempts'),
+        sa.Column('success_count', sa.Integer(), nullable=False, server_default='0', comment='Number of delivered notifications'),
+        sa.Column('failure_count', sa.Integer(), nullable=False, server_default='0', comment='Number of failed deliveries'),
+        sa.Column('retry_count', sa.Integer(), nullable=False, server_default='0', comment='Sum of retry counts'),
+        sa.Column('delivery_time_count', sa.Integer(), nullable=False, server_default='0', comment='Attempts with a delivery time'),
+        sa.Column('delivery_time_sum', sa.Float(), nullable=False, server_default='0', comment='Sum of delivery times in milliseconds'),
+        sa.Column('delivery_time_min', sa.Float(), nullable=True, comment='Minimum delivery time in milliseconds'),
+        sa.Column('delivery_time_max', sa.Float(), nullable=True, comment='Maximum delivery time in milliseconds'),
+        sa.Column('latency_sketch', sa.JSON(), nullable=True, comment='Mergeable delivery time histogram'),
+        sa.Column('error_codes', sa.JSON(), nullable=True, comment='Failure counts by error code'),
+        sa.Column('error_messages', sa.JSON(), nullable=True, comment='Failure counts by error message'),
+        sa.Column('last_success_at', sa.DateTime(timezone=True), nullable=True, comment='Most recent delivery in bucket'),
+        sa.Column('last_failure_at', sa.DateTime(timezone=True), nullable=True, comment='Most recent failure in bucket'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('resolution', 'bucket_start', 'channel', 'notification_type', name='uq_delivery_rollups_bucket')
+    )
+
+    # Create indexes for notification_delivery_rollups
+    op.create_index('idx_delivery_rollups_period', 'notification_delivery_rollups', ['resolution', 'bucket_start'])
+
+
+def downgrade() -> None:
+    op.drop_table('notification_delivery_rollups')
@@ -11,10 +11,12 @@ Provides domain-specific entity management endpoints with enhanced capabilities:
 This router integrates with existing EntityService but provides v2 API patterns.
 """
 
+import base64
+import binascii
 import logging
 from typing import Annotated, Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from pydantic import BaseModel, Field
 
 from backend.api.domains import register_domain_router
@@ -77,6 +79,7 @@ class EntityCollectionV2(BaseModel):
     page: int = Field(1, description="Current page number")
     page_size: int = Field(50, description="Number of entities per page")
     has_next: bool = Field(False, description="Whether more pages are available")
+    next_cursor: str | None = Field(None, description="Cursor for the next page, if any")
     filters_applied: dict[str, Any] = Field(default_factory=dict, description="Applied filters")
 
 # Query parameters
@@ -88,6 +91,25 @@ class EntitiesQueryParamsV2(BaseModel):
     page: int = Field(1, ge=1)
     page_size: int = Field(50, ge=1, le=100)
 
+def _encode_cursor(entity_id: str) -> str:
+    """Encode an entity ID as an opaque pagination cursor"""
+    return base64.urlsafe_b64encode(entity_id.encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> str:
+    """Decode a pagination cursor, raising 400 if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded.encode(), altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor") from e
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against the current ETag"""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
 def _check_domain_api_enabled(request: Request) -> None:
     """Check if domain API v2 is enabled, raise 404 if disabled"""
     feature_manager = get_feature_manager_from_request(request)
@@ -281,27 +303,42 @@ def create_entities_router() -> APIRouter:
     @router.get("", response_model=EntityCollectionV2)
     async def get_entities(
         request: Request,
+        response: Response,
         device_type: str | None = Query(None, description="Filter by device type"),
         area: str | None = Query(None, description="Filter by area"),
-        protocol: str | None = Query(None, description="Filter by protocol"),
+        protocol: str | None = Query(None, description="Filter by protocol (primary or secondary)"),
+        group: str | None = Query(None, description="Filter by entity group"),
         page: int = Query(1, ge=1, description="Page number"),
         page_size: int = Query(50, ge=1, le=100, description="Items per page"),
-    ) -> EntityCollectionV2:
+        cursor: str | None = Query(None, description="Cursor from a previous page (overrides page)"),
+        if_none_match: str | None = Header(None),
+    ) -> EntityCollectionV2 | Response:
         """Get entities with filtering and pagination (v2) - optimized for Pi deployment"""
 
         try:
             entity_service = get_entity_service(request)
 
-            # Get all entities from legacy service
-            all_entities = await entity_service.list_entities()
+            # Cheap revalidation for polling dashboards
+            etag = entity_service.get_registry_etag()
+            if _etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+
+            after = _decode_cursor(cursor) if cursor else None
+            result = await entity_service.list_entities_page(
+                device_type=device_type,
+                area=area,
+                protocol=protocol,
+                group=group,
+                page=page,
+                page_size=page_size,
+                after=after,
+            )
 
-            # Convert to v2 format and apply filters
-            entities_v2 = []
-            for entity_id, entity_data in all_entities.items():
-                # Convert legacy entity to v2 schema
-                entity_v2 = EntitySchemaV2(
+            # Build v2 schemas only for the requested page
+            entities_v2 = [
+                EntitySchemaV2(
                     entity_id=entity_id,
-                    name=entity_data.get("friendly_name", entity_data.get("name", entity_id)),
+                    name=entity_data.get("friendly_name") or entity_data.get("name") or entity_id,
                     device_type=entity_data.get("device_type", "unknown"),
                     protocol=entity_data.get("protocol", "rvc"),
                     state=entity_data.get("raw", {}),
@@ -309,36 +346,31 @@ def create_entities_router() -> APIRouter:
                     last_updated=entity_data.get("last_updated", "2025-01-11T00:00:00Z"),
                     available=entity_data.get("available", True)
                 )
+                for entity_id, entity_data in result["entities"].items()
+            ]
 
-                # Apply filters
-                if device_type and entity_v2.device_type != device_type:
-                    continue
-                if area and entity_v2.area != area:
-                    continue
-                if protocol and entity_v2.protocol != protocol:
-                    continue
-
-                entities_v2.append(entity_v2)
-
-            # Apply pagination
-            total_count = len(entities_v2)
-            start_idx = (page - 1) * page_size
-            end_idx = start_idx + page_size
-            paginated_entities = entities_v2[start_idx:end_idx]
+            response.headers["ETag"] = etag
+            response.headers["Cache-Control"] = "no-cache"
 
+            has_next = result["has_next"]
+            last_entity_id = result["last_entity_id"]
             return EntityCollectionV2(
-                entities=paginated_entities,
-                total_count=total_count,
+                entities=entities_v2,
+                total_count=result["total_count"],
                 page=page,
                 page_size=page_size,
-                has_next=end_idx < total_count,
+                has_next=has_next,
+                next_cursor=_encode_cursor(last_entity_id) if has_next and last_entity_id else None,
                 filters_applied={
                     "device_type": device_type,
                     "area": area,
                     "protocol": protocol,
+                    "group": group,
                 }
             )
 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Failed to get entities: {e}")
             raise HTTPException(status_code=500, detail=f"Failed to retrieve entities: {e!s}")
@@ -457,7 +489,7 @@ def create_entities_router() -> APIRouter:
             entity_data = all_entities[entity_id]
             return EntitySchemaV2(
                 entity_id=entity_id,
-                name=entity_data.get("friendly_name", entity_data.get("name", entity_id)),
+                name=entity_data.get("friendly_name") or entity_data.get("name") or entity_id,
                 device_type=entity_data.get("device_type", "unknown"),
                 protocol=entity_data.get("protocol", "rvc"),
                 state=entity_data.get("raw", {}),
@@ -570,6 +602,30 @@ def create_entities_router() -> APIRouter:
             logger.error(f"Clear emergency stop failed: {e}")
             raise HTTPException(status_code=500, detail=f"Clear emergency stop failed: {e!s}")
 
+    @router.post("/persistence/sync")
+    async def sync_entity_persistence(request: Request) -> dict:
+        """Persist all pending entity state changes immediately"""
+
+        feature_manager = get_feature_manager_from_request(request)
+        entity_feature = feature_manager.get_feature("entity_manager")
+        persistence_service = entity_feature.get_persistence_service() if entity_feature else None
+        if persistence_service is None:
+            raise HTTPException(status_code=503, detail="Entity persistence is not running")
+
+        try:
+            flushed = await persistence_service.flush()
+        except Exception as e:
+            logger.error(f"Entity persistence sync failed: {e}")
+            raise HTTPException(
+                status_code=500, detail=f"Entity persistence sync failed: {e!s}"
+            ) from e
+
+        if not flushed:
+            raise HTTPException(
+                status_code=503, detail="Entity state write failed; changes remain pending"
+            )
+        return persistence_service.get_statistics()
+
     @router.post("/reconcile-state")
     async def reconcile_state_with_rvc_bus(request: Request) -> dict:
         """Reconcile application state with RV-C bus state"""
@@ -590,12 +646,18 @@ def create_entities_router() -> APIRouter:
         entity_id: str,
         entity_service: Annotated[Any, Depends(get_entity_service)],
         limit: int = Query(100, description="Maximum number of history entries"),
-        since: float | None = Query(None, description="Unix timestamp filter")
+        since: float | None = Query(None, description="Unix timestamp filter"),
+        until: float | None = Query(None, description="Upper Unix timestamp filter"),
+        max_points: int | None = Query(
+            None, ge=1, description="Downsample to at most this many evenly spaced entries"
+        ),
     ) -> dict:
         """Get entity state change history"""
 
         try:
-            history = await entity_service.get_entity_history(entity_id, limit=limit, since=since)
+            history = await entity_service.get_entity_history(
+                entity_id, limit=limit, since=since, until=until, max_points=max_points
+            )
 
             if history is None:
                 raise HTTPException(status_code=404, detail=f"Entity '{entity_id}' not found")
@@ -11,7 +11,14 @@ import logging
 import time
 from typing import Any
 
-from backend.integrations.rvc import BAMHandler, decode_payload, decode_product_id, load_config_data
+from backend.integrations.can.decode_workers import light_state_fields
+from backend.integrations.can.frame import FrameRecord, interface_index
+from backend.integrations.rvc import (
+    BAMHandler,
+    decode_payload_values,
+    decode_product_id,
+    load_compiled_config,
+)
 from backend.services.feature_base import Feature
 from backend.services.feature_models import SafetyClassification
 
@@ -73,6 +80,22 @@ class CANBusFeature(Feature):
             "bitrate": config_dict.get("bitrate", 500000),
             "poll_interval": config_dict.get("poll_interval", 0.1),  # seconds
             "simulate": config_dict.get("simulate", False),
+            # Batched receive: drain every frame already queued in the reader per
+            # wakeup and only yield to the event loop between batches
+            "batch_receive": config_dict.get("batch_receive", True),
+            "max_batch_size": config_dict.get("max_batch_size", 256),
+            "max_batch_latency": config_dict.get("max_batch_latency", 0.005),  # seconds
+            # Priority ingest: received frames are queued per priority class
+            # and decoded by a worker that drains critical/high DGNs first
+            "priority_ingest": config_dict.get("priority_ingest", True),
+            "ingest_queue_size": config_dict.get("ingest_queue_size", 10000),
+            "ingest_batch_size": config_dict.get("ingest_batch_size", 64),
+            # Feed every received frame to the RV-C security manager's
+            # streaming flooding/scanning/impersonation detector
+            "traffic_monitoring": config_dict.get("traffic_monitoring", True),
+            # Receive and decode each interface in its own worker process; the
+            # event loop then only applies the decoded entity deltas
+            "decode_workers": config_dict.get("decode_workers", False),
         }
 
         super().__init__(
@@ -96,6 +119,12 @@ class CANBusFeature(Feature):
         self._task: asyncio.Task | None = None
         self._simulation_task: asyncio.Task | None = None
         self._deduplicator = None  # Will be initialized in startup
+        self._performance_monitor = None  # Will be initialized in startup
+        self._ingest_handler = None  # PriorityMessageHandler, set up in startup
+        self._ingest_task: asyncio.Task | None = None
+        self._decode_workers = None  # DecodeWorkerPool when decode_workers is enabled
+        self._security_manager = None  # RV-C SecurityManager, looked up lazily
+        self._security_lookup_at = 0.0  # Monotonic time of the next lookup attempt
 
         # RVC decoder data - will be loaded on startup
         self.decoder_map: dict[int, dict] = {}
@@ -126,7 +155,23 @@ class CANBusFeature(Feature):
         # Initialize BAM handler for multi-packet message support
         self.bam_handler = BAMHandler(session_timeout=30.0, max_concurrent_sessions=50)
 
+        # Share the performance monitor exposed by the performance metrics API
+        from backend.api.routers.performance_metrics import (
+            get_performance_monitor,
+            set_performance_monitor,
+        )
+        from backend.integrations.can.performance_monitor import PerformanceMonitor
+
+        self._performance_monitor = get_performance_monitor()
+        if self._performance_monitor is None:
+            self._performance_monitor = PerformanceMonitor()
+            set_performance_monitor(self._performance_monitor)
+
+        if self.config["priority_ingest"]:
+            self.start_ingest_pipeline()
+
         # Load RVC decoder configuration
+        spec_path = map_path = None
         try:
             logger.info("Loading RVC decoder configuration")
 
@@ -144,9 +189,10 @@ class CANBusFeature(Feature):
             logger.info(f"Using RVC spec path: {spec_path}")
             logger.info(f"Using device mapping path: {map_path}")
 
-            config_result = load_config_data(
+            compiled_config = load_compiled_config(
                 rvc_spec_path_override=spec_path, device_mapping_path_override=map_path
             )
+            config_result = compiled_config.config_data
             (
                 self.decoder_map,
                 _spec_meta,  # metadata about the spec file
@@ -160,20 +206,9 @@ class CANBusFeature(Feature):
                 _coach_info,  # coach information
             ) = config_result
 
-            # Extract additional lookup tables from mapping dict
-            # This is needed for device and status lookups
-            for (dgn_hex, instance), device_config in _mapping_dict.items():
-                self.device_lookup[(dgn_hex.upper(), str(instance))] = device_config
-
-            # Copy entity map to device lookup for compatibility
-            for (dgn_hex, instance), device_config in _entity_map.items():
-                self.device_lookup[(dgn_hex.upper(), str(instance))] = device_config
-
-            # Build status lookup from device lookup for devices with status_dgn
-            for (_dgn_hex, instance), device_config in self.device_lookup.items():
-                status_dgn = device_config.get("status_dgn")
-                if status_dgn:
-                    self.status_lookup[(status_dgn.upper(), str(instance))] = device_config
+            # Device and status lookups are derived once and cached with the config
+            self.device_lookup.update(compiled_config.device_lookup)
+            self.status_lookup.update(compiled_config.status_lookup)
 
             # Store raw device mapping for unmapped entry suggestions
             self.raw_device_mapping = config_result[1]  # This is the device_mapping dict
@@ -234,8 +269,12 @@ class CANBusFeature(Feature):
 
                 # CAN writer task is started by the CAN service startup method
 
-                # Set up CAN message listeners for each active interface
-                await self._setup_can_listeners()
+                if self.config["decode_workers"]:
+                    # Receive and decode in one worker process per interface
+                    self._start_decode_workers(spec_path, map_path)
+                else:
+                    # Set up CAN message listeners for each active interface
+                    await self._setup_can_listeners()
 
             except ImportError:
                 logger.warning(
@@ -249,6 +288,116 @@ class CANBusFeature(Feature):
                 logger.error(f"Failed to start CAN bus listeners: {e}", exc_info=True)
                 return
 
+    def start_ingest_pipeline(self) -> None:
+        """
+        Start the priority ingest stage between the CAN listeners and decoding.
+
+        Received frames are classified by DGN into a bounded queue per priority
+        class, and decoded by a worker that always drains critical and high
+        priority classes first. Critical and high priority frames are never
+        rate limited; lower classes are admitted through per-class token
+        buckets set above realistic status rates, so in practice only
+        diagnostic floods are shed on admission. A full class queue evicts
+        its oldest frame.
+        """
+        if self._ingest_task and not self._ingest_task.done():
+            return
+
+        from backend.integrations.rvc.performance import MessagePriority, PriorityMessageHandler
+
+        if self._ingest_handler is None:
+            from backend.core.config import get_settings
+
+            # Status classes are limited well above what a saturated 250 kbit/s
+            # RV-C bus can carry, so only diagnostic floods are dropped
+            self._ingest_handler = PriorityMessageHandler(
+                get_settings(),
+                max_queue_size=int(self.config["ingest_queue_size"]),
+                rate_limits={
+                    MessagePriority.NORMAL: 2000.0,
+                    MessagePriority.LOW: 2000.0,
+                    MessagePriority.BACKGROUND: 100.0,
+                },
+            )
+        self._ingest_task = asyncio.create_task(
+            self._ingest_handler.process_queue_continuously(
+                self._process_ingest_batch,
+                batch_size=max(1, int(self.config["ingest_batch_size"])),
+                sleep_interval=0,
+            ),
+            name="can_priority_ingest",
+        )
+
+    async def stop_ingest_pipeline(self) -> None:
+        """Stop the priority ingest worker, discarding any queued frames."""
+        if self._ingest_handler:
+            self._ingest_handler.stop_processing()
+        if self._ingest_task:
+            self._ingest_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._ingest_task
+            self._ingest_task = None
+        if self._ingest_handler:
+            self._ingest_handler.clear_queues()
+
+    async def _process_ingest_batch(self, batch: list) -> None:
+        """Decode a batch of prioritized frames taken from the ingest queues."""
+        for message in batch:
+            await self._process_frame(message.metadata)
+
+    def _start_decode_workers(self, spec_path: str | None, map_path: str | None) -> None:
+        """
+        Start one receive/decode worker process per active CAN interface.
+
+        Workers open their own socket on the interface, so frames handled this
+        way bypass the sniffer log, deduplication, transport reassembly and
+        traffic monitoring of the in-process listeners; only entity state
+        changes reach the event loop.
+        """
+        from backend.integrations.can.decode_workers import DecodeWorkerPool
+        from backend.integrations.can.manager import buses
+
+        if not buses:
+            logger.warning("No active CAN buses found, cannot start decode workers")
+            return
+
+        self._decode_workers = DecodeWorkerPool(
+            list(buses),
+            self.config["bustype"],
+            self._apply_entity_deltas,
+            spec_path=spec_path,
+            map_path=map_path,
+        )
+        self._decode_workers.start()
+
+    async def _apply_entity_deltas(self, deltas: list) -> None:
+        """Apply a batch of ``(entity_id, changed_fields, timestamp)`` deltas from the workers."""
+        for entity_id, fields, timestamp in deltas:
+            payload = {"entity_id": entity_id, "timestamp": timestamp, **fields}
+            await self._apply_entity_state(entity_id, payload)
+
+    def _get_security_manager(self):
+        """
+        Return the RV-C feature's security manager, if it is running.
+
+        The RV-C feature may start after this one, so a missing manager is
+        looked up again at most every few seconds rather than on every frame.
+        """
+        if self._security_manager is None:
+            now = time.monotonic()
+            if now < self._security_lookup_at:
+                return None
+            self._security_lookup_at = now + 5.0
+            try:
+                from backend.services.feature_manager import get_feature_manager
+
+                rvc_feature = get_feature_manager().get_feature("rvc")
+            except Exception as e:
+                logger.debug(f"RV-C security manager not available: {e}")
+                return None
+            self._security_manager = getattr(rvc_feature, "security_manager", None)
+        return self._security_manager
+
     async def _setup_can_listeners(self) -> None:
         """Set up CAN message listeners for all active interfaces using python-can's asyncio support."""
         try:
@@ -275,8 +424,13 @@ class CANBusFeature(Feature):
                     notifier = can.Notifier(bus, [reader], loop=loop)  # type: ignore
 
                     # Create a listener task for this interface
+                    listener = (
+                        self._can_batch_listener_task
+                        if self.config["batch_receive"]
+                        else self._can_listener_task
+                    )
                     listener_task = asyncio.create_task(
-                        self._can_listener_task(interface_name, reader),
+                        listener(interface_name, reader),
                         name=f"can_listener_{interface_name}",
                     )
 
@@ -331,13 +485,110 @@ class CANBusFeature(Feature):
         finally:
             logger.info(f"CAN listener for {interface_name} stopped")
 
-    async def _process_received_message(self, message, interface_name: str) -> None:
+    async def _can_batch_listener_task(self, interface_name: str, reader) -> None:
+        """
+        Async task that receives CAN messages in batches.
+
+        Waits for the first frame, then drains every frame already queued in the
+        AsyncBufferedReader (up to ``max_batch_size``) and processes them back to
+        back. Control is yielded to the event loop only between batches, or
+        early once a batch has been running longer than ``max_batch_latency``.
+
+        Args:
+            interface_name: Name of the CAN interface (e.g., 'can0', 'can1')
+            reader: can.AsyncBufferedReader object for non-blocking message reception
+        """
+        logger.info(f"CAN batch listener started for interface: {interface_name}")
+
+        max_batch_size = max(1, int(self.config["max_batch_size"]))
+        max_batch_latency = float(self.config["max_batch_latency"])
+        buffer: asyncio.Queue = reader.buffer
+
+        try:
+            while self._is_running:
+                try:
+                    # Sleep until at least one frame is available
+                    batch = [await reader.get_message()]
+
+                    # Drain whatever else is already queued
+                    while len(batch) < max_batch_size:
+                        try:
+                            batch.append(buffer.get_nowait())
+                        except asyncio.QueueEmpty:
+                            break
+
+                    await self._process_received_batch(batch, interface_name, max_batch_latency)
+
+                    # Let the API and other tasks run between batches
+                    await asyncio.sleep(0)
+
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if self._is_running:  # Only log errors if we're still supposed to be running
+                        logger.error(f"Error receiving CAN messages on {interface_name}: {e}")
+                    break
+
+        except asyncio.CancelledError:
+            logger.info(f"CAN listener for {interface_name} cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"CAN listener for {interface_name} failed: {e}", exc_info=True)
+        finally:
+            logger.info(f"CAN listener for {interface_name} stopped")
+
+    async def _process_received_batch(
+        self, messages: list, interface_name: str, max_batch_latency: float
+    ) -> None:
+        """
+        Process a batch of received CAN messages.
+
+        Frames are deduplicated, logged, decoded and applied to entities in
+        order. If the batch exceeds the latency bound, the remaining frames
+        are still processed but control is yielded once first so a large
+        burst cannot starve the event loop.
+
+        Args:
+            messages: python-can Message objects, in receive order
+            interface_name: Name of the interface that received the messages
+            max_batch_latency: Maximum seconds to run before yielding
+        """
+        started = time.perf_counter()
+        received_at = time.time()
+        deadline = started + max_batch_latency
+        processed = 0
+
+        for message in messages:
+            if message is None:
+                continue
+            await self._process_received_message(message, interface_name, received_at)
+            processed += 1
+
+            if time.perf_counter() > deadline:
+                # Record the partial batch and yield before continuing
+                if self._performance_monitor:
+                    self._performance_monitor.record_ingest_batch(
+                        processed, time.perf_counter() - started
+                    )
+                await asyncio.sleep(0)
+                started = time.perf_counter()
+                received_at = time.time()
+                deadline = started + max_batch_latency
+                processed = 0
+
+        if processed and self._performance_monitor:
+            self._performance_monitor.record_ingest_batch(processed, time.perf_counter() - started)
+
+    async def _process_received_message(
+        self, message, interface_name: str, received_at: float | None = None
+    ) -> None:
         """
         Process a received CAN message.
 
         Args:
             message: python-can Message object
             interface_name: Name of the interface that received the message
+            received_at: Wall-clock receive time shared by a batch (default: now)
         """
         try:
             # Check for duplicate messages when using bridged interfaces
@@ -349,51 +600,53 @@ class CANBusFeature(Feature):
                 )
                 return
 
-            # Log the received message
-            logger.debug(
-                f"CAN RX: {interface_name} ID: {message.arbitration_id:08X} "
-                f"Data: {message.data.hex().upper()} DLC: {message.dlc}"
+            # Log the received message (formatting it is skipped unless debugging)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"CAN RX: {interface_name} ID: {message.arbitration_id:08X} "
+                    f"Data: {message.data.hex().upper()} DLC: {message.dlc}"
+                )
+
+            # One record per frame is shared by every stage below
+            frame = FrameRecord.from_message(
+                message, interface_name, time.time() if received_at is None else received_at
             )
 
-            # Add to CAN sniffer for monitoring
-            await self._add_sniffer_entry(message, interface_name, "rx")
-
-            # Convert python-can Message to dictionary format expected by _process_message
-            msg_dict = {
-                "arbitration_id": message.arbitration_id,
-                "data": message.data,
-                "timestamp": time.time(),
-                "interface": interface_name,
-                "dlc": message.dlc,
-                "is_extended": message.is_extended_id,
-            }
+            # Streaming traffic anomaly detection (flooding, scanning, impersonation)
+            if self.config["traffic_monitoring"]:
+                security_manager = self._get_security_manager()
+                if security_manager is not None:
+                    # PDU1 destinations are masked out so that one request
+                    # PGN sent to many devices is not mistaken for scanning
+                    security_manager.observe_frame(
+                        frame.source_address, frame.pgn, len(frame.data), frame.timestamp
+                    )
 
-            # Process the message through the RV-C decoder
-            await self._process_message(msg_dict)
+            # Add to CAN sniffer for monitoring
+            self._add_sniffer_frame(frame)
+
+            # Hand the frame to the priority ingest stage, or decode it inline
+            # when the pipeline is not running
+            if self._ingest_task is not None:
+                self._ingest_handler.queue_by_priority(
+                    frame.dgn,
+                    frame.source_address,
+                    frame.data,
+                    frame.arbitration_id,
+                    frame,
+                )
+            else:
+                await self._process_frame(frame)
 
         except Exception as e:
             logger.error(f"Error processing received CAN message: {e}", exc_info=True)
 
-    async def _add_sniffer_entry(self, message, interface_name: str, direction: str) -> None:
-        """Add a CAN message to the sniffer entries for monitoring."""
+    def _add_sniffer_frame(self, frame: FrameRecord) -> None:
+        """Add a received frame to the sniffer log for monitoring."""
         try:
-            import time
-
             from backend.core.state import app_state
 
-            sniffer_entry = {
-                "timestamp": time.time(),
-                "interface": interface_name,
-                "can_id": f"{message.arbitration_id:08X}",
-                "data": message.data.hex().upper(),
-                "dlc": message.dlc,
-                "is_extended": message.is_extended_id,
-                "direction": direction,
-                "decoded": None,  # Will be filled by _process_message if decoded
-                "origin": "other",  # RX messages are from other devices
-            }
-
-            app_state.add_can_sniffer_entry(sniffer_entry)
+            app_state.add_can_sniffer_frame(frame)
 
         except Exception as e:
             logger.error(f"Error adding sniffer entry: {e}")
@@ -408,6 +661,12 @@ class CANBusFeature(Feature):
 
         self._is_running = False
 
+        await self.stop_ingest_pipeline()
+
+        if self._decode_workers:
+            await self._decode_workers.stop()
+            self._decode_workers = None
+
         # Cancel simulation task if running
         if self._simulation_task:
             self._simulation_task.cancel()
@@ -455,6 +714,8 @@ class CANBusFeature(Feature):
             return "healthy"  # Disabled is considered healthy
 
         if self._is_running:
+            if self._decode_workers and self._decode_workers.degraded_interfaces():
+                return "degraded"
             return "healthy"
 
         return "failed"
@@ -473,6 +734,16 @@ class CANBusFeature(Feature):
             else:
                 details["mode"] = "production"
                 details["description"] = "Connected to CAN interfaces"
+            if self._deduplicator:
+                details["deduplication"] = self._deduplicator.get_stats()
+            if self._ingest_handler:
+                details["ingest"] = self._ingest_handler.get_class_stats()
+            if self._decode_workers:
+                details["decode_workers"] = self._decode_workers.get_stats()
+                degraded = self._decode_workers.degraded_interfaces()
+                if degraded:
+                    details["status"] = "degraded"
+                    details["reason"] = f"Decode worker restarting for {', '.join(degraded)}"
             return details
 
         return {"status": "unhealthy", "reason": "CAN bus not running"}
@@ -485,7 +756,7 @@ class CANBusFeature(Feature):
         device_config: dict[str, Any],
         decoded_data: dict[str, Any],
         raw_data: dict[str, Any],
-        msg: dict[str, Any],
+        frame: FrameRecord,
     ) -> None:
         """
         Update entity state based on a decoded CAN message.
@@ -495,28 +766,11 @@ class CANBusFeature(Feature):
             device_config: Device configuration from the mapping
             decoded_data: Decoded signal values from the CAN message
             raw_data: Raw signal values from the CAN message
-            msg: Original CAN message dictionary
+            frame: The received frame
         """
         try:
-            from backend.services.feature_manager import get_feature_manager
-            from backend.websocket.entity_integration import notify_entity_update
-
-            # Get entity manager from feature manager
-            feature_manager = get_feature_manager()
-            entity_manager_feature = feature_manager.get_feature("entity_manager")
-            if entity_manager_feature is None:
-                logger.warning("EntityManager feature not found in feature manager")
-                return
-
-            entity_manager = entity_manager_feature.get_entity_manager()
-            entity = entity_manager.get_entity(entity_id)
-
-            if not entity:
-                logger.warning(f"Entity {entity_id} not found in entity manager")
-                return
-
             # Build state update payload
-            timestamp = msg.get("timestamp", time.time())
+            timestamp = frame.timestamp
 
             # Start with the decoded and raw data
             payload = {
@@ -541,6 +795,35 @@ class CANBusFeature(Feature):
             if device_config.get("device_type") == "light":
                 await self._update_light_state(payload, decoded_data, raw_data)
 
+            await self._apply_entity_state(entity_id, payload)
+
+        except Exception as e:
+            logger.error(f"Error updating entity {entity_id} from CAN message: {e}", exc_info=True)
+
+    async def _apply_entity_state(self, entity_id: str, payload: dict[str, Any]) -> None:
+        """
+        Apply a state update payload to an entity and fan it out.
+
+        Args:
+            entity_id: The entity ID to update
+            payload: State fields to apply, including ``timestamp``
+        """
+        try:
+            from backend.services.feature_manager import get_feature_manager
+            from backend.websocket.entity_integration import notify_entity_update
+
+            # Get entity manager from feature manager
+            feature_manager = get_feature_manager()
+            entity_manager_feature = feature_manager.get_feature("entity_manager")
+            if entity_manager_feature is None:
+                logger.warning("EntityManager feature not found in feature manager")
+                return
+
+            entity_manager = entity_manager_feature.get_entity_manager()
+            if not entity_manager.get_entity(entity_id):
+                logger.warning(f"Entity {entity_id} not found in entity manager")
+                return
+
             # Update the entity state
             updated_entity = entity_manager.update_entity_state(entity_id, payload)
 
@@ -569,42 +852,14 @@ class CANBusFeature(Feature):
             decoded_data: Decoded signal values
             raw_data: Raw signal values
         """
-        try:
-            # Extract operating status (brightness level in CAN terms)
-            operating_status = raw_data.get("operating_status", 0)
-
-            if isinstance(operating_status, str):
-                operating_status = int(operating_status)
-
-            # Convert CAN operating status (0-200) to UI brightness (0-100)
-            brightness_pct = int((operating_status / 200.0) * 100)
-            brightness_pct = max(0, min(100, brightness_pct))  # Clamp to 0-100
-
-            # Determine on/off state
-            is_on = operating_status > 0
-            state_str = "on" if is_on else "off"
-
-            # Update payload with light-specific fields
-            payload.update(
-                {
-                    "state": state_str,
-                    "brightness": brightness_pct,
-                }
-            )
-
-            logger.debug(
-                f"Light state: operating_status={operating_status}, brightness={brightness_pct}%, state={state_str}"
-            )
+        raw_data = raw_data or {}
+        light_fields = light_state_fields(raw_data)
+        payload.update(light_fields)
 
-        except Exception as e:
-            logger.error(f"Error processing light state: {e}")
-            # Fallback to safe defaults
-            payload.update(
-                {
-                    "state": "off",
-                    "brightness": 0,
-                }
-            )
+        logger.debug(
+            f"Light state: operating_status={raw_data.get('operating_status', 0)}, "
+            f"brightness={light_fields['brightness']}%, state={light_fields['state']}"
+        )
 
     async def _check_pending_command_completion(
         self, entity_id: str, payload: dict[str, Any]
@@ -624,12 +879,9 @@ class CANBusFeature(Feature):
 
             # Check if there are any pending commands for this entity
             # This will help correlate commands with responses for UI feedback
-            pending_commands = [
-                cmd
-                for cmd in app_state.pending_commands
-                if cmd.get("entity_id") == entity_id
-                and (update_timestamp - cmd.get("timestamp", 0)) < 5.0  # Within 5 seconds
-            ]
+            pending_commands = app_state.pending_command_index.for_entity(
+                entity_id, update_timestamp
+            )
 
             if pending_commands:
                 logger.debug(
@@ -646,19 +898,17 @@ class CANBusFeature(Feature):
 
     async def _process_message(self, msg: dict[str, Any]) -> None:
         """
-        Process an incoming CAN message.
+        Process an incoming CAN message given as a dictionary.
 
-        This method would be called by the CAN bus listener when a message is received.
-        It processes the message using RVC decoding for logging and analysis.
+        Used for frames that do not come from a CAN listener, such as simulated
+        traffic; the message is converted to a frame record and decoded.
 
         Args:
             msg: The CAN message as a dictionary with keys like arbitration_id, data, etc.
         """
         try:
-            # Extract message data
             arbitration_id = msg.get("arbitration_id")
             data = msg.get("data")
-            _ = msg.get("timestamp", time.time())  # Keep for potential future use
 
             if arbitration_id is None or data is None:
                 logger.warning("Received invalid CAN message")
@@ -667,24 +917,49 @@ class CANBusFeature(Feature):
             # Convert data to bytes if it's not already
             if isinstance(data, str):
                 data = bytes.fromhex(data)
-            elif isinstance(data, bytearray):
-                data = bytes(data)  # Convert bytearray to bytes
-            elif not isinstance(data, bytes):
+            elif not isinstance(data, bytes | bytearray | memoryview):
                 logger.warning(f"Unexpected data type: {type(data)}")
                 return
 
-            # Log the message at debug level
-            logger.debug(f"CAN message received: id=0x{arbitration_id:x}, data={data.hex()}")
+            timestamp = msg.get("timestamp")
+            frame = FrameRecord(
+                arbitration_id,
+                memoryview(data),
+                time.time() if timestamp is None else timestamp,
+                interface_index(msg.get("interface") or "simulated"),
+                msg.get("is_extended", msg.get("extended_id", True)),
+            )
+        except Exception as e:
+            logger.error(f"Error processing CAN message: {e}")
+            return
+
+        await self._process_frame(frame)
 
-            # Extract PGN and source address from arbitration ID
-            # RV-C uses 29-bit extended CAN IDs: Priority (3 bits) + PGN (18 bits) + Source (8 bits)
-            pgn = (arbitration_id >> 8) & 0x3FFFF
-            source_address = arbitration_id & 0xFF
+    async def _process_frame(self, frame: FrameRecord) -> None:
+        """
+        Decode a received frame and apply it to its entity.
+
+        Transport protocol frames go to the BAM handler; other frames are
+        decoded with the RV-C decoder and, when they map to a known device,
+        update that device's entity.
 
-            # Check if this is a BAM transport protocol message
-            if self.bam_handler and pgn in [BAMHandler.TP_CM_PGN, BAMHandler.TP_DT_PGN]:
+        Args:
+            frame: The received frame
+        """
+        try:
+            arbitration_id = frame.arbitration_id
+            data = frame.data
+            pgn = frame.pgn
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"CAN message received: id=0x{arbitration_id:x}, data={data.hex()}")
+
+            # Check if this is a transport protocol (BAM or RTS/CTS) message
+            if self.bam_handler and pgn in (BAMHandler.TP_CM_PGN, BAMHandler.TP_DT_PGN):
                 # Process through BAM handler
-                result = self.bam_handler.process_frame(pgn, data, source_address)
+                result = self.bam_handler.process_frame(
+                    pgn, data, frame.source_address, frame.destination_address
+                )
 
                 if result:
                     # We have a complete multi-packet message
@@ -702,23 +977,24 @@ class CANBusFeature(Feature):
                 return
 
             # Try to decode the message using RVC decoder
-            if self.decoder_map and arbitration_id in self.decoder_map:
+            entry = self.decoder_map.get(arbitration_id) if self.decoder_map else None
+            if entry is not None:
                 try:
-                    entry = self.decoder_map[arbitration_id]
-                    decoded_data, raw_data = decode_payload(entry, data)
+                    decoded_data, raw_data = decode_payload_values(entry, data)
 
                     # Extract DGN and instance for device lookup
                     dgn_hex = entry.get("dgn_hex")
-                    instance = raw_data.get("instance") if raw_data else None
+                    instance = raw_data.get("instance")
 
-                    logger.debug(
-                        f"Decoded CAN message: DGN={dgn_hex}, instance={instance}, "
-                        f"decoded={decoded_data}, raw={raw_data}"
-                    )
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            f"Decoded CAN message: DGN={dgn_hex}, instance={instance}, "
+                            f"decoded={decoded_data}, raw={raw_data}"
+                        )
 
                     # Check if this maps to a known device/entity
                     if dgn_hex and instance is not None:
-                        device_key = (dgn_hex.upper(), str(instance))
+                        device_key = (dgn_hex.upper().removeprefix("0X"), str(instance))
                         device_config = self.device_lookup.get(device_key)
 
                         if device_config:
@@ -727,7 +1003,7 @@ class CANBusFeature(Feature):
                                 logger.debug(f"Mapped to entity: {entity_id}")
                                 # Update entity state with the decoded CAN message
                                 await self._update_entity_from_can_message(
-                                    entity_id, device_config, decoded_data, raw_data, msg
+                                    entity_id, device_config, decoded_data, raw_data, frame
                                 )
                         else:
                             logger.debug(f"Unmapped device: {dgn_hex}:{instance}")
@@ -0,0 +1,290 @@
+"""
+Fixed-capacity ring buffer for the CAN sniffer log.
+
+Every received and transmitted frame is recorded in the sniffer log, so
+appending must be O(1) and must not shift the whole log once it is full.
+The log is stored as parallel columns (struct-of-arrays): timestamps, CAN IDs
+and direction codes live in typed arrays used for filtering, while the
+original entries are kept in an object column and only materialized for
+matching rows. Entries are dicts, or received frame records
+(``backend.integrations.can.frame.FrameRecord``) that are converted to their
+dict form with ``to_dict()`` only when read.
+
+The log also keeps running counters and a per-second histogram of recent
+traffic so message rates can be read without scanning the log.
+"""
+
+import time
+from array import array
+from collections.abc import Iterator
+from typing import Any
+
+DEFAULT_CAPACITY = 10000
+
+# Direction codes stored in the direction column
+_DIRECTION_CODES = {"rx": 1, "tx": 2}
+_UNKNOWN_CAN_ID = -1
+
+# Seconds of per-second message counts kept for rate estimation
+RATE_HISTORY_SECONDS = 300
+
+
+def _entry_can_id(entry: dict[str, Any]) -> int:
+    """Extract the numeric CAN ID from a sniffer entry (RX and TX entries differ)."""
+    can_id = entry.get("arbitration_id")
+    if isinstance(can_id, int):
+        return can_id
+    can_id = entry.get("can_id")
+    if isinstance(can_id, int):
+        return can_id
+    if isinstance(can_id, str):
+        try:
+            return int(can_id, 16)
+        except ValueError:
+            pass
+    return _UNKNOWN_CAN_ID
+
+
+def _materialize(entry: Any) -> dict[str, Any]:
+    """Return the dict form of a stored entry."""
+    return entry if type(entry) is dict else entry.to_dict()
+
+
+class CANSnifferLog:
+    """
+    Ring buffer of CAN sniffer entries with indexed queries and rate counters.
+
+    Entries are expected to arrive in (roughly) timestamp order, which holds for
+    the live bus; time range queries use binary search over the timestamp column.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        """
+        Initialize the sniffer log.
+
+        Args:
+            capacity: Maximum number of entries retained
+        """
+        if capacity < 1:
+            msg = f"capacity must be at least 1, got {capacity}"
+            raise ValueError(msg)
+
+        self.capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._can_ids = array("q", [_UNKNOWN_CAN_ID]) * capacity
+        self._directions = array("b", bytes(capacity))
+        self._interfaces: list[str | None] = [None] * capacity
+        self._entries: list[Any] = [None] * capacity
+        self._head = 0  # Oldest slot
+        self._size = 0
+
+        # Running counters (never reset by wrap-around)
+        self.total_count = 0
+        self.direction_counts: dict[str, int] = {}
+        self.interface_counts: dict[str, int] = {}
+
+        # Per-second message counts for sliding-window rates
+        self._rate_buckets = array("q", bytes(8 * RATE_HISTORY_SECONDS))
+        self._rate_seconds = array("q", [-1]) * RATE_HISTORY_SECONDS
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        entries = self._entries
+        capacity = self.capacity
+        for offset in range(self._size):
+            yield _materialize(entries[(self._head + offset) % capacity])
+
+    def __contains__(self, entry: object) -> bool:
+        entries = self._entries
+        capacity = self.capacity
+        for offset in range(self._size):
+            existing = entries[(self._head + offset) % capacity]
+            if existing is entry or _materialize(existing) == entry:
+                return True
+        return False
+
+    def append(self, entry: Any) -> None:
+        """
+        Add an entry, overwriting the oldest one once the log is full.
+
+        Args:
+            entry: Sniffer entry dict (RX or TX) or received frame record
+        """
+        if type(entry) is dict:
+            timestamp = entry.get("timestamp")
+            if not isinstance(timestamp, int | float):
+                timestamp = time.time()
+            can_id = _entry_can_id(entry)
+            direction = entry.get("direction")
+            interface = entry.get("interface") or entry.get("iface")
+        else:
+            timestamp = entry.timestamp
+            can_id = entry.arbitration_id
+            direction = entry.direction
+            interface = entry.interface
+
+        if self._size == self.capacity:
+            slot = self._head
+            self._head = (self._head + 1) % self.capacity
+        else:
+            slot = (self._head + self._size) % self.capacity
+            self._size += 1
+
+        self._timestamps[slot] = timestamp
+        self._can_ids[slot] = can_id
+        self._directions[slot] = _DIRECTION_CODES.get(direction, 0)
+        self._interfaces[slot] = interface
+        self._entries[slot] = entry
+
+        self.total_count += 1
+        if direction is not None:
+            self.direction_counts[direction] = self.direction_counts.get(direction, 0) + 1
+        if interface is not None:
+            self.interface_counts[interface] = self.interface_counts.get(interface, 0) + 1
+
+        second = int(timestamp)
+        bucket = second % RATE_HISTORY_SECONDS
+        if self._rate_seconds[bucket] != second:
+            self._rate_seconds[bucket] = second
+            self._rate_buckets[bucket] = 0
+        self._rate_buckets[bucket] += 1
+
+    def extend(self, entries: list[Any]) -> None:
+        """Append several entries in order."""
+        for entry in entries:
+            self.append(entry)
+
+    def clear(self) -> None:
+        """Drop all retained entries (running counters are kept)."""
+        self._entries = [None] * self.capacity
+        self._interfaces = [None] * self.capacity
+        self._head = 0
+        self._size = 0
+
+    def to_list(self) -> list[dict[str, Any]]:
+        """Return all retained entries, oldest first."""
+        return list(self)
+
+    def message_rate(self, window: float = 10.0, now: float | None = None) -> float:
+        """
+        Messages per second over the trailing window.
+
+        Counts are kept per whole second, so the window is rounded to whole
+        seconds ending with the current one.
+
+        Args:
+            window: Window length in seconds (at most RATE_HISTORY_SECONDS)
+            now: Current wall-clock time (defaults to time.time())
+
+        Returns:
+            Average messages per second over the window
+        """
+        if window <= 0:
+            return 0.0
+        now = time.time() if now is None else now
+        seconds = min(int(window), RATE_HISTORY_SECONDS) or 1
+        current = int(now)
+        count = 0
+        for second in range(current - seconds + 1, current + 1):
+            bucket = second % RATE_HISTORY_SECONDS
+            if self._rate_seconds[bucket] == second:
+                count += self._rate_buckets[bucket]
+        return count / window
+
+    def _position_at(self, timestamp: float, right: bool = False) -> int:
+        """Binary search the logical position of a timestamp in the log."""
+        timestamps = self._timestamps
+        head = self._head
+        capacity = self.capacity
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            value = timestamps[(head + mid) % capacity]
+            if value < timestamp or (right and value == timestamp):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def query(
+        self,
+        start_time: float | None = None,
+        end_time: float | None = None,
+        pgn: int | None = None,
+        source_addr: int | None = None,
+        direction: str | None = None,
+        interface: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Return entries matching all given filters, oldest first.
+
+        Only the rows inside the time range are visited and only matching
+        entries are collected.
+
+        Args:
+            start_time: Inclusive lower timestamp bound
+            end_time: Inclusive upper timestamp bound
+            pgn: Parameter group number ((can_id >> 8) & 0x3FFFF)
+            source_addr: Source address (low byte of the CAN ID)
+            direction: "rx" or "tx"
+            interface: Interface name
+            limit: Return at most this many of the newest matching entries
+
+        Returns:
+            List of matching entry dicts
+        """
+        first = 0 if start_time is None else self._position_at(start_time)
+        last = self._size if end_time is None else self._position_at(end_time, right=True)
+        if first >= last or (limit is not None and limit <= 0):
+            return []
+
+        direction_code = _DIRECTION_CODES.get(direction, 0) if direction is not None else None
+        can_ids = self._can_ids
+        head = self._head
+        capacity = self.capacity
+
+        matches: list[dict[str, Any]] = []
+        # Walk newest to oldest so limit can stop early, then restore order
+        for position in range(last - 1, first - 1, -1):
+            slot = (head + position) % capacity
+            if pgn is not None or source_addr is not None:
+                can_id = can_ids[slot]
+                if can_id == _UNKNOWN_CAN_ID:
+                    continue
+                if pgn is not None and (can_id >> 8) & 0x3FFFF != pgn:
+                    continue
+                if source_addr is not None and can_id & 0xFF != source_addr:
+                    continue
+            if direction_code is not None and self._directions[slot] != direction_code:
+                continue
+            if interface is not None and self._interfaces[slot] != interface:
+                continue
+            matches.append(_materialize(self._entries[slot]))
+            if limit is not None and len(matches) >= limit:
+                break
+
+        matches.reverse()
+        return matches
+
+    def get_stats(self, rate_window: float = 10.0) -> dict[str, Any]:
+        """
+        Get log occupancy, running counters and the recent message rate.
+
+        Args:
+            rate_window: Window in seconds for the message rate
+
+        Returns:
+            Dictionary of sniffer log statistics
+        """
+        return {
+            "capacity": self.capacity,
+            "size": self._size,
+            "total_count": self.total_count,
+            "overwritten": self.total_count - self._size,
+            "direction_counts": dict(self.direction_counts),
+            "interface_counts": dict(self.interface_counts),
+            "message_rate": self.message_rate(rate_window),
+        }
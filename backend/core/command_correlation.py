@@ -0,0 +1,222 @@
+"""
+Correlation index for pending CAN commands.
+
+Every transmitted command is kept for a short time so the status frame that
+answers it can be grouped with it in the CAN sniffer. Commands are indexed by
+(status DGN, instance), by instance and by entity, and expire in timestamp
+order from a heap, so matching a received frame only looks at the commands
+that could answer it instead of scanning every pending command.
+
+Matched pairs also feed a fixed-bucket histogram of command-to-response
+latency per match confidence.
+"""
+
+import heapq
+import itertools
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Iterator
+from typing import Any
+
+# Pending commands are dropped this long after they were sent (seconds)
+DEFAULT_MAX_AGE = 2.0
+
+# Response windows for the two match strategies (seconds)
+MAPPING_MATCH_WINDOW = 1.0
+HEURISTIC_MATCH_WINDOW = 0.5
+
+# Upper bounds (seconds) of the command-to-response latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class _Pending:
+    """A pending command and its index keys."""
+
+    __slots__ = ("active", "entity_key", "entry", "instance_key", "status_key", "timestamp")
+
+    def __init__(self, entry: dict[str, Any], status_dgn: str | None) -> None:
+        self.entry = entry
+        self.timestamp: float = entry["timestamp"]
+        self.instance_key = entry.get("instance")
+        self.status_key = (status_dgn, self.instance_key) if status_dgn else None
+        self.entity_key = entry.get("entity_id")
+        self.active = True
+
+
+class LatencyHistogram:
+    """Latency histogram with fixed bucket bounds (per-bucket, not cumulative, counts)."""
+
+    __slots__ = ("bounds", "count", "counts", "total")
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last bucket is +Inf
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one latency sample in seconds."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return bucket counts keyed by upper bound, plus count and mean."""
+        buckets = {f"{bound:g}": n for bound, n in zip(self.bounds, self.counts, strict=False)}
+        buckets["+Inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_seconds": self.total / self.count if self.count else 0.0,
+            "buckets": buckets,
+        }
+
+
+class PendingCommandIndex:
+    """
+    Pending TX commands indexed for matching against RX status frames.
+
+    Index buckets hold commands oldest first; matched and expired commands are
+    marked inactive and dropped lazily from the front of each bucket.
+    """
+
+    def __init__(self, max_age: float = DEFAULT_MAX_AGE) -> None:
+        """
+        Initialize the index.
+
+        Args:
+            max_age: Seconds after which a pending command is discarded
+        """
+        self.max_age = max_age
+        self._by_status: dict[tuple[str, Any], deque[_Pending]] = {}
+        self._by_instance: dict[Any, deque[_Pending]] = {}
+        self._by_entity: dict[str, deque[_Pending]] = {}
+        self._expiry: list[tuple[float, int, _Pending]] = []
+        self._seq = itertools.count()
+        self._active = 0
+        self.latency: dict[str, LatencyHistogram] = {}
+
+    def __len__(self) -> int:
+        return self._active
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        """Iterate over pending command entries, oldest first."""
+        for _, _, pending in sorted(self._expiry, key=lambda item: item[:2]):
+            if pending.active:
+                yield pending.entry
+
+    def add(self, entry: dict[str, Any], status_dgn: str | None = None) -> None:
+        """
+        Add a transmitted command and expire commands older than ``max_age``.
+
+        Args:
+            entry: Sniffer entry of the command; needs a ``timestamp``
+            status_dgn: DGN (hex) of the status frame that answers the command
+        """
+        pending = _Pending(entry, status_dgn)
+        heapq.heappush(self._expiry, (pending.timestamp, next(self._seq), pending))
+        self._by_instance.setdefault(pending.instance_key, deque()).append(pending)
+        if pending.status_key is not None:
+            self._by_status.setdefault(pending.status_key, deque()).append(pending)
+        if pending.entity_key is not None:
+            self._by_entity.setdefault(pending.entity_key, deque()).append(pending)
+        self._active += 1
+        self.expire(pending.timestamp)
+
+    def expire(self, now: float) -> None:
+        """Drop commands sent ``max_age`` or more seconds before ``now``."""
+        cutoff = now - self.max_age
+        expiry = self._expiry
+        while expiry and expiry[0][0] <= cutoff:
+            _, _, pending = heapq.heappop(expiry)
+            if pending.active:
+                self._deactivate(pending)
+
+    def match(
+        self, status_dgn: str | None, instance: Any, now: float
+    ) -> tuple[dict[str, Any], str] | None:
+        """
+        Find and remove the command answered by a status frame.
+
+        Commands whose known status DGN and instance match are preferred
+        (``"high"`` confidence); otherwise a command to the same instance sent
+        shortly before is taken (``"low"``).
+
+        Returns:
+            ``(command_entry, confidence)`` or None
+        """
+        self.expire(now)
+        if status_dgn is not None:
+            pending = self._take(
+                self._by_status, (status_dgn, instance), now, MAPPING_MATCH_WINDOW
+            )
+            if pending is not None:
+                self._observe_latency("high", now - pending.timestamp)
+                return pending.entry, "high"
+        pending = self._take(self._by_instance, instance, now, HEURISTIC_MATCH_WINDOW)
+        if pending is not None:
+            self._observe_latency("low", now - pending.timestamp)
+            return pending.entry, "low"
+        return None
+
+    def for_entity(self, entity_id: str, now: float) -> list[dict[str, Any]]:
+        """Return the commands still pending for an entity, oldest first."""
+        self.expire(now)
+        bucket = self._by_entity.get(entity_id)
+        if not bucket:
+            return []
+        return [pending.entry for pending in bucket if pending.active]
+
+    def clear(self) -> None:
+        """Drop all pending commands (latency statistics are kept)."""
+        self._by_status.clear()
+        self._by_instance.clear()
+        self._by_entity.clear()
+        self._expiry.clear()
+        self._active = 0
+
+    def get_latency_stats(self) -> dict[str, Any]:
+        """Return the command-to-response latency histograms by confidence."""
+        return {confidence: hist.to_dict() for confidence, hist in self.latency.items()}
+
+    def _take(
+        self, index: dict[Any, deque[_Pending]], key: Any, now: float, window: float
+    ) -> _Pending | None:
+        """Remove and return the oldest command in a bucket sent within ``window``."""
+        bucket = index.get(key)
+        if not bucket:
+            return None
+        while bucket and not bucket[0].active:
+            bucket.popleft()
+        for pending in bucket:
+            if pending.active and 0 <= now - pending.timestamp < window:
+                self._deactivate(pending)
+                return pending
+        if not bucket:
+            del index[key]
+        return None
+
+    def _deactivate(self, pending: _Pending) -> None:
+        """Mark a command as done and trim it from the front of its buckets."""
+        pending.active = False
+        self._active -= 1
+        self._trim(self._by_instance, pending.instance_key)
+        if pending.status_key is not None:
+            self._trim(self._by_status, pending.status_key)
+        if pending.entity_key is not None:
+            self._trim(self._by_entity, pending.entity_key)
+
+    @staticmethod
+    def _trim(index: dict[Any, deque[_Pending]], key: Any) -> None:
+        bucket = index.get(key)
+        if bucket is None:
+            return
+        while bucket and not bucket[0].active:
+            bucket.popleft()
+        if not bucket:
+            del index[key]
+
+    def _observe_latency(self, confidence: str, latency: float) -> None:
+        hist = self.latency.get(confidence)
+        if hist is None:
+            hist = self.latency[confidence] = LatencyHistogram()
+        hist.observe(latency)
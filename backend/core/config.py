@@ -372,6 +372,10 @@ class RVCSettings(BaseSettings):
     coach_model: str | None = Field(
         default=None, description="Coach model to use for mapping selection"
     )
+    compiled_config_cache: bool = Field(
+        default=True,
+        description="Cache the compiled spec/mapping lookup tables in the persistence data directory",
+    )
 
     @field_validator("config_dir", "spec_path", "coach_mapping_path", mode="before")
     @classmethod
@@ -564,6 +568,10 @@ class PersistenceSettings(BaseSettings):
         """Get the persistent logs directory."""
         return self.data_dir / "logs"
 
+    def get_cache_dir(self) -> Path:
+        """Get the directory for regenerable cache artifacts."""
+        return self.data_dir / "cache"
+
     def ensure_directories(self) -> list[Path]:
         """
         Ensure all required directories exist.
@@ -582,6 +590,7 @@ class PersistenceSettings(BaseSettings):
             self.get_themes_dir(),
             self.get_dashboards_dir(),
             self.get_logs_dir(),
+            self.get_cache_dir(),
         ]
 
         created = []
@@ -195,18 +195,25 @@ class EntityManagerFeature(Feature):
             return {"status": "disabled", "reason": "Feature not enabled"}
 
         entity_count = len(self.entity_manager.get_entity_ids())
-        return {
+        details = {
             "status": "healthy",
             "entity_count": entity_count,
             "description": (
                 f"{entity_count} entities loaded" if entity_count > 0 else "No entities loaded"
             ),
         }
+        if self._persistence_service:
+            details["persistence"] = self._persistence_service.get_statistics()
+        return details
 
     def get_entity_manager(self) -> EntityManager:
         """Get the EntityManager instance."""
         return self.entity_manager
 
+    def get_persistence_service(self) -> "EntityPersistenceService | None":
+        """Get the entity persistence service, if persistence is running."""
+        return self._persistence_service
+
 
 # Singleton instance and accessor functions
 _entity_manager_feature: EntityManagerFeature | None = None
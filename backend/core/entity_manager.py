@@ -6,8 +6,11 @@ and runtime state management. It replaces the dual-dictionary approach with a
 single entity registry that serves as the source of truth.
 """
 
+import bisect
+import functools
 import logging
 import time
+import uuid
 from collections.abc import Callable
 from typing import Any
 
@@ -23,6 +26,13 @@ class EntityManager:
     This class replaces the separate entity_id_lookup and state dictionaries
     with a single registry of Entity objects that each maintain their own
     configuration and state. It includes protocol ownership and deduplication.
+
+    Secondary indexes on device type, area, protocol (primary and secondary)
+    and group are maintained on registration. Device type, area and groups are
+    indexed from entity state and re-indexed when a state update changes them;
+    protocols come from the configuration. A registry version counter is
+    bumped on every registration or state change so API callers can build
+    cheap ETags.
     """
 
     def __init__(self):
@@ -40,6 +50,26 @@ class EntityManager:
         # State change listeners for observer pattern
         self._state_change_listeners: list[Callable[[str], None]] = []
 
+        # Secondary indexes: field -> value -> entity_ids
+        self._indexes: dict[str, dict[Any, set[str]]] = {
+            "device_type": {},
+            "area": {},
+            "protocol": {},
+            "group": {},
+        }
+        # Indexed (device_type, area, groups) per entity, to detect state changes
+        self._indexed_state: dict[str, tuple] = {}
+        self._registration_order: dict[str, int] = {}
+        self._registration_counter = 0
+        # Sorted query results, valid until the registry structure or an
+        # indexed state field changes
+        self._query_cache: dict[tuple, list[str]] = {}
+
+        # Registry version for change detection (ETags); the instance token
+        # keeps versions from different process lifetimes apart
+        self.instance_token = uuid.uuid4().hex[:12]
+        self.version = 0
+
     def register_entity(
         self, entity_id: str, config: EntityConfig, protocol: str = "rvc"
     ) -> Entity:
@@ -88,12 +118,23 @@ class EntityManager:
                 self.protocol_entities[protocol] = set()
             self.protocol_entities[protocol].add(existing_entity_id)
 
+            self._index_entity(existing_entity_id, existing_entity)
+            self._structure_changed()
+
             return existing_entity
 
         # Register new entity
         entity = Entity(entity_id=entity_id, config=config)
+        previous = self.entities.get(entity_id)
+        if previous is not None:
+            self._unindex_entity(entity_id)
         self.entities[entity_id] = entity
         self.physical_id_map[physical_id] = entity_id
+        entity.on_state_change = functools.partial(self._entity_state_changed, entity_id)
+        self._registration_counter += 1
+        self._registration_order[entity_id] = self._registration_counter
+        self._index_entity(entity_id, entity)
+        self._structure_changed()
 
         # Track protocol ownership
         entity_protocol = config.get("protocol", protocol)
@@ -140,43 +181,163 @@ class EntityManager:
         """
         return list(self.entities.keys())
 
-    def filter_entities(
+    @staticmethod
+    def _state_index_key(entity: Entity) -> tuple:
+        """The state fields an entity is indexed under: (device_type, area, groups)."""
+        state = entity.current_state
+        return state.device_type, state.suggested_area, tuple(state.groups or ())
+
+    def _index_entity(self, entity_id: str, entity: Entity) -> None:
+        """Add an entity to the secondary indexes."""
+        indexes = self._indexes
+        config = entity.config
+        device_type, area, groups = key = self._state_index_key(entity)
+        self._indexed_state[entity_id] = key
+        indexes["device_type"].setdefault(device_type, set()).add(entity_id)
+        indexes["area"].setdefault(area, set()).add(entity_id)
+        for protocol in (config.get("protocol", "rvc"), *config.get("secondary_protocols", [])):
+            indexes["protocol"].setdefault(protocol, set()).add(entity_id)
+        for group in groups:
+            indexes["group"].setdefault(group, set()).add(entity_id)
+
+    def _unindex_entity(self, entity_id: str) -> None:
+        """Remove an entity from the secondary indexes."""
+        self._indexed_state.pop(entity_id, None)
+        for index in self._indexes.values():
+            for value in list(index):
+                ids = index[value]
+                ids.discard(entity_id)
+                if not ids:
+                    del index[value]
+
+    def _clear_indexes(self) -> None:
+        """Drop all secondary index entries."""
+        for index in self._indexes.values():
+            index.clear()
+        self._indexed_state.clear()
+        self._registration_order.clear()
+        self._structure_changed()
+
+    def _structure_changed(self) -> None:
+        """Invalidate cached query results after the set of entities changed."""
+        self._query_cache.clear()
+        self.version += 1
+
+    def _entity_state_changed(self, entity_id: str) -> None:
+        """
+        Bump the registry version after an entity state change.
+
+        Re-indexes the entity if the update changed its device type, area or
+        groups.
+        """
+        self.version += 1
+        entity = self.entities.get(entity_id)
+        if entity is None or self._indexed_state.get(entity_id) == self._state_index_key(entity):
+            return
+        self._unindex_entity(entity_id)
+        self._index_entity(entity_id, entity)
+        self._query_cache.clear()
+
+    def query_entity_ids(
         self,
         device_type: str | None = None,
         area: str | None = None,
         protocol: str | None = None,
-    ) -> dict[str, Entity]:
+        group: str | None = None,
+    ) -> list[str]:
         """
-        Get entities filtered by device type, area, and/or protocol.
+        Get IDs of entities matching all given filters, sorted by entity ID.
+
+        Results come from the secondary indexes and are cached until an entity
+        is registered or re-indexed, so repeated queries (e.g. paginated
+        listings) are cheap.
+        The returned list must not be modified.
 
         Args:
             device_type: Optional device type to filter by
             area: Optional area to filter by
             protocol: Optional protocol to filter by (primary or secondary)
+            group: Optional group to filter by
 
         Returns:
-            Dictionary of filtered entities
+            Sorted list of matching entity IDs
         """
-        result = {}
-        for entity_id, entity in self.entities.items():
-            matches = True
+        key = (device_type, area, protocol, group)
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            return cached
+
+        candidates = [
+            self._indexes[field].get(value, set())
+            for field, value in (
+                ("device_type", device_type),
+                ("area", area),
+                ("protocol", protocol),
+                ("group", group),
+            )
+            if value is not None
+        ]
+        if candidates:
+            candidates.sort(key=len)
+            ids = candidates[0].intersection(*candidates[1:])
+        else:
+            ids = self.entities.keys()
+
+        result = sorted(entity_id for entity_id in ids if entity_id in self.entities)
+        self._query_cache[key] = result
+        return result
 
-            if device_type is not None and entity.config.get("device_type") != device_type:
-                matches = False
+    def page_entity_ids(
+        self,
+        entity_ids: list[str],
+        limit: int,
+        after: str | None = None,
+        offset: int = 0,
+    ) -> tuple[list[str], bool]:
+        """
+        Slice a sorted entity ID list for pagination.
 
-            if area is not None and entity.config.get("suggested_area") != area:
-                matches = False
+        Args:
+            entity_ids: Sorted entity IDs as returned by query_entity_ids
+            limit: Page size
+            after: Cursor; return IDs strictly after this entity ID
+            offset: Offset used when no cursor is given
 
-            if protocol is not None:
-                entity_protocol = entity.config.get("protocol", "rvc")
-                secondary_protocols = entity.config.get("secondary_protocols", [])
-                if protocol != entity_protocol and protocol not in secondary_protocols:
-                    matches = False
+        Returns:
+            Tuple of (page of entity IDs, whether more IDs follow)
+        """
+        start = bisect.bisect_right(entity_ids, after) if after is not None else offset
+        end = start + limit
+        return entity_ids[start:end], end < len(entity_ids)
 
-            if matches:
-                result[entity_id] = entity
+    def filter_entities(
+        self,
+        device_type: str | None = None,
+        area: str | None = None,
+        protocol: str | None = None,
+        group: str | None = None,
+    ) -> dict[str, Entity]:
+        """
+        Get entities filtered by device type, area, protocol and/or group.
 
-        return result
+        Args:
+            device_type: Optional device type to filter by
+            area: Optional area to filter by
+            protocol: Optional protocol to filter by (primary or secondary)
+            group: Optional group to filter by
+
+        Returns:
+            Dictionary of filtered entities in registration order
+        """
+        if device_type is None and area is None and protocol is None and group is None:
+            return dict(self.entities)
+
+        ids = self.query_entity_ids(device_type, area, protocol, group)
+        order = self._registration_order
+        return {
+            entity_id: self.entities[entity_id]
+            for entity_id in sorted(ids, key=lambda entity_id: order.get(entity_id, 0))
+        }
 
     def get_entities_by_protocol(self, protocol: str) -> dict[str, Entity]:
         """
@@ -242,6 +403,7 @@ class EntityManager:
         logger.info(f"Bulk loading {len(entity_configs)} entities")
         self.entities = {}
         self.light_entity_ids = []
+        self._clear_indexes()
 
         for entity_id, config in entity_configs.items():
             self.register_entity(entity_id, config)
@@ -16,6 +16,7 @@ logger = logging.getLogger(__name__)
 MetricType = TypeVar("MetricType", Counter, Gauge, Histogram)
 
 __all__ = [
+    "get_can_command_response_latency",
     "get_can_tx_enqueue_latency",
     "get_can_tx_enqueue_total",
     "get_can_tx_queue_length",
@@ -31,6 +32,7 @@ _METRICS_INITIALIZED = False
 CAN_TX_QUEUE_LENGTH: Gauge | None = None
 CAN_TX_ENQUEUE_TOTAL: Counter | None = None
 CAN_TX_ENQUEUE_LATENCY: Histogram | None = None
+CAN_COMMAND_RESPONSE_LATENCY: Histogram | None = None
 HTTP_REQUESTS: Counter | None = None
 HTTP_LATENCY: Histogram | None = None
 
@@ -86,7 +88,7 @@ def initialize_backend_metrics():
     Initialize backend-specific metrics with collision avoidance.
     """
     global _METRICS_INITIALIZED, CAN_TX_QUEUE_LENGTH, CAN_TX_ENQUEUE_TOTAL, CAN_TX_ENQUEUE_LATENCY
-    global HTTP_REQUESTS, HTTP_LATENCY
+    global CAN_COMMAND_RESPONSE_LATENCY, HTTP_REQUESTS, HTTP_LATENCY
 
     if _METRICS_INITIALIZED:
         logger.debug("Backend metrics already initialized")
@@ -97,7 +99,7 @@ def initialize_backend_metrics():
     try:
         # Try to create metrics safely
         global CAN_TX_QUEUE_LENGTH, CAN_TX_ENQUEUE_TOTAL, CAN_TX_ENQUEUE_LATENCY
-        global HTTP_REQUESTS, HTTP_LATENCY
+        global CAN_COMMAND_RESPONSE_LATENCY, HTTP_REQUESTS, HTTP_LATENCY
 
         CAN_TX_QUEUE_LENGTH = _safe_create_metric(
             Gauge,
@@ -117,6 +119,13 @@ def initialize_backend_metrics():
             "Latency for enqueueing CAN control messages",
         )
 
+        CAN_COMMAND_RESPONSE_LATENCY = _safe_create_metric(
+            Histogram,
+            "coachiq_can_command_response_latency_seconds",
+            "Latency between a CAN command and the status frame grouped with it",
+            labelnames=["confidence"],
+        )
+
         HTTP_REQUESTS = _safe_create_metric(
             Counter,
             "coachiq_http_requests_total",
@@ -140,6 +149,7 @@ def initialize_backend_metrics():
         CAN_TX_QUEUE_LENGTH = None
         CAN_TX_ENQUEUE_TOTAL = None
         CAN_TX_ENQUEUE_LATENCY = None
+        CAN_COMMAND_RESPONSE_LATENCY = None
         HTTP_REQUESTS = None
         HTTP_LATENCY = None
 
@@ -174,6 +184,16 @@ def get_can_tx_enqueue_latency() -> Histogram:
     return CAN_TX_ENQUEUE_LATENCY
 
 
+def get_can_command_response_latency() -> Histogram:
+    """Get the CAN command-to-response latency metric, initializing if needed."""
+    if not _METRICS_INITIALIZED:
+        initialize_backend_metrics()
+    if CAN_COMMAND_RESPONSE_LATENCY is None:
+        msg = "CAN command response latency metric failed to initialize"
+        raise RuntimeError(msg)
+    return CAN_COMMAND_RESPONSE_LATENCY
+
+
 def get_http_requests() -> Counter:
     """Get the HTTP requests metric, initializing if needed."""
     if not _METRICS_INITIALIZED:
@@ -9,17 +9,25 @@ It is a core feature of the backend, supporting initialization, updates, and acc
 import asyncio
 import contextlib
 import logging
+from collections import deque
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from backend.models.common import CoachInfo
     from backend.models.entity_model import EntityConfig
 
+from backend.core.can_sniffer_log import DEFAULT_CAPACITY as SNIFFER_LOG_CAPACITY
+from backend.core.can_sniffer_log import CANSnifferLog
+from backend.core.command_correlation import PendingCommandIndex
 from backend.core.entity_manager import EntityManager
+from backend.core.metrics import get_can_command_response_latency
 from backend.services.feature_base import Feature
 
 logger = logging.getLogger(__name__)
 
+# Number of grouped command/response pairs kept for the CAN sniffer
+GROUPED_LOG_CAPACITY = 500
+
 
 class AppState(Feature):
     """
@@ -72,12 +80,15 @@ class AppState(Feature):
         self.unknown_pgns: dict[str, Any] = {}
         self.config_data: dict[str, Any] = config or {}
         self.background_tasks: set[Any] = set()
-        self.pending_commands: list[Any] = []
+        self.pending_command_index = PendingCommandIndex()
         self.observed_source_addresses: set[Any] = set()
         self.known_command_status_pairs: dict[Any, Any] = {}
-        self.can_sniffer_grouped: list[Any] = []
+        self.can_sniffer_grouped: deque[Any] = deque(maxlen=GROUPED_LOG_CAPACITY)
+        self._broadcast_can_sniffer_group = None
         self.last_seen_by_source_addr: dict[Any, Any] = {}
-        self.can_command_sniffer_log: list[Any] = []
+        self.can_command_sniffer_log = CANSnifferLog(
+            (config or {}).get("can_sniffer_log_capacity", SNIFFER_LOG_CAPACITY)
+        )
 
     def __repr__(self) -> str:
         return (
@@ -146,70 +157,51 @@ class AppState(Feature):
         """Returns a sorted list of all observed CAN source addresses."""
         return sorted(self.observed_source_addresses)
 
+    @property
+    def pending_commands(self) -> list[Any]:
+        """Pending TX command entries, oldest first."""
+        return list(self.pending_command_index)
+
     def add_pending_command(self, entry) -> None:
         """
-        Add a pending command and clean up old entries.
+        Add a pending command; commands older than two seconds expire.
         """
-        self.pending_commands.append(entry)
-        now = entry["timestamp"]
-        new_pending = []
-        for cmd in self.pending_commands:
-            if now - cmd["timestamp"] < 2.0:
-                new_pending.append(cmd)
-        self.pending_commands[:] = new_pending
+        cmd_dgn = entry.get("dgn_hex")
+        status_dgn = (
+            self.known_command_status_pairs.get(cmd_dgn) if isinstance(cmd_dgn, str) else None
+        )
+        self.pending_command_index.add(entry, status_dgn)
 
     def try_group_response(self, response_entry) -> bool:
         """
         Try to group a response (RX) with a pending command (TX).
         """
         now = response_entry["timestamp"]
-        instance = response_entry.get("instance")
-        dgn = response_entry.get("dgn_hex")
-
-        for cmd in self.pending_commands:
-            cmd_dgn = cmd.get("dgn_hex")
-            if (
-                cmd.get("instance") == instance
-                and isinstance(cmd_dgn, str)
-                and self.known_command_status_pairs.get(cmd_dgn) == dgn
-                and 0 <= now - cmd["timestamp"] < 1.0
-            ):
-                group = {
-                    "command": cmd,
-                    "response": response_entry,
-                    "confidence": "high",
-                    "reason": "mapping",
-                }
-                self.can_sniffer_grouped.append(group)
-                # Limit grouped entries to prevent memory buildup (keep last 500 groups)
-                if len(self.can_sniffer_grouped) > 500:
-                    self.can_sniffer_grouped.pop(0)
-                if self._broadcast_can_sniffer_group:
-                    task = asyncio.create_task(self._broadcast_can_sniffer_group(group))
-                    self.background_tasks.add(task)
-                    task.add_done_callback(self.background_tasks.discard)
-                self.pending_commands.remove(cmd)
-                return True
-
-        for cmd in self.pending_commands:
-            if cmd.get("instance") == instance and 0 <= now - cmd["timestamp"] < 0.5:
-                group = {
-                    "command": cmd,
-                    "response": response_entry,
-                    "confidence": "low",
-                    "reason": "heuristic",
-                }
-                self.can_sniffer_grouped.append(group)
-                # Limit grouped entries to prevent memory buildup (keep last 500 groups)
-                if len(self.can_sniffer_grouped) > 500:
-                    self.can_sniffer_grouped.pop(0)
-                if self._broadcast_can_sniffer_group:
-                    task = asyncio.create_task(self._broadcast_can_sniffer_group(group))
-                    self.background_tasks.add(task)
-                    task.add_done_callback(self.background_tasks.discard)
-                self.pending_commands.remove(cmd)
-                return True
-        return False
+        match = self.pending_command_index.match(
+            response_entry.get("dgn_hex"), response_entry.get("instance"), now
+        )
+        if match is None:
+            return False
+
+        cmd, confidence = match
+        group = {
+            "command": cmd,
+            "response": response_entry,
+            "confidence": confidence,
+            "reason": "mapping" if confidence == "high" else "heuristic",
+        }
+        self.can_sniffer_grouped.append(group)
+        try:
+            get_can_command_response_latency().labels(confidence=confidence).observe(
+                now - cmd["timestamp"]
+            )
+        except RuntimeError as e:
+            logger.debug(f"Failed to record command response latency: {e}")
+        if self._broadcast_can_sniffer_group:
+            task = asyncio.create_task(self._broadcast_can_sniffer_group(group))
+            self.background_tasks.add(task)
+            task.add_done_callback(self.background_tasks.discard)
+        return True
 
     def get_can_sniffer_grouped(self) -> list:
         """Returns the list of grouped CAN sniffer entries."""
@@ -227,16 +219,50 @@ class AppState(Feature):
     def add_can_sniffer_entry(self, entry) -> None:
         """
         Adds a CAN command/control message entry to the sniffer log.
+
+        The log is a fixed-capacity ring buffer; once full, the oldest entry is overwritten.
         """
         self.can_command_sniffer_log.append(entry)
         self.update_last_seen_by_source_addr(entry)
-        if len(self.can_command_sniffer_log) > 1000:
-            self.can_command_sniffer_log.pop(0)
+        self.notify_network_map_ws()
+
+    def add_can_sniffer_frame(self, frame) -> None:
+        """
+        Adds a received frame record to the sniffer log without converting it.
+
+        The record is turned into a sniffer entry dict only when the log is read.
+        """
+        self.can_command_sniffer_log.append(frame)
         self.notify_network_map_ws()
 
     def get_can_sniffer_log(self) -> list:
         """Returns the current CAN command/control sniffer log."""
-        return list(self.can_command_sniffer_log)
+        return self.can_command_sniffer_log.to_list()
+
+    def query_can_sniffer_log(
+        self,
+        start_time: float | None = None,
+        end_time: float | None = None,
+        pgn: int | None = None,
+        source_addr: int | None = None,
+        direction: str | None = None,
+        interface: str | None = None,
+        limit: int | None = None,
+    ) -> list:
+        """
+        Returns sniffer log entries matching the given filters, oldest first.
+
+        See CANSnifferLog.query for the filter semantics.
+        """
+        return self.can_command_sniffer_log.query(
+            start_time=start_time,
+            end_time=end_time,
+            pgn=pgn,
+            source_addr=source_addr,
+            direction=direction,
+            interface=interface,
+            limit=limit,
+        )
 
     def get_last_known_brightness(self, entity_id) -> int:
         """
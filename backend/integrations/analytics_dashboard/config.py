@@ -72,6 +72,12 @@ class AnalyticsDashboardSettings(BaseSettings):
         ge=1,
         le=1000,
     )
+    metric_flush_interval_seconds: float = Field(
+        default=5.0,
+        description="Maximum seconds a recorded metric waits before being written to SQLite",
+        ge=0.1,
+        le=300.0,
+    )
     db_path: str = Field(
         default="data/analytics.db",
         description="Path to SQLite database file when persistence is enabled",
@@ -0,0 +1,362 @@
+"""
+Per-interface CAN decode worker processes.
+
+In this optional mode each CAN interface is received and decoded in its own
+process instead of on the asyncio loop that also serves the API. A worker
+opens its own socketcan socket for the interface, decodes RV-C frames with the
+compiled configuration and sends compact entity deltas back to the main
+process over a pipe:
+
+    (entity_id, changed_fields, timestamp)
+
+``changed_fields`` only holds the top-level state fields whose value differs
+from the last delta sent for that entity, so repeated identical status frames
+cost nothing on the main loop, which only applies state and fans it out.
+The main process can also change entity state on its own (optimistic updates
+when a command is sent), so every ``resync_interval`` seconds the next status
+frame for an entity is sent with all of its fields, overwriting any value the
+bus never confirmed.
+
+Deltas are sent in batches, flushed when a batch is full or when the oldest
+delta in it has waited ``flush_interval`` seconds.
+
+A worker that exits unexpectedly is started again after a delay that doubles
+with every consecutive failure; until it is back, its interface is reported
+as degraded.
+"""
+
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from backend.integrations.rvc.decoder_core import decode_payload_values
+
+logger = logging.getLogger(__name__)
+
+# A decoded change for one entity: (entity_id, changed_fields, timestamp)
+EntityDelta = tuple[str, dict[str, Any], float]
+
+DEFAULT_BATCH_SIZE = 128
+DEFAULT_FLUSH_INTERVAL = 0.005  # seconds
+DEFAULT_RESYNC_INTERVAL = 1.0  # seconds
+_IDLE_RECV_TIMEOUT = 0.5  # seconds; bounds how long a stop request can go unnoticed
+RESPAWN_BACKOFF_INITIAL = 1.0  # seconds before restarting a worker that exited
+RESPAWN_BACKOFF_MAX = 60.0  # seconds; cap for the doubling restart delay
+
+# Device config fields copied into entity state
+_CONFIG_FIELDS = ("suggested_area", "device_type", "capabilities", "friendly_name", "groups")
+
+
+def light_state_fields(raw_data: dict[str, Any]) -> dict[str, Any]:
+    """
+    Derive light ``state`` and ``brightness`` from raw RV-C signal values.
+
+    The CAN operating status (0-200) maps to a 0-100 UI brightness; anything
+    above zero is on. Unparseable values fall back to off.
+    """
+    try:
+        operating_status = raw_data.get("operating_status", 0)
+        if isinstance(operating_status, str):
+            operating_status = int(operating_status)
+
+        brightness_pct = max(0, min(100, int((operating_status / 200.0) * 100)))
+        return {"state": "on" if operating_status > 0 else "off", "brightness": brightness_pct}
+    except Exception as e:
+        logger.error(f"Error processing light state: {e}")
+        return {"state": "off", "brightness": 0}
+
+
+class FrameDecoder:
+    """
+    Decodes RV-C frames into entity deltas.
+
+    Keeps the last state fields sent for each entity so only changes are
+    emitted, plus a full set of fields every ``resync_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        decoder_map: dict[int, dict],
+        device_lookup: dict[tuple[str, str], dict],
+        resync_interval: float = DEFAULT_RESYNC_INTERVAL,
+    ) -> None:
+        self.decoder_map = decoder_map
+        self.device_lookup = device_lookup
+        self.resync_interval = resync_interval
+        self._last_fields: dict[str, dict[str, Any]] = {}
+        self._last_resync: dict[str, float] = {}
+        self.frames = 0
+        self.decoded = 0
+        self.errors = 0
+
+    def decode(self, arbitration_id: int, data: bytes, timestamp: float) -> EntityDelta | None:
+        """Decode a frame; return the entity delta, or None if nothing changed."""
+        self.frames += 1
+        entry = self.decoder_map.get(arbitration_id)
+        if entry is None:
+            return None
+
+        try:
+            decoded_data, raw_data = decode_payload_values(entry, data)
+        except Exception as e:
+            self.errors += 1
+            logger.debug(f"Error decoding CAN message 0x{arbitration_id:x}: {e}")
+            return None
+
+        dgn_hex = entry.get("dgn_hex")
+        instance = raw_data.get("instance")
+        if not dgn_hex or instance is None:
+            return None
+        # Spec entries carry "0x"-prefixed DGNs; the lookup is keyed without it
+        device_config = self.device_lookup.get(
+            (dgn_hex.upper().removeprefix("0X"), str(instance))
+        )
+        entity_id = device_config.get("entity_id") if device_config else None
+        if not entity_id:
+            return None
+        self.decoded += 1
+
+        fields: dict[str, Any] = {"value": decoded_data, "raw": raw_data}
+        for config_field in _CONFIG_FIELDS:
+            if config_field in device_config:
+                fields[config_field] = device_config[config_field]
+        if device_config.get("device_type") == "light":
+            fields.update(light_state_fields(raw_data))
+
+        last = self._last_fields.get(entity_id)
+        if last is None or timestamp - self._last_resync[entity_id] >= self.resync_interval:
+            changed = fields
+            self._last_resync[entity_id] = timestamp
+        else:
+            changed = {key: value for key, value in fields.items() if last.get(key) != value}
+            if not changed:
+                return None
+        self._last_fields[entity_id] = fields
+        return entity_id, changed, timestamp
+
+
+def run_decode_worker(
+    interface: str,
+    bustype: str,
+    spec_path: str | None,
+    map_path: str | None,
+    conn,
+    stop_event,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    resync_interval: float = DEFAULT_RESYNC_INTERVAL,
+) -> None:
+    """
+    Worker process entry point: receive, decode and ship deltas until stopped.
+
+    Args:
+        interface: CAN channel to receive from (e.g. ``can0``)
+        bustype: python-can interface type (e.g. ``socketcan``)
+        spec_path: RV-C spec path override
+        map_path: Coach mapping path override
+        conn: Sending end of the pipe to the main process
+        stop_event: ``multiprocessing.Event`` set by the main process to stop
+        batch_size: Maximum deltas per message on the pipe
+        flush_interval: Maximum seconds a delta waits before being sent
+        resync_interval: Seconds between full-field deltas for an entity
+    """
+    import can
+
+    from backend.integrations.rvc.decode import load_compiled_config
+
+    compiled = load_compiled_config(
+        rvc_spec_path_override=spec_path, device_mapping_path_override=map_path
+    )
+    decoder = FrameDecoder(compiled.config_data[0], compiled.device_lookup, resync_interval)
+    bus = can.Bus(channel=interface, interface=bustype)
+
+    batch: list[EntityDelta] = []
+    deadline = 0.0
+    try:
+        while not stop_event.is_set():
+            timeout = max(0.0, deadline - time.monotonic()) if batch else _IDLE_RECV_TIMEOUT
+            message = bus.recv(timeout=timeout)
+            if message is not None:
+                delta = decoder.decode(message.arbitration_id, bytes(message.data), time.time())
+                if delta is not None:
+                    if not batch:
+                        deadline = time.monotonic() + flush_interval
+                    batch.append(delta)
+            if batch and (len(batch) >= batch_size or time.monotonic() >= deadline):
+                conn.send(batch)
+                batch = []
+    except (BrokenPipeError, EOFError):
+        pass  # Main process went away
+    finally:
+        bus.shutdown()
+        conn.close()
+
+
+class DecodeWorkerPool:
+    """
+    One decode worker process per CAN interface.
+
+    Deltas arriving from the workers are read by the event loop when the pipe
+    becomes readable and handed, one batch at a time, to ``on_deltas``. A
+    worker whose pipe closes is restarted with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        interfaces: list[str],
+        bustype: str,
+        on_deltas: Callable[[list[EntityDelta]], Awaitable[None]],
+        spec_path: str | None = None,
+        map_path: str | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        resync_interval: float = DEFAULT_RESYNC_INTERVAL,
+    ) -> None:
+        self.interfaces = interfaces
+        self.bustype = bustype
+        self.on_deltas = on_deltas
+        self.spec_path = spec_path
+        self.map_path = map_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.resync_interval = resync_interval
+        # Spawn instead of fork: the main process runs an event loop and threads
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = self._context.Event()
+        self._workers: dict[str, dict[str, Any]] = {}
+        self._pending: asyncio.Queue[list[EntityDelta]] = asyncio.Queue()
+        self._apply_task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start a worker process for every interface."""
+        self._stop_event.clear()
+        for interface in self.interfaces:
+            self._workers[interface] = {
+                "process": None,
+                "conn": None,
+                "batches": 0,
+                "deltas": 0,
+                "restarts": 0,
+                "backoff": RESPAWN_BACKOFF_INITIAL,
+                "respawn": None,
+            }
+            self._spawn_worker(interface)
+        self._apply_task = asyncio.create_task(self._apply_loop(), name="can_decode_apply")
+
+    def _spawn_worker(self, interface: str) -> None:
+        """Start the worker process for one interface and watch its pipe."""
+        worker = self._workers[interface]
+        worker["respawn"] = None
+        recv_conn, send_conn = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=run_decode_worker,
+            args=(
+                interface,
+                self.bustype,
+                self.spec_path,
+                self.map_path,
+                send_conn,
+                self._stop_event,
+                self.batch_size,
+                self.flush_interval,
+                self.resync_interval,
+            ),
+            name=f"can-decode-{interface}",
+            daemon=True,
+        )
+        process.start()
+        send_conn.close()  # Only the worker writes
+        worker["process"] = process
+        worker["conn"] = recv_conn
+        asyncio.get_running_loop().add_reader(recv_conn.fileno(), self._on_readable, interface)
+        logger.info(f"Started CAN decode worker for {interface} (pid {process.pid})")
+
+    def _on_readable(self, interface: str) -> None:
+        """Drain every batch already waiting on a worker's pipe."""
+        worker = self._workers[interface]
+        conn = worker["conn"]
+        try:
+            while conn.poll():
+                batch = conn.recv()
+                worker["batches"] += 1
+                worker["deltas"] += len(batch)
+                # The worker is delivering again, so the next failure starts over
+                worker["backoff"] = RESPAWN_BACKOFF_INITIAL
+                self._pending.put_nowait(batch)
+        except (EOFError, OSError):
+            self._on_worker_exit(interface)
+
+    def _on_worker_exit(self, interface: str) -> None:
+        """Stop watching a dead worker's pipe and schedule its restart."""
+        worker = self._workers[interface]
+        conn = worker["conn"]
+        loop = asyncio.get_running_loop()
+        loop.remove_reader(conn.fileno())
+        conn.close()
+        worker["conn"] = None
+        if self._stop_event.is_set():
+            return
+
+        delay = worker["backoff"]
+        worker["backoff"] = min(delay * 2, RESPAWN_BACKOFF_MAX)
+        worker["restarts"] += 1
+        worker["respawn"] = loop.call_later(delay, self._spawn_worker, interface)
+        logger.error(f"CAN decode worker for {interface} exited; restarting in {delay:.1f}s")
+
+    async def _apply_loop(self) -> None:
+        while True:
+            batch = await self._pending.get()
+            try:
+                await self.on_deltas(batch)
+            except Exception as e:
+                logger.error(f"Error applying decoded CAN deltas: {e}", exc_info=True)
+
+    async def stop(self, join_timeout: float = 2.0) -> None:
+        """Stop the workers, waiting up to ``join_timeout`` seconds before terminating them."""
+        self._stop_event.set()
+        loop = asyncio.get_running_loop()
+        for interface, worker in self._workers.items():
+            if worker["respawn"] is not None:
+                worker["respawn"].cancel()
+            conn = worker["conn"]
+            if conn is not None:
+                with contextlib.suppress(Exception):
+                    loop.remove_reader(conn.fileno())
+            process = worker["process"]
+            await loop.run_in_executor(None, process.join, join_timeout)
+            if process.is_alive():
+                logger.warning(f"CAN decode worker for {interface} did not stop; terminating")
+                process.terminate()
+            if conn is not None:
+                conn.close()
+        self._workers.clear()
+        if self._apply_task:
+            self._apply_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._apply_task
+            self._apply_task = None
+
+    def degraded_interfaces(self) -> list[str]:
+        """Interfaces whose worker has exited and is waiting to be restarted."""
+        return [
+            interface
+            for interface, worker in self._workers.items()
+            if worker["conn"] is None or not worker["process"].is_alive()
+        ]
+
+    def get_stats(self) -> dict[str, Any]:
+        """Per-interface worker status, restart and delta counters."""
+        return {
+            interface: {
+                "pid": worker["process"].pid,
+                "alive": worker["conn"] is not None and worker["process"].is_alive(),
+                "restarts": worker["restarts"],
+                "batches": worker["batches"],
+                "deltas": worker["deltas"],
+            }
+            for interface, worker in self._workers.items()
+        }
@@ -0,0 +1,130 @@
+"""
+Slotted record for a received CAN frame.
+
+A frame received by ``CANBusFeature`` is turned into a single ``FrameRecord``
+that is passed unchanged through deduplication, traffic monitoring, the
+sniffer log, the priority ingest queues, BAM reassembly and RV-C decoding.
+The payload is a memoryview of the python-can message buffer, and the
+interface is stored as a small integer index. The dictionary form used by
+API and WebSocket consumers is only built by ``to_dict`` when one of them
+reads the frame.
+"""
+
+from typing import Any
+
+# Interface names by index, shared by every frame record
+_interface_names: list[str] = []
+_interface_indexes: dict[str, int] = {}
+
+
+def interface_index(name: str) -> int:
+    """Return the index of an interface name, registering it on first use."""
+    index = _interface_indexes.get(name)
+    if index is None:
+        index = _interface_indexes[name] = len(_interface_names)
+        _interface_names.append(name)
+    return index
+
+
+def interface_name(index: int) -> str:
+    """Return the interface name registered under ``index``."""
+    return _interface_names[index]
+
+
+class FrameRecord:
+    """
+    A received CAN frame.
+
+    ``pgn`` is the parameter group number with the destination address of
+    PDU1-format frames masked out; ``dgn`` is the 18-bit field as it appears in
+    the arbitration ID.
+    """
+
+    __slots__ = (
+        "arbitration_id",
+        "data",
+        "destination_address",
+        "direction",
+        "iface",
+        "is_extended",
+        "pgn",
+        "source_address",
+        "timestamp",
+    )
+
+    def __init__(
+        self,
+        arbitration_id: int,
+        data: memoryview,
+        timestamp: float,
+        iface: int,
+        is_extended: bool = True,
+        direction: str = "rx",
+    ) -> None:
+        self.arbitration_id = arbitration_id
+        self.data = data
+        self.timestamp = timestamp
+        self.iface = iface
+        self.is_extended = is_extended
+        self.direction = direction
+        self.source_address = arbitration_id & 0xFF
+        pgn = (arbitration_id >> 8) & 0x3FFFF
+        if ((pgn >> 8) & 0xFF) < 0xF0:
+            # PDU1 format: the PS byte carries the destination address
+            self.destination_address = pgn & 0xFF
+            pgn &= 0x3FF00
+        else:
+            self.destination_address = 0xFF
+        self.pgn = pgn
+
+    @classmethod
+    def from_message(cls, message, interface: str, timestamp: float) -> "FrameRecord":
+        """
+        Wrap a python-can message without copying its payload.
+
+        Args:
+            message: python-can Message object
+            interface: Name of the interface that received the message
+            timestamp: Receive time to record for the frame
+        """
+        return cls(
+            message.arbitration_id,
+            memoryview(message.data),
+            timestamp,
+            interface_index(interface),
+            message.is_extended_id,
+        )
+
+    @property
+    def dgn(self) -> int:
+        """The 18-bit DGN field of the arbitration ID."""
+        return (self.arbitration_id >> 8) & 0x3FFFF
+
+    @property
+    def dlc(self) -> int:
+        return len(self.data)
+
+    @property
+    def interface(self) -> str:
+        return _interface_names[self.iface]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the frame as a CAN sniffer entry."""
+        return {
+            "timestamp": self.timestamp,
+            "interface": _interface_names[self.iface],
+            "can_id": f"{self.arbitration_id:08X}",
+            "data": self.data.hex().upper(),
+            "dlc": len(self.data),
+            "is_extended": self.is_extended,
+            "direction": self.direction,
+            "decoded": None,
+            "origin": "other",  # RX frames come from other devices
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"FrameRecord(arbitration_id=0x{self.arbitration_id:08X}, "
+            f"data={self.data.hex().upper()}, interface={self.interface!r}, "
+            f"timestamp={self.timestamp})"
+        )
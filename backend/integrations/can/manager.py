@@ -3,7 +3,7 @@ Manages CAN bus communication for the CoachIQ daemon.
 
 This module is responsible for:
 - Initializing and managing CAN bus listener threads for specified interfaces.
-- Providing a writer task to send messages from an asynchronous queue to the CAN bus.
+- Providing a writer task that runs the per-interface priority transmit scheduler.
 - Constructing RV-C specific CAN messages (e.g., for light control).
 - Storing and providing access to active CAN bus interface objects.
 """
@@ -19,115 +19,78 @@ from can.exceptions import CanInterfaceNotImplementedError
 from backend.core.config import get_settings
 from backend.core.metrics import get_can_tx_queue_length
 from backend.core.state import AppState
+from backend.integrations.can.tx_scheduler import CANTxScheduler
 
 logger = logging.getLogger(__name__)
 
-can_tx_queue: asyncio.Queue[tuple[can.Message, str]] = asyncio.Queue()
 buses: dict[str, BusABC] = {}
 
 
+def _open_bus(interface_name: str) -> BusABC:
+    """Open a bus that was not pre-initialized, using the configured bustype."""
+    default_bustype = get_settings().can.bustype
+    logger.warning(
+        f"CAN writer: Bus for interface '{interface_name}' not pre-initialized. "
+        f"Attempting to open with bustype '{default_bustype}'."
+    )
+    try:
+        return can.interface.Bus(channel=interface_name, bustype=default_bustype)
+    except CanInterfaceNotImplementedError as e:
+        msg = (
+            f"CAN interface '{interface_name}' ({default_bustype}) "
+            f"is not implemented or configuration is missing: {e}"
+        )
+        raise RuntimeError(msg) from e
+
+
+# Per-interface priority transmit scheduler. Kept under the historical
+# ``can_tx_queue`` name: callers ``await can_tx_queue.put((msg, interface))``
+# or pass ``(msg, interface, TxPriority.EMERGENCY)`` to jump the line.
+can_tx_queue = CANTxScheduler(buses, open_bus=_open_bus)
+
+
+def _set_queue_length_metric(length: int) -> None:
+    try:
+        get_can_tx_queue_length().set(length)
+    except RuntimeError as e:
+        logger.warning(f"Failed to update queue length metric: {e}")
+
+
 async def can_writer(app_state: AppState) -> None:
     """
-    Continuously dequeues messages from can_tx_queue and sends them over the CAN bus.
-    Handles sending each message twice as per RV-C specification.
-    Attempts to initialize a bus if not already available in the 'buses' dictionary.
+    Run the CAN transmit scheduler until cancelled.
+
+    Each interface gets its own worker; ``bus.send`` runs off the event loop
+    and the RV-C repeat transmission is scheduled as a deferred timer rather
+    than a blocking sleep. Every frame is added to the CAN sniffer log and the
+    pending-command index after its first transmission.
     """
-    settings = get_settings()
-    default_bustype = settings.can.bustype
+
+    def on_sent(msg: can.Message, interface_name: str) -> None:
+        # Note: Decoder functionality moved to RVC integration feature
+        # For now, we'll log without decoding to maintain functionality
+        source_addr = msg.arbitration_id & 0xFF
+        origin = "self" if source_addr == app_state.get_controller_source_addr() else "other"
+        sniffer_entry = {
+            "timestamp": time.time(),
+            "direction": "tx",
+            "arbitration_id": msg.arbitration_id,
+            "data": msg.data.hex().upper(),
+            "decoded": None,
+            "raw": None,
+            "iface": interface_name,
+            "pgn": None,
+            "dgn_hex": None,
+            "name": None,
+            "instance": None,
+            "source_addr": source_addr,
+            "origin": origin,
+        }
+        app_state.add_can_sniffer_entry(sniffer_entry)
+        app_state.add_pending_command(sniffer_entry)
+
     try:
-        while True:
-            msg, interface_name = await can_tx_queue.get()
-            try:
-                get_can_tx_queue_length().set(can_tx_queue.qsize())
-            except RuntimeError as e:
-                logger.warning(f"Failed to update queue length metric: {e}")
-            try:
-                bus = buses.get(interface_name)
-                if not bus:
-                    logger.warning(
-                        f"CAN writer: Bus for interface '{interface_name}' not pre-initialized. "
-                        f"Attempting to open with bustype '{default_bustype}'."
-                    )
-                    try:
-                        bus = can.interface.Bus(channel=interface_name, bustype=default_bustype)
-                        buses[interface_name] = bus
-                        logger.info(
-                            f"CAN writer: Successfully opened and "
-                            f"registered bus for '{interface_name}'."
-                        )
-                    except CanInterfaceNotImplementedError as e:
-                        logger.error(
-                            f"CAN writer: CAN interface '{interface_name}' ({default_bustype}) "
-                            f"is not implemented or configuration is missing: {e}"
-                        )
-                        can_tx_queue.task_done()
-                        continue
-                    except Exception as e:
-                        logger.error(
-                            f"CAN writer: Failed to initialize CAN bus '{interface_name}' "
-                            f"({default_bustype}): {e}"
-                        )
-                        can_tx_queue.task_done()
-                        continue
-                try:
-                    bus.send(msg)
-                    logger.info(
-                        f"CAN TX (1/2): {interface_name} ID: {msg.arbitration_id:08X} "
-                        f"Data: {msg.data.hex().upper()}"
-                    )
-                    # --- CAN Sniffer Logging (TX, ALL messages) ---
-                    now = time.time()
-                    # Note: Decoder functionality moved to RVC integration feature
-                    # For now, we'll log without decoding to maintain functionality
-                    entry = None
-                    instance = None
-                    decoded = None
-                    raw = None
-                    source_addr = msg.arbitration_id & 0xFF
-                    origin = (
-                        "self" if source_addr == app_state.get_controller_source_addr() else "other"
-                    )
-                    sniffer_entry = {
-                        "timestamp": now,
-                        "direction": "tx",
-                        "arbitration_id": msg.arbitration_id,
-                        "data": msg.data.hex().upper(),
-                        "decoded": decoded,
-                        "raw": raw,
-                        "iface": interface_name,
-                        "pgn": entry.get("pgn") if entry else None,
-                        "dgn_hex": entry.get("dgn_hex") if entry else None,
-                        "name": entry.get("name") if entry else None,
-                        "instance": instance,
-                        "source_addr": source_addr,
-                        "origin": origin,
-                    }
-                    app_state.add_can_sniffer_entry(sniffer_entry)
-                    app_state.add_pending_command(sniffer_entry)
-                    await asyncio.sleep(0.05)  # RV-C spec: send commands twice
-                    bus.send(msg)
-                    logger.info(
-                        f"CAN TX (2/2): {interface_name} ID: {msg.arbitration_id:08X} "
-                        f"Data: {msg.data.hex().upper()}"
-                    )
-                except can.exceptions.CanError as e:
-                    logger.error(f"CAN writer failed to send message on {interface_name}: {e}")
-                except Exception as e:
-                    logger.error(
-                        f"CAN writer encountered an unexpected error "
-                        f"during send on {interface_name}: {e}"
-                    )
-            except Exception as e:
-                logger.error(
-                    f"CAN writer encountered a critical unexpected error for {interface_name}: {e}",
-                    exc_info=True,
-                )
-            finally:
-                can_tx_queue.task_done()
-                try:
-                    get_can_tx_queue_length().set(can_tx_queue.qsize())
-                except RuntimeError as e:
-                    logger.warning(f"Failed to update queue length metric: {e}")
+        await can_tx_queue.run(on_sent=on_sent, on_queue_change=_set_queue_length_metric)
     except asyncio.CancelledError:
         logger.info("CAN writer task cancelled, shutting down gracefully")
         return
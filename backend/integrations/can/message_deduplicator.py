@@ -2,27 +2,16 @@
 CAN Message Deduplication for Bridged Interfaces
 
 Prevents duplicate processing when using cangw or similar bridges.
+
+Messages are keyed directly on ``(arbitration_id, bytes(data))`` and expired
+through a fixed-size ring buffer ordered by a monotonic clock, so the hot path
+does no hashing beyond the tuple key and no per-frame object allocation other
+than the key itself.
 """
 
-import hashlib
 import time
-from collections import deque
-from dataclasses import dataclass
-from typing import Dict, Optional, Set
-
-
-@dataclass
-class MessageSignature:
-    """Unique signature for a CAN message."""
-    can_id: int
-    data: bytes
-    timestamp: float
-
-    def hash(self) -> str:
-        """Generate hash for message comparison."""
-        # Include CAN ID and data, but not timestamp or interface
-        content = f"{self.can_id:08X}{self.data.hex()}"
-        return hashlib.md5(content.encode()).hexdigest()[:16]
+from collections.abc import Callable
+from typing import Any
 
 
 class CANMessageDeduplicator:
@@ -30,23 +19,50 @@ class CANMessageDeduplicator:
     Deduplicates CAN messages when multiple interfaces are bridged.
 
     Uses a sliding time window to detect and filter duplicate messages
-    that appear on multiple interfaces due to bridging.
+    that appear on multiple interfaces due to bridging. A message is a
+    duplicate if an identical frame (same CAN ID and data) was first seen
+    less than ``window_ms`` ago; duplicates do not extend the window.
     """
 
-    def __init__(self, window_ms: int = 50, max_cache_size: int = 10000):
+    def __init__(
+        self,
+        window_ms: int = 50,
+        max_cache_size: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         """
         Initialize deduplicator.
 
         Args:
             window_ms: Time window in milliseconds to consider messages as duplicates
-            max_cache_size: Maximum number of message hashes to cache
+            max_cache_size: Maximum number of messages tracked inside the window
+            clock: Monotonic clock returning seconds (injectable for tests)
         """
+        if max_cache_size < 1:
+            msg = f"max_cache_size must be at least 1, got {max_cache_size}"
+            raise ValueError(msg)
+
         self.window_ms = window_ms
         self.max_cache_size = max_cache_size
-        self.message_cache: Dict[str, float] = {}
-        self.cache_order: deque = deque()
+        self._window = window_ms / 1000.0
+        self._clock = clock
+
+        # Last-seen time per message key
+        self.message_cache: dict[tuple[int, bytes], float] = {}
+
+        # Ring buffer of (key, seen_at) in insertion (and therefore time) order
+        self._ring_keys: list[tuple[int, bytes] | None] = [None] * max_cache_size
+        self._ring_times: list[float] = [0.0] * max_cache_size
+        self._head = 0  # Oldest slot
+        self._size = 0
 
-    def is_duplicate(self, can_id: int, data: bytes) -> bool:
+        # Counters
+        self.hits = 0  # Duplicates dropped
+        self.misses = 0  # Unique messages passed through
+        self.expirations = 0  # Entries aged out of the window
+        self.evictions = 0  # Entries dropped early because the ring was full
+
+    def is_duplicate(self, can_id: int, data: bytes | bytearray) -> bool:
         """
         Check if a message is a duplicate.
 
@@ -57,39 +73,78 @@ class CANMessageDeduplicator:
         Returns:
             True if message is a duplicate within the time window
         """
-        current_time = time.time() * 1000  # Convert to milliseconds
-
-        # Create message signature
-        sig = MessageSignature(can_id, data, current_time)
-        msg_hash = sig.hash()
+        now = self._clock()
+        key = (can_id, bytes(data))
 
         # Clean old entries
-        self._clean_expired_entries(current_time)
+        if self._size:
+            self._expire(now - self._window)
+
+        last_seen = self.message_cache.get(key)
+        if last_seen is not None and (now - last_seen) < self._window:
+            self.hits += 1
+            return True
 
-        # Check if we've seen this message recently
-        if msg_hash in self.message_cache:
-            last_seen = self.message_cache[msg_hash]
-            if (current_time - last_seen) < self.window_ms:
-                return True
+        self.misses += 1
 
-        # Add to cache
-        self.message_cache[msg_hash] = current_time
-        self.cache_order.append((msg_hash, current_time))
+        # Make room if the ring is full
+        if self._size == self.max_cache_size:
+            self._pop_oldest()
+            self.evictions += 1
 
-        # Maintain cache size limit
-        if len(self.cache_order) > self.max_cache_size:
-            oldest_hash, _ = self.cache_order.popleft()
-            self.message_cache.pop(oldest_hash, None)
+        tail = (self._head + self._size) % self.max_cache_size
+        self._ring_keys[tail] = key
+        self._ring_times[tail] = now
+        self._size += 1
+        self.message_cache[key] = now
 
         return False
 
-    def _clean_expired_entries(self, current_time: float) -> None:
-        """Remove entries older than the time window."""
-        cutoff_time = current_time - self.window_ms
+    def _expire(self, cutoff: float) -> None:
+        """Remove entries last seen at or before the cutoff time."""
+        ring_times = self._ring_times
+        while self._size and ring_times[self._head] <= cutoff:
+            self._pop_oldest()
+            self.expirations += 1
+
+    def _pop_oldest(self) -> None:
+        """Drop the oldest ring slot and its cache entry if not refreshed since."""
+        head = self._head
+        key = self._ring_keys[head]
+        seen_at = self._ring_times[head]
+        self._ring_keys[head] = None
+        self._head = (head + 1) % self.max_cache_size
+        self._size -= 1
+
+        # A newer ring slot owns the key if it was seen again after this one
+        if key is not None and self.message_cache.get(key) == seen_at:
+            del self.message_cache[key]
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get deduplication statistics.
 
-        while self.cache_order and self.cache_order[0][1] < cutoff_time:
-            expired_hash, _ = self.cache_order.popleft()
-            self.message_cache.pop(expired_hash, None)
+        Returns:
+            Dictionary with hit/miss/eviction counters and cache occupancy
+        """
+        total = self.hits + self.misses
+        return {
+            "window_ms": self.window_ms,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "duplicate_rate": self.hits / total if total else 0.0,
+            "cache_size": len(self.message_cache),
+            "max_cache_size": self.max_cache_size,
+        }
+
+    def reset_stats(self) -> None:
+        """Reset the hit/miss/eviction counters."""
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
 
 
 # Usage example for your application:
@@ -9,6 +9,7 @@ This module is part of Phase 3.2 of the CAN Bus Decoder architecture improvement
 """
 
 import asyncio
+import bisect
 import logging
 import statistics
 import threading
@@ -40,6 +41,23 @@ class ComponentType(Enum):
     CONFIGURATION_SERVICE = "configuration_service"
     RVC_DECODER = "rvc_decoder"
     J1939_DECODER = "j1939_decoder"
+    CAN_INGEST = "can_ingest"
+
+
+# Default histogram buckets for the batched CAN receive loop
+INGEST_BATCH_SIZE_BUCKETS: tuple[float, ...] = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+INGEST_BATCH_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+)
 
 
 @dataclass
@@ -134,6 +152,75 @@ class ComponentStats:
         return len(recent_times) / window_seconds
 
 
+@dataclass
+class HistogramStats:
+    """Fixed-bucket histogram in the Prometheus style (upper-bound buckets plus +Inf)."""
+
+    buckets: tuple[float, ...]
+    counts: list[int] = field(init=False)
+    count: int = 0
+    total: float = 0.0
+    max_value: float = 0.0
+
+    def __post_init__(self) -> None:
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+
+    def observe(self, value: float) -> None:
+        """Record a single observation."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max_value:
+            self.max_value = value
+
+    def get_mean(self) -> float:
+        """Get the mean of all observations."""
+        return self.total / self.count if self.count else 0.0
+
+    def get_percentile(self, percentile: float) -> float:
+        """Get the bucket upper bound containing the given percentile."""
+        if self.count == 0:
+            return 0.0
+        target = self.count * percentile / 100.0
+        running = 0
+        for index, bucket_count in enumerate(self.counts):
+            running += bucket_count
+            if running >= target:
+                return self.buckets[index] if index < len(self.buckets) else self.max_value
+        return self.max_value
+
+    def cumulative_counts(self) -> list[tuple[str, int]]:
+        """Get (le, cumulative count) pairs including the +Inf bucket."""
+        result = []
+        running = 0
+        for bound, bucket_count in zip((*self.buckets, "+Inf"), self.counts, strict=True):
+            running += bucket_count
+            result.append((str(bound), running))
+        return result
+
+    def to_prometheus_lines(self, name: str, description: str = "") -> list[str]:
+        """Render the histogram in Prometheus exposition format."""
+        full_name = f"canbus_decoder_{name}"
+        lines = [f"# HELP {full_name} {description}", f"# TYPE {full_name} histogram"]
+        for le, cumulative in self.cumulative_counts():
+            lines.append(f'{full_name}_bucket{{le="{le}"}} {cumulative}')
+        lines.append(f"{full_name}_sum {self.total}")
+        lines.append(f"{full_name}_count {self.count}")
+        return lines
+
+    def to_dict(self) -> dict[str, Any]:
+        """Summarize the histogram for API responses."""
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.get_mean(),
+            "p50": self.get_percentile(50.0),
+            "p99": self.get_percentile(99.0),
+            "max": self.max_value,
+            "buckets": dict(self.cumulative_counts()),
+        }
+
+
 class PerformanceMonitor:
     """
     Comprehensive performance monitoring system for CAN bus decoder components.
@@ -188,6 +275,9 @@ class PerformanceMonitor:
             "last_activity": time.time(),
         }
 
+        # Batched CAN receive loop histograms
+        self.histograms: dict[str, HistogramStats] = self._create_histograms()
+
         # Threading
         self._lock = threading.RLock()
         self._stop_event = threading.Event()
@@ -208,6 +298,14 @@ class PerformanceMonitor:
             f"retention_hours={retention_hours}h"
         )
 
+    @staticmethod
+    def _create_histograms() -> dict[str, HistogramStats]:
+        """Create the histograms tracked by the monitor."""
+        return {
+            "can_ingest_batch_size": HistogramStats(INGEST_BATCH_SIZE_BUCKETS),
+            "can_ingest_batch_latency_seconds": HistogramStats(INGEST_BATCH_LATENCY_BUCKETS),
+        }
+
     def start_monitoring(self) -> None:
         """Start background metrics collection."""
         if self._collection_task is None or self._collection_task.done():
@@ -435,6 +533,17 @@ class PerformanceMonitor:
             self.system_stats["total_messages_processed"] += 1
             self.system_stats["last_activity"] = time.time()
 
+    def record_ingest_batch(self, batch_size: int, duration: float) -> None:
+        """Record one batch processed by the CAN receive loop."""
+        with self._lock:
+            self.histograms["can_ingest_batch_size"].observe(batch_size)
+            self.histograms["can_ingest_batch_latency_seconds"].observe(duration)
+            stats = self.component_stats[ComponentType.CAN_INGEST]
+            stats.messages_processed += batch_size
+            stats.total_processing_time += duration
+            stats.last_activity = time.time()
+            self.system_stats["last_activity"] = stats.last_activity
+
     def record_error(self, component: ComponentType) -> None:
         """Record an error for a component."""
         with self._lock:
@@ -608,6 +717,10 @@ class PerformanceMonitor:
                     # Add metric
                     lines.append(latest_metric.to_prometheus_format())
 
+            # Histograms are rendered live since they span several series
+            for name, histogram in self.histograms.items():
+                lines.extend(histogram.to_prometheus_lines(name))
+
         return "\n".join(lines)
 
     def get_performance_summary(self) -> dict[str, Any]:
@@ -663,6 +776,9 @@ class PerformanceMonitor:
                     )
                     * 100,
                 },
+                "can_ingest": {
+                    name: histogram.to_dict() for name, histogram in self.histograms.items()
+                },
                 "threshold_violations": self.check_performance_thresholds(),
             }
 
@@ -713,4 +829,5 @@ class PerformanceMonitor:
                 "uptime_start": time.time(),
                 "last_activity": time.time(),
             }
+            self.histograms = self._create_histograms()
             logger.info("Performance metrics reset")
@@ -121,7 +121,7 @@ class ProtocolRouter:
             if frame.pgn in self.TRANSPORT_PGNS:
                 # Multi-packet transport protocol
                 completed_message = self.bam_handler.process_frame(
-                    frame.pgn, frame.data, frame.source_address
+                    frame.pgn, frame.data, frame.source_address, frame.destination_address
                 )
                 if completed_message:
                     target_pgn, reassembled_data = completed_message
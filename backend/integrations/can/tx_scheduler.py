@@ -0,0 +1,327 @@
+"""
+Per-interface CAN transmit scheduler.
+
+Outgoing frames are queued per interface in a priority queue and sent by one
+worker task per bus. The blocking ``bus.send`` call runs in a single-thread
+executor owned by that bus, so a slow or stalled interface never blocks the
+event loop or the other interfaces, and frames on one bus keep their order.
+
+RV-C asks for commands to be transmitted twice. Instead of sleeping between
+the two sends (which held up every queued command), the repeat is scheduled
+with ``loop.call_later`` and re-enters the interface queue when it is due,
+ahead of any same-priority command queued after the original.
+"""
+
+import asyncio
+import contextlib
+import itertools
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
+from typing import Any
+
+import can
+from can.bus import BusABC
+
+logger = logging.getLogger(__name__)
+
+# RV-C spec: commands are sent twice, roughly 50 ms apart
+RVC_REPEAT_DELAY = 0.05
+
+
+class TxPriority(IntEnum):
+    """Transmit priority; lower values are sent first."""
+
+    EMERGENCY = 0
+    HIGH = 1
+    NORMAL = 2
+    BULK = 3
+
+
+class _TxItem:
+    """A queued transmission, ordered by (priority, sequence)."""
+
+    __slots__ = ("is_repeat", "message", "priority", "repeat", "seq")
+
+    def __init__(
+        self,
+        priority: int,
+        seq: int,
+        message: can.Message,
+        repeat: bool,
+        is_repeat: bool = False,
+    ) -> None:
+        self.priority = priority
+        self.seq = seq
+        self.message = message
+        self.repeat = repeat
+        self.is_repeat = is_repeat
+
+    def __lt__(self, other: "_TxItem") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class _InterfaceWorker:
+    """Queue, executor and worker task for a single CAN interface."""
+
+    def __init__(self, interface: str) -> None:
+        self.interface = interface
+        self.queue: asyncio.PriorityQueue[_TxItem] = asyncio.PriorityQueue()
+        self.executor: ThreadPoolExecutor | None = None
+        self.task: asyncio.Task | None = None
+        self.sent = 0
+        self.repeats_sent = 0
+        self.errors = 0
+        self.pending_repeats = 0
+
+
+class CANTxScheduler:
+    """
+    Priority transmit scheduler with one worker per CAN interface.
+
+    The scheduler also exposes the subset of the ``asyncio.Queue`` API that
+    callers of the former global ``can_tx_queue`` relied on: ``put`` and
+    ``put_nowait`` accept ``(message, interface)`` or
+    ``(message, interface, priority)`` tuples, and ``qsize``/``maxsize``
+    report the total backlog.
+    """
+
+    maxsize = 0  # Queues are unbounded, matching the former asyncio.Queue
+
+    def __init__(
+        self,
+        buses: dict[str, BusABC],
+        open_bus: Callable[[str], BusABC] | None = None,
+        repeat_delay: float = RVC_REPEAT_DELAY,
+    ) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            buses: Shared interface name to bus mapping
+            open_bus: Called (in the interface's executor) to open a bus that
+                is not in ``buses`` yet; missing buses are an error without it
+            repeat_delay: Delay in seconds before the RV-C repeat transmission
+        """
+        self.buses = buses
+        self.open_bus = open_bus
+        self.repeat_delay = repeat_delay
+        self._workers: dict[str, _InterfaceWorker] = {}
+        self._seq = itertools.count()
+        self._on_sent: Callable[[can.Message, str], None] | None = None
+        self._on_queue_change: Callable[[int], None] | None = None
+        self._running = False
+        self._repeat_handles: set[asyncio.TimerHandle] = set()
+
+    # ------------------------------------------------------------------
+    # Queue-compatible API
+    # ------------------------------------------------------------------
+
+    async def put(self, item: tuple) -> None:
+        """Queue a ``(message, interface[, priority])`` tuple."""
+        self.put_nowait(item)
+
+    def put_nowait(self, item: tuple) -> None:
+        """Queue a ``(message, interface[, priority])`` tuple without waiting."""
+        if not isinstance(item, tuple) or len(item) not in (2, 3):
+            msg = "CAN TX items must be (message, interface[, priority]) tuples"
+            raise TypeError(msg)
+        message, interface = item[0], item[1]
+        priority = item[2] if len(item) == 3 else TxPriority.NORMAL
+        self.submit(message, interface, priority=priority)
+
+    def qsize(self) -> int:
+        """Return the number of frames queued across all interfaces."""
+        return sum(worker.queue.qsize() for worker in self._workers.values())
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        message: can.Message,
+        interface: str,
+        priority: int = TxPriority.NORMAL,
+        repeat: bool = True,
+    ) -> None:
+        """
+        Queue a frame for transmission.
+
+        Args:
+            message: The frame to send
+            interface: Target CAN interface name
+            priority: TxPriority (lower is sent first)
+            repeat: Send the RV-C repeat transmission after ``repeat_delay``
+        """
+        worker = self._get_worker(interface)
+        worker.queue.put_nowait(_TxItem(int(priority), next(self._seq), message, repeat))
+        self._queue_changed()
+
+    def _get_worker(self, interface: str) -> _InterfaceWorker:
+        worker = self._workers.get(interface)
+        if worker is None:
+            worker = _InterfaceWorker(interface)
+            self._workers[interface] = worker
+        if self._running and (worker.task is None or worker.task.done()):
+            worker.task = asyncio.create_task(self._worker_loop(worker))
+        return worker
+
+    def _queue_changed(self) -> None:
+        if self._on_queue_change:
+            try:
+                self._on_queue_change(self.qsize())
+            except Exception as e:
+                logger.warning(f"Failed to update CAN TX queue metric: {e}")
+
+    def _schedule_repeat(self, worker: _InterfaceWorker, item: _TxItem) -> None:
+        """Re-queue a frame once the repeat delay has elapsed."""
+        loop = asyncio.get_running_loop()
+        worker.pending_repeats += 1
+
+        def requeue() -> None:
+            self._repeat_handles.discard(handle)
+            worker.pending_repeats -= 1
+            # Keep the original sequence so the repeat goes ahead of
+            # same-priority commands queued after the original
+            worker.queue.put_nowait(
+                _TxItem(item.priority, item.seq, item.message, repeat=False, is_repeat=True)
+            )
+            self._queue_changed()
+
+        handle = loop.call_later(self.repeat_delay, requeue)
+        self._repeat_handles.add(handle)
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    async def run(
+        self,
+        on_sent: Callable[[can.Message, str], None] | None = None,
+        on_queue_change: Callable[[int], None] | None = None,
+    ) -> None:
+        """
+        Start a worker for every interface and run until cancelled.
+
+        Args:
+            on_sent: Called after the first transmission of each frame
+            on_queue_change: Called with the total backlog whenever it changes
+        """
+        self._on_sent = on_sent
+        self._on_queue_change = on_queue_change
+        self._running = True
+        for interface in list(self._workers):
+            self._get_worker(interface)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+    async def stop(self) -> None:
+        """Stop all workers and cancel pending repeat transmissions."""
+        self._running = False
+        for handle in self._repeat_handles:
+            handle.cancel()
+        self._repeat_handles.clear()
+        tasks = [worker.task for worker in self._workers.values() if worker.task]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        for worker in self._workers.values():
+            worker.task = None
+            worker.pending_repeats = 0
+            if worker.executor is not None:
+                worker.executor.shutdown(wait=False)
+                worker.executor = None
+
+    async def _worker_loop(self, worker: _InterfaceWorker) -> None:
+        """Send queued frames for one interface in priority order."""
+        loop = asyncio.get_running_loop()
+        interface = worker.interface
+        if worker.executor is None:
+            worker.executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"can-tx-{interface}"
+            )
+        while True:
+            item = await worker.queue.get()
+            self._queue_changed()
+            try:
+                bus = self.buses.get(interface)
+                if bus is None:
+                    bus = await loop.run_in_executor(worker.executor, self._open_bus, interface)
+                    if bus is None:
+                        worker.errors += 1
+                        continue
+
+                await loop.run_in_executor(worker.executor, bus.send, item.message)
+                message = item.message
+                if item.is_repeat:
+                    worker.repeats_sent += 1
+                    logger.info(
+                        f"CAN TX (2/2): {interface} ID: {message.arbitration_id:08X} "
+                        f"Data: {message.data.hex().upper()}"
+                    )
+                    continue
+
+                worker.sent += 1
+                logger.info(
+                    f"CAN TX ({'1/2' if item.repeat else '1/1'}): {interface} "
+                    f"ID: {message.arbitration_id:08X} Data: {message.data.hex().upper()}"
+                )
+                if item.repeat:
+                    self._schedule_repeat(worker, item)
+                if self._on_sent:
+                    try:
+                        self._on_sent(message, interface)
+                    except Exception as e:
+                        logger.error(f"CAN TX post-send hook failed on {interface}: {e}")
+            except asyncio.CancelledError:
+                raise
+            except can.exceptions.CanError as e:
+                worker.errors += 1
+                logger.error(f"CAN writer failed to send message on {interface}: {e}")
+            except Exception as e:
+                worker.errors += 1
+                logger.error(
+                    f"CAN writer encountered an unexpected error during send on {interface}: {e}",
+                    exc_info=True,
+                )
+            finally:
+                worker.queue.task_done()
+
+    def _open_bus(self, interface: str) -> BusABC | None:
+        """Open and register a bus for an interface (runs in the executor)."""
+        if self.open_bus is None:
+            logger.error(f"CAN writer: no bus registered for interface '{interface}'")
+            return None
+        try:
+            bus = self.open_bus(interface)
+        except Exception as e:
+            logger.error(f"CAN writer: Failed to initialize CAN bus '{interface}': {e}")
+            return None
+        self.buses[interface] = bus
+        logger.info(f"CAN writer: Successfully opened and registered bus for '{interface}'.")
+        return bus
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get per-interface transmit statistics.
+
+        Returns:
+            Dictionary of interface name to queue depth and send counters
+        """
+        return {
+            name: {
+                "queue_depth": worker.queue.qsize(),
+                "pending_repeats": worker.pending_repeats,
+                "sent": worker.sent,
+                "repeats_sent": worker.repeats_sent,
+                "errors": worker.errors,
+                "running": worker.task is not None and not worker.task.done(),
+            }
+            for name, worker in self._workers.items()
+        }
@@ -138,7 +138,7 @@ class J1939ProtocolBridge:
                 source_protocol="j1939",
                 target_protocol="rvc",
                 entity_id=mapping.entity_id,
-                original_data=j1939_message.decoded_signals,
+                original_data=dict(j1939_message.decoded_signals),
                 translated_data=rvc_data,
                 timestamp=j1939_message.timestamp or 0.0,
             )
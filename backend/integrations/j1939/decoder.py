@@ -14,6 +14,7 @@ Key features:
 """
 
 import logging
+from collections.abc import Callable, Iterator, Mapping
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, NamedTuple
@@ -46,7 +47,45 @@ class SystemType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+class SignalValues(Mapping):
+    """
+    Read-only signal name to value mapping produced by a compiled PGN decoder.
+
+    The name index is built once per PGN and shared by every decoded frame, so
+    a frame only allocates the tuple of values.
+    """
+
+    __slots__ = ("_index", "_values")
+
+    def __init__(self, index: dict[str, int], values: tuple[Any, ...]) -> None:
+        self._index = index
+        self._values = values
+
+    def __getitem__(self, name: str) -> Any:
+        return self._values[self._index[name]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def get(self, name: str, default: Any = None) -> Any:
+        position = self._index.get(name)
+        return default if position is None else self._values[position]
+
+    def __repr__(self) -> str:
+        return f"SignalValues({dict(self.items())!r})"
+
+
+# Compiled decoder for one PGN: data -> (decoded_signals, raw_signals)
+PGNDecodeFunc = Callable[[bytes], tuple[SignalValues, SignalValues]]
+
+
+@dataclass(slots=True)
 class J1939Message:
     """Decoded J1939 message structure."""
 
@@ -55,8 +94,8 @@ class J1939Message:
     data: bytes
     priority: int
     system_type: SystemType
-    decoded_signals: dict[str, Any]
-    raw_signals: dict[str, int]
+    decoded_signals: Mapping[str, Any]
+    raw_signals: Mapping[str, int]
     manufacturer: str | None = None
     timestamp: float | None = None
 
@@ -86,6 +125,66 @@ class PGNDefinition(NamedTuple):
     manufacturer: str | None = None
 
 
+def compile_pgn_decoder(pgn_def: PGNDefinition) -> PGNDecodeFunc:
+    """
+    Compile a PGN definition into a decode function.
+
+    Shift, mask, scale and clamp bounds are resolved once here; the returned
+    function converts the payload to an integer once per frame and extracts
+    every signal from it. Results match ``J1939Decoder._extract_signal_bits``
+    plus scaling and clamping, including a 0 / 0.0 result for signals that
+    extend beyond the payload.
+    """
+    index: dict[str, int] = {}
+    for signal in pgn_def.signals:
+        index.setdefault(signal.name, len(index))
+
+    # A later definition of a duplicated signal name overwrites the earlier one
+    positions = [index[signal.name] for signal in pgn_def.signals]
+    plan = tuple(
+        (
+            position,
+            signal.start_bit,
+            (1 << signal.length) - 1,
+            signal.start_bit + signal.length,
+            signal.scale,
+            signal.offset,
+            signal.min_value,
+            signal.max_value,
+        )
+        for position, signal in zip(positions, pgn_def.signals, strict=True)
+    )
+    width = len(index)
+    for signal in pgn_def.signals:
+        if signal.start_bit + signal.length > pgn_def.data_length * 8:
+            logger.warning(
+                f"Signal {signal.name} of PGN 0x{pgn_def.pgn:04X} extends beyond "
+                f"{pgn_def.data_length} data bytes"
+            )
+
+    def decode(data: bytes) -> tuple[SignalValues, SignalValues]:
+        payload = int.from_bytes(data, "little")
+        data_bits = len(data) * 8
+        decoded: list[Any] = [0.0] * width
+        raw: list[int] = [0] * width
+        for position, shift, mask, end_bit, scale, offset, low, high in plan:
+            if end_bit > data_bits:
+                decoded[position] = 0.0
+                raw[position] = 0
+                continue
+            raw_value = (payload >> shift) & mask
+            value = raw_value * scale + offset
+            if low is not None and value < low:
+                value = low
+            if high is not None and value > high:
+                value = high
+            decoded[position] = value
+            raw[position] = raw_value
+        return SignalValues(index, tuple(decoded)), SignalValues(index, tuple(raw))
+
+    return decode
+
+
 class J1939Decoder:
     """
     J1939 protocol decoder with manufacturer extensions.
@@ -108,6 +207,7 @@ class J1939Decoder:
         self.j1939_config = settings.j1939
         self._pgn_definitions: dict[int, PGNDefinition] = {}
         self._manufacturer_extensions: dict[str, dict[int, PGNDefinition]] = {}
+        self._compiled_decoders: dict[int, tuple[PGNDefinition, PGNDecodeFunc]] = {}
         self._load_standard_pgns()
         if self.j1939_config.enable_cummins_extensions:
             self._load_cummins_extensions()
@@ -115,6 +215,8 @@ class J1939Decoder:
             self._load_allison_extensions()
         if self.j1939_config.enable_chassis_extensions:
             self._load_chassis_extensions()
+        for pgn, pgn_def in self._pgn_definitions.items():
+            self._compile_pgn(pgn, pgn_def)
 
         logger.info(f"J1939 decoder initialized with {len(self._pgn_definitions)} PGN definitions")
 
@@ -139,11 +241,12 @@ class J1939Decoder:
         Returns:
             Decoded J1939Message or None if PGN not recognized
         """
-        # Look up PGN definition
-        pgn_def = self._get_pgn_definition(pgn)
-        if not pgn_def:
+        # Look up the compiled decoder for the PGN definition
+        compiled = self._get_compiled_decoder(pgn)
+        if compiled is None:
             logger.debug(f"Unknown J1939 PGN: 0x{pgn:04X}")
             return None
+        pgn_def, decode = compiled
 
         # Validate data length
         if len(data) < pgn_def.data_length:
@@ -154,7 +257,7 @@ class J1939Decoder:
 
         # Decode signals
         try:
-            decoded_signals, raw_signals = self._decode_signals(pgn_def, data)
+            decoded_signals, raw_signals = decode(data)
         except Exception as e:
             logger.error(f"Error decoding PGN 0x{pgn:04X}: {e}")
             return None
@@ -278,45 +381,22 @@ class J1939Decoder:
         """Get PGN definition from standard or manufacturer-specific definitions."""
         return self._pgn_definitions.get(pgn)
 
-    def _decode_signals(
-        self, pgn_def: PGNDefinition, data: bytes
-    ) -> tuple[dict[str, Any], dict[str, int]]:
-        """
-        Decode all signals from a PGN definition.
-
-        Args:
-            pgn_def: PGN definition containing signal information
-            data: Message data bytes
-
-        Returns:
-            Tuple of (decoded_signals, raw_signals)
-        """
-        decoded_signals = {}
-        raw_signals = {}
-
-        for signal in pgn_def.signals:
-            try:
-                # Extract raw value using bit manipulation
-                raw_value = self._extract_signal_bits(data, signal.start_bit, signal.length)
-                raw_signals[signal.name] = raw_value
-
-                # Apply scaling and offset
-                scaled_value = (raw_value * signal.scale) + signal.offset
-
-                # Apply range validation if specified
-                if signal.min_value is not None and scaled_value < signal.min_value:
-                    scaled_value = signal.min_value
-                if signal.max_value is not None and scaled_value > signal.max_value:
-                    scaled_value = signal.max_value
-
-                decoded_signals[signal.name] = scaled_value
-
-            except Exception as e:
-                logger.warning(f"Error decoding signal {signal.name}: {e}")
-                raw_signals[signal.name] = 0
-                decoded_signals[signal.name] = 0.0
-
-        return decoded_signals, raw_signals
+    def _get_compiled_decoder(self, pgn: int) -> tuple[PGNDefinition, PGNDecodeFunc] | None:
+        """Get the compiled decoder for a PGN, compiling definitions added after startup."""
+        pgn_def = self._get_pgn_definition(pgn)
+        if pgn_def is None:
+            return None
+        compiled = self._compiled_decoders.get(pgn)
+        if compiled is None or compiled[0] is not pgn_def:
+            compiled = self._compile_pgn(pgn, pgn_def)
+        return compiled
+
+    def _compile_pgn(
+        self, pgn: int, pgn_def: PGNDefinition
+    ) -> tuple[PGNDefinition, PGNDecodeFunc]:
+        compiled = (pgn_def, compile_pgn_decoder(pgn_def))
+        self._compiled_decoders[pgn] = compiled
+        return compiled
 
     def _extract_signal_bits(self, data: bytes, start_bit: int, length: int) -> int:
         """
@@ -22,12 +22,13 @@ Architecture:
 """
 
 import logging
-import struct
+from collections.abc import Mapping
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, NamedTuple
 
 from backend.core.config import Settings
+from backend.integrations.j1939.decoder import PGNDecodeFunc, SignalValues
 
 logger = logging.getLogger(__name__)
 
@@ -55,7 +56,7 @@ class SpartanK2SystemType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class SpartanK2Message:
     """Decoded Spartan K2 chassis message structure."""
 
@@ -64,8 +65,8 @@ class SpartanK2Message:
     data: bytes
     priority: int
     system_type: SpartanK2SystemType
-    decoded_signals: dict[str, Any]
-    raw_signals: dict[str, int]
+    decoded_signals: Mapping[str, Any]
+    raw_signals: Mapping[str, int]
     safety_interlocks: list[str]
     diagnostic_codes: list[int]
     timestamp: float | None = None
@@ -99,6 +100,76 @@ class SpartanK2PGNDefinition(NamedTuple):
     diagnostic_support: bool = True
 
 
+def compile_spartan_k2_decoder(pgn_def: SpartanK2PGNDefinition) -> PGNDecodeFunc:
+    """
+    Compile a Spartan K2 PGN definition into a decode function.
+
+    Signals are read from a window of one (up to 8 bits), two (up to 16 bits)
+    or four bytes starting at the signal's first byte. The window is folded
+    into each signal's mask here, so the returned function extracts every
+    signal from a single integer conversion of the payload. Signals whose
+    window does not fit the payload decode to None with a raw value of 0, and
+    out-of-range values are logged but not clamped.
+    """
+    index: dict[str, int] = {}
+    for signal in pgn_def.signals:
+        index.setdefault(signal.name, len(index))
+
+    plan = []
+    for signal in pgn_def.signals:
+        byte_offset, bit_offset = divmod(signal.start_bit, 8)
+        if signal.length <= 8:
+            window_bits, min_length = 8, byte_offset + 1
+        elif signal.length <= 16:
+            window_bits, min_length = 16, byte_offset + 2
+        else:
+            # Read with int.from_bytes, which accepts a truncated slice
+            window_bits, min_length = 32, 0
+        if byte_offset + window_bits // 8 > pgn_def.data_length and min_length:
+            logger.warning(
+                f"Signal {signal.name} of Spartan K2 PGN 0x{pgn_def.pgn:04X} extends beyond "
+                f"{pgn_def.data_length} data bytes"
+            )
+        mask = ((1 << signal.length) - 1) & (((1 << window_bits) - 1) >> bit_offset)
+        plan.append(
+            (
+                index[signal.name],
+                signal.name,
+                signal.start_bit,
+                mask,
+                min_length,
+                signal.scale,
+                signal.offset,
+                signal.min_value,
+                signal.max_value,
+            )
+        )
+    plan = tuple(plan)
+    width = len(index)
+
+    def decode(data: bytes) -> tuple[SignalValues, SignalValues]:
+        payload = int.from_bytes(data, "little")
+        data_length = len(data)
+        decoded: list[Any] = [None] * width
+        raw: list[int] = [0] * width
+        for position, name, shift, mask, min_length, scale, offset, low, high in plan:
+            if data_length < min_length:
+                decoded[position] = None
+                raw[position] = 0
+                continue
+            raw_value = (payload >> shift) & mask
+            value = raw_value * scale + offset
+            if low is not None and value < low:
+                logger.warning(f"Signal {name} below minimum: {value} < {low}")
+            if high is not None and value > high:
+                logger.warning(f"Signal {name} above maximum: {value} > {high}")
+            decoded[position] = value
+            raw[position] = raw_value
+        return SignalValues(index, tuple(decoded)), SignalValues(index, tuple(raw))
+
+    return decode
+
+
 class SpartanK2SafetyInterlock:
     """Safety interlock validation for Spartan K2 chassis systems."""
 
@@ -197,7 +268,10 @@ class SpartanK2Decoder:
         self.safety_interlock = SpartanK2SafetyInterlock(settings)
         self._pgn_definitions: dict[int, SpartanK2PGNDefinition] = {}
         self._message_cache: dict[int, SpartanK2Message] = {}
+        self._compiled_decoders: dict[int, tuple[SpartanK2PGNDefinition, PGNDecodeFunc]] = {}
         self._load_spartan_k2_pgns()
+        for pgn, pgn_def in self._pgn_definitions.items():
+            self._compiled_decoders[pgn] = (pgn_def, compile_spartan_k2_decoder(pgn_def))
 
         logger.info(
             f"Spartan K2 decoder initialized with {len(self._pgn_definitions)} PGN definitions"
@@ -224,11 +298,12 @@ class SpartanK2Decoder:
         Returns:
             Decoded SpartanK2Message or None if PGN not recognized
         """
-        # Look up PGN definition
-        pgn_def = self._get_pgn_definition(pgn)
-        if not pgn_def:
+        # Look up the compiled decoder for the PGN definition
+        compiled = self._get_compiled_decoder(pgn)
+        if compiled is None:
             logger.debug(f"Unknown Spartan K2 PGN: 0x{pgn:04X}")
             return None
+        pgn_def, decode = compiled
 
         # Validate data length
         if len(data) < pgn_def.data_length:
@@ -239,7 +314,7 @@ class SpartanK2Decoder:
 
         # Decode signals
         try:
-            decoded_signals, raw_signals = self._decode_signals(pgn_def, data)
+            decoded_signals, raw_signals = decode(data)
         except Exception as e:
             logger.error(f"Error decoding Spartan K2 PGN 0x{pgn:04X}: {e}")
             return None
@@ -446,59 +521,18 @@ class SpartanK2Decoder:
         """Get PGN definition for the given PGN."""
         return self._pgn_definitions.get(pgn)
 
-    def _decode_signals(
-        self, pgn_def: SpartanK2PGNDefinition, data: bytes
-    ) -> tuple[dict[str, Any], dict[str, int]]:
-        """Decode signals from message data."""
-        decoded_signals = {}
-        raw_signals = {}
-
-        for signal in pgn_def.signals:
-            try:
-                # Extract raw value
-                byte_offset = signal.start_bit // 8
-                bit_offset = signal.start_bit % 8
-
-                if signal.length <= 8:
-                    # Single byte signal
-                    raw_value = data[byte_offset]
-                    mask = (1 << signal.length) - 1
-                    raw_value = (raw_value >> bit_offset) & mask
-                elif signal.length <= 16:
-                    # Two-byte signal
-                    raw_value = struct.unpack("<H", data[byte_offset : byte_offset + 2])[0]
-                    mask = (1 << signal.length) - 1
-                    raw_value = (raw_value >> bit_offset) & mask
-                else:
-                    # Multi-byte signal
-                    raw_value = int.from_bytes(
-                        data[byte_offset : byte_offset + 4], byteorder="little"
-                    )
-                    mask = (1 << signal.length) - 1
-                    raw_value = (raw_value >> bit_offset) & mask
-
-                # Apply scaling and offset
-                decoded_value = raw_value * signal.scale + signal.offset
-
-                # Validate ranges
-                if signal.min_value is not None and decoded_value < signal.min_value:
-                    logger.warning(
-                        f"Signal {signal.name} below minimum: {decoded_value} < {signal.min_value}"
-                    )
-                if signal.max_value is not None and decoded_value > signal.max_value:
-                    logger.warning(
-                        f"Signal {signal.name} above maximum: {decoded_value} > {signal.max_value}"
-                    )
-
-                decoded_signals[signal.name] = decoded_value
-                raw_signals[signal.name] = raw_value
-
-            except Exception as e:
-                logger.error(f"Error decoding signal {signal.name}: {e}")
-                decoded_signals[signal.name] = None
-                raw_signals[signal.name] = 0
-
-        return decoded_signals, raw_signals
+    def _get_compiled_decoder(
+        self, pgn: int
+    ) -> tuple[SpartanK2PGNDefinition, PGNDecodeFunc] | None:
+        """Get the compiled decoder for a PGN, compiling definitions added after startup."""
+        pgn_def = self._get_pgn_definition(pgn)
+        if pgn_def is None:
+            return None
+        compiled = self._compiled_decoders.get(pgn)
+        if compiled is None or compiled[0] is not pgn_def:
+            compiled = (pgn_def, compile_spartan_k2_decoder(pgn_def))
+            self._compiled_decoders[pgn] = compiled
+        return compiled
 
     def _validate_safety_interlocks(
         self, pgn_def: SpartanK2PGNDefinition, decoded_signals: dict
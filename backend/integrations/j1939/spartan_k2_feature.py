@@ -249,7 +249,7 @@ class SpartanK2Feature(Feature):
                     "pgn": message.pgn,
                     "source_address": message.source_address,
                     "system_type": message.system_type.value,
-                    "decoded_signals": message.decoded_signals,
+                    "decoded_signals": dict(message.decoded_signals),
                     "safety_interlocks": message.safety_interlocks,
                     "diagnostic_codes": message.diagnostic_codes,
                     "timestamp": message.timestamp,
@@ -14,7 +14,10 @@ from backend.integrations.j1939.decoder import (
     J1939Decoder,
     J1939Message,
     MessagePriority,
+    PGNDefinition,
+    SignalDefinition,
     SystemType,
+    compile_pgn_decoder,
 )
 
 
@@ -264,3 +267,44 @@ class TestSignalExtraction:
         # Try to extract beyond data length
         with pytest.raises(ValueError):
             j1939_decoder._extract_signal_bits(data, 0, 16)  # Only 8 bits available
+
+
+class TestCompiledPGNDecoder:
+    """Test cases for compiled PGN decoders."""
+
+    def test_compiled_decoder_matches_bit_extraction(self, j1939_decoder):
+        """Test compiled decoding against per-signal extraction, scaling and clamping."""
+        pgn_def = j1939_decoder._pgn_definitions[65262]
+        decode = compile_pgn_decoder(pgn_def)
+        data = bytes([0xFA, 0x32, 0x00, 0xFF, 0x20, 0x4E, 0x7B, 0xFF])
+
+        decoded, raw = decode(data)
+
+        assert list(decoded) == [signal.name for signal in pgn_def.signals]
+        for signal in pgn_def.signals:
+            raw_value = j1939_decoder._extract_signal_bits(data, signal.start_bit, signal.length)
+            value = raw_value * signal.scale + signal.offset
+            value = max(signal.min_value, min(signal.max_value, value))
+            assert raw[signal.name] == raw_value
+            assert decoded[signal.name] == value
+
+    def test_signals_beyond_payload_decode_to_zero(self):
+        """Test that signals not covered by the payload decode to zero."""
+        pgn_def = PGNDefinition(
+            pgn=0xFF00,
+            name="Test",
+            system_type=SystemType.UNKNOWN,
+            priority=MessagePriority.NORMAL,
+            data_length=2,
+            signals=[
+                SignalDefinition("low", 0, 8, 2, 1, "unit"),
+                SignalDefinition("wide", 8, 16, 1, 0, "unit"),
+            ],
+        )
+
+        decoded, raw = compile_pgn_decoder(pgn_def)(bytes([0x10, 0x20]))
+
+        assert dict(decoded) == {"low": 33, "wide": 0.0}
+        assert dict(raw) == {"low": 0x10, "wide": 0}
+        assert decoded.get("missing") is None
+        assert "wide" in decoded
@@ -9,12 +9,18 @@ according to the RV-C specification. It includes:
 - Configuration loading and validation
 - Missing DGN tracking
 - Entity state management integration
+- Vectorized batch decoding of recorded captures (see ``batch_decoder``; kept
+  out of the package namespace so NumPy is only imported when needed)
 
 Functions:
     - get_bits: Extract bits from binary data
     - decode_payload: Convert raw CAN data into decoded signal values
     - decode_payload_safe: Safely decode with missing DGN handling
+    - decode_payload_values: Decode into plain decoded and raw value dicts
+    - compile_decode_plan: Compile a spec entry into a reusable DecodePlan
     - load_config_data: Load RV-C specification and device mapping files
+    - load_compiled_config: Load the config plus derived lookups via the
+      persistent compiled-config cache
     - clear_config_cache: Clear cached configuration data
     - get_missing_dgns: Get tracked missing DGNs
     - clear_missing_dgns: Clear missing DGN tracking
@@ -31,26 +37,34 @@ from backend.integrations.rvc.decode import (
     decode_payload_safe,
     get_bits,
     get_missing_dgns,
+    load_compiled_config,
     load_config_data,
     record_missing_dgn,
 )
 
 # Import decoder core functions
 from backend.integrations.rvc.decoder_core import (
+    DecodePlan,
+    compile_decode_plan,
+    decode_payload_values,
     decode_product_id,
     decode_string_payload,
 )
 
 __all__ = [
     "BAMHandler",
+    "DecodePlan",
     "clear_config_cache",
+    "compile_decode_plan",
     "clear_missing_dgns",
     "decode_payload",
     "decode_payload_safe",
+    "decode_payload_values",
     "decode_product_id",
     "decode_string_payload",
     "get_bits",
     "get_missing_dgns",
+    "load_compiled_config",
     "load_config_data",
     "record_missing_dgn",
 ]
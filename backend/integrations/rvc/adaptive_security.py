@@ -19,6 +19,13 @@ from cachetools import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Incremental per-(source, PGN) statistics
+INTERVAL_EWMA_ALPHA = 0.1  # Weight of the newest inter-arrival sample
+INTERVAL_HORIZON = 60.0  # Gaps longer than this are not timing samples
+BURST_WINDOW = 10.0  # Seconds covered by the burst counter
+BURST_BUCKETS = 10  # Sub-windows in the burst counter
+PAYLOAD_SIMILARITY_THRESHOLD = 0.8  # Fraction of bytes that must look familiar
+
 
 class AnomalyType(Enum):
     """Types of security anomalies that can be detected."""
@@ -69,6 +76,99 @@ class SecurityEvent:
         }
 
 
+@dataclass(slots=True)
+class PGNStatistics:
+    """
+    Incremental traffic statistics for one PGN from one source.
+
+    Every update and every score is O(1): inter-arrival time is an EWMA, the
+    burst counter is a ring of fixed sub-windows, and "normal" payloads are a
+    256-bit mask of observed values per byte position plus a mask of observed
+    lengths.
+    """
+
+    last_timestamp: float | None = None
+    interval_ewma: float | None = None
+    burst_buckets: list[int] = field(default_factory=lambda: [0] * BURST_BUCKETS)
+    burst_newest: int = -BURST_BUCKETS  # Index of the newest sub-window
+    burst_count: int = 0
+    byte_masks: list[int] = field(default_factory=list)
+    length_mask: int = 0
+    payload_samples: int = 0
+
+    def record(self, timestamp: float, data: bytes, learn: bool) -> None:
+        """Record a message; learned payload values are only updated while learning."""
+        if self.last_timestamp is not None:
+            interval = timestamp - self.last_timestamp
+            if 0.0 <= interval < INTERVAL_HORIZON:
+                if self.interval_ewma is None:
+                    self.interval_ewma = interval
+                else:
+                    self.interval_ewma += INTERVAL_EWMA_ALPHA * (interval - self.interval_ewma)
+        if self.last_timestamp is None or timestamp >= self.last_timestamp:
+            self.last_timestamp = timestamp
+
+        bucket_id = self._advance(timestamp)
+        self.burst_buckets[bucket_id % BURST_BUCKETS] += 1
+        self.burst_count += 1
+
+        if learn:
+            self.learn_payload(data)
+
+    def recent_interval(self, timestamp: float) -> float | None:
+        """Time since the previous message, or None if there was none in the last minute."""
+        if self.last_timestamp is None:
+            return None
+        elapsed = timestamp - self.last_timestamp
+        return elapsed if elapsed < INTERVAL_HORIZON else None
+
+    def burst_size(self, timestamp: float) -> int:
+        """Number of messages recorded in the burst window ending at ``timestamp``."""
+        self._advance(timestamp)
+        return self.burst_count
+
+    def _advance(self, timestamp: float) -> int:
+        """Expire sub-windows that fell out of the burst window; return the current one."""
+        bucket_id = int(timestamp * BURST_BUCKETS / BURST_WINDOW)
+        newest = self.burst_newest
+        if bucket_id <= newest:
+            # Same sub-window, or an out-of-order timestamp counted in the newest one
+            return newest
+        if bucket_id - newest >= BURST_BUCKETS:
+            self.burst_buckets[:] = [0] * BURST_BUCKETS
+            self.burst_count = 0
+        else:
+            for current in range(newest + 1, bucket_id + 1):
+                slot = current % BURST_BUCKETS
+                self.burst_count -= self.burst_buckets[slot]
+                self.burst_buckets[slot] = 0
+        self.burst_newest = bucket_id
+        return bucket_id
+
+    def learn_payload(self, data: bytes) -> None:
+        """Add a payload to the set of normal values."""
+        self.length_mask |= 1 << len(data)
+        if len(self.byte_masks) < len(data):
+            self.byte_masks.extend([0] * (len(data) - len(self.byte_masks)))
+        for position, value in enumerate(data):
+            self.byte_masks[position] |= 1 << value
+        self.payload_samples += 1
+
+    def payload_similarity(self, data: bytes) -> float:
+        """
+        Fraction of payload bytes whose value was seen at that position (0.0 to 1.0).
+
+        Payloads with a length that was never learned score 0.0.
+        """
+        if not (self.length_mask >> len(data)) & 1:
+            return 0.0
+        if not data:
+            return 1.0
+        masks = self.byte_masks
+        matching = sum((masks[position] >> value) & 1 for position, value in enumerate(data))
+        return matching / len(data)
+
+
 @dataclass
 class DeviceProfile:
     """Learning profile for a specific CAN device."""
@@ -82,9 +182,8 @@ class DeviceProfile:
     pgn_intervals: dict[int, float] = field(default_factory=dict)  # PGN -> avg interval
     pgn_burst_patterns: dict[int, int] = field(default_factory=dict)  # PGN -> max burst
 
-    # Message patterns
-    message_history: deque = field(default_factory=lambda: deque(maxlen=1000))
-    data_patterns: dict[int, list[bytes]] = field(default_factory=dict)  # PGN -> data samples
+    # Incremental per-PGN statistics
+    pgn_stats: dict[int, PGNStatistics] = field(default_factory=dict)
 
     # Learning state
     learning_phase: bool = True
@@ -97,43 +196,32 @@ class DeviceProfile:
     last_anomaly_time: float = 0.0
 
     def update_from_message(self, pgn: int, timestamp: float, data: bytes) -> None:
-        """Update profile with new message data."""
+        """
+        Update profile with new message data.
+
+        Timing and burst statistics track every message of an expected PGN;
+        the learned baseline (expected PGNs, intervals, burst sizes and payload
+        values) only changes during the learning phase. After learning, PGNs
+        outside the baseline are reported as unexpected and keep no state, so
+        a scan of the PGN space cannot grow the profile.
+        """
         self.last_seen = timestamp
         self.message_count += 1
         self.total_messages += 1
 
+        stats = self.pgn_stats.get(pgn)
+        if stats is None:
+            if not self.learning_phase:
+                return
+            stats = self.pgn_stats[pgn] = PGNStatistics()
+        stats.record(timestamp, data, learn=self.learning_phase)
+
         if self.learning_phase:
             self.expected_pgns.add(pgn)
-            self.message_history.append((pgn, timestamp, len(data)))
-
-            # Store data patterns for anomaly detection
-            if pgn not in self.data_patterns:
-                self.data_patterns[pgn] = []
-            if len(self.data_patterns[pgn]) < 50:  # Limit samples per PGN
-                self.data_patterns[pgn].append(data)
-
-            self._update_timing_patterns(pgn, timestamp)
-
-    def _update_timing_patterns(self, pgn: int, timestamp: float) -> None:
-        """Update timing and burst pattern analysis."""
-        # Calculate message intervals for this PGN
-        recent_messages = [
-            (p, t)
-            for p, t, _ in self.message_history
-            if p == pgn and timestamp - t < 60.0  # Last minute
-        ]
-
-        if len(recent_messages) >= 2:
-            intervals = [
-                recent_messages[i][1] - recent_messages[i - 1][1]
-                for i in range(1, len(recent_messages))
-            ]
-            if intervals:
-                self.pgn_intervals[pgn] = sum(intervals) / len(intervals)
-
-        # Track burst patterns (messages per 10-second window)
-        burst_window = [t for p, t, _ in self.message_history if p == pgn and timestamp - t < 10.0]
-        self.pgn_burst_patterns[pgn] = max(self.pgn_burst_patterns.get(pgn, 0), len(burst_window))
+            if stats.interval_ewma is not None:
+                self.pgn_intervals[pgn] = stats.interval_ewma
+            if stats.burst_count > self.pgn_burst_patterns.get(pgn, 0):
+                self.pgn_burst_patterns[pgn] = stats.burst_count
 
     def is_message_anomalous(
         self, pgn: int, timestamp: float, data: bytes
@@ -150,40 +238,33 @@ class DeviceProfile:
             anomalies.append(f"Unexpected PGN 0x{pgn:04X}")
             confidence_scores.append(0.9)
 
-        # Check timing anomalies
-        expected_interval = self.pgn_intervals.get(pgn, 1.0)
-        recent_messages = [
-            t for p, t, _ in self.message_history if p == pgn and timestamp - t < 60.0
-        ]
-
-        if recent_messages:
-            last_message_time = max(recent_messages)
-            actual_interval = timestamp - last_message_time
+        stats = self.pgn_stats.get(pgn)
+        if stats is not None:
+            # Check timing anomalies
+            expected_interval = self.pgn_intervals.get(pgn, 1.0)
+            actual_interval = stats.recent_interval(timestamp)
 
-            # Detect unusually fast messaging
-            if actual_interval < expected_interval * 0.1:  # 10x faster than expected
+            # Detect unusually fast messaging (10x faster than expected)
+            if actual_interval is not None and actual_interval < expected_interval * 0.1:
                 anomalies.append(
                     f"Timing anomaly: {actual_interval:.3f}s vs expected {expected_interval:.3f}s"
                 )
                 confidence_scores.append(0.7)
 
-        # Check burst anomalies
-        expected_burst = self.pgn_burst_patterns.get(pgn, 10)
-        recent_burst = len(
-            [t for p, t, _ in self.message_history if p == pgn and timestamp - t < 10.0]
-        )
+            # Check burst anomalies
+            expected_burst = self.pgn_burst_patterns.get(pgn, 10)
+            recent_burst = stats.burst_size(timestamp)
 
-        if recent_burst > expected_burst * 2:  # 2x more than expected burst
-            anomalies.append(
-                f"Burst anomaly: {recent_burst} messages vs expected max {expected_burst}"
-            )
-            confidence_scores.append(0.8)
+            if recent_burst > expected_burst * 2:  # 2x more than expected burst
+                anomalies.append(
+                    f"Burst anomaly: {recent_burst} messages vs expected max {expected_burst}"
+                )
+                confidence_scores.append(0.8)
 
-        # Check data anomalies (basic pattern matching)
-        if pgn in self.data_patterns:
-            known_patterns = self.data_patterns[pgn]
-            if known_patterns and not any(
-                self._data_similarity(data, pattern) > 0.8 for pattern in known_patterns
+            # Check data anomalies against the learned byte values
+            if (
+                stats.payload_samples
+                and stats.payload_similarity(data) <= PAYLOAD_SIMILARITY_THRESHOLD
             ):
                 anomalies.append("Data pattern anomaly")
                 confidence_scores.append(0.6)
@@ -196,17 +277,6 @@ class DeviceProfile:
 
         return False, "Normal", 0.0
 
-    def _data_similarity(self, data1: bytes, data2: bytes) -> float:
-        """Calculate similarity between two data patterns (0.0 to 1.0)."""
-        if len(data1) != len(data2):
-            return 0.0
-
-        if len(data1) == 0:
-            return 1.0
-
-        matching_bytes = sum(1 for b1, b2 in zip(data1, data2, strict=True) if b1 == b2)
-        return matching_bytes / len(data1)
-
     def get_statistics(self) -> dict:
         """Get profile statistics for monitoring."""
         return {
@@ -319,11 +389,9 @@ class AdaptiveSecurityManager:
 
             profile = self.device_profiles[source_addr]
 
-            # Update profile with message data
-            profile.update_from_message(frame.pgn, current_time, frame.data)
-
             # Check if learning phase is complete
             if profile.learning_phase:
+                profile.update_from_message(frame.pgn, current_time, frame.data)
                 learning_elapsed = current_time - profile.learning_start_time
                 if learning_elapsed >= self.learning_duration or profile.message_count >= 100:
                     profile.learning_phase = False
@@ -334,10 +402,11 @@ class AdaptiveSecurityManager:
 
                 return True  # Allow all messages during learning
 
-            # Perform anomaly detection
+            # Score against the statistics so far, then record the message
             is_anomalous, reason, confidence = profile.is_message_anomalous(
                 frame.pgn, current_time, frame.data
             )
+            profile.update_from_message(frame.pgn, current_time, frame.data)
 
             if is_anomalous and confidence >= self.anomaly_threshold:
                 # Determine threat level based on anomaly type and confidence
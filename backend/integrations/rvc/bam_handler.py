@@ -3,13 +3,22 @@ BAM (Broadcast Announce Message) handler for multi-packet RV-C messages.
 
 This module handles the reassembly of multi-packet messages sent via the
 J1939/RV-C transport protocol. BAM is used for messages larger than 8 bytes
-that need to be split across multiple CAN frames.
+that need to be split across multiple CAN frames. Connection-mode transfers
+(RTS/CTS) between two nodes are reassembled passively from the same frames;
+the handler only listens and never answers with CTS.
 
 Transport Protocol PGNs:
 - 0xEC00 (60416): Transport Protocol Control (TP.CM) - BAM announcement
 - 0xEB00 (60160): Transport Protocol Data Transfer (TP.DT) - Data packets
+
+Each session preallocates its reassembly buffer and writes every TP.DT
+payload straight to its offset, tracking completeness with a bitmask.
+Sessions expire through a min-heap keyed on last activity, so neither the
+timeout sweep nor capacity eviction scans every open session.
 """
 
+import heapq
+import itertools
 import logging
 import time
 from dataclasses import dataclass, field
@@ -17,24 +26,65 @@ from typing import Any
 
 logger = logging.getLogger(__name__)
 
+BROADCAST_ADDRESS = 0xFF
+PACKET_PAYLOAD_SIZE = 7  # Data bytes carried by each TP.DT frame
+
 
-@dataclass
+@dataclass(eq=False)
 class BAMSession:
-    """Represents an active BAM message reassembly session."""
+    """Represents an active multi-packet message reassembly session."""
 
     source_address: int
     target_pgn: int
     total_size: int
     total_packets: int
-    received_packets: dict[int, bytes] = field(default_factory=dict)
-    timestamp: float = field(default_factory=time.time)
+    destination_address: int = BROADCAST_ADDRESS
+    buffer: bytearray = field(init=False, repr=False)
+    received_mask: int = 0
+    received_count: int = 0
+    timestamp: float = field(default_factory=time.monotonic)
+    last_activity: float = 0.0
     complete: bool = False
     reassembled_data: bytes | None = None
 
+    def __post_init__(self) -> None:
+        self.buffer = bytearray(self.total_packets * PACKET_PAYLOAD_SIZE)
+        self._view = memoryview(self.buffer)
+        if not self.last_activity:
+            self.last_activity = self.timestamp
+
+    @property
+    def is_broadcast(self) -> bool:
+        """True for BAM sessions, False for RTS/CTS connection-mode transfers."""
+        return self.destination_address == BROADCAST_ADDRESS
+
+    def store_packet(self, sequence_number: int, data: bytes) -> bool:
+        """
+        Write a TP.DT payload at its offset in the reassembly buffer.
+
+        Args:
+            sequence_number: Packet sequence number (1-based)
+            data: The full 8-byte TP.DT frame
+
+        Returns:
+            True once every packet has been received
+        """
+        bit = 1 << (sequence_number - 1)
+        offset = (sequence_number - 1) * PACKET_PAYLOAD_SIZE
+        self._view[offset : offset + PACKET_PAYLOAD_SIZE] = data[1:8]
+        if not self.received_mask & bit:
+            self.received_mask |= bit
+            self.received_count += 1
+        return self.received_count == self.total_packets
+
+    def payload(self) -> bytes:
+        """Return the reassembled message trimmed to its announced size."""
+        return bytes(self._view[: self.total_size])
+
 
 class BAMHandler:
     """
-    Handles reassembly of multi-packet BAM messages.
+    Handles reassembly of multi-packet BAM and RTS/CTS messages.
 
     The BAM protocol is used for broadcasting messages larger than 8 bytes
     to all nodes on the network. Unlike the peer-to-peer protocol, BAM
@@ -46,6 +96,12 @@ class BAMHandler:
     TP_DT_PGN = 0xEB00  # Transport Protocol Data Transfer
     BAM_CONTROL_BYTE = 0x20  # Identifies a BAM start message
 
+    # Connection-mode control bytes
+    RTS_CONTROL_BYTE = 0x10  # Request To Send
+    CTS_CONTROL_BYTE = 0x11  # Clear To Send
+    EOM_ACK_CONTROL_BYTE = 0x13  # End of Message Acknowledge
+    ABORT_CONTROL_BYTE = 0xFF  # Connection Abort
+
     # CAN frame constants
     CAN_FRAME_SIZE = 8  # Standard CAN frame data size
 
@@ -54,66 +110,115 @@ class BAMHandler:
         Initialize the BAM handler.
 
         Args:
-            session_timeout: Maximum time in seconds to wait for a complete message
-            max_concurrent_sessions: Maximum number of concurrent BAM sessions to track
+            session_timeout: Maximum time in seconds without traffic before a
+                session is discarded
+            max_concurrent_sessions: Maximum number of concurrent sessions to track
         """
         self.sessions: dict[tuple[int, int], BAMSession] = {}
         self.source_to_sessions: dict[int, list[int]] = {}  # source -> [target_pgns]
         self.session_timeout = session_timeout
         self.max_concurrent_sessions = max_concurrent_sessions
-        self._last_cleanup = time.time()
-        self._cleanup_interval = 10.0  # Run cleanup every 10 seconds
 
-    def process_frame(self, pgn: int, data: bytes, source_address: int) -> tuple[int, bytes] | None:
+        # (source, destination) -> session key receiving that pair's TP.DT frames
+        self._transfers: dict[tuple[int, int], tuple[int, int]] = {}
+
+        # Expiry heap of (deadline, tiebreak, session key). Entries are not
+        # updated on activity; a popped entry whose session has seen newer
+        # traffic is pushed back with its refreshed deadline.
+        self._expiry_heap: list[tuple[float, int, tuple[int, int]]] = []
+        self._heap_counter = itertools.count()
+
+    def process_frame(
+        self,
+        pgn: int,
+        data: bytes,
+        source_address: int,
+        destination_address: int = BROADCAST_ADDRESS,
+    ) -> tuple[int, bytes] | None:
         """
-        Process a CAN frame that might be part of a BAM transfer.
+        Process a CAN frame that might be part of a multi-packet transfer.
 
         Args:
-            pgn: The Parameter Group Number of the message
+            pgn: The Parameter Group Number of the message (PS byte cleared)
             data: The 8-byte data payload
             source_address: The source address of the message
+            destination_address: Destination address from the PS byte
+                (0xFF for broadcast)
 
         Returns:
             Tuple of (target_pgn, reassembled_data) if a complete message is available,
             None otherwise
         """
-        # Periodic cleanup of stale sessions
-        if time.time() - self._last_cleanup > self._cleanup_interval:
-            self._cleanup_stale_sessions()
+        now = time.monotonic()
+        if self._expiry_heap and self._expiry_heap[0][0] <= now:
+            self._expire_sessions(now)
 
         if pgn == self.TP_CM_PGN:
-            return self._handle_control_message(data, source_address)
+            return self._handle_control_message(data, source_address, destination_address, now)
         if pgn == self.TP_DT_PGN:
-            return self._handle_data_transfer(data, source_address)
+            return self._handle_data_transfer(data, source_address, destination_address, now)
 
         return None
 
-    def _handle_control_message(self, data: bytes, source_address: int) -> tuple[int, bytes] | None:
+    def _handle_control_message(
+        self,
+        data: bytes,
+        source_address: int,
+        destination_address: int = BROADCAST_ADDRESS,
+        now: float | None = None,
+    ) -> tuple[int, bytes] | None:
         """Handle a Transport Protocol Control message."""
         if len(data) < self.CAN_FRAME_SIZE:
             logger.warning(f"TP.CM message too short: {len(data)} bytes")
             return None
 
+        if now is None:
+            now = time.monotonic()
         control_byte = data[0]
+        # PGN is stored in J1939 format (3 bytes, little-endian)
+        target_pgn = int.from_bytes(data[5:8], "little")
+
+        if control_byte == self.BAM_CONTROL_BYTE:
+            self._start_session(data, source_address, BROADCAST_ADDRESS, target_pgn, now)
+        elif control_byte == self.RTS_CONTROL_BYTE:
+            self._start_session(data, source_address, destination_address, target_pgn, now)
+        elif control_byte == self.CTS_CONTROL_BYTE:
+            # The receiver is pacing the sender; keep the transfer alive
+            session = self.sessions.get((destination_address, target_pgn))
+            if session:
+                session.last_activity = now
+        elif control_byte == self.EOM_ACK_CONTROL_BYTE:
+            # Receiver confirmed the transfer; anything still open is finished
+            self._remove_session((destination_address, target_pgn))
+        elif control_byte == self.ABORT_CONTROL_BYTE:
+            # Either side may abort a connection
+            for key in ((destination_address, target_pgn), (source_address, target_pgn)):
+                if key in self.sessions:
+                    logger.debug(
+                        f"Transport session aborted: source={key[0]:02X}, PGN={target_pgn:05X}"
+                    )
+                    self._remove_session(key)
 
-        # Check if this is a BAM start message
-        if control_byte != self.BAM_CONTROL_BYTE:
-            # Not a BAM message, might be RTS/CTS
-            return None
+        return None
 
-        # Extract BAM header information
+    def _start_session(
+        self,
+        data: bytes,
+        source_address: int,
+        destination_address: int,
+        target_pgn: int,
+        now: float,
+    ) -> None:
+        """Open a reassembly session from a BAM or RTS announcement."""
         total_size = int.from_bytes(data[1:3], "little")
         total_packets = data[3]
-        # data[4] is reserved (0xFF)
-        pgn_bytes = data[5:8]
-        # PGN is stored in J1939 format (3 bytes, little-endian)
-        target_pgn = int.from_bytes(pgn_bytes, "little")
-
-        # Limit concurrent sessions to prevent memory issues
-        if len(self.sessions) >= self.max_concurrent_sessions:
-            self._cleanup_oldest_session()
+        if total_packets == 0 or total_size > total_packets * PACKET_PAYLOAD_SIZE:
+            logger.warning(
+                f"Invalid transport announcement from source={source_address:02X}: "
+                f"size={total_size}, packets={total_packets}"
+            )
+            return
 
-        # Create new session
         session_key = (source_address, target_pgn)
 
         if session_key in self.sessions:
@@ -121,55 +226,60 @@ class BAMHandler:
                 f"Overwriting existing BAM session for source={source_address:02X}, "
                 f"PGN={target_pgn:05X}"
             )
+            self._remove_session(session_key)
+
+        # A node runs one transfer per destination at a time, so a new
+        # announcement replaces whatever that pair had open
+        transfer_key = (source_address, destination_address)
+        previous_key = self._transfers.get(transfer_key)
+        if previous_key is not None:
+            self._remove_session(previous_key)
+
+        # Limit concurrent sessions to prevent memory issues
+        if len(self.sessions) >= self.max_concurrent_sessions:
+            self._cleanup_oldest_session()
 
         self.sessions[session_key] = BAMSession(
             source_address=source_address,
             target_pgn=target_pgn,
             total_size=total_size,
             total_packets=total_packets,
+            destination_address=destination_address,
+            timestamp=now,
+        )
+        self._transfers[transfer_key] = session_key
+        self.source_to_sessions.setdefault(source_address, []).append(target_pgn)
+        heapq.heappush(
+            self._expiry_heap,
+            (now + self.session_timeout, next(self._heap_counter), session_key),
         )
-
-        # Update source-to-sessions mapping for O(1) lookup
-        if source_address not in self.source_to_sessions:
-            self.source_to_sessions[source_address] = []
-        if target_pgn not in self.source_to_sessions[source_address]:
-            self.source_to_sessions[source_address].append(target_pgn)
 
         logger.debug(
-            f"Started BAM session: source={source_address:02X}, PGN={target_pgn:05X}, "
+            f"Started {'BAM' if destination_address == BROADCAST_ADDRESS else 'RTS/CTS'} "
+            f"session: source={source_address:02X}, PGN={target_pgn:05X}, "
             f"size={total_size}, packets={total_packets}"
         )
 
-        return None
-
-    def _handle_data_transfer(self, data: bytes, source_address: int) -> tuple[int, bytes] | None:
+    def _handle_data_transfer(
+        self,
+        data: bytes,
+        source_address: int,
+        destination_address: int = BROADCAST_ADDRESS,
+        now: float | None = None,
+    ) -> tuple[int, bytes] | None:
         """Handle a Transport Protocol Data Transfer message."""
         if len(data) < self.CAN_FRAME_SIZE:
             logger.warning(f"TP.DT message too short: {len(data)} bytes")
             return None
 
-        sequence_number = data[0]
-        payload = data[1:8]  # 7 bytes of actual data per packet
-
-        # Find the active session for this source using O(1) lookup
-        session = None
-        session_key = None
-
-        # Use O(1) lookup to source's active sessions
-        target_pgns = self.source_to_sessions.get(source_address, [])
-        for target_pgn in target_pgns:
-            potential_key = (source_address, target_pgn)
-            potential_session = self.sessions.get(potential_key)
-            if potential_session and not potential_session.complete:
-                session = potential_session
-                session_key = potential_key
-                break
-
+        session_key = self._transfers.get((source_address, destination_address))
+        session = self.sessions.get(session_key) if session_key else None
         if not session:
             logger.debug(f"Received TP.DT from source={source_address:02X} with no active session")
             return None
 
         # Validate sequence number
+        sequence_number = data[0]
         if sequence_number < 1 or sequence_number > session.total_packets:
             logger.warning(
                 f"Invalid sequence number {sequence_number} for session with "
@@ -177,108 +287,95 @@ class BAMHandler:
             )
             return None
 
-        # Store the packet
-        session.received_packets[sequence_number] = payload
-
-        # Check if we have all packets
-        if len(session.received_packets) >= session.total_packets:
-            # Reassemble the message
-            reassembled = self._reassemble_message(session)
-
-            if reassembled:
-                session.complete = True
-                session.reassembled_data = reassembled
-
-                # Clean up the completed session
-                if session_key:
-                    self._remove_session(session_key)
-
-                logger.debug(
-                    f"Completed BAM message: PGN={session.target_pgn:05X}, "
-                    f"size={len(reassembled)} bytes"
-                )
-
-                return (session.target_pgn, reassembled)
+        session.last_activity = now if now is not None else time.monotonic()
+        if not session.store_packet(sequence_number, data):
+            return None
 
-        return None
+        reassembled = session.payload()
+        session.complete = True
+        session.reassembled_data = reassembled
+        self._remove_session(session_key)
 
-    def _reassemble_message(self, session: BAMSession) -> bytes | None:
-        """Reassemble a complete message from received packets."""
-        try:
-            reassembled = bytearray()
-
-            # Combine packets in sequence order
-            for seq_num in range(1, session.total_packets + 1):
-                if seq_num not in session.received_packets:
-                    logger.error(
-                        f"Missing packet {seq_num} in BAM reassembly for "
-                        f"PGN={session.target_pgn:05X}"
-                    )
-                    return None
+        logger.debug(
+            f"Completed BAM message: PGN={session.target_pgn:05X}, size={len(reassembled)} bytes"
+        )
 
-                reassembled.extend(session.received_packets[seq_num])
+        return (session.target_pgn, reassembled)
 
-            # Trim to the expected size
-            reassembled = reassembled[: session.total_size]
+    def _expire_sessions(self, now: float) -> None:
+        """Remove sessions whose last activity is older than the timeout."""
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            _deadline, _, key = heapq.heappop(heap)
+            session = self.sessions.get(key)
+            if session is None:
+                continue  # Completed or replaced since this entry was pushed
 
-            return bytes(reassembled)
+            deadline = session.last_activity + self.session_timeout
+            if deadline > now:
+                heapq.heappush(heap, (deadline, next(self._heap_counter), key))
+                continue
 
-        except Exception as e:
-            logger.error(f"Error reassembling BAM message: {e}")
-            return None
+            logger.warning(
+                f"BAM session timeout: source={session.source_address:02X}, "
+                f"PGN={session.target_pgn:05X}, received {session.received_count}/"
+                f"{session.total_packets} packets"
+            )
+            self._remove_session(key)
 
     def _cleanup_stale_sessions(self) -> None:
         """Remove sessions that have timed out."""
-        current_time = time.time()
-        keys_to_remove = []
-
-        for key, session in self.sessions.items():
-            if current_time - session.timestamp > self.session_timeout:
-                logger.warning(
-                    f"BAM session timeout: source={session.source_address:02X}, "
-                    f"PGN={session.target_pgn:05X}, received {len(session.received_packets)}/"
-                    f"{session.total_packets} packets"
-                )
-                keys_to_remove.append(key)
-
-        for key in keys_to_remove:
-            self._remove_session(key)
-
-        self._last_cleanup = current_time
+        self._expire_sessions(time.monotonic())
 
     def _cleanup_oldest_session(self) -> None:
-        """Remove the oldest session when at capacity."""
-        if not self.sessions:
-            return
-
-        oldest_key = min(self.sessions.keys(), key=lambda k: self.sessions[k].timestamp)
-        oldest_session = self.sessions[oldest_key]
-
-        logger.warning(
-            "Removing oldest BAM session due to capacity: source=%02X, PGN=%05X",
-            oldest_session.source_address,
-            oldest_session.target_pgn,
-        )
+        """Remove the least recently active session when at capacity."""
+        heap = self._expiry_heap
+        while heap:
+            _deadline, _, key = heapq.heappop(heap)
+            session = self.sessions.get(key)
+            if session is None:
+                continue
+
+            deadline = session.last_activity + self.session_timeout
+            if deadline > _deadline:
+                # Active since this entry was pushed; reinsert with its real deadline
+                heapq.heappush(heap, (deadline, next(self._heap_counter), key))
+                continue
 
-        self._remove_session(oldest_key)
+            logger.warning(
+                "Removing oldest BAM session due to capacity: source=%02X, PGN=%05X",
+                session.source_address,
+                session.target_pgn,
+            )
+            self._remove_session(key)
+            return
 
     def _remove_session(self, session_key: tuple[int, int]) -> None:
-        """Remove a session and update source-to-sessions mapping."""
+        """Remove a session and update the source and transfer mappings."""
+        session = self.sessions.pop(session_key, None)
+        if session is None:
+            return
         source_address, target_pgn = session_key
 
-        # Remove from main sessions dict
-        if session_key in self.sessions:
-            del self.sessions[session_key]
+        transfer_key = (source_address, session.destination_address)
+        if self._transfers.get(transfer_key) == session_key:
+            del self._transfers[transfer_key]
 
         # Update source-to-sessions mapping
-        if source_address in self.source_to_sessions:
-            if target_pgn in self.source_to_sessions[source_address]:
-                self.source_to_sessions[source_address].remove(target_pgn)
+        target_pgns = self.source_to_sessions.get(source_address)
+        if target_pgns is not None:
+            if target_pgn in target_pgns:
+                target_pgns.remove(target_pgn)
 
             # Clean up empty source entries
-            if not self.source_to_sessions[source_address]:
+            if not target_pgns:
                 del self.source_to_sessions[source_address]
 
+        # Drop expiry entries for sessions that are gone once they dominate the heap
+        if len(self._expiry_heap) > 2 * len(self.sessions) + 64:
+            self._expiry_heap = [entry for entry in self._expiry_heap if entry[2] in self.sessions]
+            heapq.heapify(self._expiry_heap)
+
     def get_active_session_count(self) -> int:
         """Get the number of active BAM sessions."""
         return len(self.sessions)
@@ -286,17 +383,20 @@ class BAMHandler:
     def get_session_info(self) -> list[dict[str, Any]]:
         """Get information about all active sessions for debugging."""
         info = []
-        current_time = time.time()
+        current_time = time.monotonic()
 
         for (source, pgn), session in self.sessions.items():
             info.append(
                 {
                     "source_address": f"{source:02X}",
+                    "destination_address": f"{session.destination_address:02X}",
+                    "mode": "bam" if session.is_broadcast else "rts_cts",
                     "target_pgn": f"{pgn:05X}",
                     "total_packets": session.total_packets,
-                    "received_packets": len(session.received_packets),
+                    "received_packets": session.received_count,
                     "total_size": session.total_size,
                     "age_seconds": current_time - session.timestamp,
+                    "idle_seconds": current_time - session.last_activity,
                     "complete": session.complete,
                 }
             )
@@ -0,0 +1,194 @@
+"""
+Persistent compiled-config cache for RV-C spec and device mapping data.
+
+Parsing ``rvc.json`` and the coach mapping YAML, compiling decode plans and
+deriving the lookup tables dominates cold start on Raspberry Pi deployments.
+This module stores the fully derived result as a single pickle in the
+persistence data directory, keyed by a content hash of the spec and mapping
+files (and of the modules that build the artifact), so later starts can skip
+all of that work when nothing has changed.
+
+The file holds two pickles back to back: the cache key and the
+CompiledConfig. The key is read first so a stale artifact is rejected
+without unpickling the full payload. Unpickling can run code, so a cache
+file is only loaded if it is owned by the current user and not writable
+by group or others, which is how ``write_compiled_config`` creates it.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import stat
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of CompiledConfig or the config_data tuple changes
+CACHE_FORMAT_VERSION = 1
+
+CACHE_FILENAME = "rvc_compiled_config.pickle"
+
+# Modules whose code shapes the cached artifact; editing any of them
+# invalidates existing caches
+_SOURCE_MODULES = ("config_cache.py", "config_loader.py", "decode.py", "decoder_core.py")
+
+
+@dataclass
+class CompiledConfig:
+    """
+    Fully derived RV-C configuration as cached on disk.
+
+    Attributes:
+        key: Cache key the artifact was built for
+        config_data: The tuple returned by ``load_config_data``
+        device_lookup: (DGN hex, instance) to device config, upper-cased DGN keys
+        status_lookup: (status DGN hex, instance) to device config
+    """
+
+    key: str
+    config_data: tuple[Any, ...]
+    device_lookup: dict[tuple[str, str], dict] = field(default_factory=dict)
+    status_lookup: dict[tuple[str, str], dict] = field(default_factory=dict)
+
+
+def compute_cache_key(rvc_spec_path: str, device_mapping_path: str) -> str:
+    """
+    Compute the cache key for a spec/mapping file pair.
+
+    Args:
+        rvc_spec_path: Path to the RVC spec JSON file
+        device_mapping_path: Path to the device mapping YAML file
+
+    Returns:
+        Hex SHA-256 digest of the file contents, the building modules' sources,
+        the cache format version and the Python version
+
+    Raises:
+        FileNotFoundError: If either config file doesn't exist
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{CACHE_FORMAT_VERSION}:{sys.version_info[:2]}".encode())
+
+    module_dir = Path(__file__).parent
+    for module_name in _SOURCE_MODULES:
+        try:
+            digest.update((module_dir / module_name).read_bytes())
+        except OSError:
+            # Frozen/zipped installs: fall back to the format version alone
+            digest.update(module_name.encode())
+
+    for path in (rvc_spec_path, device_mapping_path):
+        digest.update(b"\0")
+        digest.update(Path(path).read_bytes())
+
+    return digest.hexdigest()
+
+
+def get_cache_path() -> Path | None:
+    """
+    Get the location of the compiled-config cache file.
+
+    Returns:
+        Path inside the persistence cache directory, or None if the cache is
+        disabled via ``COACHIQ_RVC__COMPILED_CONFIG_CACHE`` or settings are
+        unavailable
+    """
+    try:
+        from backend.core.config import get_settings
+
+        settings = get_settings()
+        if not settings.rvc.compiled_config_cache:
+            return None
+        return settings.persistence.get_cache_dir() / CACHE_FILENAME
+    except Exception as e:
+        logger.debug(f"Compiled config cache unavailable: {e}")
+        return None
+
+
+def _is_trusted_cache_file(file_stat: os.stat_result) -> bool:
+    """Whether a cache file is owned by this user and writable by no one else."""
+    if file_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        return False
+    return not hasattr(os, "getuid") or file_stat.st_uid == os.getuid()
+
+
+def read_compiled_config(cache_path: Path, key: str) -> CompiledConfig | None:
+    """
+    Load a cached CompiledConfig if it was built for the given key.
+
+    Args:
+        cache_path: Path to the cache file
+        key: Expected cache key
+
+    Returns:
+        The cached CompiledConfig, or None if missing, stale, unreadable or
+        not safe to unpickle
+    """
+    try:
+        with open(cache_path, "rb") as f:
+            # Checked on the open file so it cannot be swapped after the check
+            if not _is_trusted_cache_file(os.fstat(f.fileno())):
+                logger.warning(
+                    f"Ignoring compiled RVC config cache {cache_path}: not owned by this "
+                    "user or writable by others"
+                )
+                return None
+            # Only files this process's user wrote and others cannot modify are
+            # unpickled (checked above)
+            if pickle.load(f) != key:  # noqa: S301
+                logger.info("Compiled RVC config cache is stale, rebuilding")
+                return None
+            compiled = pickle.load(f)  # noqa: S301
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable compiled RVC config cache {cache_path}: {e}")
+        return None
+
+    if not isinstance(compiled, CompiledConfig) or compiled.key != key:
+        logger.warning(f"Ignoring malformed compiled RVC config cache {cache_path}")
+        return None
+
+    logger.info(f"Loaded compiled RVC config from cache: {cache_path}")
+    return compiled
+
+
+def write_compiled_config(cache_path: Path, compiled: CompiledConfig) -> bool:
+    """
+    Atomically write a CompiledConfig to the cache file.
+
+    Failures are logged and swallowed; the cache is only an optimization.
+
+    Args:
+        cache_path: Path to the cache file
+        compiled: The compiled configuration to store
+
+    Returns:
+        True if the cache file was written
+    """
+    tmp_path = None
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=cache_path.parent, prefix=f".{cache_path.name}.", suffix=".tmp"
+        )
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(compiled.key, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.warning(f"Failed to write compiled RVC config cache {cache_path}: {e}")
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+        return False
+
+    logger.debug(f"Wrote compiled RVC config cache: {cache_path}")
+    return True
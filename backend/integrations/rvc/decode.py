@@ -9,10 +9,14 @@ delegating to specialized submodules for different aspects of the decoding proce
 Functions:
     - get_bits: Extracts a little-endian bitfield from a CAN payload
     - decode_payload: Decodes all signals in a spec entry
-    - load_config_data: Loads and parses RVC spec and device mapping
+    - load_config_data: Loads and parses RVC spec and device mapping, compiling
+      each spec entry into a DecodePlan for fast per-frame decoding
+    - load_compiled_config: Same data plus derived lookup tables, served from the
+      persistent compiled-config cache when the config files are unchanged
 
 The actual implementation is split across several modules:
     - config_loader: Handles loading and validation of configuration files
+    - config_cache: Persistent on-disk cache of the compiled configuration
     - decoder_core: Core bit-level decoding logic
     - missing_dgns: Tracks DGNs not found in the specification
     - bam_handler: Handles multi-packet BAM message reassembly
@@ -21,12 +25,20 @@ The actual implementation is split across several modules:
 import functools
 import logging
 
+from backend.integrations.rvc.config_cache import (
+    CompiledConfig,
+    compute_cache_key,
+    get_cache_path,
+    read_compiled_config,
+    write_compiled_config,
+)
 from backend.integrations.rvc.config_loader import (
     extract_coach_info,
     get_default_paths,
     load_device_mapping,
     load_rvc_spec,
 )
+from backend.integrations.rvc.decoder_core import DECODE_PLAN_KEY, compile_decode_plan
 from backend.integrations.rvc.decoder_core import decode_payload as _decode_payload
 from backend.integrations.rvc.decoder_core import get_bits as _get_bits
 from backend.integrations.rvc.missing_dgns import (
@@ -50,14 +62,16 @@ __all__ = [
     "decode_payload_safe",
     "get_bits",
     "get_missing_dgns",
+    "load_compiled_config",
     "load_config_data",
     "record_missing_dgn",
 ]
 
 
 def clear_config_cache() -> None:
-    """Clear the configuration cache to force reloading."""
+    """Clear the in-process configuration cache to force reloading."""
     load_config_data.cache_clear()
+    load_compiled_config.cache_clear()
     logger.debug("Configuration cache cleared")
 
 
@@ -114,7 +128,9 @@ def load_config_data(
 
     This function uses @functools.cache to automatically cache the loaded data
     and avoid redundant file I/O and parsing when the same configuration is
-    requested multiple times during startup.
+    requested multiple times during startup. Across process restarts the data
+    comes from the persistent compiled-config cache (see
+    ``load_compiled_config``) when the spec and mapping files are unchanged.
 
     Args:
         rvc_spec_path_override: Optional path override for RVC spec JSON
@@ -133,6 +149,30 @@ def load_config_data(
             - dgn_pairs: Dictionary mapping DGNs to useful metadata for faster lookups
             - coach_info: CoachInfo object with detected coach metadata
     """
+    return load_compiled_config(
+        rvc_spec_path_override, device_mapping_path_override
+    ).config_data
+
+
+@functools.cache
+def load_compiled_config(
+    rvc_spec_path_override: str | None = None,
+    device_mapping_path_override: str | None = None,
+) -> CompiledConfig:
+    """
+    Load the fully derived RVC configuration, using the on-disk cache if valid.
+
+    The cache is keyed by a content hash of the spec and mapping files. On a
+    miss the configuration is built from scratch and written back to the
+    cache for the next start.
+
+    Args:
+        rvc_spec_path_override: Optional path override for RVC spec JSON
+        device_mapping_path_override: Optional path override for device mapping YAML
+
+    Returns:
+        CompiledConfig with the ``load_config_data`` tuple and derived lookups
+    """
     # Get default paths if not overridden
     rvc_spec_path, device_mapping_path = get_default_paths()
     if rvc_spec_path_override:
@@ -140,6 +180,61 @@ def load_config_data(
     if device_mapping_path_override:
         device_mapping_path = device_mapping_path_override
 
+    key = ""
+    cache_path = get_cache_path()
+    if cache_path is not None:
+        key = compute_cache_key(rvc_spec_path, device_mapping_path)
+        compiled = read_compiled_config(cache_path, key)
+        if compiled is not None:
+            return compiled
+
+    config_data = _build_config_data(rvc_spec_path, device_mapping_path)
+    device_lookup, status_lookup = build_device_lookups(config_data[2], config_data[3])
+    compiled = CompiledConfig(
+        key=key,
+        config_data=config_data,
+        device_lookup=device_lookup,
+        status_lookup=status_lookup,
+    )
+    if cache_path is not None:
+        write_compiled_config(cache_path, compiled)
+    return compiled
+
+
+def build_device_lookups(
+    mapping_dict: dict[tuple[str, str], dict],
+    entity_map: dict[tuple[str, str], dict],
+) -> tuple[dict[tuple[str, str], dict], dict[tuple[str, str], dict]]:
+    """
+    Derive the device and status lookup tables used by the CAN feature.
+
+    Args:
+        mapping_dict: Mapping of (dgn_hex, instance) to device lists
+        entity_map: Mapping of (dgn_hex, instance) to device entries
+
+    Returns:
+        Tuple of (device_lookup, status_lookup), both keyed by upper-cased
+        DGN hex and string instance
+    """
+    device_lookup: dict[tuple[str, str], dict] = {}
+    for (dgn_hex, instance), device_config in mapping_dict.items():
+        device_lookup[(dgn_hex.upper(), str(instance))] = device_config
+
+    # Entity map entries take precedence for compatibility
+    for (dgn_hex, instance), device_config in entity_map.items():
+        device_lookup[(dgn_hex.upper(), str(instance))] = device_config
+
+    status_lookup: dict[tuple[str, str], dict] = {}
+    for (_dgn_hex, instance), device_config in device_lookup.items():
+        status_dgn = device_config.get("status_dgn") if isinstance(device_config, dict) else None
+        if status_dgn:
+            status_lookup[(status_dgn.upper(), str(instance))] = device_config
+
+    return device_lookup, status_lookup
+
+
+def _build_config_data(rvc_spec_path: str, device_mapping_path: str) -> tuple:
+    """Parse the config files and build the ``load_config_data`` tuple."""
     # Load RVC spec and device mapping using the new modules
     rvc_spec = load_rvc_spec(rvc_spec_path)
     device_mapping = load_device_mapping(device_mapping_path)
@@ -157,6 +252,10 @@ def load_config_data(
         # Add dgn_hex to the entry for easier lookups
         pgn_entry["dgn_hex"] = pgn_entry["pgn"]
 
+        # Compile the signal definitions once so per-frame decoding can skip
+        # walking the spec dict (decode_payload picks the plan up automatically)
+        pgn_entry[DECODE_PLAN_KEY] = compile_decode_plan(pgn_entry)
+
         dgn_dict[dgn] = pgn_entry
         pgn_hex_to_name_map[pgn_entry["pgn"]] = pgn_name
         rvc_spec_dgn_pairs[pgn_entry["pgn"]] = {
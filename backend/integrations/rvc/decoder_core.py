@@ -26,7 +26,7 @@ class DecodeError:
     raw_data: bytes
 
 
-@dataclass
+@dataclass(slots=True)
 class DecodedValue:
     """Successfully decoded value with metadata."""
 
@@ -157,6 +157,9 @@ def decode_payload(
     """
     Decode all signals in a spec entry.
 
+    If the entry carries a precompiled DecodePlan (attached by
+    ``load_config_data``), the plan is used instead of walking the spec dict.
+
     Args:
         entry: The PGN entry from the RVC spec containing signal definitions
         data_bytes: The CAN data bytes to decode
@@ -166,6 +169,10 @@ def decode_payload(
             - results: Dictionary of signal names to DecodedValue or DecodeError
             - errors: List of all DecodeError instances for failed signals
     """
+    plan = entry.get(DECODE_PLAN_KEY)
+    if plan is not None:
+        return plan.decode(data_bytes)
+
     results = {}
     errors = []
 
@@ -193,6 +200,315 @@ def decode_payload(
     return results, errors
 
 
+def decode_payload_values(
+    entry: dict[str, Any], data_bytes: bytes
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    Decode all signals in a spec entry into plain value dictionaries.
+
+    Produces the same values as ``decode_payload`` without wrapping each
+    signal in a ``DecodedValue``. Signals that fail to decode are logged as by
+    ``decode_payload`` and left out of both dictionaries.
+
+    Args:
+        entry: The PGN entry from the RVC spec containing signal definitions
+        data_bytes: The CAN data bytes to decode (any bytes-like object)
+
+    Returns:
+        Tuple of:
+            - decoded: Dictionary of signal names to decoded values
+            - raw: Dictionary of signal names to raw integer values
+    """
+    plan = entry.get(DECODE_PLAN_KEY)
+    if plan is not None:
+        return plan.decode_values(data_bytes)
+
+    decoded: dict[str, Any] = {}
+    raw: dict[str, Any] = {}
+    for name, result in decode_payload(entry, data_bytes)[0].items():
+        if isinstance(result, DecodedValue):
+            decoded[name] = result.value
+            raw[name] = result.value if result.raw_value is None else result.raw_value
+    return decoded, raw
+
+
+# Key under which load_config_data stores the compiled plan on each spec entry
+DECODE_PLAN_KEY = "_decode_plan"
+
+
+@dataclass(frozen=True)
+class SignalPlan:
+    """
+    Precompiled extraction parameters for a single signal.
+
+    Signals whose definition cannot be handled by the fast path (invalid bit
+    ranges, fields wider than 64 bits, non-numeric scale/offset, or enum maps
+    that are not dictionaries) are marked with ``fallback`` and decoded through
+    ``decode_signal`` so the result is identical to the uncompiled decoder.
+    """
+
+    name: Any
+    shift: int
+    mask: int
+    end_bit: int
+    scale: int | float
+    offset: int | float
+    scaled: bool
+    passthrough: bool
+    unit: str | None
+    enum: dict[int, str] | None
+    fallback: bool
+    signal: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class DecodePlan:
+    """
+    Immutable decode plan compiled from a single RV-C spec entry.
+
+    The plan converts the payload to an integer once per frame and extracts
+    every signal with a precomputed shift and mask, producing exactly the same
+    results as ``decode_payload`` on the raw spec entry.
+    """
+
+    pgn: Any
+    signals: tuple[SignalPlan, ...]
+
+    def decode(
+        self, data_bytes: bytes
+    ) -> tuple[dict[str, DecodedValue | DecodeError], list[DecodeError]]:
+        """
+        Decode all signals in the plan from CAN data.
+
+        Args:
+            data_bytes: The CAN data bytes to decode
+
+        Returns:
+            Same ``(results, errors)`` tuple as ``decode_payload``
+        """
+        results: dict[str, DecodedValue | DecodeError] = {}
+        errors: list[DecodeError] = []
+
+        if not self.signals:
+            logger.warning(f"No signals defined for PGN {self.pgn}")
+            return results, errors
+
+        total_bits = len(data_bytes) * 8
+        raw_int = int.from_bytes(data_bytes, byteorder="little")
+
+        for plan in self.signals:
+            if plan.fallback or plan.end_bit > total_bits:
+                # Slow path reproduces the exact error/warning behaviour
+                decode_result = decode_signal(plan.signal, data_bytes)
+                results[plan.name] = decode_result
+                if isinstance(decode_result, DecodeError):
+                    errors.append(decode_result)
+                    logger.error(
+                        "Failed to decode signal '%s': %s - %s",
+                        plan.name,
+                        decode_result.error_type,
+                        decode_result.message,
+                    )
+                continue
+
+            raw_value = (raw_int >> plan.shift) & plan.mask
+
+            if plan.enum is not None:
+                enum_str = plan.enum.get(raw_value)
+                if enum_str is not None:
+                    results[plan.name] = DecodedValue(
+                        value=enum_str, unit=plan.unit, raw_value=raw_value
+                    )
+                else:
+                    results[plan.name] = DecodedValue(
+                        value=f"UNKNOWN ({raw_value})",
+                        unit=plan.unit,
+                        valid=False,
+                        raw_value=raw_value,
+                    )
+            elif plan.scaled:
+                results[plan.name] = DecodedValue(
+                    value=raw_value * plan.scale + plan.offset,
+                    unit=plan.unit,
+                    raw_value=raw_value,
+                )
+            elif plan.passthrough:
+                results[plan.name] = DecodedValue(
+                    value=raw_value, unit=plan.unit, raw_value=raw_value
+                )
+            else:
+                results[plan.name] = DecodedValue(
+                    value=int(raw_value * plan.scale + plan.offset),
+                    unit=plan.unit,
+                    raw_value=raw_value,
+                )
+
+        return results, errors
+
+    def decode_values(self, data_bytes: bytes) -> tuple[dict[str, Any], dict[str, Any]]:
+        """
+        Decode all signals in the plan into plain value dictionaries.
+
+        Args:
+            data_bytes: The CAN data bytes to decode
+
+        Returns:
+            Same ``(decoded, raw)`` tuple as ``decode_payload_values``
+        """
+        decoded: dict[str, Any] = {}
+        raw: dict[str, Any] = {}
+
+        if not self.signals:
+            logger.warning(f"No signals defined for PGN {self.pgn}")
+            return decoded, raw
+
+        total_bits = len(data_bytes) * 8
+        raw_int = int.from_bytes(data_bytes, byteorder="little")
+
+        for plan in self.signals:
+            if plan.fallback or plan.end_bit > total_bits:
+                decode_result = decode_signal(plan.signal, data_bytes)
+                if isinstance(decode_result, DecodeError):
+                    logger.error(
+                        "Failed to decode signal '%s': %s - %s",
+                        plan.name,
+                        decode_result.error_type,
+                        decode_result.message,
+                    )
+                    # A later signal with the same name still replaces the earlier one
+                    decoded.pop(plan.name, None)
+                    raw.pop(plan.name, None)
+                    continue
+                decoded[plan.name] = decode_result.value
+                raw[plan.name] = (
+                    decode_result.value
+                    if decode_result.raw_value is None
+                    else decode_result.raw_value
+                )
+                continue
+
+            raw_value = (raw_int >> plan.shift) & plan.mask
+            raw[plan.name] = raw_value
+
+            if plan.enum is not None:
+                enum_str = plan.enum.get(raw_value)
+                decoded[plan.name] = (
+                    enum_str if enum_str is not None else f"UNKNOWN ({raw_value})"
+                )
+            elif plan.scaled:
+                decoded[plan.name] = raw_value * plan.scale + plan.offset
+            elif plan.passthrough:
+                decoded[plan.name] = raw_value
+            else:
+                decoded[plan.name] = int(raw_value * plan.scale + plan.offset)
+
+        return decoded, raw
+
+
+def _compile_enum(enum_map: dict[Any, Any]) -> dict[int, str]:
+    """
+    Re-key an enum map by integer raw value.
+
+    Only keys that ``str(raw_value)`` could ever produce (canonical,
+    non-negative decimal strings) are kept, so lookups match the string-keyed
+    behaviour exactly.
+    """
+    compiled: dict[int, str] = {}
+    for key, value in enum_map.items():
+        if value is None or not isinstance(key, str):
+            continue
+        try:
+            int_key = int(key)
+        except ValueError:
+            continue
+        if int_key >= 0 and str(int_key) == key:
+            compiled[int_key] = value
+    return compiled
+
+
+def compile_signal_plan(signal: dict[str, Any]) -> SignalPlan:
+    """
+    Compile a single signal definition into a SignalPlan.
+
+    Args:
+        signal: Signal definition from the RVC spec
+
+    Returns:
+        The compiled SignalPlan (marked as fallback if it needs the slow path)
+    """
+    name = signal.get("name", "unknown")
+    start_bit = signal.get("start_bit", 0)
+    length = signal.get("length", 8)
+    scale = signal.get("scale", 1)
+    offset = signal.get("offset", 0)
+    enum_map = signal.get("enum") if "enum" in signal else None
+
+    fallback = not (
+        isinstance(start_bit, int)
+        and isinstance(length, int)
+        and start_bit >= 0
+        and 0 < length <= 64
+        and isinstance(scale, int | float)
+        and isinstance(offset, int | float)
+        and ("enum" not in signal or isinstance(enum_map, dict))
+    )
+
+    if fallback:
+        return SignalPlan(
+            name=name,
+            shift=0,
+            mask=0,
+            end_bit=0,
+            scale=1,
+            offset=0,
+            scaled=False,
+            passthrough=False,
+            unit=signal.get("unit"),
+            enum=None,
+            fallback=True,
+            signal=signal,
+        )
+
+    scaled = scale != 1 or offset != 0
+    return SignalPlan(
+        name=name,
+        shift=start_bit,
+        mask=(1 << length) - 1,
+        end_bit=start_bit + length,
+        scale=scale,
+        offset=offset,
+        scaled=scaled,
+        passthrough=type(scale) is int and type(offset) is int and not scaled,
+        unit=signal.get("unit"),
+        enum=_compile_enum(enum_map) if enum_map is not None else None,
+        fallback=False,
+        signal=signal,
+    )
+
+
+def compile_decode_plan(entry: dict[str, Any]) -> DecodePlan | None:
+    """
+    Compile a spec entry into an immutable DecodePlan.
+
+    Args:
+        entry: The PGN entry from the RVC spec containing signal definitions
+
+    Returns:
+        The compiled DecodePlan, or None if the entry is malformed in a way
+        that only the uncompiled decoder can report
+    """
+    signals = entry.get("signals", [])
+    if not signals:
+        return DecodePlan(pgn=entry.get("pgn", "unknown"), signals=())
+    if not isinstance(signals, list | tuple) or not all(isinstance(s, dict) for s in signals):
+        return None
+
+    return DecodePlan(
+        pgn=entry.get("pgn", "unknown"),
+        signals=tuple(compile_signal_plan(signal) for signal in signals),
+    )
+
+
 def decode_string_payload(data_bytes: bytes, encoding: str = "utf-8") -> str:
     """
     Decode a string payload from multi-packet messages.
@@ -3,9 +3,15 @@ RVC Encoder for creating CAN messages from high-level commands.
 
 This module handles encoding of entity control commands into RV-C compliant
 CAN messages, supporting single-frame and multi-frame (BAM) transmissions.
+
+Per-entity command templates (command spec, CAN ID and the base payload with
+the instance already packed) are compiled when the configuration loads, so
+encoding a command only patches the command bytes. Fully encoded frames for
+repeated identical commands are kept in a small LRU cache.
 """
 
 import logging
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any
 
@@ -16,9 +22,9 @@ from backend.models.entity import ControlCommand
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True)
 class CANMessage:
-    """Represents a CAN message to be transmitted."""
+    """Represents a CAN message to be transmitted; immutable so cached frames can be shared."""
 
     can_id: int
     data: bytes
@@ -31,6 +37,24 @@ class EncodingError(Exception):
     """Raised when encoding fails."""
 
 
+@dataclass(frozen=True)
+class CommandTemplate:
+    """Precompiled command encoding for a single entity."""
+
+    entity_id: str
+    device_type: str
+    command_dgn_hex: str
+    command_spec: dict[str, Any]
+    can_id: int
+    base_payload: bytes
+    # (start_bit, length, scale, offset) of signals patched by generic encoding
+    state_signals: tuple[tuple[int, int, float, float], ...] = ()
+    level_signals: tuple[tuple[int, int, float, float], ...] = ()
+
+
+# Number of fully encoded commands kept for repeated identical commands
+ENCODED_FRAME_CACHE_SIZE = 256
+
 
 class RVCEncoder:
     """
@@ -49,6 +73,12 @@ class RVCEncoder:
         """
         self.settings = settings or get_settings()
         self._config_loaded = False
+        self._templates: dict[str, CommandTemplate] = {}
+        self._template_errors: dict[str, str] = {}
+        self._command_dgns: dict[str, str] = {}
+        self._frame_cache: OrderedDict[tuple, tuple[CANMessage, ...]] = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
         self._load_configuration()
 
     def _load_configuration(self) -> None:
@@ -81,8 +111,12 @@ class RVCEncoder:
                 device_mapping_path_override=map_path_override,
             )
 
+            self._build_command_templates()
             self._config_loaded = True
-            logger.info(f"RVC encoder configuration loaded - coach: {self.coach_info}")
+            logger.info(
+                f"RVC encoder configuration loaded - coach: {self.coach_info}, "
+                f"{len(self._templates)} command templates"
+            )
 
         except Exception as e:
             logger.error(f"Failed to load RVC encoder configuration: {e}")
@@ -94,6 +128,103 @@ class RVCEncoder:
         """Check if the encoder is ready to encode commands."""
         return self._config_loaded
 
+    def _build_command_templates(self) -> None:
+        """Precompile the per-entity command templates used by the encoder."""
+        self._frame_cache.clear()
+
+        # Command spec by PGN (the first spec wins, as with the former linear scan)
+        specs_by_pgn: dict[int, dict[str, Any]] = {}
+        for dgn, spec in self.dgn_dict.items():
+            specs_by_pgn.setdefault(dgn & 0x3FFFF, spec)
+
+        # Status DGN -> command DGN, direct pairs taking precedence over reverse ones
+        command_dgns = {stat_dgn: cmd_dgn for cmd_dgn, stat_dgn in self.dgn_pairs.items()}
+        command_dgns.update(self.dgn_pairs)
+        self._command_dgns = command_dgns
+
+        templates: dict[str, CommandTemplate] = {}
+        errors: dict[str, str] = {}
+        for entity_id, entity_config in self.inst_map.items():
+            try:
+                templates[entity_id] = self._compile_template(
+                    entity_id, entity_config, specs_by_pgn
+                )
+            except EncodingError as e:
+                errors[entity_id] = str(e)
+
+        self._templates = templates
+        self._template_errors = errors
+
+    def _compile_template(
+        self,
+        entity_id: str,
+        entity_config: dict[str, Any],
+        specs_by_pgn: dict[int, dict[str, Any]],
+    ) -> CommandTemplate:
+        """
+        Compile the command template for one entity.
+
+        Raises:
+            EncodingError: If the entity cannot be commanded
+        """
+        dgn_hex = entity_config["dgn_hex"]
+        instance = entity_config["instance"]
+
+        # entity_map is keyed by the instance exactly as written in the mapping
+        device_config = self.entity_map.get((dgn_hex, instance))
+        if device_config is None:
+            device_config = self.entity_map.get((dgn_hex, str(instance)))
+        if device_config is None:
+            msg = f"No device mapping found for entity {entity_id}"
+            raise EncodingError(msg)
+
+        command_dgn_hex = self._get_command_dgn(dgn_hex)
+        if not command_dgn_hex:
+            msg = f"No command DGN found for status DGN {dgn_hex}"
+            raise EncodingError(msg)
+
+        command_spec = specs_by_pgn.get(int(command_dgn_hex, 16) & 0x3FFFF)
+        if not command_spec:
+            msg = f"No specification found for command DGN {command_dgn_hex}"
+            raise EncodingError(msg)
+
+        try:
+            instance_num = int(instance)
+        except (TypeError, ValueError) as e:
+            msg = f"Invalid instance '{instance}' for entity {entity_id}"
+            raise EncodingError(msg) from e
+
+        # Create base payload (8 bytes for standard CAN frame) with the
+        # instance field (byte 0) packed
+        payload = bytearray(8)
+        payload[0] = instance_num & 0xFF
+
+        state_signals = []
+        level_signals = []
+        for signal in command_spec.get("signals", []):
+            signal_name = signal.get("name", "").lower()
+            layout = (
+                signal.get("start_bit", 0),
+                signal.get("length", 8),
+                signal.get("scale", 1),
+                signal.get("offset", 0),
+            )
+            if "state" in signal_name or "status" in signal_name:
+                state_signals.append(layout)
+            elif "brightness" in signal_name or "level" in signal_name:
+                level_signals.append(layout)
+
+        return CommandTemplate(
+            entity_id=entity_id,
+            device_type=device_config.get("device_type", "unknown"),
+            command_dgn_hex=command_dgn_hex,
+            command_spec=command_spec,
+            can_id=self._build_can_id(command_spec, instance_num),
+            base_payload=bytes(payload),
+            state_signals=tuple(state_signals),
+            level_signals=tuple(level_signals),
+        )
+
     def encode_entity_command(self, entity_id: str, command: ControlCommand) -> list[CANMessage]:
         """
         Encode a high-level entity command into RV-C CAN messages.
@@ -112,47 +243,27 @@ class RVCEncoder:
             msg = "Encoder not ready - configuration not loaded"
             raise EncodingError(msg)
 
-        # Look up entity in configuration
-        if entity_id not in self.inst_map:
+        cache_key = (entity_id, command.command, command.state, command.brightness)
+        cached = self._frame_cache.get(cache_key)
+        if cached is not None:
+            self._frame_cache.move_to_end(cache_key)
+            self._cache_hits += 1
+            return list(cached)
+
+        template = self._templates.get(entity_id)
+        if template is None:
+            if entity_id in self._template_errors:
+                raise EncodingError(self._template_errors[entity_id])
             msg = f"Unknown entity ID: {entity_id}"
             raise EncodingError(msg)
 
-        entity_config = self.inst_map[entity_id]
-        dgn_hex = entity_config["dgn_hex"]
-        instance = entity_config["instance"]
-
-        # Get the device configuration for this entity
-        device_key = (dgn_hex, str(instance))
-        if device_key not in self.entity_map:
-            msg = f"No device mapping found for entity {entity_id}"
-            raise EncodingError(msg)
-
-        device_config = self.entity_map[device_key]
-
-        # Determine command DGN based on the dgn_pairs mapping
-        command_dgn_hex = self._get_command_dgn(dgn_hex)
-        if not command_dgn_hex:
-            msg = f"No command DGN found for status DGN {dgn_hex}"
-            raise EncodingError(msg)
-
-        # Get the DGN specification for encoding
-        command_dgn_int = int(command_dgn_hex, 16)
-
-        # Find matching DGN in dgn_dict (need to match by PGN portion)
-        command_pgn = command_dgn_int & 0x3FFFF
-        command_spec = None
-
-        for dgn, spec in self.dgn_dict.items():
-            if (dgn & 0x3FFFF) == command_pgn:
-                command_spec = spec
-                break
-
-        if not command_spec:
-            msg = f"No specification found for command DGN {command_dgn_hex}"
-            raise EncodingError(msg)
+        self._cache_misses += 1
+        messages = self._encode_command_payload(template, command)
 
-        # Encode the command based on device type and command
-        return self._encode_command_payload(command_spec, command, device_config, instance)
+        self._frame_cache[cache_key] = tuple(messages)
+        if len(self._frame_cache) > ENCODED_FRAME_CACHE_SIZE:
+            self._frame_cache.popitem(last=False)
+        return messages
 
     def _get_command_dgn(self, status_dgn_hex: str) -> str | None:
         """
@@ -164,14 +275,10 @@ class RVCEncoder:
         Returns:
             Command DGN hex string or None if not found
         """
-        # Check direct mapping first
-        if status_dgn_hex in self.dgn_pairs:
-            return self.dgn_pairs[status_dgn_hex]
-
-        # Check reverse mapping (command -> status)
-        for cmd_dgn, stat_dgn in self.dgn_pairs.items():
-            if stat_dgn == status_dgn_hex:
-                return cmd_dgn
+        # Direct and reverse dgn_pairs mappings, precomputed at load time
+        command_dgn = self._command_dgns.get(status_dgn_hex)
+        if command_dgn:
+            return command_dgn
 
         # Fallback: try to infer based on common RV-C patterns
         # Many command DGNs are status DGN + 0x100
@@ -185,48 +292,33 @@ class RVCEncoder:
         return None
 
     def _encode_command_payload(
-        self,
-        command_spec: dict[str, Any],
-        command: ControlCommand,
-        device_config: dict[str, Any],
-        instance: str,
+        self, template: CommandTemplate, command: ControlCommand
     ) -> list[CANMessage]:
         """
-        Encode command payload based on specification and device type.
+        Encode command payload by patching the entity's base payload.
 
         Args:
-            command_spec: DGN specification from RVC spec
+            template: Precompiled command template for the entity
             command: Control command to encode
-            device_config: Device configuration from mapping
-            instance: Device instance number
 
         Returns:
             List of CANMessage objects
         """
-        device_type = device_config.get("device_type", "unknown")
-
-        # Create base payload (8 bytes for standard CAN frame)
-        payload = bytearray(8)
-
-        # Set instance field (typically byte 0)
-        instance_num = int(instance)
-        payload[0] = instance_num & 0xFF
+        payload = bytearray(template.base_payload)
+        device_type = template.device_type
 
         # Encode based on device type and command
         if device_type in ("light", "dimmer"):
-            self._encode_light_command(payload, command, command_spec)
+            self._encode_light_command(payload, command, template.command_spec)
         elif device_type == "switch":
-            self._encode_switch_command(payload, command, command_spec)
+            self._encode_switch_command(payload, command, template.command_spec)
         elif device_type == "fan":
-            self._encode_fan_command(payload, command, command_spec)
+            self._encode_fan_command(payload, command, template.command_spec)
         else:
-            # Generic encoding - try to map command fields to signals
-            self._encode_generic_command(payload, command, command_spec)
-
-        # Create CAN message
-        can_id = self._build_can_id(command_spec, instance_num)
+            # Generic encoding - map command fields to the template's signals
+            self._encode_generic_command(payload, command, template)
 
-        return [CANMessage(can_id=can_id, data=bytes(payload), extended=True)]
+        return [CANMessage(can_id=template.can_id, data=bytes(payload), extended=True)]
 
     def _encode_light_command(
         self, payload: bytearray, command: ControlCommand, spec: dict[str, Any]
@@ -284,39 +376,27 @@ class RVCEncoder:
             payload[1] = 0xFE
 
     def _encode_generic_command(
-        self, payload: bytearray, command: ControlCommand, spec: dict[str, Any]
+        self, payload: bytearray, command: ControlCommand, template: CommandTemplate
     ) -> None:
         """Generic command encoding based on signal specifications."""
-        signals = spec.get("signals", [])
-
-        for signal in signals:
-            signal_name = signal.get("name", "").lower()
-
-            # Map common signal names to command fields
-            if "state" in signal_name or "status" in signal_name:
-                if command.state == "on":
-                    value = 1
-                elif command.state == "off":
-                    value = 0
-                else:
-                    continue
-
-                self._set_signal_value(payload, signal, value)
-
-            elif "brightness" in signal_name or "level" in signal_name:
-                if command.brightness is not None:
-                    self._set_signal_value(payload, signal, command.brightness)
-
-    def _set_signal_value(self, payload: bytearray, signal: dict[str, Any], value: int) -> None:
+        if command.state == "on":
+            for layout in template.state_signals:
+                self._set_signal_value(payload, layout, 1)
+        elif command.state == "off":
+            for layout in template.state_signals:
+                self._set_signal_value(payload, layout, 0)
+
+        if command.brightness is not None:
+            for layout in template.level_signals:
+                self._set_signal_value(payload, layout, command.brightness)
+
+    def _set_signal_value(
+        self, payload: bytearray, layout: tuple[int, int, float, float], value: int
+    ) -> None:
         """Set a signal value in the payload."""
-        start_bit = signal.get("start_bit", 0)
-        length = signal.get("length", 8)
+        start_bit, length, scale, offset = layout
 
-        # Apply scale and offset (reverse of decoding)
-        scale = signal.get("scale", 1)
-        offset = signal.get("offset", 0)
-
-        # Convert physical value to raw value
+        # Convert physical value to raw value (reverse of decoding)
         raw_value = int((value - offset) / scale)
 
         # Ensure value fits in the field
@@ -368,7 +448,6 @@ class RVCEncoder:
         # Format: [Priority(3)] [Reserved(1)] [Data Page(1)] [PDU Format(8)] [PDU Specific(8)] [Source Address(8)]
         return (priority << 26) | (pgn << 8) | source_addr
 
-
     def validate_command(self, entity_id: str, command: ControlCommand) -> tuple[bool, str]:
         """
         Validate a command before encoding.
@@ -451,4 +530,10 @@ class RVCEncoder:
             "total_entities": len(getattr(self, "entity_ids", [])),
             "supported_entities": len(self.get_supported_entities()),
             "dgn_pairs_count": len(getattr(self, "dgn_pairs", {})),
+            "frame_cache": {
+                "size": len(self._frame_cache),
+                "max_size": ENCODED_FRAME_CACHE_SIZE,
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+            },
         }
@@ -3,6 +3,12 @@ Performance optimization and priority message handling for RV-C.
 
 This module provides message prioritization, queue management, and performance
 optimization for real-time CAN message processing.
+
+Each priority class below HIGH is admitted through its own token bucket, every
+class is held in its own bounded queue, and workers always drain higher
+classes first. When the bus saturates, safety and chassis traffic therefore
+never waits behind (or competes for admission with) lighting and tank-level
+chatter, and is never rate limited itself.
 """
 
 import asyncio
@@ -29,7 +35,11 @@ class MessagePriority(Enum):
     BACKGROUND = 5  # Diagnostic and maintenance messages
 
 
-@dataclass
+# Classes admitted without a token bucket; only their bounded queues shed load
+RATE_EXEMPT_PRIORITIES = frozenset({MessagePriority.CRITICAL, MessagePriority.HIGH})
+
+
+@dataclass(slots=True)
 class PrioritizedMessage:
     """A CAN message with priority information."""
 
@@ -39,7 +49,7 @@ class PrioritizedMessage:
     source_address: int
     data: bytes
     can_id: int
-    metadata: dict[str, Any] = field(default_factory=dict)
+    metadata: Any = field(default_factory=dict)  # Caller's payload, e.g. a frame record
 
     def __lt__(self, other: "PrioritizedMessage") -> bool:
         """Compare messages for priority queue ordering."""
@@ -50,6 +60,52 @@ class PrioritizedMessage:
         return self.timestamp < other.timestamp
 
 
+@dataclass
+class TokenBucket:
+    """Token bucket admitting up to ``rate`` messages per second with bursts of ``capacity``."""
+
+    rate: float
+    capacity: float
+    tokens: float = -1.0
+    updated: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self) -> None:
+        if self.tokens < 0:
+            self.tokens = self.capacity
+
+    def try_consume(self, now: float | None = None) -> bool:
+        """
+        Take one token if available.
+
+        Args:
+            now: Current monotonic time (default: time.monotonic())
+
+        Returns:
+            True if the message is admitted, False if rate limited
+        """
+        if now is None:
+            now = time.monotonic()
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+@dataclass
+class PriorityClassStats:
+    """Admission and queue statistics for one priority class."""
+
+    enqueued: int = 0
+    dequeued: int = 0
+    dropped_rate_limited: int = 0
+    evicted_queue_full: int = 0
+    queue_size_max: int = 0
+
+
 @dataclass
 class PerformanceMetrics:
     """Performance metrics for monitoring message processing."""
@@ -74,22 +130,33 @@ class PriorityMessageHandler:
     - Load balancing
     """
 
-    def __init__(self, settings: Any = None, max_queue_size: int = 10000):
+    def __init__(
+        self,
+        settings: Any = None,
+        max_queue_size: int = 10000,
+        rate_limits: dict[MessagePriority, float] | None = None,
+    ):
         """
         Initialize the priority message handler.
 
         Args:
             settings: Application settings instance
-            max_queue_size: Maximum number of messages to queue
+            max_queue_size: Maximum number of messages to queue, split evenly
+                between the priority classes
+            rate_limits: Optional per-class admission rates (messages/second)
+                overriding the defaults; CRITICAL and HIGH are never rate limited
         """
         self.settings = settings or get_settings()
         self.max_queue_size = max_queue_size
 
-        # Priority queues for different message types
+        # Bounded queue per priority class; a full queue evicts its oldest message
         self._priority_queues: dict[MessagePriority, deque] = {
-            priority: deque(maxlen=max_queue_size // len(MessagePriority))
+            priority: deque(maxlen=max(1, max_queue_size // len(MessagePriority)))
             for priority in MessagePriority
         }
+        self._class_stats: dict[MessagePriority, PriorityClassStats] = {
+            priority: PriorityClassStats() for priority in MessagePriority
+        }
 
         # Performance metrics
         self.metrics = PerformanceMetrics()
@@ -98,18 +165,25 @@ class PriorityMessageHandler:
         # Priority classification rules
         self._priority_rules = self._setup_priority_rules()
 
-        # Rate limiting per priority
+        # Rate limiting per priority; critical and high classes are exempt
         self._priority_limits = {
-            MessagePriority.CRITICAL: 1000.0,  # No practical limit for critical
-            MessagePriority.HIGH: 200.0,  # 200 msg/sec for high priority
             MessagePriority.NORMAL: 100.0,  # 100 msg/sec for normal
             MessagePriority.LOW: 50.0,  # 50 msg/sec for low priority
             MessagePriority.BACKGROUND: 10.0,  # 10 msg/sec for background
         }
+        if rate_limits:
+            self._priority_limits.update(rate_limits)
+
+        # Token bucket per rate-limited class, allowing a one-second burst
+        self._rate_buckets: dict[MessagePriority, TokenBucket] = {
+            priority: TokenBucket(rate=limit, capacity=max(limit, 1.0))
+            for priority, limit in self._priority_limits.items()
+            if priority not in RATE_EXEMPT_PRIORITIES
+        }
 
         # Processing state
         self._processing_active = False
-        self._last_priority_check = time.time()
+        self._messages_available: asyncio.Event | None = None
 
         logger.info("Priority message handler initialized")
 
@@ -229,7 +303,7 @@ class PriorityMessageHandler:
         source_address: int,
         data: bytes,
         can_id: int,
-        metadata: dict[str, Any] | None = None,
+        metadata: Any = None,
     ) -> bool:
         """
         Queue message by priority for ordered processing.
@@ -250,6 +324,7 @@ class PriorityMessageHandler:
         # Check rate limiting for this priority level
         if not self._check_rate_limit(priority):
             self.metrics.messages_dropped += 1
+            self._class_stats[priority].dropped_rate_limited += 1
             logger.debug(
                 f"Message dropped due to rate limiting: DGN {dgn:X}, priority {priority.name}"
             )
@@ -266,28 +341,21 @@ class PriorityMessageHandler:
             metadata=metadata or {},
         )
 
-        # Add to appropriate priority queue
         queue = self._priority_queues[priority]
+        stats = self._class_stats[priority]
+
+        # A full class queue evicts its oldest message; newer status frames
+        # supersede older ones, and other classes are never touched
+        if len(queue) >= queue.maxlen:
+            self.metrics.messages_dropped += 1
+            stats.evicted_queue_full += 1
+            logger.debug(f"Queue full for priority {priority.name} - evicting oldest message")
 
-        # Check if queue is full
-        if queue.maxlen is not None and len(queue) >= queue.maxlen:
-            # For critical messages, drop oldest low-priority message if possible
-            if priority == MessagePriority.CRITICAL:
-                if self._drop_lowest_priority_message():
-                    logger.info("Dropped low priority message to make room for critical message")
-                else:
-                    self.metrics.messages_dropped += 1
-                    logger.warning("Critical message queue full - dropping message")
-                    return False
-            else:
-                self.metrics.messages_dropped += 1
-                logger.debug(f"Queue full for priority {priority.name} - dropping message")
-                return False
-
-        # Add message to queue
         queue.append(message)
 
         # Update metrics
+        stats.enqueued += 1
+        stats.queue_size_max = max(stats.queue_size_max, len(queue))
         self.metrics.messages_processed += 1
         self.metrics.priority_distribution[priority] = (
             self.metrics.priority_distribution.get(priority, 0) + 1
@@ -297,37 +365,15 @@ class PriorityMessageHandler:
             self.metrics.queue_size_max, self.metrics.queue_size_current
         )
 
-        return True
-
-    def _check_rate_limit(self, priority: MessagePriority) -> bool:
-        """Check if priority level is under rate limit."""
-        current_time = time.time()
-
-        # Simple rate limiting based on priority
-        # More sophisticated implementation could use token bucket algorithm
-
-        limit = self._priority_limits.get(priority, 50.0)  # messages per second
-
-        # For now, just check time since last priority check
-        # This is a simplified implementation
-        time_since_check = current_time - self._last_priority_check
+        if self._messages_available is not None:
+            self._messages_available.set()
 
-        if time_since_check < (1.0 / limit):
-            return False  # Rate limited
-
-        self._last_priority_check = current_time
         return True
 
-    def _drop_lowest_priority_message(self) -> bool:
-        """Drop the oldest message from the lowest priority non-empty queue."""
-        # Check queues from lowest to highest priority
-        for priority in reversed(list(MessagePriority)):
-            queue = self._priority_queues[priority]
-            if queue:
-                queue.popleft()  # Drop oldest message
-                logger.debug(f"Dropped {priority.name} priority message to make room")
-                return True
-        return False
+    def _check_rate_limit(self, priority: MessagePriority) -> bool:
+        """Check if priority level is under its token bucket rate limit."""
+        bucket = self._rate_buckets.get(priority)
+        return bucket is None or bucket.try_consume()
 
     def get_next_message(self) -> PrioritizedMessage | None:
         """
@@ -341,6 +387,7 @@ class PriorityMessageHandler:
             queue = self._priority_queues[priority]
             if queue:
                 message = queue.popleft()
+                self._class_stats[priority].dequeued += 1
                 self.metrics.queue_size_current = self.get_total_queue_size()
                 return message
 
@@ -363,8 +410,10 @@ class PriorityMessageHandler:
             queue = self._priority_queues[priority]
 
             # Take messages from this priority level
-            while queue and len(batch) < max_batch_size:
+            taken = min(len(queue), max_batch_size - len(batch))
+            for _ in range(taken):
                 batch.append(queue.popleft())
+            self._class_stats[priority].dequeued += taken
 
         self.metrics.queue_size_current = self.get_total_queue_size()
         return batch
@@ -377,6 +426,29 @@ class PriorityMessageHandler:
         """Get queue sizes for each priority level."""
         return {priority: len(queue) for priority, queue in self._priority_queues.items()}
 
+    def get_class_stats(self) -> dict[str, dict[str, Any]]:
+        """
+        Get admission, drop and queue statistics for each priority class.
+
+        Returns:
+            Dictionary of priority class name to its statistics
+        """
+        return {
+            priority.name: {
+                "queue_depth": len(self._priority_queues[priority]),
+                "queue_capacity": self._priority_queues[priority].maxlen,
+                "queue_size_max": stats.queue_size_max,
+                "rate_limit": (
+                    self._priority_limits.get(priority) if priority in self._rate_buckets else None
+                ),
+                "enqueued": stats.enqueued,
+                "dequeued": stats.dequeued,
+                "dropped_rate_limited": stats.dropped_rate_limited,
+                "evicted_queue_full": stats.evicted_queue_full,
+            }
+            for priority, stats in self._class_stats.items()
+        }
+
     def record_processing_time(self, processing_time: float) -> None:
         """
         Record message processing time for performance metrics.
@@ -419,11 +491,13 @@ class PriorityMessageHandler:
                 priority.name: size for priority, size in self.get_queue_sizes_by_priority().items()
             },
             "messages_per_second": self.metrics.messages_processed / max(uptime, 1),
+            "classes": self.get_class_stats(),
         }
 
     def reset_metrics(self) -> None:
         """Reset performance metrics."""
         self.metrics = PerformanceMetrics()
+        self._class_stats = {priority: PriorityClassStats() for priority in MessagePriority}
         self._processing_times.clear()
         logger.info("Performance metrics reset")
 
@@ -482,17 +556,24 @@ class PriorityMessageHandler:
         self,
         processor_func: Callable,
         batch_size: int = 50,
-        sleep_interval: float = 0.001,  # 1ms sleep between batches
+        sleep_interval: float = 0.001,  # 1ms pause between batches
     ) -> None:
         """
         Continuously process messages from queues.
 
+        Waits for messages instead of polling, and takes every batch from the
+        highest non-empty priority classes first, so critical and high
+        priority traffic is handled ahead of any backlog.
+
         Args:
             processor_func: Function to process messages (async)
             batch_size: Number of messages to process per batch
-            sleep_interval: Sleep time between processing batches
+            sleep_interval: Pause between batches (0 only yields to the event loop)
         """
         self._processing_active = True
+        if self._messages_available is None:
+            self._messages_available = asyncio.Event()
+        messages_available = self._messages_available
         logger.info("Started continuous queue processing")
 
         try:
@@ -500,27 +581,27 @@ class PriorityMessageHandler:
                 # Get batch of messages
                 batch = self.get_messages_batch(batch_size)
 
-                if batch:
-                    # Process batch
-                    start_time = time.time()
+                if not batch:
+                    # Sleep until queue_by_priority (or stop_processing) wakes us
+                    messages_available.clear()
+                    await messages_available.wait()
+                    continue
 
-                    try:
-                        await processor_func(batch)
+                # Process batch
+                start_time = time.time()
 
-                        # Record processing time
-                        processing_time = time.time() - start_time
-                        self.record_processing_time(processing_time / len(batch))  # Per message
+                try:
+                    await processor_func(batch)
 
-                    except Exception as e:
-                        logger.error(f"Error processing message batch: {e}")
-                        # Continue processing despite errors
+                    # Record processing time
+                    processing_time = time.time() - start_time
+                    self.record_processing_time(processing_time / len(batch))  # Per message
 
-                else:
-                    # No messages to process, sleep a bit longer
-                    await asyncio.sleep(sleep_interval * 10)
-                    continue
+                except Exception as e:
+                    logger.error(f"Error processing message batch: {e}")
+                    # Continue processing despite errors
 
-                # Brief sleep to prevent busy waiting
+                # Let producers and other tasks run between batches
                 await asyncio.sleep(sleep_interval)
 
         except asyncio.CancelledError:
@@ -536,3 +617,5 @@ class PriorityMessageHandler:
     def stop_processing(self) -> None:
         """Stop continuous queue processing."""
         self._processing_active = False
+        if self._messages_available is not None:
+            self._messages_available.set()
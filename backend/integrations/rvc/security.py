@@ -15,6 +15,15 @@ from backend.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Streaming traffic detection thresholds
+FLOOD_THRESHOLD = 100  # Messages per FLOOD_WINDOW from one source
+FLOOD_WINDOW = 1.0  # seconds
+SCAN_THRESHOLD = 20  # Distinct DGNs per SCAN_WINDOW from one source
+SCAN_WINDOW = 10.0  # seconds
+NEW_SOURCE_WINDOW = 10.0  # A source counts as new for this long after first seen
+IMPERSONATION_WINDOW = 60.0  # Other sources active this recently are compared
+MAX_DATA_LENGTH = 8  # Standard CAN frame
+
 
 @dataclass
 class Anomaly:
@@ -38,6 +47,82 @@ class RateLimit:
     window_seconds: float = 1.0
 
 
+class SlidingWindowCounter:
+    """
+    Event counter over a sliding time window.
+
+    The window is split into a fixed ring of sub-windows, so adding an event
+    and reading the count are O(1) regardless of the event rate.
+    """
+
+    __slots__ = ("_buckets", "_bucket_width", "_newest", "count")
+
+    def __init__(self, window_seconds: float, buckets: int = 10) -> None:
+        self._buckets = [0] * buckets
+        self._bucket_width = window_seconds / buckets
+        self._newest = -buckets
+        self.count = 0
+
+    def add(self, timestamp: float) -> int:
+        """Count an event and return the number of events in the window."""
+        self._buckets[self._advance(timestamp) % len(self._buckets)] += 1
+        self.count += 1
+        return self.count
+
+    def current(self, timestamp: float) -> int:
+        """Return the number of events in the window ending at ``timestamp``."""
+        self._advance(timestamp)
+        return self.count
+
+    def _advance(self, timestamp: float) -> int:
+        bucket_id = int(timestamp / self._bucket_width)
+        newest = self._newest
+        if bucket_id <= newest:
+            # Same sub-window, or an out-of-order event counted in the newest one
+            return newest
+        size = len(self._buckets)
+        if bucket_id - newest >= size:
+            self._buckets[:] = [0] * size
+            self.count = 0
+        else:
+            for current in range(newest + 1, bucket_id + 1):
+                slot = current % size
+                self.count -= self._buckets[slot]
+                self._buckets[slot] = 0
+        self._newest = bucket_id
+        return bucket_id
+
+
+class _SourceTraffic:
+    """Streaming detection state for one source address."""
+
+    __slots__ = (
+        "dgn_mask",
+        "first_seen",
+        "flood_reported",
+        "impersonation_reported",
+        "last_seen",
+        "rate",
+        "scan_current",
+        "scan_previous",
+        "scan_reported",
+        "scan_window",
+    )
+
+    def __init__(self, timestamp: float) -> None:
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.rate = SlidingWindowCounter(FLOOD_WINDOW)
+        self.dgn_mask = 0  # Bit per DGN ever sent by this source
+        # DGN bitsets for the current and previous half scan windows
+        self.scan_window = -1
+        self.scan_current = 0
+        self.scan_previous = 0
+        self.flood_reported = -1.0  # Start of the last reported flooding window
+        self.scan_reported = -1  # Scan window of the last scanning report
+        self.impersonation_reported = False
+
+
 class SecurityManager:
     """
     Security manager for RV-C CANbus networks.
@@ -71,6 +156,10 @@ class SecurityManager:
         self._anomalies: list[Anomaly] = []
         self._max_anomalies = 1000  # Ring buffer
 
+        # Streaming traffic detection: per-source counters and DGN bitsets
+        self._traffic: dict[int, _SourceTraffic] = {}
+        self._dgn_bits: dict[int, int] = {}  # DGN -> bit in the DGN bitsets
+
         # Security configuration
         self._setup_security_rules()
 
@@ -167,113 +256,188 @@ class SecurityManager:
 
         return True
 
-    def detect_anomalous_traffic(self, messages: list[dict[str, Any]]) -> list[Anomaly]:
+    def observe_frame(
+        self,
+        source_address: int,
+        dgn: int | None,
+        data_length: int = MAX_DATA_LENGTH,
+        timestamp: float | None = None,
+    ) -> list[Anomaly]:
         """
-        Analyze message patterns for anomalies.
+        Feed one received frame to the streaming traffic detector.
+
+        Per-source rates are kept in sliding-window counters and the DGNs each
+        source has used in bitsets, so every frame is checked in O(1) for
+        flooding, DGN scanning, oversized payloads and, while a source is new,
+        impersonation of other recently active sources.
 
         Args:
-            messages: List of recent CAN messages
+            source_address: Source address from the CAN ID
+            dgn: DGN of the frame (None if unknown)
+            data_length: Payload length in bytes
+            timestamp: Receive time (default: now)
 
         Returns:
-            List of detected anomalies
+            Anomalies detected for this frame (usually empty)
         """
-        anomalies = []
-        current_time = time.time()
-
-        # Group messages by source
-        by_source = defaultdict(list)
-        for msg in messages:
-            source = msg.get("source_address", 0)
-            by_source[source].append(msg)
-
-        for source_address, source_messages in by_source.items():
-            # Update source statistics
-            stats = self._source_stats[source_address]
-            stats["last_seen"] = current_time
-            stats["message_count"] += len(source_messages)
-
-            # Collect DGNs for this source
-            dgns_in_batch = set()
-            for msg in source_messages:
-                if "dgn" in msg:
-                    dgns_in_batch.add(msg["dgn"])
-                    stats["dgns_seen"].add(msg["dgn"])
-
-            # 1. Detect message flooding
-            recent_count = len(
-                [msg for msg in source_messages if current_time - msg.get("timestamp", 0) < 1.0]
-            )
-
-            if recent_count > 100:  # More than 100 messages per second
-                anomaly = self._record_anomaly(
+        now = time.time() if timestamp is None else timestamp
+        anomalies: list[Anomaly] = []
+
+        traffic = self._traffic.get(source_address)
+        is_new = traffic is None
+        if is_new:
+            traffic = self._traffic[source_address] = _SourceTraffic(now)
+        traffic.last_seen = now
+
+        stats = self._source_stats[source_address]
+        stats["last_seen"] = now
+        stats["message_count"] += 1
+
+        # 1. Message flooding, reported once per window
+        rate = traffic.rate.add(now)
+        if rate > FLOOD_THRESHOLD and now - traffic.flood_reported >= FLOOD_WINDOW:
+            traffic.flood_reported = now
+            anomalies.append(
+                self._record_anomaly(
                     "message_flooding",
                     source_address,
                     None,
                     "high",
-                    f"Source {source_address:02X} sending {recent_count} messages/second",
-                    {"message_rate": recent_count, "timeframe": 1.0},
-                )
-                anomalies.append(anomaly)
-
-            # 2. Detect DGN scanning (sending to many different DGNs)
-            if len(dgns_in_batch) > 20:  # Threshold for DGN scanning
-                anomaly = self._record_anomaly(
-                    "dgn_scanning",
-                    source_address,
-                    None,
-                    "medium",
-                    f"Source {source_address:02X} sending to {len(dgns_in_batch)} different DGNs",
-                    {
-                        "dgn_count": len(dgns_in_batch),
-                        "dgns": list(dgns_in_batch)[:10],
-                    },  # Limit evidence size
+                    f"Source {source_address:02X} sending {rate} messages/second",
+                    {"message_rate": rate, "timeframe": FLOOD_WINDOW},
                 )
-                anomalies.append(anomaly)
+            )
 
-            # 3. Detect malformed messages
-            for msg in source_messages:
-                data_length = len(msg.get("data", b""))
-                expected_length = 8  # Standard CAN frame
+        if dgn is not None:
+            bit = self._dgn_bits.get(dgn)
+            if bit is None:
+                bit = self._dgn_bits[dgn] = 1 << len(self._dgn_bits)
 
-                if data_length > expected_length:
-                    anomaly = self._record_anomaly(
-                        "oversized_message",
-                        source_address,
-                        msg.get("dgn"),
-                        "medium",
-                        f"Message with {data_length} bytes (expected {expected_length})",
-                        {"data_length": data_length, "expected": expected_length},
-                    )
-                    anomalies.append(anomaly)
-
-            # 4. Detect new sources (potential impersonation)
-            if stats["message_count"] == len(source_messages):  # First time seeing this source
-                # Check if this source address was recently used by another device
-                for other_source, other_stats in self._source_stats.items():
-                    if (
-                        other_source != source_address
-                        and current_time - other_stats["last_seen"] < 60.0  # Recently active
-                        and len(stats["dgns_seen"] & other_stats["dgns_seen"]) > 0
-                    ):  # Overlapping DGNs
-                        anomaly = self._record_anomaly(
-                            "potential_impersonation",
+            # 2. DGN scanning over the current and previous half windows
+            window = int(now / (SCAN_WINDOW / 2))
+            if window != traffic.scan_window:
+                traffic.scan_previous = (
+                    traffic.scan_current if window == traffic.scan_window + 1 else 0
+                )
+                traffic.scan_current = 0
+                traffic.scan_window = window
+            if not traffic.scan_current & bit:
+                traffic.scan_current |= bit
+                recent_dgns = traffic.scan_current | traffic.scan_previous
+                dgn_count = recent_dgns.bit_count()
+                if dgn_count > SCAN_THRESHOLD and window - traffic.scan_reported > 1:
+                    traffic.scan_reported = window
+                    anomalies.append(
+                        self._record_anomaly(
+                            "dgn_scanning",
                             source_address,
                             None,
-                            "high",
-                            f"New source {source_address:02X} using DGNs recently used by {other_source:02X}",
+                            "medium",
+                            f"Source {source_address:02X} sending to {dgn_count} different DGNs",
                             {
-                                "new_source": source_address,
-                                "existing_source": other_source,
-                                "overlapping_dgns": list(
-                                    stats["dgns_seen"] & other_stats["dgns_seen"]
-                                ),
-                            },
+                                "dgn_count": dgn_count,
+                                "dgns": self._dgns_from_mask(recent_dgns)[:10],
+                            },  # Limit evidence size
                         )
+                    )
+
+            if not traffic.dgn_mask & bit:
+                traffic.dgn_mask |= bit
+                stats["dgns_seen"].add(dgn)
+
+                # 4. New source using DGNs recently used by another device
+                if (
+                    not traffic.impersonation_reported
+                    and now - traffic.first_seen < NEW_SOURCE_WINDOW
+                ):
+                    anomaly = self._check_impersonation(source_address, traffic, now)
+                    if anomaly:
                         anomalies.append(anomaly)
-                        break
 
+        # 3. Malformed messages
+        if data_length > MAX_DATA_LENGTH:
+            anomalies.append(
+                self._record_anomaly(
+                    "oversized_message",
+                    source_address,
+                    dgn,
+                    "medium",
+                    f"Message with {data_length} bytes (expected {MAX_DATA_LENGTH})",
+                    {"data_length": data_length, "expected": MAX_DATA_LENGTH},
+                )
+            )
+
+        return anomalies
+
+    def observe_frames(self, frames: list[tuple[int, int | None, int, float]]) -> list[Anomaly]:
+        """
+        Feed a batch of ``(source_address, dgn, data_length, timestamp)`` frames.
+
+        Returns:
+            Anomalies detected across the batch
+        """
+        anomalies: list[Anomaly] = []
+        for source_address, dgn, data_length, timestamp in frames:
+            anomalies.extend(self.observe_frame(source_address, dgn, data_length, timestamp))
         return anomalies
 
+    def _check_impersonation(
+        self, source_address: int, traffic: _SourceTraffic, now: float
+    ) -> Anomaly | None:
+        """Compare a new source's DGN bitset against other recently active sources."""
+        for other_source, other in self._traffic.items():
+            if (
+                other_source != source_address
+                and now - other.last_seen < IMPERSONATION_WINDOW
+                and other.first_seen <= traffic.first_seen
+            ):
+                overlap = traffic.dgn_mask & other.dgn_mask
+                if overlap:
+                    traffic.impersonation_reported = True
+                    return self._record_anomaly(
+                        "potential_impersonation",
+                        source_address,
+                        None,
+                        "high",
+                        f"New source {source_address:02X} using DGNs recently used by {other_source:02X}",
+                        {
+                            "new_source": source_address,
+                            "existing_source": other_source,
+                            "overlapping_dgns": self._dgns_from_mask(overlap),
+                        },
+                    )
+        return None
+
+    def _dgns_from_mask(self, mask: int) -> list[int]:
+        """Translate a DGN bitset back into DGN values."""
+        return [dgn for dgn, bit in self._dgn_bits.items() if mask & bit]
+
+    def detect_anomalous_traffic(self, messages: list[dict[str, Any]]) -> list[Anomaly]:
+        """
+        Analyze a list of messages for anomalies.
+
+        Kept for callers that collect messages themselves; each message is fed
+        to the streaming detector (see ``observe_frame``) in order.
+
+        Args:
+            messages: List of recent CAN messages
+
+        Returns:
+            List of detected anomalies
+        """
+        current_time = time.time()
+        return self.observe_frames(
+            [
+                (
+                    msg.get("source_address", 0),
+                    msg.get("dgn"),
+                    len(msg.get("data", b"")),
+                    msg.get("timestamp", current_time),
+                )
+                for msg in messages
+            ]
+        )
+
     def rate_limit_commands(self, source_address: int, dgn: int | None = None) -> bool:
         """
         Check if a command should be rate limited.
@@ -511,6 +675,8 @@ class SecurityManager:
         self._source_stats.clear()
         self._rate_limit_violations.clear()
         self._anomalies.clear()
+        self._traffic.clear()
+        self._dgn_bits.clear()
 
         logger.info("Security manager statistics reset")
 
@@ -2,6 +2,9 @@
 Tests for the BAM (Broadcast Announce Message) handler.
 """
 
+from types import SimpleNamespace
+
+from backend.integrations.rvc import bam_handler
 from backend.integrations.rvc.bam_handler import BAMHandler
 
 
@@ -17,8 +20,8 @@ class TestBAMHandler:
         # Total size = 50 bytes (0x32, 0x00 in little endian)
         # Total packets = 8
         # Reserved = 0xFF
-        # Target PGN = 0x1FEF2 (Product ID) = F2 EF 01 in little endian
-        control_data = bytes([0x20, 0x32, 0x00, 0x08, 0xFF, 0xF2, 0xEF, 0x01])
+        # Target PGN = 0x1FEF2 (Product ID) = F2 FE 01 in little endian
+        control_data = bytes([0x20, 0x32, 0x00, 0x08, 0xFF, 0xF2, 0xFE, 0x01])
 
         result = handler.process_frame(BAMHandler.TP_CM_PGN, control_data, source_address=0x42)
 
@@ -41,7 +44,7 @@ class TestBAMHandler:
 
         # Start a BAM session
         control_data = bytes(
-            [0x20, 0x15, 0x00, 0x03, 0xFF, 0xF2, 0xEF, 0x01]
+            [0x20, 0x15, 0x00, 0x03, 0xFF, 0xF2, 0xFE, 0x01]
         )  # 21 bytes, 3 packets
         handler.process_frame(BAMHandler.TP_CM_PGN, control_data, source_address=0x42)
 
@@ -75,7 +78,7 @@ class TestBAMHandler:
 
         # Start a BAM session
         control_data = bytes(
-            [0x20, 0x0E, 0x00, 0x02, 0xFF, 0xF2, 0xEF, 0x01]
+            [0x20, 0x0E, 0x00, 0x02, 0xFF, 0xF2, 0xFE, 0x01]
         )  # 14 bytes, 2 packets
         handler.process_frame(BAMHandler.TP_CM_PGN, control_data, source_address=0x42)
 
@@ -91,7 +94,7 @@ class TestBAMHandler:
         handler = BAMHandler(session_timeout=0.1)  # Very short timeout for testing
 
         # Start a BAM session
-        control_data = bytes([0x20, 0x0E, 0x00, 0x02, 0xFF, 0xF2, 0xEF, 0x01])
+        control_data = bytes([0x20, 0x0E, 0x00, 0x02, 0xFF, 0xF2, 0xFE, 0x01])
         handler.process_frame(BAMHandler.TP_CM_PGN, control_data, source_address=0x42)
 
         assert handler.get_active_session_count() == 1
@@ -102,7 +105,7 @@ class TestBAMHandler:
         time.sleep(0.2)
 
         # Trigger cleanup by processing another frame
-        dummy_control = bytes([0x20, 0x0E, 0x00, 0x02, 0xFF, 0xF3, 0xEF, 0x01])
+        dummy_control = bytes([0x20, 0x0E, 0x00, 0x02, 0xFF, 0xF3, 0xFE, 0x01])
         handler.process_frame(BAMHandler.TP_CM_PGN, dummy_control, source_address=0x43)
 
         # Original session should be cleaned up, only new one remains
@@ -115,11 +118,11 @@ class TestBAMHandler:
         handler = BAMHandler()
 
         # Start first session from source 0x42
-        control1 = bytes([0x20, 0x0E, 0x00, 0x02, 0xFF, 0xF2, 0xEF, 0x01])
+        control1 = bytes([0x20, 0x0E, 0x00, 0x02, 0xFF, 0xF2, 0xFE, 0x01])
         handler.process_frame(BAMHandler.TP_CM_PGN, control1, source_address=0x42)
 
         # Start second session from source 0x43
-        control2 = bytes([0x20, 0x15, 0x00, 0x03, 0xFF, 0xF3, 0xEF, 0x01])
+        control2 = bytes([0x20, 0x15, 0x00, 0x03, 0xFF, 0xF3, 0xFE, 0x01])
         handler.process_frame(BAMHandler.TP_CM_PGN, control2, source_address=0x43)
 
         assert handler.get_active_session_count() == 2
@@ -145,3 +148,91 @@ class TestBAMHandler:
 
         # Only second session should remain
         assert handler.get_active_session_count() == 1
+
+    def test_duplicate_packet_does_not_complete_session(self):
+        """Test that a repeated packet is not counted twice."""
+        handler = BAMHandler()
+        control_data = bytes([0x20, 0x0E, 0x00, 0x02, 0xFF, 0xF2, 0xFE, 0x01])
+        handler.process_frame(BAMHandler.TP_CM_PGN, control_data, source_address=0x42)
+
+        packet1 = bytes([0x01]) + b"First  "
+        assert handler.process_frame(BAMHandler.TP_DT_PGN, packet1, source_address=0x42) is None
+        assert handler.process_frame(BAMHandler.TP_DT_PGN, packet1, source_address=0x42) is None
+        assert handler.get_session_info()[0]["received_packets"] == 1
+
+        packet2 = bytes([0x02]) + b"Message"
+        result = handler.process_frame(BAMHandler.TP_DT_PGN, packet2, source_address=0x42)
+        assert result == (0x1FEF2, b"First  Message")
+
+    def test_rts_cts_transfer_reassembly(self):
+        """Test passive reassembly of a connection-mode (RTS/CTS) transfer."""
+        handler = BAMHandler()
+        sender, receiver = 0x42, 0x80
+
+        # RTS: 10 bytes in 2 packets, up to 1 packet per CTS, PGN 0x1FEF2
+        rts = bytes([0x10, 0x0A, 0x00, 0x02, 0x01, 0xF2, 0xFE, 0x01])
+        handler.process_frame(BAMHandler.TP_CM_PGN, rts, sender, receiver)
+        assert handler.get_session_info()[0]["mode"] == "rts_cts"
+
+        # A broadcast TP.DT from the same sender belongs to no session
+        packet1 = bytes([0x01]) + b"Connect"
+        assert handler.process_frame(BAMHandler.TP_DT_PGN, packet1, sender) is None
+        assert handler.get_session_info()[0]["received_packets"] == 0
+
+        cts = bytes([0x11, 0x01, 0x01, 0xFF, 0xFF, 0xF2, 0xFE, 0x01])
+        handler.process_frame(BAMHandler.TP_CM_PGN, cts, receiver, sender)
+        assert handler.process_frame(BAMHandler.TP_DT_PGN, packet1, sender, receiver) is None
+
+        handler.process_frame(BAMHandler.TP_CM_PGN, cts, receiver, sender)
+        packet2 = bytes([0x02]) + b"ed\xff\xff\xff\xff\xff"
+        result = handler.process_frame(BAMHandler.TP_DT_PGN, packet2, sender, receiver)
+
+        assert result == (0x1FEF2, b"Connected\xff"[:10])
+        assert handler.get_active_session_count() == 0
+
+    def test_connection_abort_removes_session(self):
+        """Test that a TP.CM abort from the receiver ends the transfer."""
+        handler = BAMHandler()
+        rts = bytes([0x10, 0x0A, 0x00, 0x02, 0x01, 0xF2, 0xFE, 0x01])
+        handler.process_frame(BAMHandler.TP_CM_PGN, rts, 0x42, 0x80)
+
+        abort = bytes([0xFF, 0x01, 0xFF, 0xFF, 0xFF, 0xF2, 0xFE, 0x01])
+        handler.process_frame(BAMHandler.TP_CM_PGN, abort, 0x80, 0x42)
+
+        assert handler.get_active_session_count() == 0
+
+    def test_activity_extends_session_timeout(self, monkeypatch):
+        """Test that sessions expire on inactivity rather than age."""
+        now = [1000.0]
+        monkeypatch.setattr(bam_handler, "time", SimpleNamespace(monotonic=lambda: now[0]))
+        handler = BAMHandler(session_timeout=10.0)
+        control_data = bytes([0x20, 0x15, 0x00, 0x03, 0xFF, 0xF2, 0xFE, 0x01])
+        handler.process_frame(BAMHandler.TP_CM_PGN, control_data, source_address=0x42)
+
+        now[0] += 8.0
+        handler.process_frame(BAMHandler.TP_DT_PGN, bytes([0x01]) + b"Hello, ", 0x42)
+
+        # 12s after the announcement but only 4s idle: still open
+        now[0] += 4.0
+        handler.process_frame(BAMHandler.TP_DT_PGN, bytes([0x02]) + b"World! ", 0x42)
+        assert handler.get_active_session_count() == 1
+
+        now[0] += 11.0
+        handler.process_frame(BAMHandler.TP_CM_PGN, b"\x00" * 8, source_address=0x43)
+        assert handler.get_active_session_count() == 0
+
+    def test_capacity_evicts_least_recently_active_session(self):
+        """Test that the idlest session is evicted when at capacity."""
+        handler = BAMHandler(max_concurrent_sessions=2)
+        for source in (0x42, 0x43):
+            control = bytes([0x20, 0x0E, 0x00, 0x02, 0xFF, 0xF2, 0xFE, 0x01])
+            handler.process_frame(BAMHandler.TP_CM_PGN, control, source_address=source)
+
+        # Traffic on the older session makes 0x43 the least recently active
+        handler.process_frame(BAMHandler.TP_DT_PGN, bytes([0x01]) + b"First  ", 0x42)
+
+        control = bytes([0x20, 0x0E, 0x00, 0x02, 0xFF, 0xF2, 0xFE, 0x01])
+        handler.process_frame(BAMHandler.TP_CM_PGN, control, source_address=0x44)
+
+        sources = sorted(info["source_address"] for info in handler.get_session_info())
+        assert sources == ["42", "44"]
@@ -8,7 +8,7 @@ import uuid
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import JSON, DateTime, String, UniqueConstraint, func
+from sqlalchemy import JSON, BigInteger, DateTime, Integer, String, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -293,6 +293,38 @@ class EntityState(Base):
         )
 
 
+class EntityStateJournal(Base):
+    """
+    Append-only journal of entity state changes.
+
+    Each row holds only the fields that changed since the previously
+    persisted version of the entity. Rows are periodically compacted into
+    EntityState snapshots; startup restore replays any remaining rows on
+    top of the snapshots in id order.
+    """
+
+    __tablename__ = "entity_state_journal"
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+        comment="Journal sequence number",
+    )
+
+    entity_id: Mapped[str] = mapped_column(
+        String(255), nullable=False, index=True, comment="Entity whose state changed"
+    )
+
+    changes: Mapped[dict[str, Any]] = mapped_column(
+        JSON, nullable=False, comment="Changed state fields and their new values"
+    )
+
+    recorded_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, comment="When the change was persisted"
+    )
+
+
 class SystemSettings(Base):
     """
     System-level mutable configuration settings stored in database.
@@ -0,0 +1,199 @@
+"""
+Compact state history store for entities.
+
+Keeping a full EntityState model per update means up to ``max_history_length``
+Pydantic instances per entity, almost all of which repeat the same
+configuration fields. EntityHistory instead records, per update, only the
+timestamp (in a typed array) and the fields that changed since the previous
+entry. Full snapshots are kept every ``KEYFRAME_INTERVAL`` entries so any
+entry can be rebuilt by replaying at most that many deltas, and EntityState
+objects are only materialized when history is requested.
+"""
+
+import bisect
+from array import array
+from typing import Any
+
+# A full snapshot is stored for every Nth entry
+KEYFRAME_INTERVAL = 32
+
+# Shared delta for updates that changed nothing but the timestamp
+_NO_CHANGE: dict[str, Any] = {}
+
+
+class EntityHistory:
+    """
+    Time-ordered history of entity state snapshots stored as deltas.
+
+    Entries are addressed by a monotonically increasing sequence number.
+    Time range queries binary-search the timestamp column while it is in
+    non-decreasing order (the normal case for live updates) and fall back to
+    a scan if an out-of-order timestamp is being retained.
+    """
+
+    def __init__(self, fields: tuple[str, ...], max_length: int = 1000) -> None:
+        """
+        Initialize an empty history.
+
+        Args:
+            fields: State field names to record (excluding ``timestamp``)
+            max_length: Maximum number of entries to keep
+        """
+        if max_length < 1:
+            msg = f"max_length must be at least 1, got {max_length}"
+            raise ValueError(msg)
+
+        self.fields = fields
+        self.max_length = max_length
+        self._timestamps = array("d")
+        self._deltas: list[dict[str, Any]] = []
+        self._keyframes: dict[int, dict[str, Any]] = {}
+        self._start = 0  # Offset of the oldest live entry in the columns
+        self._first_seq = 0  # Sequence number of the oldest live entry
+        self._base: dict[str, Any] = {}  # Full state of the oldest live entry
+        self._last: dict[str, Any] = {}  # Full state of the newest entry
+        self._descents = 0  # Live adjacent pairs whose timestamps decrease
+
+    def __len__(self) -> int:
+        return len(self._timestamps) - self._start
+
+    def append(self, state: dict[str, Any], timestamp: float) -> None:
+        """
+        Record a new state snapshot.
+
+        Args:
+            state: Full state values; keys outside ``fields`` are ignored
+            timestamp: Snapshot timestamp
+        """
+        last = self._last
+        delta = {
+            name: state[name]
+            for name in self.fields
+            if name in state and (name not in last or last[name] != state[name])
+        }
+        if len(self) == 0:
+            self._base = {name: state.get(name) for name in self.fields}
+            self._last = dict(self._base)
+        elif delta:
+            last.update(delta)
+
+        seq = self._first_seq + len(self)
+        if len(self) and timestamp < self._timestamps[-1]:
+            self._descents += 1
+        self._timestamps.append(timestamp)
+        self._deltas.append(delta or _NO_CHANGE)
+        if seq % KEYFRAME_INTERVAL == 0:
+            self._keyframes[seq] = dict(self._last)
+
+        if len(self) > self.max_length:
+            self.pop_oldest()
+
+    def pop_oldest(self) -> None:
+        """Drop the oldest entry, folding the next entry's delta into the base state."""
+        if len(self) == 0:
+            return
+
+        self._keyframes.pop(self._first_seq, None)
+        if len(self) > 1 and self._timestamps[self._start + 1] < self._timestamps[self._start]:
+            self._descents -= 1
+        self._start += 1
+        self._first_seq += 1
+
+        if len(self) == 0:
+            self._base = {}
+            self._last = {}
+        else:
+            self._base.update(self._deltas[self._start])
+
+        # Compact the columns once the dead prefix dominates
+        if self._start >= self.max_length or len(self) == 0:
+            del self._timestamps[: self._start]
+            del self._deltas[: self._start]
+            self._start = 0
+
+    def prune_before(self, cutoff: float) -> None:
+        """Drop all entries with a timestamp older than the cutoff."""
+        while len(self) and self._timestamps[self._start] < cutoff:
+            self.pop_oldest()
+
+    def _state_at(self, position: int) -> dict[str, Any]:
+        """Rebuild the full state of the entry at a live position."""
+        seq = self._first_seq + position
+        keyframe_seq = seq - seq % KEYFRAME_INTERVAL
+        if keyframe_seq > self._first_seq and keyframe_seq in self._keyframes:
+            state = dict(self._keyframes[keyframe_seq])
+            replay_from = keyframe_seq - self._first_seq + 1
+        else:
+            state = dict(self._base)
+            replay_from = 1
+        deltas = self._deltas
+        for index in range(self._start + replay_from, self._start + position + 1):
+            delta = deltas[index]
+            if delta:
+                state.update(delta)
+        return state
+
+    def select(
+        self,
+        count: int | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        max_points: int | None = None,
+    ) -> list[tuple[float, dict[str, Any]]]:
+        """
+        Select history entries and rebuild their full state.
+
+        Args:
+            count: Keep only the newest ``count`` entries of the range
+            since: Inclusive lower timestamp bound
+            until: Inclusive upper timestamp bound
+            max_points: Downsample the range to at most this many evenly spaced
+                entries (the newest entry is always kept)
+
+        Returns:
+            List of (timestamp, state) tuples, oldest first
+        """
+        timestamps = self._timestamps
+        start = self._start
+        positions: range | list[int]
+        if self._descents:
+            positions = [
+                position
+                for position in range(len(self))
+                if (since is None or timestamps[start + position] >= since)
+                and (until is None or timestamps[start + position] <= until)
+            ]
+        else:
+            lo = start
+            hi = len(timestamps)
+            if since is not None:
+                lo = bisect.bisect_left(timestamps, since, lo, hi)
+            if until is not None:
+                hi = bisect.bisect_right(timestamps, until, lo, hi)
+            positions = range(lo - start, hi - start)
+
+        if count is not None:
+            positions = positions[-count:]
+        if not positions:
+            return []
+
+        if max_points is not None and 0 < max_points < len(positions):
+            step = (len(positions) - 1) / max(max_points - 1, 1)
+            picked = {positions[-1 - round(i * step)] for i in range(max_points)}
+            positions = sorted(picked)
+
+        results = []
+        state: dict[str, Any] | None = None
+        previous = -2
+        deltas = self._deltas
+        for position in positions:
+            if state is not None and position == previous + 1:
+                # Sequential positions only need the next delta applied
+                delta = deltas[start + position]
+                if delta:
+                    state = {**state, **delta}
+            else:
+                state = self._state_at(position)
+            results.append((timestamps[start + position], state))
+            previous = position
+        return results
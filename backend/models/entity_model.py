@@ -7,11 +7,13 @@ with proper typing and validation.
 """
 
 import time
-from collections import deque
+from collections.abc import Callable
 from typing import Any, TypedDict
 
 from pydantic import BaseModel, Field
 
+from backend.models.entity_history import EntityHistory
+
 
 class EntityConfig(TypedDict, total=False):
     """Configuration for an entity derived from the device mapping file."""
@@ -71,9 +73,13 @@ class Entity:
 
     This class provides a single source of truth for entity data, combining
     the static configuration (from device mapping) with dynamic runtime state.
-    It also maintains a history of state changes for analysis and debugging.
+    It also maintains a history of state changes for analysis and debugging,
+    stored compactly as per-update deltas (see EntityHistory).
     """
 
+    # EntityState fields tracked in history; timestamps are stored separately
+    HISTORY_FIELDS = tuple(name for name in EntityState.model_fields if name != "timestamp")
+
     def __init__(
         self,
         entity_id: str,
@@ -94,7 +100,7 @@ class Entity:
         self.config = config
         self.max_history_length = max_history_length
         self.history_duration = history_duration
-        self.history: deque[EntityState] = deque(maxlen=max_history_length)
+        self.history = EntityHistory(self.HISTORY_FIELDS, max_length=max_history_length)
 
         # Initialize with default state
         self.current_state = EntityState(
@@ -112,11 +118,14 @@ class Entity:
         )
 
         # Add initial state to history
-        self.history.append(self.current_state)
+        self.history.append(self.current_state.__dict__, self.current_state.timestamp)
 
         # Additional properties specific to entity types
         self.last_known_brightness: int | None = None
 
+        # Called after every state update (set by the EntityManager registry)
+        self.on_state_change: Callable[[], None] | None = None
+
     def update_state(self, new_state: dict[str, Any]) -> None:
         """
         Update the entity's current state and add to history.
@@ -131,8 +140,8 @@ class Entity:
         # Update current state
         self.current_state = updated_state
 
-        # Add to history
-        self.history.append(updated_state)
+        # Add to history (only changed fields are stored)
+        self.history.append(updated_state.__dict__, updated_state.timestamp)
 
         # Prune old history entries
         self._prune_history()
@@ -141,20 +150,23 @@ class Entity:
         if self.config.get("device_type") == "light" and "brightness" in new_state:
             self.last_known_brightness = new_state["brightness"]
 
+        if self.on_state_change is not None:
+            self.on_state_change()
+
     def _prune_history(self) -> None:
         """Remove history entries older than history_duration."""
-        current_time = time.time()
-        cutoff = current_time - self.history_duration
-
-        while self.history and self.history[0].timestamp < cutoff:
-            self.history.popleft()
+        self.history.prune_before(time.time() - self.history_duration)
 
     def get_state(self) -> EntityState:
         """Get the current state of the entity."""
         return self.current_state
 
     def get_history(
-        self, count: int | None = None, since: float | None = None
+        self,
+        count: int | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        max_points: int | None = None,
     ) -> list[EntityState]:
         """
         Get historical state data for the entity.
@@ -162,19 +174,18 @@ class Entity:
         Args:
             count: Maximum number of history entries to return
             since: Return only entries newer than this timestamp
+            until: Return only entries up to this timestamp
+            max_points: Downsample to at most this many evenly spaced entries
 
         Returns:
             List of historical entity states
         """
-        history_data = list(self.history)
-
-        if since is not None:
-            history_data = [state for state in history_data if state.timestamp >= since]
-
-        if count is not None:
-            history_data = history_data[-count:]
-
-        return history_data
+        return [
+            EntityState.model_construct(**state, timestamp=timestamp)
+            for timestamp, state in self.history.select(
+                count=count, since=since, until=until, max_points=max_points
+            )
+        ]
 
     def to_dict(self) -> dict[str, Any]:
         """
@@ -10,7 +10,17 @@ from datetime import datetime
 from enum import Enum
 from typing import Any
 
-from sqlalchemy import JSON, Boolean, DateTime, Float, Index, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.models.database import Base, TimestampMixin
@@ -26,6 +36,14 @@ class AggregationPeriod(str, Enum):
     MONTHLY = "monthly"
 
 
+class RollupResolution(str, Enum):
+    """Bucket sizes of the incremental delivery rollups."""
+
+    MINUTE = "minute"
+    HOUR = "hour"
+    DAY = "day"
+
+
 class MetricType(str, Enum):
     """Types of notification metrics."""
 
@@ -65,6 +83,7 @@ class ChannelMetrics:
     last_success: datetime | None
     last_failure: datetime | None
     error_breakdown: dict[str, int]
+    delivery_time_percentiles: dict[str, float] = field(default_factory=dict)
 
 
 @dataclass
@@ -238,6 +257,103 @@ class NotificationMetricAggregate(Base, TimestampMixin):
     )
 
 
+class NotificationDeliveryRollup(Base, TimestampMixin):
+    """
+    SQLAlchemy model for incremental delivery rollups.
+
+    One row per resolution, bucket, channel and notification type, updated
+    as delivery logs are flushed. Counts, delivery time sums and latency
+    sketches merge across buckets, so dashboard and report queries over any
+    range are answered from rollups instead of raw delivery logs.
+    """
+
+    __tablename__ = "notification_delivery_rollups"
+
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=True, comment="Primary key"
+    )
+
+    resolution: Mapped[str] = mapped_column(
+        String(10), nullable=False, comment="Bucket size (minute, hour, day)"
+    )
+
+    bucket_start: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, comment="Start of bucket (UTC)"
+    )
+
+    channel: Mapped[str] = mapped_column(
+        String(50), nullable=False, comment="Delivery channel"
+    )
+
+    notification_type: Mapped[str] = mapped_column(
+        String(50), nullable=False, comment="Type of notification"
+    )
+
+    delivery_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="Number of delivery attempts"
+    )
+
+    success_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="Number of delivered notifications"
+    )
+
+    failure_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="Number of failed deliveries"
+    )
+
+    retry_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="Sum of retry counts"
+    )
+
+    delivery_time_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="Attempts with a delivery time"
+    )
+
+    delivery_time_sum: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, comment="Sum of delivery times in milliseconds"
+    )
+
+    delivery_time_min: Mapped[float | None] = mapped_column(
+        Float, nullable=True, comment="Minimum delivery time in milliseconds"
+    )
+
+    delivery_time_max: Mapped[float | None] = mapped_column(
+        Float, nullable=True, comment="Maximum delivery time in milliseconds"
+    )
+
+    latency_sketch: Mapped[dict[str, Any] | None] = mapped_column(
+        JSON, nullable=True, comment="Mergeable delivery time histogram"
+    )
+
+    error_codes: Mapped[dict[str, int] | None] = mapped_column(
+        JSON, nullable=True, comment="Failure counts by error code"
+    )
+
+    error_messages: Mapped[dict[str, int] | None] = mapped_column(
+        JSON, nullable=True, comment="Failure counts by error message"
+    )
+
+    last_success_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, comment="Most recent delivery in bucket"
+    )
+
+    last_failure_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, comment="Most recent failure in bucket"
+    )
+
+    # Define table constraints and indexes
+    __table_args__ = (
+        UniqueConstraint(
+            "resolution",
+            "bucket_start",
+            "channel",
+            "notification_type",
+            name="uq_delivery_rollups_bucket",
+        ),
+        Index("idx_delivery_rollups_period", "resolution", "bucket_start"),
+    )
+
+
 class NotificationErrorAnalysis(Base, TimestampMixin):
     """
     SQLAlchemy model for notification error analysis.
@@ -65,6 +65,9 @@ class AnalyticsDashboardService:
 
         self._running = True
 
+        # Seed metric baselines before recording starts
+        await self.storage.initialize()
+
         # Start background analysis tasks
         self._insight_task = asyncio.create_task(self._insight_generation_loop())
         self._pattern_task = asyncio.create_task(self._pattern_analysis_loop())
@@ -85,8 +88,8 @@ class AnalyticsDashboardService:
             with contextlib.suppress(asyncio.CancelledError):
                 await self._pattern_task
 
-        # Clean up storage resources
-        self.storage.close()
+        # Write buffered metrics and clean up storage resources
+        await self.storage.close()
 
         logger.info("Analytics dashboard service stopped")
 
@@ -3,13 +3,22 @@ Analytics Storage Service
 
 Provides mandatory SQLite persistence for analytics data using the database manager.
 Simplified from dual-mode architecture to use only database storage.
+
+Metric samples are written behind: they are kept in memory, with rolling
+per-metric baselines and a window of recent points, and written to SQLite in
+bulk inserts once ``sqlite_batch_size`` samples are buffered or the oldest has
+waited ``metric_flush_interval_seconds``. Trends within the in-memory window
+are served without touching the database.
 """
 
+import asyncio
+import contextlib
 import logging
 import time
+from collections import deque
 from typing import Any
 
-from sqlalchemy import delete, desc, select
+from sqlalchemy import delete, desc, func, select
 from sqlalchemy.dialects.sqlite import insert
 
 from backend.core.services import get_core_services
@@ -25,13 +34,20 @@ from backend.models.analytics import (
 
 logger = logging.getLogger(__name__)
 
+# Number of recent values a metric's baseline is averaged over
+BASELINE_WINDOW = 10
+
+# Buffered samples kept while SQLite is unavailable, in batches
+MAX_PENDING_BATCHES = 10
+
 
 class AnalyticsStorageService:
     """
     Analytics storage service with mandatory SQLite persistence.
 
     Uses the database manager for all analytics data operations.
-    No in-memory fallback - persistence is mandatory.
+    No in-memory fallback - persistence is mandatory; metric samples are
+    only buffered in memory until the next bulk write.
     """
 
     def __init__(self) -> None:
@@ -40,14 +56,66 @@ class AnalyticsStorageService:
         core_services = get_core_services()
         self._db_manager = core_services.database_manager
 
+        # Rolling baselines, seeded from the database on first use
+        self._baselines: dict[str, deque[float]] = {}
+        self._baselines_loaded = False
+
+        # Every point recorded since startup, within the memory retention window
+        self._started_at = time.time()
+        self._memory_retention = self.settings.memory_retention_hours * 3600
+        self._recent_points: dict[str, deque[TrendPoint]] = {}
+
+        # Write-behind buffer of metric rows
+        self._pending_metrics: list[dict[str, Any]] = []
+        self._flush_lock = asyncio.Lock()
+        self._flush_timer: asyncio.Task | None = None
+        self._flush_size = self.settings.sqlite_batch_size
+        self._flush_interval = self.settings.metric_flush_interval_seconds
+
         logger.info("Analytics storage service initialized with mandatory SQLite persistence")
 
+    async def initialize(self) -> None:
+        """Seed metric baselines from the most recent stored values."""
+        if self._baselines_loaded:
+            return
+        self._baselines_loaded = True
+
+        try:
+            ranked = select(
+                AnalyticsMetric.metric_name,
+                AnalyticsMetric.value,
+                AnalyticsMetric.timestamp,
+                func.row_number()
+                .over(
+                    partition_by=AnalyticsMetric.metric_name,
+                    order_by=desc(AnalyticsMetric.timestamp),
+                )
+                .label("rank"),
+            ).subquery()
+
+            async with self._db_manager.get_session() as session:
+                result = await session.execute(
+                    select(ranked.c.metric_name, ranked.c.value)
+                    .where(ranked.c.rank <= BASELINE_WINDOW)
+                    .order_by(ranked.c.metric_name, ranked.c.timestamp)
+                )
+
+                for metric_name, value in result.fetchall():
+                    self._baseline(metric_name).append(value)
+
+            logger.debug("Seeded baselines for %d metrics", len(self._baselines))
+
+        except Exception as e:
+            logger.warning("Error seeding metric baselines: %s", e)
+
     async def record_metric(
         self, metric_name: str, value: float, metadata: dict[str, Any] | None = None
     ) -> bool:
         """
         Record metric with mandatory SQLite persistence.
 
+        The sample is buffered and written with the next bulk insert.
+
         Args:
             metric_name: Name of the metric
             value: Metric value
@@ -57,8 +125,12 @@ class AnalyticsStorageService:
             True if successful, False otherwise
         """
         try:
+            if not self._baselines_loaded:
+                await self.initialize()
+
             # Calculate baseline deviation if we have history
-            baseline_deviation = await self._calculate_baseline_deviation(metric_name, value)
+            baseline_deviation = self._calculate_baseline_deviation(metric_name, value)
+            self._baseline(metric_name).append(value)
 
             # Create metric record
             timestamp = time.time()
@@ -68,24 +140,70 @@ class AnalyticsStorageService:
                 baseline_deviation=baseline_deviation,
                 anomaly_score=0.0,  # Will be calculated by analytics engine
             )
+            self._remember_point(metric_name, trend_point)
+
+            self._pending_metrics.append(
+                {
+                    "metric_name": metric_name,
+                    "value": value,
+                    "baseline_deviation": baseline_deviation,
+                    "anomaly_score": trend_point.anomaly_score,
+                    "metric_metadata": metadata,
+                    "timestamp": timestamp,
+                }
+            )
 
-            metric_record = AnalyticsMetric.from_trend_point(metric_name, trend_point, metadata)
-
-            # Store in database
-            async with self._db_manager.get_session() as session:
-                session.add(metric_record)
-                await session.commit()
+            if len(self._pending_metrics) >= self._flush_size:
+                await self.flush_metrics()
+            elif self._flush_timer is None or self._flush_timer.done():
+                self._flush_timer = asyncio.create_task(self._flush_timeout_handler())
 
-            logger.debug("Recorded metric in database: %s=%s", metric_name, value)
+            logger.debug("Recorded metric: %s=%s", metric_name, value)
             return True
 
         except Exception as e:
             logger.exception("Error recording metric: %s", e)
             return False
 
+    async def flush_metrics(self) -> int:
+        """
+        Write buffered metric samples to SQLite in one bulk insert.
+
+        Returns:
+            Number of samples written
+        """
+        async with self._flush_lock:
+            if not self._pending_metrics:
+                return 0
+
+            batch, self._pending_metrics = self._pending_metrics, []
+            try:
+                async with self._db_manager.get_session() as session:
+                    await session.execute(insert(AnalyticsMetric), batch)
+                    await session.commit()
+
+            except Exception as e:
+                logger.exception("Error writing metric batch: %s", e)
+                # Keep the batch for the next flush, dropping the oldest
+                # samples if SQLite stays unavailable
+                self._pending_metrics[:0] = batch
+                max_pending = self._flush_size * MAX_PENDING_BATCHES
+                if len(self._pending_metrics) > max_pending:
+                    dropped = len(self._pending_metrics) - max_pending
+                    del self._pending_metrics[:dropped]
+                    logger.warning("Dropped %d unwritten metric samples", dropped)
+                return 0
+
+            logger.debug("Wrote batch of %d metric samples", len(batch))
+            return len(batch)
+
     async def get_metrics_trend(self, metric_name: str, hours: int = 24) -> list[TrendPoint]:
         """
-        Get metric trend data from SQLite database.
+        Get metric trend data, from memory where possible.
+
+        Points recorded since startup and within the memory retention window
+        are held in memory; only the older part of the range is read from
+        the SQLite database.
 
         Args:
             metric_name: Name of the metric
@@ -95,20 +213,33 @@ class AnalyticsStorageService:
             List of TrendPoint objects sorted by timestamp
         """
         try:
-            cutoff_time = time.time() - (hours * 3600)
-
-            async with self._db_manager.get_session() as session:
-                result = await session.execute(
-                    select(AnalyticsMetric)
-                    .where(
-                        AnalyticsMetric.metric_name == metric_name,
-                        AnalyticsMetric.timestamp >= cutoff_time,
+            now = time.time()
+            cutoff_time = now - (hours * 3600)
+            memory_since = max(self._started_at, now - self._memory_retention)
+
+            points: list[TrendPoint] = []
+            if cutoff_time < memory_since:
+                async with self._db_manager.get_session() as session:
+                    result = await session.execute(
+                        select(AnalyticsMetric)
+                        .where(
+                            AnalyticsMetric.metric_name == metric_name,
+                            AnalyticsMetric.timestamp >= cutoff_time,
+                            AnalyticsMetric.timestamp < memory_since,
+                        )
+                        .order_by(AnalyticsMetric.timestamp.asc())
                     )
-                    .order_by(AnalyticsMetric.timestamp.asc())
-                )
 
-                metrics = result.scalars().all()
-                return [metric.to_trend_point() for metric in metrics]
+                    metrics = result.scalars().all()
+                    points = [metric.to_trend_point() for metric in metrics]
+
+            window_start = max(cutoff_time, memory_since)
+            points.extend(
+                point
+                for point in self._recent_points.get(metric_name, ())
+                if point.timestamp >= window_start
+            )
+            return points
 
         except Exception as e:
             logger.exception("Error getting metrics trend: %s", e)
@@ -346,6 +477,10 @@ class AnalyticsStorageService:
                     "storage_type": "mandatory_sqlite",
                     "metric_types": metric_types,
                     "total_metric_points": total_metric_points,
+                    "buffered_metric_points": len(self._pending_metrics),
+                    "memory_metric_points": sum(
+                        len(points) for points in self._recent_points.values()
+                    ),
                     "insights_stored": insights_count,
                     "patterns_stored": patterns_count,
                     "retention_days": self.settings.persistence_retention_days,
@@ -359,15 +494,33 @@ class AnalyticsStorageService:
                 "error": str(e),
             }
 
-    def close(self) -> None:
-        """Clean up resources when service is shut down."""
-        # No specific cleanup needed for SQLite storage
+    async def close(self) -> None:
+        """Write any buffered metric samples when the service is shut down."""
+        if self._flush_timer and not self._flush_timer.done():
+            self._flush_timer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_timer
+
+        written = await self.flush_metrics()
+        if self._pending_metrics:
+            logger.warning(
+                "Analytics storage closed with %d unwritten metric samples",
+                len(self._pending_metrics),
+            )
+
         # Database connections are managed by the database manager
-        logger.debug("Analytics storage service closed")
+        logger.debug("Analytics storage service closed (%d buffered samples written)", written)
 
-    async def _calculate_baseline_deviation(self, metric_name: str, current_value: float) -> float:
+    def _baseline(self, metric_name: str) -> deque[float]:
+        """Return the rolling baseline values of a metric."""
+        baseline = self._baselines.get(metric_name)
+        if baseline is None:
+            baseline = self._baselines[metric_name] = deque(maxlen=BASELINE_WINDOW)
+        return baseline
+
+    def _calculate_baseline_deviation(self, metric_name: str, current_value: float) -> float:
         """
-        Calculate baseline deviation from recent historical data.
+        Calculate baseline deviation from the metric's recent values.
 
         Args:
             metric_name: Name of the metric
@@ -376,26 +529,30 @@ class AnalyticsStorageService:
         Returns:
             Percentage deviation from baseline
         """
-        try:
-            # Get last 10 data points for baseline calculation
-            async with self._db_manager.get_session() as session:
-                result = await session.execute(
-                    select(AnalyticsMetric.value)
-                    .where(AnalyticsMetric.metric_name == metric_name)
-                    .order_by(desc(AnalyticsMetric.timestamp))
-                    .limit(10)
-                )
+        recent_values = self._baselines.get(metric_name)
+        if not recent_values:
+            return 0.0
 
-                recent_values = [row[0] for row in result.fetchall()]
+        baseline = sum(recent_values) / len(recent_values)
+        if baseline > 0:
+            return ((current_value - baseline) / baseline) * 100
+        return 0.0
 
-                if not recent_values:
-                    return 0.0
+    def _remember_point(self, metric_name: str, point: TrendPoint) -> None:
+        """Add a point to the metric's in-memory window, expiring old points."""
+        points = self._recent_points.get(metric_name)
+        if points is None:
+            points = self._recent_points[metric_name] = deque()
+        points.append(point)
 
-                baseline = sum(recent_values) / len(recent_values)
-                if baseline > 0:
-                    return ((current_value - baseline) / baseline) * 100
-                return 0.0
+        expires_before = point.timestamp - self._memory_retention
+        while points[0].timestamp < expires_before:
+            points.popleft()
 
-        except Exception as e:
-            logger.warning("Error calculating baseline deviation: %s", e)
-            return 0.0
+    async def _flush_timeout_handler(self) -> None:
+        """Flush buffered metric samples once the flush interval has passed."""
+        try:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush_metrics()
+        except asyncio.CancelledError:
+            pass
@@ -17,6 +17,7 @@ from typing import Any
 import can
 
 from backend.integrations.can.manager import buses, can_tx_queue
+from backend.integrations.can.tx_scheduler import TxPriority
 
 logger = logging.getLogger(__name__)
 
@@ -98,7 +99,11 @@ class CANService:
         return interface_details
 
     async def send_raw_message(
-        self, arbitration_id: int, data: bytes, interface: str
+        self,
+        arbitration_id: int,
+        data: bytes,
+        interface: str,
+        priority: TxPriority = TxPriority.NORMAL,
     ) -> dict[str, Any]:
         """
         Send a raw CAN message to the specified interface.
@@ -107,6 +112,8 @@ class CANService:
             arbitration_id: CAN arbitration ID
             data: Raw message data
             interface: Target CAN interface name
+            priority: Transmit priority; EMERGENCY frames are sent ahead of
+                everything already queued on the interface
 
         Returns:
             dict: Dictionary with send status and details.
@@ -141,7 +148,7 @@ class CANService:
 
         try:
             # Queue the message for transmission
-            await can_tx_queue.put((msg, interface))
+            await can_tx_queue.put((msg, interface, priority))
 
             logger.info(
                 f"Raw CAN message queued: ID=0x{arbitration_id:08X}, "
@@ -154,6 +161,7 @@ class CANService:
                 "arbitration_id_hex": f"0x{arbitration_id:08X}",
                 "data": data.hex().upper(),
                 "interface": interface,
+                "priority": TxPriority(priority).name.lower(),
                 "queue_size": can_tx_queue.qsize(),
             }
 
@@ -181,6 +189,7 @@ class CANService:
         stats = {
             "interfaces": {},
             "queue": await self.get_queue_status(),
+            "transmit": can_tx_queue.get_stats(),
             "summary": {
                 "total_interfaces": len(buses),
                 "active_interfaces": len([b for b in buses.values() if b]),
@@ -224,21 +233,7 @@ class CANService:
         try:
             if not self.app_state:
                 return 0.0
-
-            # Get recent CAN sniffer entries from app state
-            import time
-
-            current_time = time.time()
-            recent_messages = [
-                entry
-                for entry in self.app_state.can_command_sniffer_log
-                if current_time - entry.get("timestamp", 0) <= 10.0  # Last 10 seconds
-            ]
-
-            # Calculate rate as messages per second
-            if len(recent_messages) > 0:
-                return len(recent_messages) / 10.0
-            return 0.0
+            return self.app_state.can_command_sniffer_log.message_rate(10.0)
 
         except Exception as e:
             logger.warning(f"Failed to calculate message rate: {e}")
@@ -254,7 +249,7 @@ class CANService:
         try:
             if not self.app_state:
                 return 0
-            return len(self.app_state.can_command_sniffer_log)
+            return self.app_state.can_command_sniffer_log.total_count
         except Exception as e:
             logger.warning(f"Failed to get total message count: {e}")
             return 0
@@ -301,7 +296,11 @@ class CANService:
         logger.info("CANService shutdown complete")
 
     async def send_message(
-        self, arbitration_id: int, data: bytes, interface: str
+        self,
+        arbitration_id: int,
+        data: bytes,
+        interface: str,
+        priority: TxPriority = TxPriority.NORMAL,
     ) -> dict[str, Any]:
         """
         Send a CAN message (alias for send_raw_message for compatibility).
@@ -310,11 +309,12 @@ class CANService:
             arbitration_id: CAN arbitration ID
             data: Raw message data
             interface: Target CAN interface name
+            priority: Transmit priority
 
         Returns:
             dict: Dictionary with send status and details.
         """
-        return await self.send_raw_message(arbitration_id, data, interface)
+        return await self.send_raw_message(arbitration_id, data, interface, priority)
 
     async def get_recent_messages(self, limit: int = 100) -> list[dict[str, Any]]:
         """
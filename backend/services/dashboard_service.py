@@ -15,6 +15,7 @@ from uuid import uuid4
 
 from backend.core.config import get_features_settings
 from backend.core.entity_manager import EntityManager
+from backend.integrations.can.tx_scheduler import TxPriority
 from backend.models.dashboard import (
     ActiveAlert,
     ActivityEntry,
@@ -403,7 +404,9 @@ class DashboardService:
                     command=request.command, state=state, brightness=brightness
                 )
 
-                response = await self.entity_service.control_entity(entity_id, control_command)
+                response = await self.entity_service.control_entity(
+                    entity_id, control_command, priority=TxPriority.BULK
+                )
 
                 if response.status == "success":
                     successful += 1
@@ -20,6 +20,7 @@ import can
 
 from backend.core.config import get_settings
 from backend.integrations.can.manager import can_tx_queue
+from backend.integrations.can.tx_scheduler import TxPriority
 from backend.services.can_service import CANService
 
 logger = logging.getLogger(__name__)
@@ -1300,8 +1301,9 @@ class DeviceDiscoveryService:
             # Create CAN message
             message = can.Message(arbitration_id=can_id, data=data, is_extended_id=True)
 
-            # Send via CAN queue
-            await can_tx_queue.put(message)
+            # Discovery polls are low priority and not repeated like commands
+            for interface in get_settings().can.all_interfaces:
+                can_tx_queue.submit(message, interface, priority=TxPriority.BULK, repeat=False)
 
             logger.debug(
                 f"Sent PGN request: PGN={pgn:04X}, Dest={destination:02X}, "
@@ -18,6 +18,7 @@ from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
 from backend.core.entity_manager import EntityManager
+from backend.integrations.can.tx_scheduler import TxPriority
 from backend.models.entity import ControlCommand
 from backend.services.auth_manager import AuthManager
 from backend.services.config_service import ConfigService
@@ -294,13 +295,15 @@ class EntityDomainService:
         self,
         entity_id: str,
         command: SafetyControlCommandV2,
-        user_context: dict[str, Any] | None = None
+        user_context: dict[str, Any] | None = None,
+        priority: TxPriority = TxPriority.HIGH,
     ) -> SafetyOperationResultV2:
         """
         Control a single entity with safety-critical validation and acknowledgment.
 
         This method implements the command/acknowledgment pattern essential
-        for vehicle control systems.
+        for vehicle control systems. ``priority`` is the transmit priority of
+        the resulting CAN command.
         """
         operation_id = str(uuid.uuid4())
         start_time = time.time()
@@ -342,7 +345,7 @@ class EntityDomainService:
             )
 
             # Step 4: Execute command via existing entity service
-            result = await self.entities.control_entity(entity_id, legacy_command)
+            result = await self.entities.control_entity(entity_id, legacy_command, priority)
 
             # Step 5: Wait for acknowledgment from physical system
             acknowledged, ack_time = await self._wait_for_acknowledgment(
@@ -442,9 +445,17 @@ class EntityDomainService:
 
         logger.info(f"Pi bulk operation: {len(request.entity_ids)} entities, concurrency: {pi_safe_concurrency}")
 
+        # Emergency-stop bulk commands jump the transmit queue; other bulk
+        # operations yield to interactive control
+        priority = (
+            TxPriority.EMERGENCY if request.safety_mode == "emergency_stop" else TxPriority.BULK
+        )
+
         async def control_single_entity_safe(entity_id: str) -> SafetyOperationResultV2:
             async with semaphore:
-                return await self.control_entity_safe(entity_id, request.command, user_context)
+                return await self.control_entity_safe(
+                    entity_id, request.command, user_context, priority
+                )
 
         # Execute all operations
         operation_tasks = [control_single_entity_safe(entity_id) for entity_id in request.entity_ids]
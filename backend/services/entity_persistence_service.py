@@ -3,15 +3,21 @@ Entity Persistence Service
 
 Manages the persistence of entity states to the database using an event-driven
 architecture with debounced writes and background processing.
+
+Only the fields that changed since an entity was last persisted are written,
+as rows of an append-only journal. The journal is periodically compacted into
+the EntityState snapshot table, and startup restore replays it on top of the
+snapshots.
 """
 
 import asyncio
 import logging
 import random
+import time
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, insert, select
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -22,9 +28,13 @@ if TYPE_CHECKING:
 import contextlib
 
 from backend.models.database import EntityState as EntityStateModel
+from backend.models.database import EntityStateJournal
 
 logger = logging.getLogger(__name__)
 
+# Runtime fields restored on startup; the rest come from entity configuration
+RESTORED_FIELDS = ("value", "raw", "state", "timestamp")
+
 
 class EntityPersistenceService:
     """
@@ -33,6 +43,20 @@ class EntityPersistenceService:
     Uses an event-driven architecture to decouple entity state management
     from persistence concerns. Implements debounced writes and batch
     processing for optimal performance.
+
+    State changes mark entities in a coalescing dirty set, so a hot entity
+    occupies one slot however often it changes. A per-entity generation
+    counter detects changes made while a write is in flight; such entities
+    stay dirty. The worker flushes once no entity has changed for
+    ``debounce_delay``, but never leaves an entity dirty for longer than
+    ``max_staleness`` (barring write failures, after which dirty entities are
+    kept and retried). ``flush()`` persists everything on demand.
+
+    Each batch appends one journal row per entity holding only its changed
+    fields; entities whose state is unchanged apart from the timestamp are
+    skipped. The worker compacts the journal into snapshots once
+    ``compaction_threshold`` rows have accumulated or ``compaction_interval``
+    has passed, and again on shutdown.
     """
 
     def __init__(
@@ -42,6 +66,9 @@ class EntityPersistenceService:
         debounce_delay: float = 0.5,
         max_batch_size: int = 100,
         max_retries: int = 3,
+        max_staleness: float = 2.0,
+        compaction_interval: float = 300.0,
+        compaction_threshold: int = 1000,
     ):
         """
         Initialize the Entity Persistence Service.
@@ -49,18 +76,38 @@ class EntityPersistenceService:
         Args:
             entity_manager: The entity manager to observe for state changes
             database_manager: Database manager for persistence operations
-            debounce_delay: Delay in seconds before writing batched changes
+            debounce_delay: Quiet period in seconds before writing batched changes
             max_batch_size: Maximum number of entities to persist in one batch
             max_retries: Maximum number of retry attempts for failed writes
+            max_staleness: Maximum seconds an entity stays dirty before it is written
+            compaction_interval: Maximum seconds between journal compactions
+            compaction_threshold: Journal rows that trigger an early compaction
         """
         self._entity_manager = entity_manager
         self._db_manager = database_manager
         self._debounce_delay = debounce_delay
         self._max_batch_size = max_batch_size
         self._max_retries = max_retries
-
-        # Queue for dirty entity IDs
-        self._dirty_entity_ids: asyncio.Queue[str | None] = asyncio.Queue()
+        self._max_staleness = max_staleness
+        self._failure_backoff = 5.0  # seconds before retrying a failed flush
+        self._compaction_interval = compaction_interval
+        self._compaction_threshold = compaction_threshold
+
+        # Last persisted state document per entity, and entities whose
+        # journal rows are not yet compacted into snapshots
+        self._persisted_states: dict[str, dict[str, Any]] = {}
+        self._uncompacted_ids: set[str] = set()
+        self._journal_rows = 0
+        self._last_compaction = 0.0
+
+        # Coalescing dirty set: entity ID -> monotonic time it became dirty
+        self._dirty: dict[str, float] = {}
+        # Per-entity change generation, compared after each write
+        self._generations: dict[str, int] = {}
+        self._last_change = 0.0
+        self._retry_after = 0.0
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
 
         # Background worker task
         self._worker_task: asyncio.Task | None = None
@@ -71,7 +118,12 @@ class EntityPersistenceService:
             "total_writes": 0,
             "failed_writes": 0,
             "total_entities_persisted": 0,
+            "unchanged_entities_skipped": 0,
+            "coalesced_updates": 0,
+            "compactions": 0,
             "last_write_time": None,
+            "last_flush_latency": None,
+            "max_flush_latency": 0.0,
         }
 
     async def start(self) -> None:
@@ -102,7 +154,7 @@ class EntityPersistenceService:
         self._entity_manager.unregister_state_change_listener(self._on_entity_state_changed)
 
         # Signal the worker to finish
-        await self._dirty_entity_ids.put(None)  # Sentinel value
+        self._wakeup.set()
 
         # Wait for worker to complete
         if self._worker_task:
@@ -114,6 +166,13 @@ class EntityPersistenceService:
                 with contextlib.suppress(asyncio.CancelledError):
                     await self._worker_task
 
+        # Persist remaining changes and fold the journal into snapshots
+        if self._dirty:
+            logger.info(f"Persisting {len(self._dirty)} dirty entities before shutdown")
+            await self.flush()
+        if self._uncompacted_ids:
+            await self._compact_journal()
+
         logger.info("EntityPersistenceService stopped")
 
     def _on_entity_state_changed(self, entity_id: str) -> None:
@@ -126,140 +185,186 @@ class EntityPersistenceService:
         Args:
             entity_id: ID of the entity whose state changed
         """
-        if not self._is_stopping:
-            try:
-                self._dirty_entity_ids.put_nowait(entity_id)
-            except asyncio.QueueFull:
-                logger.warning(f"Persistence queue full, dropping update for entity {entity_id}")
+        if self._is_stopping:
+            return
+
+        now = time.monotonic()
+        self._generations[entity_id] = self._generations.get(entity_id, 0) + 1
+        if entity_id in self._dirty:
+            self._stats["coalesced_updates"] += 1
+        else:
+            self._dirty[entity_id] = now
+        self._last_change = now
+        self._wakeup.set()
+
+    async def flush(self) -> bool:
+        """
+        Persist every entity that is dirty when the call starts.
+
+        Used by the shutdown path and on-demand syncs; safe to call while
+        the background worker is running.
+
+        Returns:
+            True if all dirty entities were written, False if a write failed
+            and the remaining entities are still dirty
+        """
+        async with self._flush_lock:
+            started = time.monotonic()
+            pending = sorted(self._dirty, key=self._dirty.__getitem__)
+
+            for start in range(0, len(pending), self._max_batch_size):
+                if not await self._persist_batch(pending[start : start + self._max_batch_size]):
+                    return False
+
+            if pending:
+                latency = time.monotonic() - started
+                self._stats["last_flush_latency"] = latency
+                self._stats["max_flush_latency"] = max(self._stats["max_flush_latency"], latency)
+            return True
 
     async def _load_entity_states(self) -> None:
-        """Load entity states from the database on startup."""
+        """Load entity states from snapshots and the journal on startup."""
         logger.info("Loading entity states from database...")
 
         try:
             async with self._db_manager.get_session() as session:
-                # Load all entity states
                 result = await session.execute(select(EntityStateModel))
-                entity_states = result.scalars().all()
-
-                loaded_count = 0
-                for db_state in entity_states:
-                    # Restore entity state in the entity manager
-                    entity = self._entity_manager.get_entity(db_state.entity_id)
-                    if entity:
-                        # Convert database model to state dict
-                        state_dict = {
-                            "entity_id": db_state.entity_id,
-                            "state": db_state.state,
-                            "timestamp": db_state.updated_at.timestamp(),
-                        }
-                        # Update entity with persisted state
-                        entity.update_state(state_dict)
-                        loaded_count += 1
-                    else:
-                        logger.warning(
-                            f"Entity {db_state.entity_id} found in database but not in entity manager"
-                        )
-
-                logger.info(f"Loaded {loaded_count} entity states from database")
+                for db_state in result.scalars().all():
+                    state = dict(db_state.state)
+                    state.setdefault("timestamp", db_state.updated_at.timestamp())
+                    self._persisted_states[db_state.entity_id] = state
+
+                # Replay changes journaled since the last compaction
+                result = await session.execute(
+                    select(EntityStateJournal.entity_id, EntityStateJournal.changes).order_by(
+                        EntityStateJournal.id
+                    )
+                )
+                for entity_id, changes in result.all():
+                    self._persisted_states.setdefault(entity_id, {}).update(changes)
+                    self._uncompacted_ids.add(entity_id)
+                    self._journal_rows += 1
 
         except Exception as e:
             logger.error(f"Failed to load entity states from database: {e}")
-            # Don't fail startup - entities will start with default states
+            # Don't fail startup - entities will start with default states,
+            # and the first write of each entity journals its full state
+            self._persisted_states.clear()
+            self._uncompacted_ids.clear()
+            self._journal_rows = 0
+            return
+
+        loaded_count = 0
+        for entity_id, state in self._persisted_states.items():
+            # Restore entity state in the entity manager
+            entity = self._entity_manager.get_entity(entity_id)
+            if entity:
+                entity.update_state({key: state[key] for key in RESTORED_FIELDS if key in state})
+                loaded_count += 1
+            else:
+                logger.warning(f"Entity {entity_id} found in database but not in entity manager")
+
+        logger.info(
+            f"Loaded {loaded_count} entity states from database "
+            f"({self._journal_rows} journal entries replayed)"
+        )
+        self._last_compaction = time.monotonic()
 
     async def _persistence_worker(self) -> None:
         """
-        Background worker that processes the queue of dirty entities.
+        Background worker that flushes the dirty set.
 
-        Implements debouncing and batching for efficient database writes.
+        Implements debouncing and a staleness bound for efficient database
+        writes; the journal is compacted after flushes when due.
         """
         logger.debug("Persistence worker started")
 
         while not self._is_stopping:
             try:
-                # Wait for the first dirty entity
-                first_id = await self._dirty_entity_ids.get()
-                if first_id is None:  # Sentinel for shutdown
-                    break
-
-                # Start collecting a batch
-                batch = {first_id}
-
-                # Debounce: collect more items that arrive within the delay window
-                deadline = asyncio.get_event_loop().time() + self._debounce_delay
-
-                while len(batch) < self._max_batch_size:
-                    remaining_time = deadline - asyncio.get_event_loop().time()
-                    if remaining_time <= 0:
-                        break  # Debounce window expired
-
-                    try:
-                        # Try to get another item within the remaining time
-                        item = await asyncio.wait_for(
-                            self._dirty_entity_ids.get(), timeout=remaining_time
-                        )
-                        if item is None:  # Shutdown sentinel
-                            self._is_stopping = True
-                            break
-                        batch.add(item)
-                    except TimeoutError:
-                        # No more items arrived within the window
-                        break
-
-                # Persist the batch
-                if batch:
-                    await self._persist_batch(list(batch))
+                self._wakeup.clear()
+                if not self._dirty:
+                    await self._wakeup.wait()
+                    continue
+
+                # Re-evaluate on every change until the flush is due
+                delay = self._flush_delay()
+                if delay > 0:
+                    with contextlib.suppress(TimeoutError):
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                    continue
+
+                if not await self.flush():
+                    self._retry_after = time.monotonic() + self._failure_backoff
+
+                if self._compaction_due():
+                    await self._compact_journal()
 
             except Exception as e:
                 logger.error(f"Unhandled exception in persistence worker: {e}", exc_info=True)
                 # Prevent fast-spinning crash loop
                 await asyncio.sleep(5)
 
-        # Graceful shutdown: drain any remaining items
-        logger.info("Draining persistence queue before shutdown...")
-        final_batch = set()
-
-        while not self._dirty_entity_ids.empty():
-            try:
-                entity_id = self._dirty_entity_ids.get_nowait()
-                if entity_id is not None:
-                    final_batch.add(entity_id)
-            except asyncio.QueueEmpty:
-                break
-
-        if final_batch:
-            logger.info(f"Persisting final batch of {len(final_batch)} entities")
-            await self._persist_batch(list(final_batch))
-
         logger.debug("Persistence worker stopped")
 
-    async def _persist_batch(self, entity_ids: list[str]) -> None:
+    def _flush_delay(self) -> float:
+        """Seconds until the dirty set should be flushed."""
+        now = time.monotonic()
+        if now < self._retry_after:
+            return self._retry_after - now
+        if len(self._dirty) >= self._max_batch_size:
+            return 0.0
+
+        oldest = min(self._dirty.values())
+        return min(self._last_change + self._debounce_delay, oldest + self._max_staleness) - now
+
+    def _mark_clean(self, entity_id: str, generation: int, written_at: float) -> None:
+        """Clear an entity written at ``generation`` unless it changed since."""
+        if self._generations.get(entity_id, 0) == generation:
+            self._dirty.pop(entity_id, None)
+        elif entity_id in self._dirty:
+            # Changed while the write was in flight; dirty since the snapshot
+            self._dirty[entity_id] = written_at
+
+    async def _persist_batch(self, entity_ids: list[str]) -> bool:
         """
         Persist a batch of entities to the database with retry logic.
 
         Args:
             entity_ids: List of entity IDs to persist
+
+        Returns:
+            True if the batch was written; on failure the entities stay dirty
         """
         logger.debug(f"Persisting batch of {len(entity_ids)} entities")
 
-        # Collect entity states
-        states_to_persist = []
+        # Snapshot generations and collect the fields changed since each
+        # entity was last persisted
+        snapshot_time = time.monotonic()
+        recorded_at = datetime.now(UTC)
+        generations = {
+            entity_id: self._generations.get(entity_id, 0) for entity_id in entity_ids
+        }
+        journal_rows = []
+        new_states = {}
         for entity_id in entity_ids:
             entity = self._entity_manager.get_entity(entity_id)
             if entity:
-                state_dict = entity.to_dict()
-                states_to_persist.append(
-                    {
-                        "entity_id": entity_id,
-                        "state": state_dict,
-                        "updated_at": datetime.now(UTC),
-                    }
-                )
+                state = entity.to_dict()
+                changes = self._changed_fields(self._persisted_states.get(entity_id), state)
+                if changes:
+                    journal_rows.append(
+                        {"entity_id": entity_id, "changes": changes, "recorded_at": recorded_at}
+                    )
+                    new_states[entity_id] = state
+                else:
+                    self._stats["unchanged_entities_skipped"] += 1
             else:
                 logger.warning(f"Entity {entity_id} not found in entity manager")
 
-        if not states_to_persist:
-            return
+        if not journal_rows:
+            for entity_id, generation in generations.items():
+                self._mark_clean(entity_id, generation, snapshot_time)
+            return True
 
         # Retry logic with exponential backoff
         base_delay = 1.0  # seconds
@@ -267,16 +372,21 @@ class EntityPersistenceService:
         for attempt in range(self._max_retries):
             try:
                 async with self._db_manager.get_session() as session:
-                    await self._bulk_upsert_states(session, states_to_persist)
+                    await session.execute(insert(EntityStateJournal), journal_rows)
                     await session.commit()
 
                 # Success!
+                for entity_id, generation in generations.items():
+                    self._mark_clean(entity_id, generation, snapshot_time)
+                self._persisted_states.update(new_states)
+                self._uncompacted_ids.update(new_states)
+                self._journal_rows += len(journal_rows)
                 self._stats["total_writes"] += 1
-                self._stats["total_entities_persisted"] += len(states_to_persist)
+                self._stats["total_entities_persisted"] += len(journal_rows)
                 self._stats["last_write_time"] = datetime.now(UTC)
 
-                logger.debug(f"Successfully persisted {len(states_to_persist)} entities")
-                return
+                logger.debug(f"Successfully journaled {len(journal_rows)} entity changes")
+                return True
 
             except Exception as e:
                 logger.warning(
@@ -284,26 +394,108 @@ class EntityPersistenceService:
                 )
 
                 if attempt + 1 == self._max_retries:
-                    # All retries exhausted
+                    # All retries exhausted; the entities stay in the dirty
+                    # set, which is bounded by the number of entities
                     self._stats["failed_writes"] += 1
                     logger.error(
                         f"Failed to persist batch of {len(entity_ids)} entities after "
                         f"{self._max_retries} retries. Entity IDs: {entity_ids}"
                     )
-
-                    # Re-queue the entities to try again later
-                    # This prevents data loss but could lead to queue buildup
-                    for entity_id in entity_ids:
-                        try:
-                            self._dirty_entity_ids.put_nowait(entity_id)
-                        except asyncio.QueueFull:
-                            logger.error(f"Cannot re-queue entity {entity_id} - queue full")
-                    break
+                    return False
 
                 # Exponential backoff with jitter
                 delay = (base_delay * 2**attempt) + random.uniform(0, 0.5)
                 await asyncio.sleep(delay)
 
+    @staticmethod
+    def _changed_fields(
+        previous: dict[str, Any] | None, state: dict[str, Any]
+    ) -> dict[str, Any]:
+        """
+        Return the fields of ``state`` that differ from ``previous``.
+
+        The timestamp alone does not count as a change, but is included
+        whenever another field changed.
+        """
+        if previous is None:
+            return state
+
+        changes = {
+            key: value
+            for key, value in state.items()
+            if key != "timestamp" and previous.get(key) != value
+        }
+        if changes and "timestamp" in state:
+            changes["timestamp"] = state["timestamp"]
+        return changes
+
+    def _compaction_due(self) -> bool:
+        """Whether the journal should be folded into snapshots now."""
+        if not self._uncompacted_ids:
+            return False
+        if self._journal_rows >= self._compaction_threshold:
+            return True
+        elapsed = time.monotonic() - self._last_compaction
+        return elapsed >= self._compaction_interval
+
+    async def _compact_journal(self) -> None:
+        """
+        Fold journaled changes into EntityState snapshots.
+
+        Runs under the flush lock, so no flush can journal a change between
+        reading the in-memory persisted states and clearing the journal; the
+        states then match snapshots plus journal exactly, and the snapshots
+        of changed entities are rewritten and their journal rows deleted in
+        one transaction. Only rows of the compacted entities, up to the
+        newest row present when compaction started, are deleted: after a
+        failed load the journal still holds changes for entities that are
+        not in memory, and those must survive until a load replays them.
+        """
+        async with self._flush_lock:
+            if not self._uncompacted_ids:
+                return
+
+            entity_ids = list(self._uncompacted_ids)
+            updated_at = datetime.now(UTC)
+            snapshots = [
+                {
+                    "entity_id": entity_id,
+                    "state": self._persisted_states[entity_id],
+                    "updated_at": updated_at,
+                }
+                for entity_id in entity_ids
+            ]
+
+            try:
+                async with self._db_manager.get_session() as session:
+                    max_id = await session.scalar(select(func.max(EntityStateJournal.id)))
+                    for start in range(0, len(snapshots), self._max_batch_size):
+                        await self._bulk_upsert_states(
+                            session, snapshots[start : start + self._max_batch_size]
+                        )
+                        if max_id is not None:
+                            await session.execute(
+                                delete(EntityStateJournal).where(
+                                    EntityStateJournal.id <= max_id,
+                                    EntityStateJournal.entity_id.in_(
+                                        entity_ids[start : start + self._max_batch_size]
+                                    ),
+                                )
+                            )
+                    await session.commit()
+            except Exception as e:
+                # The journal is intact; compaction is retried after the next batch
+                logger.warning(f"Entity state journal compaction failed: {e}")
+                return
+
+            logger.debug(
+                f"Compacted {self._journal_rows} journal entries into {len(entity_ids)} snapshots"
+            )
+            self._uncompacted_ids.clear()
+            self._journal_rows = 0
+            self._last_compaction = time.monotonic()
+            self._stats["compactions"] += 1
+
     async def _bulk_upsert_states(
         self, session: AsyncSession, states: list[dict[str, Any]]
     ) -> None:
@@ -329,6 +521,10 @@ class EntityPersistenceService:
         """Get persistence service statistics."""
         return {
             **self._stats,
-            "queue_size": self._dirty_entity_ids.qsize(),
+            "dirty_count": len(self._dirty),
+            "oldest_dirty_age": (
+                time.monotonic() - min(self._dirty.values()) if self._dirty else 0.0
+            ),
+            "journal_entries": self._journal_rows,
             "is_running": self._worker_task is not None and not self._worker_task.done(),
         }
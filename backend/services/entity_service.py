@@ -20,6 +20,7 @@ from backend.core.config import get_can_settings
 from backend.core.entity_manager import EntityManager
 from backend.integrations.can.manager import can_tx_queue
 from backend.integrations.can.message_factory import create_light_can_message
+from backend.integrations.can.tx_scheduler import TxPriority
 from backend.models.entity import (
     ControlCommand,
     ControlEntityResponse,
@@ -97,6 +98,65 @@ class EntityService:
         # Convert to API format
         return {entity_id: entity.to_dict() for entity_id, entity in filtered_entities.items()}
 
+    async def list_entities_page(
+        self,
+        device_type: str | None = None,
+        area: str | None = None,
+        protocol: str | None = None,
+        group: str | None = None,
+        page: int = 1,
+        page_size: int = 50,
+        after: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        List one page of entities ordered by entity ID.
+
+        Filtering uses the EntityManager indexes and only the entities on the
+        requested page are converted to API format.
+
+        Args:
+            device_type: Optional filter by entity device_type
+            area: Optional filter by entity suggested_area
+            protocol: Optional filter by protocol ownership
+            group: Optional filter by entity group
+            page: 1-based page number (ignored when ``after`` is given)
+            page_size: Number of entities per page
+            after: Cursor; return entities with IDs after this one
+
+        Returns:
+            Dictionary with the page's entities, total_count, has_next and the
+            ID of the last entity on the page (``last_entity_id``)
+        """
+        entity_ids = self.entity_manager.query_entity_ids(
+            device_type=device_type, area=area, protocol=protocol, group=group
+        )
+        page_ids, has_next = self.entity_manager.page_entity_ids(
+            entity_ids, page_size, after=after, offset=(page - 1) * page_size
+        )
+        entities = {}
+        for entity_id in page_ids:
+            entity = self.entity_manager.get_entity(entity_id)
+            if entity:
+                entities[entity_id] = entity.to_dict()
+        return {
+            "entities": entities,
+            "total_count": len(entity_ids),
+            "has_next": has_next,
+            "last_entity_id": page_ids[-1] if page_ids else None,
+        }
+
+    def get_registry_etag(self) -> str:
+        """
+        Get an ETag for the current entity registry contents.
+
+        The tag changes whenever an entity is registered or its state changes.
+
+        Returns:
+            Quoted ETag string
+        """
+        manager = self.entity_manager
+        return f'"{manager.instance_token}-{manager.version}"'
+
     async def list_entity_ids(self) -> list[str]:
         """Return all known entity IDs."""
         return self.entity_manager.get_entity_ids()
@@ -121,6 +181,8 @@ class EntityService:
         entity_id: str,
         since: float | None = None,
         limit: int | None = 1000,
+        until: float | None = None,
+        max_points: int | None = None,
     ) -> list[dict[str, Any]] | None:
         """
         Get entity history with optional filtering.
@@ -129,6 +191,8 @@ class EntityService:
             entity_id: The ID of the entity
             since: Optional Unix timestamp to filter entries newer than this
             limit: Optional limit on the number of points to return
+            until: Optional Unix timestamp to filter entries up to this
+            max_points: Optional downsampling to at most this many evenly spaced points
 
         Returns:
             List of entity history entries or None if entity not found
@@ -136,7 +200,9 @@ class EntityService:
         entity = self.entity_manager.get_entity(entity_id)
         if entity:
             # Get history from the entity with optional filtering
-            history_entries = entity.get_history(count=limit, since=since)
+            history_entries = entity.get_history(
+                count=limit, since=since, until=until, max_points=max_points
+            )
             # Convert each EntityState to a dictionary
             return [state.model_dump() for state in history_entries]
         return None
@@ -309,7 +375,10 @@ class EntityService:
             )
 
     async def control_entity(
-        self, entity_id: str, command: ControlCommand
+        self,
+        entity_id: str,
+        command: ControlCommand,
+        priority: TxPriority = TxPriority.HIGH,
     ) -> ControlEntityResponse:
         """
         Control an entity by routing to the appropriate device-specific control method.
@@ -317,6 +386,8 @@ class EntityService:
         Args:
             entity_id: The ID of the entity to control
             command: Control command with action details
+            priority: Transmit priority of the resulting CAN command; bulk
+                operations pass BULK so interactive control is sent first
 
         Returns:
             ControlEntityResponse: Response with status and action description
@@ -333,19 +404,25 @@ class EntityService:
         device_type = entity.config.get("device_type")
 
         if device_type == "light":
-            return await self.control_light(entity_id, command)
+            return await self.control_light(entity_id, command, priority)
         msg = f"Control not supported for device type '{device_type}'. Supported types: light"
         raise ValueError(
             msg
         )
 
-    async def control_light(self, entity_id: str, cmd: ControlCommand) -> ControlEntityResponse:
+    async def control_light(
+        self,
+        entity_id: str,
+        cmd: ControlCommand,
+        priority: TxPriority = TxPriority.HIGH,
+    ) -> ControlEntityResponse:
         """
         Control a light entity.
 
         Args:
             entity_id: The ID of the light entity to control
             cmd: Control command with action details
+            priority: Transmit priority of the CAN command
 
         Returns:
             ControlEntityResponse: Response with status and action description
@@ -442,15 +519,9 @@ class EntityService:
         new_brightness = max(new_brightness, 0)
         new_brightness = min(new_brightness, 100)
 
-        # Broadcast entity update over WebSocket after control
-        await self.websocket_manager.broadcast_to_data_clients(
-            {
-                "type": "entity_update",
-                "data": {
-                    "entity_id": entity_id,
-                    "entity_data": entity.to_dict(),
-                },
-            }
+        # Send the command; this also applies and broadcasts the optimistic state
+        await self._execute_light_command(
+            entity_id, new_brightness if new_state else 0, action, priority
         )
 
         return ControlEntityResponse(
@@ -467,6 +538,7 @@ class EntityService:
         entity_id: str,
         target_brightness_ui: int,
         action_description: str,
+        priority: TxPriority = TxPriority.HIGH,
     ) -> ControlEntityResponse:
         """
         Execute a light control command by sending CAN messages.
@@ -475,6 +547,7 @@ class EntityService:
             entity_id: The entity ID
             target_brightness_ui: Target brightness (0-100)
             action_description: Description of the action being taken
+            priority: Transmit priority of the CAN command
 
         Returns:
             Control response with status and details
@@ -560,7 +633,7 @@ class EntityService:
                 f"Sending CAN message for {entity_id} on interface {can_interface} (logical: {logical_interface})"
             )
 
-            await can_tx_queue.put((can_message, can_interface))
+            await can_tx_queue.put((can_message, can_interface, priority))
 
             # Add sniffer entry for TX tracking
             sniffer_entry = {
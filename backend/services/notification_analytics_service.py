@@ -3,6 +3,11 @@ Notification Analytics Service
 
 This service provides comprehensive analytics and metrics collection for the
 notification system, including real-time metrics, aggregation, and reporting.
+
+Delivery logs are folded into minute, hour and day rollups as they are
+flushed (see ``notification_rollups``). Channel metrics, aggregated metrics
+and reports are answered from the rollups, so raw logs are only kept for
+``_raw_log_retention`` to support error analysis and engagement tracking.
 """
 
 import asyncio
@@ -14,8 +19,7 @@ from pathlib import Path
 from typing import Any
 from uuid import uuid4
 
-from sqlalchemy import and_, func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, delete, func, select
 
 from backend.models.notification import (
     NotificationChannel,
@@ -30,13 +34,18 @@ from backend.models.notification_analytics import (
     NotificationDeliveryLog,
     NotificationErrorAnalysis,
     NotificationMetric,
-    NotificationMetricAggregate,
     NotificationQueueHealth,
+    RollupResolution,
 )
 from backend.models.notification_analytics import (
     NotificationReport as NotificationReportModel,
 )
 from backend.services.database_manager import DatabaseManager
+from backend.services.notification_rollups import (
+    DeliveryRollup,
+    NotificationRollupEngine,
+    bucket_floor,
+)
 
 
 class NotificationAnalyticsService:
@@ -62,9 +71,16 @@ class NotificationAnalyticsService:
         self._buffer_lock = asyncio.Lock()
         self._buffer_size_limit = 100
         self._buffer_flush_interval = 30.0  # seconds
+        self._flush_lock = asyncio.Lock()
+
+        # Incremental rollups; raw logs are pruned after the retention period
+        self._rollups = NotificationRollupEngine()
+        self._raw_log_retention = timedelta(days=7)
+        self._backfill_batch_size = 1000
+        self._maintenance_interval = 3600.0  # seconds
 
         # Background tasks
-        self._aggregation_task: asyncio.Task | None = None
+        self._maintenance_task: asyncio.Task | None = None
         self._flush_task: asyncio.Task | None = None
         self._health_monitor_task: asyncio.Task | None = None
         self._running = False
@@ -80,9 +96,13 @@ class NotificationAnalyticsService:
 
         self._running = True
 
+        # Logs recorded before the rollup table existed must be rolled up
+        # before the first prune deletes them
+        await self._backfill_rollups()
+
         # Start background tasks
         self._flush_task = asyncio.create_task(self._flush_buffer_loop())
-        self._aggregation_task = asyncio.create_task(self._aggregation_loop())
+        self._maintenance_task = asyncio.create_task(self._maintenance_loop())
         self._health_monitor_task = asyncio.create_task(self._health_monitor_loop())
 
         self.logger.info("NotificationAnalyticsService started")
@@ -95,7 +115,7 @@ class NotificationAnalyticsService:
         self._running = False
 
         # Cancel background tasks
-        for task in [self._flush_task, self._aggregation_task, self._health_monitor_task]:
+        for task in [self._flush_task, self._maintenance_task, self._health_monitor_task]:
             if task and not task.done():
                 task.cancel()
 
@@ -138,14 +158,17 @@ class NotificationAnalyticsService:
             error_message=error_message,
             error_code=error_code,
             metadata=metadata or {},
+            # Set here rather than by the database so the log can be rolled up
+            created_at=datetime.now(UTC),
         )
 
         async with self._buffer_lock:
             self._metric_buffer.append(log_entry)
+            buffer_full = len(self._metric_buffer) >= self._buffer_size_limit
 
-            # Flush if buffer is full
-            if len(self._metric_buffer) >= self._buffer_size_limit:
-                await self._flush_buffer()
+        # Flush if buffer is full
+        if buffer_full:
+            await self._flush_buffer()
 
     async def track_engagement(
         self,
@@ -205,94 +228,35 @@ class NotificationAnalyticsService:
             start_date = end_date - timedelta(days=7)
 
         async with self.db_manager.get_session() as session:
-            # Build base query
-            query = select(
-                NotificationDeliveryLog.channel,
-                func.count().label("total"),
-                func.sum(
-                    func.cast(
-                        NotificationDeliveryLog.status == NotificationStatus.DELIVERED.value,
-                        func.Integer
-                    )
-                ).label("delivered"),
-                func.sum(
-                    func.cast(
-                        NotificationDeliveryLog.status == NotificationStatus.FAILED.value,
-                        func.Integer
-                    )
-                ).label("failed"),
-                func.sum(NotificationDeliveryLog.retry_count).label("retries"),
-                func.avg(NotificationDeliveryLog.delivery_time_ms).label("avg_delivery_time"),
-            ).where(
-                and_(
-                    NotificationDeliveryLog.created_at >= start_date,
-                    NotificationDeliveryLog.created_at <= end_date,
-                )
+            by_channel = await self._rollups.summarize(
+                session,
+                start_date,
+                end_date,
+                key=lambda row: row.channel,
+                channel=channel.value if channel else None,
             )
-
-            if channel:
-                query = query.where(NotificationDeliveryLog.channel == channel.value)
-
-            query = query.group_by(NotificationDeliveryLog.channel)
-
-            result = await session.execute(query)
-            rows = result.all()
-
-            metrics = []
-            for row in rows:
-                # Get last success/failure times
-                last_success_stmt = select(
-                    func.max(NotificationDeliveryLog.delivered_at)
-                ).where(
-                    and_(
-                        NotificationDeliveryLog.channel == row.channel,
-                        NotificationDeliveryLog.status == NotificationStatus.DELIVERED.value,
-                    )
-                )
-                last_success = await session.scalar(last_success_stmt)
-
-                last_failure_stmt = select(
-                    func.max(NotificationDeliveryLog.created_at)
-                ).where(
-                    and_(
-                        NotificationDeliveryLog.channel == row.channel,
-                        NotificationDeliveryLog.status == NotificationStatus.FAILED.value,
-                    )
-                )
-                last_failure = await session.scalar(last_failure_stmt)
-
-                # Get error breakdown
-                error_stmt = select(
-                    NotificationDeliveryLog.error_code,
-                    func.count().label("count")
-                ).where(
-                    and_(
-                        NotificationDeliveryLog.channel == row.channel,
-                        NotificationDeliveryLog.error_code.isnot(None),
-                        NotificationDeliveryLog.created_at >= start_date,
-                        NotificationDeliveryLog.created_at <= end_date,
-                    )
-                ).group_by(NotificationDeliveryLog.error_code)
-
-                error_result = await session.execute(error_stmt)
-                error_breakdown = {err.error_code: err.count for err in error_result}
-
-                metrics.append(
-                    ChannelMetrics(
-                        channel=NotificationChannel(row.channel),
-                        total_sent=row.total or 0,
-                        total_delivered=row.delivered or 0,
-                        total_failed=row.failed or 0,
-                        total_retried=row.retries or 0,
-                        success_rate=(row.delivered or 0) / max(row.total, 1),
-                        average_delivery_time=row.avg_delivery_time,
-                        last_success=last_success,
-                        last_failure=last_failure,
-                        error_breakdown=error_breakdown,
-                    )
+            latest_outcomes = await self._rollups.latest_outcomes(session)
+
+        metrics = []
+        for channel_name, rollup in sorted(by_channel.items()):
+            last_success, last_failure = latest_outcomes.get(channel_name, (None, None))
+            metrics.append(
+                ChannelMetrics(
+                    channel=NotificationChannel(channel_name),
+                    total_sent=rollup.delivery_count,
+                    total_delivered=rollup.success_count,
+                    total_failed=rollup.failure_count,
+                    total_retried=rollup.retry_count,
+                    success_rate=rollup.success_rate,
+                    average_delivery_time=rollup.average_delivery_time,
+                    last_success=last_success,
+                    last_failure=last_failure,
+                    error_breakdown=dict(rollup.error_codes),
+                    delivery_time_percentiles=rollup.percentiles(),
                 )
+            )
 
-            return metrics
+        return metrics
 
     async def get_aggregated_metrics(
         self,
@@ -306,6 +270,9 @@ class NotificationAnalyticsService:
         """
         Get aggregated metrics for a specific period.
 
+        Hourly metrics are read from hour rollups; daily, weekly and monthly
+        metrics from day rollups.
+
         Args:
             metric_type: Type of metric to retrieve
             aggregation_period: Aggregation period
@@ -320,39 +287,38 @@ class NotificationAnalyticsService:
         if end_date is None:
             end_date = datetime.now(UTC)
 
+        resolution = (
+            RollupResolution.HOUR
+            if aggregation_period == AggregationPeriod.HOURLY
+            else RollupResolution.DAY
+        )
+
         async with self.db_manager.get_session() as session:
-            query = select(NotificationMetricAggregate).where(
-                and_(
-                    NotificationMetricAggregate.metric_type == metric_type.value,
-                    NotificationMetricAggregate.aggregation_period == aggregation_period.value,
-                    NotificationMetricAggregate.period_start >= start_date,
-                    NotificationMetricAggregate.period_start <= end_date,
-                )
+            buckets = await self._rollups.series(
+                session,
+                resolution,
+                start_date,
+                end_date,
+                channel=channel.value if channel else None,
+                notification_type=notification_type.value if notification_type else None,
             )
 
-            if channel:
-                query = query.where(NotificationMetricAggregate.channel == channel.value)
-            if notification_type:
-                query = query.where(
-                    NotificationMetricAggregate.notification_type == notification_type.value
-                )
-
-            result = await session.execute(query.order_by(NotificationMetricAggregate.period_start))
-            aggregates = result.scalars().all()
-
-            return [
-                NotificationMetric(
-                    timestamp=agg.period_start,
-                    metric_type=MetricType(agg.metric_type),
-                    value=agg.value,
-                    channel=NotificationChannel(agg.channel) if agg.channel else None,
-                    notification_type=NotificationType(agg.notification_type)
-                    if agg.notification_type
-                    else None,
-                    metadata=agg.metadata or {},
-                )
-                for agg in aggregates
-            ]
+        periods: dict[datetime, DeliveryRollup] = {}
+        for bucket_start, rollup in sorted(buckets.items()):
+            period_start = self._period_start(bucket_start, aggregation_period)
+            periods.setdefault(period_start, DeliveryRollup()).merge(rollup)
+
+        return [
+            NotificationMetric(
+                timestamp=period_start,
+                metric_type=metric_type,
+                value=self._metric_value(metric_type, rollup),
+                channel=channel,
+                notification_type=notification_type,
+                extra_data={"count": rollup.delivery_count, **rollup.percentiles()},
+            )
+            for period_start, rollup in periods.items()
+        ]
 
     async def analyze_errors(
         self,
@@ -519,7 +485,8 @@ class NotificationAnalyticsService:
         # For now, return a sample implementation
         async with self.db_manager.get_session() as session:
             # Get queue statistics from last hour
-            one_hour_ago = datetime.now(UTC) - timedelta(hours=1)
+            now = datetime.now(UTC)
+            one_hour_ago = now - timedelta(hours=1)
 
             # Count pending notifications
             pending_count_stmt = select(func.count()).select_from(
@@ -529,33 +496,15 @@ class NotificationAnalyticsService:
             )
             pending_count = await session.scalar(pending_count_stmt) or 0
 
-            # Calculate processing rate
-            processed_stmt = select(func.count()).select_from(
-                NotificationDeliveryLog
-            ).where(
-                and_(
-                    NotificationDeliveryLog.created_at >= one_hour_ago,
-                    NotificationDeliveryLog.status.in_(
-                        [NotificationStatus.DELIVERED.value, NotificationStatus.FAILED.value]
-                    ),
-                )
+            # Processing and success rates from the minute rollups
+            recent = (await self._rollups.summarize(session, one_hour_ago, now)).get(
+                None, DeliveryRollup()
             )
-            processed_count = await session.scalar(processed_stmt) or 0
+            processed_count = recent.success_count + recent.failure_count
             processing_rate = processed_count / 3600.0  # per second
+            success_rate = recent.success_count / max(processed_count, 1)
 
-            # Calculate success rate
-            success_stmt = select(func.count()).select_from(
-                NotificationDeliveryLog
-            ).where(
-                and_(
-                    NotificationDeliveryLog.created_at >= one_hour_ago,
-                    NotificationDeliveryLog.status == NotificationStatus.DELIVERED.value,
-                )
-            )
-            success_count = await session.scalar(success_stmt) or 0
-            success_rate = success_count / max(processed_count, 1)
-
-            # Calculate average times
+            # Wait time needs per-log timestamps, so it is read from raw logs
             avg_wait_stmt = select(
                 func.avg(
                     func.extract(
@@ -571,15 +520,7 @@ class NotificationAnalyticsService:
             )
             avg_wait_time = await session.scalar(avg_wait_stmt) or 0.0
 
-            avg_processing_stmt = select(
-                func.avg(NotificationDeliveryLog.delivery_time_ms)
-            ).where(
-                and_(
-                    NotificationDeliveryLog.created_at >= one_hour_ago,
-                    NotificationDeliveryLog.delivery_time_ms.isnot(None),
-                )
-            )
-            avg_processing_time = (await session.scalar(avg_processing_stmt) or 0.0) / 1000.0
+            avg_processing_time = (recent.average_delivery_time or 0.0) / 1000.0
 
             # Calculate health score
             health_score = self._calculate_health_score(
@@ -615,179 +556,60 @@ class NotificationAnalyticsService:
                 self.logger.error(f"Buffer flush error: {e}")
 
     async def _flush_buffer(self) -> None:
-        """Flush metric buffer to database."""
-        async with self._buffer_lock:
-            if not self._metric_buffer:
-                return
+        """Flush metric buffer to database and fold it into the rollups."""
+        # Flushes are serialized so rollup buckets are not updated concurrently
+        async with self._flush_lock:
+            async with self._buffer_lock:
+                if not self._metric_buffer:
+                    return
+
+                buffer_copy = self._metric_buffer
+                self._metric_buffer = []
 
-            buffer_copy = self._metric_buffer.copy()
-            self._metric_buffer.clear()
+            try:
+                async with self.db_manager.get_session() as session:
+                    session.add_all(buffer_copy)
+                    await self._rollups.apply(session, buffer_copy)
+                    await session.commit()
+
+                self.logger.debug(f"Flushed {len(buffer_copy)} delivery logs to database")
+            except Exception as e:
+                self.logger.error(f"Failed to flush metric buffer: {e}")
+                # Re-add to buffer on failure
+                async with self._buffer_lock:
+                    self._metric_buffer[:0] = buffer_copy
 
+    async def _backfill_rollups(self) -> None:
+        """Fold pre-existing delivery logs into the rollups if none exist yet."""
         try:
-            async with self.db_manager.get_session() as session:
-                session.add_all(buffer_copy)
+            async with self._flush_lock, self.db_manager.get_session() as session:
+                backfilled = await self._rollups.backfill(session, self._backfill_batch_size)
                 await session.commit()
-
-            self.logger.debug(f"Flushed {len(buffer_copy)} delivery logs to database")
+            if backfilled:
+                self.logger.info(f"Backfilled rollups from {backfilled} delivery logs")
         except Exception as e:
-            self.logger.error(f"Failed to flush metric buffer: {e}")
-            # Re-add to buffer on failure
-            async with self._buffer_lock:
-                self._metric_buffer.extend(buffer_copy)
+            self.logger.error(f"Failed to backfill delivery rollups: {e}")
 
-    async def _aggregation_loop(self) -> None:
-        """Background loop to perform metric aggregation."""
+    async def _maintenance_loop(self) -> None:
+        """Background loop to prune expired rollups and raw delivery logs."""
         while self._running:
             try:
-                # Run aggregation every hour
-                await asyncio.sleep(3600)
-                await self._perform_aggregation()
+                await asyncio.sleep(self._maintenance_interval)
+                await self._prune_expired()
             except Exception as e:
-                self.logger.error(f"Aggregation error: {e}")
-
-    async def _perform_aggregation(self) -> None:
-        """Perform metric aggregation for different periods."""
-        end_time = datetime.now(UTC)
-
-        # Hourly aggregation for last 24 hours
-        await self._aggregate_period(
-            AggregationPeriod.HOURLY,
-            end_time - timedelta(days=1),
-            end_time,
-            timedelta(hours=1)
-        )
+                self.logger.error(f"Maintenance error: {e}")
 
-        # Daily aggregation for last 30 days
-        await self._aggregate_period(
-            AggregationPeriod.DAILY,
-            end_time - timedelta(days=30),
-            end_time,
-            timedelta(days=1)
-        )
-
-        # Weekly aggregation for last 12 weeks
-        await self._aggregate_period(
-            AggregationPeriod.WEEKLY,
-            end_time - timedelta(weeks=12),
-            end_time,
-            timedelta(weeks=1)
-        )
-
-    async def _aggregate_period(
-        self,
-        period: AggregationPeriod,
-        start_date: datetime,
-        end_date: datetime,
-        interval: timedelta,
-    ) -> None:
-        """Aggregate metrics for a specific period."""
+    async def _prune_expired(self) -> None:
+        """Delete rollups and raw delivery logs past their retention."""
+        now = datetime.now(UTC)
         async with self.db_manager.get_session() as session:
-            current = start_date
-
-            while current < end_date:
-                period_end = min(current + interval, end_date)
-
-                # Aggregate each metric type
-                for metric_type in MetricType:
-                    await self._aggregate_metric(
-                        session,
-                        metric_type,
-                        period,
-                        current,
-                        period_end,
-                    )
-
-                current = period_end
-
-            await session.commit()
-
-    async def _aggregate_metric(
-        self,
-        session: AsyncSession,
-        metric_type: MetricType,
-        period: AggregationPeriod,
-        start: datetime,
-        end: datetime,
-    ) -> None:
-        """Aggregate a specific metric for a period."""
-        # Check if aggregation already exists
-        exists_stmt = select(func.count()).select_from(
-            NotificationMetricAggregate
-        ).where(
-            and_(
-                NotificationMetricAggregate.metric_type == metric_type.value,
-                NotificationMetricAggregate.aggregation_period == period.value,
-                NotificationMetricAggregate.period_start == start,
-            )
-        )
-
-        exists_count = await session.scalar(exists_stmt)
-        if exists_count and exists_count > 0:
-            return
-
-        # Calculate aggregation based on metric type
-        if metric_type == MetricType.DELIVERY_COUNT:
-            value_stmt = select(func.count()).select_from(
-                NotificationDeliveryLog
-            ).where(
-                and_(
-                    NotificationDeliveryLog.created_at >= start,
-                    NotificationDeliveryLog.created_at < end,
-                )
-            )
-            value = await session.scalar(value_stmt) or 0
-
-        elif metric_type == MetricType.SUCCESS_RATE:
-            total_stmt = select(func.count()).select_from(
-                NotificationDeliveryLog
-            ).where(
-                and_(
-                    NotificationDeliveryLog.created_at >= start,
-                    NotificationDeliveryLog.created_at < end,
+            await self._rollups.prune(session, now)
+            await session.execute(
+                delete(NotificationDeliveryLog).where(
+                    NotificationDeliveryLog.created_at < now - self._raw_log_retention
                 )
             )
-            total = await session.scalar(total_stmt) or 0
-
-            success_stmt = select(func.count()).select_from(
-                NotificationDeliveryLog
-            ).where(
-                and_(
-                    NotificationDeliveryLog.created_at >= start,
-                    NotificationDeliveryLog.created_at < end,
-                    NotificationDeliveryLog.status == NotificationStatus.DELIVERED.value,
-                )
-            )
-            success = await session.scalar(success_stmt) or 0
-
-            value = success / max(total, 1)
-
-        elif metric_type == MetricType.AVERAGE_DELIVERY_TIME:
-            avg_stmt = select(
-                func.avg(NotificationDeliveryLog.delivery_time_ms)
-            ).where(
-                and_(
-                    NotificationDeliveryLog.created_at >= start,
-                    NotificationDeliveryLog.created_at < end,
-                    NotificationDeliveryLog.delivery_time_ms.isnot(None),
-                )
-            )
-            value = await session.scalar(avg_stmt) or 0.0
-
-        else:
-            # Add more metric type calculations as needed
-            value = 0.0
-
-        # Create aggregation record
-        aggregate = NotificationMetricAggregate(
-            metric_type=metric_type.value,
-            aggregation_period=period.value,
-            period_start=start,
-            period_end=end,
-            value=value,
-            count=1,  # Would be calculated properly
-        )
-
-        session.add(aggregate)
+            await session.commit()
 
     async def _health_monitor_loop(self) -> None:
         """Background loop to monitor queue health."""
@@ -860,6 +682,31 @@ class NotificationAnalyticsService:
 
         return max(0.0, min(1.0, score))
 
+    def _period_start(self, bucket_start: datetime, period: AggregationPeriod) -> datetime:
+        """Start of the aggregation period containing a rollup bucket."""
+        if period == AggregationPeriod.WEEKLY:
+            return bucket_start - timedelta(days=bucket_start.weekday())
+        if period == AggregationPeriod.MONTHLY:
+            return bucket_start.replace(day=1)
+        return bucket_start
+
+    def _metric_value(self, metric_type: MetricType, rollup: DeliveryRollup) -> float:
+        """Calculate a metric from merged rollup statistics."""
+        if metric_type == MetricType.DELIVERY_COUNT:
+            return float(rollup.delivery_count)
+        if metric_type == MetricType.SUCCESS_RATE:
+            return rollup.success_rate
+        if metric_type == MetricType.FAILURE_RATE:
+            return rollup.failure_count / max(rollup.delivery_count, 1)
+        if metric_type == MetricType.RETRY_COUNT:
+            return float(rollup.retry_count)
+        if metric_type == MetricType.AVERAGE_DELIVERY_TIME:
+            return rollup.average_delivery_time or 0.0
+        if metric_type == MetricType.ERROR_RATE:
+            return sum(rollup.error_codes.values()) / max(rollup.delivery_count, 1)
+        # Engagement is recorded on raw logs after delivery and is not rolled up
+        return 0.0
+
     async def _collect_report_data(
         self,
         report_type: str,
@@ -922,20 +769,21 @@ class NotificationAnalyticsService:
         start_date: datetime,
         end_date: datetime,
     ) -> dict[int, int]:
-        """Get hourly distribution of notifications."""
+        """Get hourly distribution of notifications from the hour rollups."""
         async with self.db_manager.get_session() as session:
-            stmt = select(
-                func.extract("hour", NotificationDeliveryLog.created_at).label("hour"),
-                func.count().label("count")
-            ).where(
-                and_(
-                    NotificationDeliveryLog.created_at >= start_date,
-                    NotificationDeliveryLog.created_at <= end_date,
-                )
-            ).group_by("hour")
+            buckets = await self._rollups.series(
+                session,
+                RollupResolution.HOUR,
+                bucket_floor(start_date, RollupResolution.HOUR),
+                end_date,
+            )
 
-            result = await session.execute(stmt)
-            return {int(row.hour): int(row.count) for row in result}
+        distribution: dict[int, int] = {}
+        for bucket_start, rollup in buckets.items():
+            distribution[bucket_start.hour] = (
+                distribution.get(bucket_start.hour, 0) + rollup.delivery_count
+            )
+        return distribution
 
     async def _get_type_distribution(
         self,
@@ -944,18 +792,14 @@ class NotificationAnalyticsService:
     ) -> dict[str, int]:
         """Get distribution by notification type."""
         async with self.db_manager.get_session() as session:
-            stmt = select(
-                NotificationDeliveryLog.notification_type,
-                func.count().label("count")
-            ).where(
-                and_(
-                    NotificationDeliveryLog.created_at >= start_date,
-                    NotificationDeliveryLog.created_at <= end_date,
-                )
-            ).group_by(NotificationDeliveryLog.notification_type)
+            by_type = await self._rollups.summarize(
+                session,
+                start_date,
+                end_date,
+                key=lambda row: row.notification_type,
+            )
 
-            result = await session.execute(stmt)
-            return {str(row.notification_type): int(row.count) for row in result}
+        return {str(name): rollup.delivery_count for name, rollup in by_type.items()}
 
     async def _get_top_errors(
         self,
@@ -965,23 +809,11 @@ class NotificationAnalyticsService:
     ) -> list[tuple[str, int]]:
         """Get top error messages."""
         async with self.db_manager.get_session() as session:
-            stmt = select(
-                NotificationDeliveryLog.error_message,
-                func.count().label("count")
-            ).where(
-                and_(
-                    NotificationDeliveryLog.created_at >= start_date,
-                    NotificationDeliveryLog.created_at <= end_date,
-                    NotificationDeliveryLog.error_message.isnot(None),
-                )
-            ).group_by(
-                NotificationDeliveryLog.error_message
-            ).order_by(
-                func.count().desc()
-            ).limit(limit)
+            summary = await self._rollups.summarize(session, start_date, end_date)
 
-            result = await session.execute(stmt)
-            return [(str(row.error_message), int(row.count)) for row in result]
+        rollup = summary.get(None, DeliveryRollup())
+        top_errors = sorted(rollup.error_messages.items(), key=lambda item: item[1], reverse=True)
+        return top_errors[:limit]
 
     async def _generate_report_file(
         self,
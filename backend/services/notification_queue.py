@@ -12,6 +12,9 @@ Key Features:
 - Batch processing for efficiency
 - Comprehensive statistics and monitoring
 - Write batching to minimize flash storage wear
+- Long-lived connections: one writer driven by a single writer task, plus a
+  small pool of read-only connections, so SQLite's per-connection statement
+  cache keeps every query prepared
 
 Example:
     >>> queue = NotificationQueue("data/notifications.db")
@@ -24,9 +27,13 @@ Example:
 import asyncio
 import json
 import logging
+import sqlite3
 import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Any
 
 import aiosqlite
 
@@ -37,6 +44,54 @@ from backend.models.notification import (
     QueueStatistics,
 )
 
+# A unit of work for the writer task, run on the writer connection and committed
+WriteJob = Callable[[aiosqlite.Connection], Awaitable[Any]]
+
+# UPDATE ... RETURNING needs SQLite 3.35+; older builds claim with SELECT + UPDATE
+_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+_INSERT_SQL = """
+    INSERT OR REPLACE INTO notifications
+    (id, created_at, data, status, priority, retry_count, max_retries,
+     scheduled_for, last_attempt, last_error)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_PENDING_SQL = """
+    SELECT id, data, retry_count, priority, created_at
+    FROM notifications
+    WHERE status = 'pending'
+    AND (scheduled_for IS NULL OR scheduled_for <= ?)
+    ORDER BY priority ASC, created_at ASC
+    LIMIT ?
+"""
+
+_CLAIM_SQL = """
+    UPDATE notifications
+    SET status = 'processing', last_attempt = ?
+    WHERE id IN (
+        SELECT id
+        FROM notifications
+        WHERE status = 'pending'
+        AND (scheduled_for IS NULL OR scheduled_for <= ?)
+        ORDER BY priority ASC, created_at ASC
+        LIMIT ?
+    )
+    RETURNING id, data, retry_count, priority, created_at
+"""
+
+_MARK_PROCESSING_SQL = """
+    UPDATE notifications
+    SET status = 'processing', last_attempt = ?
+    WHERE id = ?
+"""
+
+_MARK_UNREADABLE_SQL = """
+    UPDATE notifications
+    SET status = 'failed', last_error = 'Unreadable notification data', completed_at = ?
+    WHERE id = ?
+"""
+
 
 class NotificationQueue:
     """
@@ -47,6 +102,11 @@ class NotificationQueue:
     - Write batching to reduce storage wear
     - Comprehensive error handling and retry logic
     - Background cleanup and maintenance
+
+    All writes are submitted as jobs to a single writer task that owns the
+    writer connection, so they are serialized without contending for the
+    SQLite write lock. Statistics and dead letter listings use a pool of
+    read-only connections, which WAL mode lets run alongside the writer.
     """
 
     def __init__(self, db_path: str = "data/notifications.db"):
@@ -70,31 +130,54 @@ class NotificationQueue:
         self._stats_cache: QueueStatistics | None = None
         self._stats_cache_expires: datetime | None = None
 
-        # Connection pool for concurrent access
+        # Single writer connection and its job queue
+        self._writer: aiosqlite.Connection | None = None
+        self._write_jobs: asyncio.Queue[tuple[WriteJob | None, asyncio.Future | None]] = (
+            asyncio.Queue()
+        )
+        self._writer_task: asyncio.Task | None = None
+
+        # Read-only connection pool
+        self._reader_count = 2
+        self._readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+
+        self._init_lock = asyncio.Lock()
         self._db_initialized = False
         self._maintenance_task: asyncio.Task | None = None
 
     async def initialize(self) -> None:
-        """Initialize database schema and configuration."""
-        try:
-            # Ensure directory exists
-            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        """Open connections, initialize database schema and configuration."""
+        async with self._init_lock:
+            if self._db_initialized:
+                return
 
-            # Initialize database schema
-            await self._init_schema()
+            try:
+                # Ensure directory exists
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # Configure SQLite for durability and performance
-            await self._configure_sqlite()
+                # Configure SQLite before creating the schema so auto_vacuum
+                # applies to a new database file
+                self._writer = await aiosqlite.connect(self.db_path)
+                await self._configure_sqlite(self._writer)
+                await self._init_schema(self._writer)
 
-            # Start background maintenance tasks
-            self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+                for _ in range(self._reader_count):
+                    reader = await aiosqlite.connect(self.db_path)
+                    await reader.execute("PRAGMA query_only=1")
+                    self._readers.put_nowait(reader)
 
-            self._db_initialized = True
-            self.logger.info(f"NotificationQueue initialized: {self.db_path}")
+                self._writer_task = asyncio.create_task(self._writer_loop())
 
-        except Exception as e:
-            self.logger.error(f"Failed to initialize notification queue: {e}")
-            raise
+                # Start background maintenance tasks
+                self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+
+                self._db_initialized = True
+                self.logger.info(f"NotificationQueue initialized: {self.db_path}")
+
+            except Exception as e:
+                self.logger.error(f"Failed to initialize notification queue: {e}")
+                await self._close_connections()
+                raise
 
     async def enqueue(self, notification: NotificationPayload) -> str:
         """
@@ -126,6 +209,9 @@ class NotificationQueue:
         """
         Get batch of pending notifications for processing.
 
+        Due notifications are claimed (marked as processing) and returned in
+        one statement, so concurrent callers never receive the same one.
+
         Args:
             size: Maximum batch size
 
@@ -136,52 +222,8 @@ class NotificationQueue:
             await self.initialize()
 
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                # Get notifications ready for processing
-                async with db.execute(
-                    """
-                    SELECT data, retry_count, scheduled_for
-                    FROM notifications
-                    WHERE status = 'pending'
-                    AND (scheduled_for IS NULL OR scheduled_for <= ?)
-                    ORDER BY priority ASC, created_at ASC
-                    LIMIT ?
-                """,
-                    (datetime.utcnow().isoformat(), size),
-                ) as cursor:
-                    rows = await cursor.fetchall()
-
-                if not rows:
-                    return []
-
-                # Parse notification data
-                notifications = []
-                notification_ids = []
-
-                for row in rows:
-                    try:
-                        data = json.loads(row[0])
-                        notification = NotificationPayload.model_validate(data)
-                        notification.retry_count = row[1]
-                        notifications.append(notification)
-                        notification_ids.append(notification.id)
-                    except Exception as e:
-                        self.logger.warning(f"Failed to parse notification data: {e}")
-                        continue
-
-                # Mark as processing to prevent duplicate processing
-                if notification_ids:
-                    await db.execute(
-                        """
-                        UPDATE notifications
-                        SET status = 'processing', last_attempt = ?
-                        WHERE id IN ({})
-                    """.format(",".join("?" * len(notification_ids))),
-                        [datetime.utcnow().isoformat(), *notification_ids],
-                    )
-                    await db.commit()
-
-                return notifications
+            await self._flush_pending_writes()
+            return await self._write(lambda db: self._claim_pending(db, size))
 
         except Exception as e:
             self.logger.error(f"Failed to dequeue notifications: {e}")
@@ -197,18 +239,20 @@ class NotificationQueue:
         Returns:
             bool: True if marked successfully
         """
+
+        async def complete(db: aiosqlite.Connection) -> None:
+            await db.execute(
+                """
+                UPDATE notifications
+                SET status = 'sent', completed_at = ?
+                WHERE id = ?
+            """,
+                (datetime.utcnow().isoformat(), notification_id),
+            )
+
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute(
-                    """
-                    UPDATE notifications
-                    SET status = 'sent', completed_at = ?
-                    WHERE id = ?
-                """,
-                    (datetime.utcnow().isoformat(), notification_id),
-                )
-                await db.commit()
-                return True
+            await self._write(complete)
+            return True
 
         except Exception as e:
             self.logger.error(f"Failed to mark notification complete: {e}")
@@ -228,53 +272,55 @@ class NotificationQueue:
         Returns:
             bool: True if handled successfully
         """
-        try:
-            async with aiosqlite.connect(self.db_path) as db:
-                # Get current notification data
-                async with db.execute(
+
+        async def fail(db: aiosqlite.Connection) -> bool:
+            # Get current notification data
+            async with db.execute(
+                """
+                SELECT retry_count, max_retries
+                FROM notifications
+                WHERE id = ?
+            """,
+                (notification_id,),
+            ) as cursor:
+                row = await cursor.fetchone()
+
+            if not row:
+                return False
+
+            retry_count, max_retries = row
+            retry_count += 1
+
+            # Check if we should retry or move to DLQ
+            if should_retry and retry_count < max_retries:
+                # Schedule retry with exponential backoff
+                retry_delay = min(300, 30 * (2**retry_count))  # Max 5 minutes
+                retry_time = datetime.utcnow() + timedelta(seconds=retry_delay)
+
+                await db.execute(
                     """
-                    SELECT data, retry_count, max_retries
-                    FROM notifications
+                    UPDATE notifications
+                    SET status = 'pending',
+                        retry_count = ?,
+                        last_error = ?,
+                        scheduled_for = ?
                     WHERE id = ?
                 """,
-                    (notification_id,),
-                ) as cursor:
-                    row = await cursor.fetchone()
+                    (retry_count, error_message, retry_time.isoformat(), notification_id),
+                )
+
+                self.logger.info(
+                    f"Notification {notification_id} scheduled for retry {retry_count}/{max_retries}"
+                )
+
+            else:
+                # Move to dead letter queue
+                await self._move_to_dlq(db, notification_id, error_message, retry_count)
 
-                if not row:
-                    return False
-
-                data, retry_count, max_retries = row
-                retry_count += 1
-
-                # Check if we should retry or move to DLQ
-                if should_retry and retry_count < max_retries:
-                    # Schedule retry with exponential backoff
-                    retry_delay = min(300, 30 * (2**retry_count))  # Max 5 minutes
-                    retry_time = datetime.utcnow() + timedelta(seconds=retry_delay)
-
-                    await db.execute(
-                        """
-                        UPDATE notifications
-                        SET status = 'pending',
-                            retry_count = ?,
-                            last_error = ?,
-                            scheduled_for = ?
-                        WHERE id = ?
-                    """,
-                        (retry_count, error_message, retry_time.isoformat(), notification_id),
-                    )
-
-                    self.logger.info(
-                        f"Notification {notification_id} scheduled for retry {retry_count}/{max_retries}"
-                    )
-
-                else:
-                    # Move to dead letter queue
-                    await self._move_to_dlq(notification_id, error_message, retry_count)
-
-                await db.commit()
-                return True
+            return True
+
+        try:
+            return await self._write(fail)
 
         except Exception as e:
             self.logger.error(f"Failed to mark notification as failed: {e}")
@@ -293,7 +339,9 @@ class NotificationQueue:
             return self._stats_cache
 
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            await self._flush_pending_writes()
+
+            async with self._reader() as db:
                 stats = QueueStatistics(
                     pending_count=0,
                     processing_count=0,
@@ -409,24 +457,24 @@ class NotificationQueue:
         """
         cutoff_date = (datetime.utcnow() - timedelta(days=days)).isoformat()
 
-        try:
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute(
-                    """
-                    DELETE FROM notifications
-                    WHERE status IN ('sent', 'failed')
-                    AND completed_at < ?
-                """,
-                    (cutoff_date,),
-                )
+        async def cleanup(db: aiosqlite.Connection) -> int:
+            cursor = await db.execute(
+                """
+                DELETE FROM notifications
+                WHERE status IN ('sent', 'failed')
+                AND completed_at < ?
+            """,
+                (cutoff_date,),
+            )
+            return cursor.rowcount
 
-                deleted_count = cursor.rowcount
-                await db.commit()
+        try:
+            deleted_count = await self._write(cleanup)
 
-                if deleted_count > 0:
-                    self.logger.info(f"Cleaned up {deleted_count} old notifications")
+            if deleted_count > 0:
+                self.logger.info(f"Cleaned up {deleted_count} old notifications")
 
-                return deleted_count
+            return deleted_count
 
         except Exception as e:
             self.logger.error(f"Failed to cleanup old notifications: {e}")
@@ -443,7 +491,7 @@ class NotificationQueue:
             List of dead letter entries
         """
         try:
-            async with aiosqlite.connect(self.db_path) as db, db.execute(
+            async with self._reader() as db, db.execute(
                 """
                     SELECT id, original_data, failed_at, failure_reason,
                            total_attempts, error_history, reviewed, can_retry, retry_after
@@ -456,10 +504,7 @@ class NotificationQueue:
                 entries = []
                 async for row in cursor:
                     try:
-                        original_data = json.loads(row[1])
-                        original_notification = NotificationPayload.model_validate(
-                            original_data
-                        )
+                        original_notification = NotificationPayload.model_validate_json(row[1])
 
                         error_history = json.loads(row[5]) if row[5] else []
 
@@ -496,37 +541,39 @@ class NotificationQueue:
         Returns:
             bool: True if successfully moved back to main queue
         """
-        try:
-            async with aiosqlite.connect(self.db_path) as db:
-                # Get DLQ entry
-                async with db.execute(
-                    """
-                    SELECT original_data FROM dead_letter_queue WHERE id = ?
-                """,
-                    (dlq_entry_id,),
-                ) as cursor:
-                    row = await cursor.fetchone()
 
-                if not row:
-                    return False
+        async def retry(db: aiosqlite.Connection) -> NotificationPayload | None:
+            # Get DLQ entry
+            async with db.execute(
+                """
+                SELECT original_data FROM dead_letter_queue WHERE id = ?
+            """,
+                (dlq_entry_id,),
+            ) as cursor:
+                row = await cursor.fetchone()
 
-                # Parse and reset notification
-                original_data = json.loads(row[0])
-                notification = NotificationPayload.model_validate(original_data)
-                notification.retry_count = 0
-                notification.status = NotificationStatus.PENDING
-                notification.last_error = None
-                notification.scheduled_for = None
+            if not row:
+                return None
 
-                # Re-enqueue
-                await self._insert_notification(notification)
+            # Parse and reset notification
+            notification = NotificationPayload.model_validate_json(row[0])
+            notification.retry_count = 0
+            notification.status = NotificationStatus.PENDING
+            notification.last_error = None
+            notification.scheduled_for = None
 
-                # Remove from DLQ
-                await db.execute("DELETE FROM dead_letter_queue WHERE id = ?", (dlq_entry_id,))
-                await db.commit()
+            # Re-enqueue and remove from DLQ in the same transaction
+            await db.execute(_INSERT_SQL, self._notification_row(notification))
+            await db.execute("DELETE FROM dead_letter_queue WHERE id = ?", (dlq_entry_id,))
+            return notification
 
-                self.logger.info(f"Notification {notification.id} retried from DLQ")
-                return True
+        try:
+            notification = await self._write(retry)
+            if notification is None:
+                return False
+
+            self.logger.info(f"Notification {notification.id} retried from DLQ")
+            return True
 
         except Exception as e:
             self.logger.error(f"Failed to retry from DLQ: {e}")
@@ -552,6 +599,12 @@ class NotificationQueue:
             if self._batch_timer and not self._batch_timer.done():
                 self._batch_timer.cancel()
 
+            # Let the writer finish queued jobs, then close every connection
+            if self._writer_task and not self._writer_task.done():
+                self._write_jobs.put_nowait((None, None))
+                await self._writer_task
+            await self._close_connections()
+
             self.logger.info("NotificationQueue shutdown complete")
 
         except Exception as e:
@@ -559,78 +612,176 @@ class NotificationQueue:
 
     # Private implementation methods
 
-    async def _init_schema(self) -> None:
+    async def _write(self, job: WriteJob) -> Any:
+        """
+        Run a job on the writer connection and return its result.
+
+        The job is committed when it returns and rolled back if it raises.
+        """
+        if not self._db_initialized:
+            await self.initialize()
+        if self._writer_task is None or self._writer_task.done():
+            raise RuntimeError("NotificationQueue writer is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        self._write_jobs.put_nowait((job, future))
+        return await future
+
+    async def _writer_loop(self) -> None:
+        """Run write jobs one at a time, in submission order."""
+        while True:
+            job, future = await self._write_jobs.get()
+            if job is None:
+                break
+
+            try:
+                result = await job(self._writer)
+                await self._writer.commit()
+            except Exception as e:
+                try:
+                    await self._writer.rollback()
+                except Exception as rollback_error:
+                    self.logger.error(f"Failed to roll back write: {rollback_error}")
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a read-only connection from the pool."""
+        if not self._db_initialized:
+            await self.initialize()
+
+        reader = await self._readers.get()
+        try:
+            yield reader
+        finally:
+            self._readers.put_nowait(reader)
+
+    async def _close_connections(self) -> None:
+        """Close the writer and all pooled reader connections."""
+        self._db_initialized = False
+
+        connections = []
+        if self._writer is not None:
+            connections.append(self._writer)
+            self._writer = None
+        while not self._readers.empty():
+            connections.append(self._readers.get_nowait())
+
+        for connection in connections:
+            try:
+                await connection.close()
+            except Exception as e:
+                self.logger.warning(f"Failed to close queue connection: {e}")
+
+    async def _claim_pending(
+        self, db: aiosqlite.Connection, size: int
+    ) -> list[NotificationPayload]:
+        """Mark up to ``size`` due notifications as processing and return them."""
+        now = datetime.utcnow().isoformat()
+
+        if _SUPPORTS_RETURNING:
+            async with db.execute(_CLAIM_SQL, (now, now, size)) as cursor:
+                rows = await cursor.fetchall()
+            # RETURNING does not keep the order of the subquery
+            rows = sorted(rows, key=lambda row: (row[3], row[4]))
+        else:
+            async with db.execute(_PENDING_SQL, (now, size)) as cursor:
+                rows = await cursor.fetchall()
+            await db.executemany(_MARK_PROCESSING_SQL, [(now, row[0]) for row in rows])
+
+        notifications = []
+        unreadable = []
+        for notification_id, data, retry_count, _priority, _created_at in rows:
+            try:
+                notification = NotificationPayload.model_validate_json(data)
+            except ValueError as e:
+                self.logger.warning(f"Failed to parse notification data: {e}")
+                unreadable.append((now, notification_id))
+                continue
+            notification.retry_count = retry_count
+            notifications.append(notification)
+
+        # Fail rows that cannot be parsed so they are not claimed again
+        if unreadable:
+            await db.executemany(_MARK_UNREADABLE_SQL, unreadable)
+
+        return notifications
+
+    async def _init_schema(self, db: aiosqlite.Connection) -> None:
         """Initialize database schema."""
-        async with aiosqlite.connect(self.db_path) as db:
-            # Main notifications table
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS notifications (
-                    id TEXT PRIMARY KEY,
-                    created_at TEXT NOT NULL,
-                    data TEXT NOT NULL,
-                    status TEXT NOT NULL DEFAULT 'pending',
-                    priority INTEGER NOT NULL DEFAULT 1,
-                    retry_count INTEGER NOT NULL DEFAULT 0,
-                    max_retries INTEGER NOT NULL DEFAULT 3,
-                    scheduled_for TEXT,
-                    last_attempt TEXT,
-                    last_error TEXT,
-                    completed_at TEXT
-                )
-            """)
-
-            # Dead letter queue
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS dead_letter_queue (
-                    id TEXT PRIMARY KEY,
-                    original_data TEXT NOT NULL,
-                    failed_at TEXT NOT NULL,
-                    failure_reason TEXT NOT NULL,
-                    total_attempts INTEGER NOT NULL,
-                    error_history TEXT,
-                    reviewed INTEGER NOT NULL DEFAULT 0,
-                    can_retry INTEGER NOT NULL DEFAULT 1,
-                    retry_after TEXT
-                )
-            """)
+        # Main notifications table
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS notifications (
+                id TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL,
+                data TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                priority INTEGER NOT NULL DEFAULT 1,
+                retry_count INTEGER NOT NULL DEFAULT 0,
+                max_retries INTEGER NOT NULL DEFAULT 3,
+                scheduled_for TEXT,
+                last_attempt TEXT,
+                last_error TEXT,
+                completed_at TEXT
+            )
+        """)
+
+        # Dead letter queue
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS dead_letter_queue (
+                id TEXT PRIMARY KEY,
+                original_data TEXT NOT NULL,
+                failed_at TEXT NOT NULL,
+                failure_reason TEXT NOT NULL,
+                total_attempts INTEGER NOT NULL,
+                error_history TEXT,
+                reviewed INTEGER NOT NULL DEFAULT 0,
+                can_retry INTEGER NOT NULL DEFAULT 1,
+                retry_after TEXT
+            )
+        """)
 
-            # Indexes for performance
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_notifications_status_priority
-                ON notifications(status, priority, created_at)
-            """)
+        # Indexes for performance
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_notifications_status_priority
+            ON notifications(status, priority, created_at)
+        """)
 
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_notifications_scheduled
-                ON notifications(scheduled_for) WHERE scheduled_for IS NOT NULL
-            """)
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_notifications_scheduled
+            ON notifications(scheduled_for) WHERE scheduled_for IS NOT NULL
+        """)
 
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_notifications_created_status
-                ON notifications(created_at, status)
-            """)
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_notifications_created_status
+            ON notifications(created_at, status)
+        """)
 
-            await db.commit()
+        await db.commit()
 
-    async def _configure_sqlite(self) -> None:
+    async def _configure_sqlite(self, db: aiosqlite.Connection) -> None:
         """Configure SQLite for durability and performance."""
-        async with aiosqlite.connect(self.db_path) as db:
-            # WAL mode for better crash safety and concurrent access
-            await db.execute("PRAGMA journal_mode=WAL")
+        # Enable auto-vacuum for storage management (only takes effect
+        # before the first table is created)
+        await db.execute("PRAGMA auto_vacuum=INCREMENTAL")
 
-            # Full synchronous for safety-critical environment
-            await db.execute("PRAGMA synchronous=NORMAL")  # Balance safety/performance
+        # WAL mode for better crash safety and concurrent access
+        await db.execute("PRAGMA journal_mode=WAL")
 
-            # Larger cache for better performance
-            await db.execute("PRAGMA cache_size=-64000")  # 64MB cache
+        # Full synchronous for safety-critical environment
+        await db.execute("PRAGMA synchronous=NORMAL")  # Balance safety/performance
 
-            # WAL auto-checkpoint for space management
-            await db.execute("PRAGMA wal_autocheckpoint=1000")
+        # Larger cache for better performance
+        await db.execute("PRAGMA cache_size=-64000")  # 64MB cache
 
-            # Enable auto-vacuum for storage management
-            await db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        # WAL auto-checkpoint for space management
+        await db.execute("PRAGMA wal_autocheckpoint=1000")
 
-            await db.commit()
+        await db.commit()
 
     async def _batch_timeout_handler(self) -> None:
         """Handle write batch timeout."""
@@ -642,101 +793,88 @@ class NotificationQueue:
         except asyncio.CancelledError:
             pass
 
+    async def _flush_pending_writes(self) -> None:
+        """Flush the write batch so reads see every enqueued notification."""
+        if self._write_batch:
+            async with self._batch_lock:
+                await self._flush_write_batch()
+
     async def _flush_write_batch(self) -> None:
         """Flush pending write batch to database."""
         if not self._write_batch:
             return
 
-        try:
-            async with aiosqlite.connect(self.db_path) as db:
-                for notification in self._write_batch:
-                    await self._insert_notification_in_transaction(db, notification)
-                await db.commit()
+        batch, self._write_batch = self._write_batch, []
+        rows = [self._notification_row(notification) for notification in batch]
 
-            self.logger.debug(f"Flushed batch of {len(self._write_batch)} notifications")
-            self._write_batch.clear()
+        try:
+            await self._write(lambda db: db.executemany(_INSERT_SQL, rows))
+            self.logger.debug(f"Flushed batch of {len(batch)} notifications")
 
         except Exception as e:
             self.logger.error(f"Failed to flush write batch: {e}")
             # Keep notifications in batch for retry
+            self._write_batch[:0] = batch
+
+    @staticmethod
+    def _notification_row(notification: NotificationPayload) -> tuple:
+        """Build the parameters of an insert into the notifications table."""
+        return (
+            notification.id,
+            notification.created_at.isoformat(),
+            notification.model_dump_json(),
+            notification.status.value,
+            notification.priority,
+            notification.retry_count,
+            notification.max_retries,
+            notification.scheduled_for.isoformat() if notification.scheduled_for else None,
+            notification.last_attempt.isoformat() if notification.last_attempt else None,
+            notification.last_error,
+        )
 
-    async def _insert_notification(self, notification: NotificationPayload) -> None:
-        """Insert single notification (used for retries)."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await self._insert_notification_in_transaction(db, notification)
-            await db.commit()
-
-    async def _insert_notification_in_transaction(
-        self, db: aiosqlite.Connection, notification: NotificationPayload
+    async def _move_to_dlq(
+        self,
+        db: aiosqlite.Connection,
+        notification_id: str,
+        error_message: str,
+        total_attempts: int,
     ) -> None:
-        """Insert notification within existing transaction."""
-        data = notification.model_dump_json()
+        """Move notification to dead letter queue within the current write job."""
+        # Get original notification data
+        async with db.execute(
+            """
+            SELECT data FROM notifications WHERE id = ?
+        """,
+            (notification_id,),
+        ) as cursor:
+            row = await cursor.fetchone()
+
+        if not row:
+            return
 
+        # Insert into DLQ
+        dlq_id = f"dlq_{notification_id}_{int(time.time())}"
         await db.execute(
             """
-            INSERT OR REPLACE INTO notifications
-            (id, created_at, data, status, priority, retry_count, max_retries,
-             scheduled_for, last_attempt, last_error)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO dead_letter_queue
+            (id, original_data, failed_at, failure_reason, total_attempts,
+             error_history, reviewed, can_retry)
+            VALUES (?, ?, ?, ?, ?, ?, 0, 1)
         """,
             (
-                notification.id,
-                notification.created_at.isoformat(),
-                data,
-                notification.status.value,
-                notification.priority,
-                notification.retry_count,
-                notification.max_retries,
-                notification.scheduled_for.isoformat() if notification.scheduled_for else None,
-                notification.last_attempt.isoformat() if notification.last_attempt else None,
-                notification.last_error,
+                dlq_id,
+                row[0],  # original data
+                datetime.utcnow().isoformat(),
+                error_message,
+                total_attempts,
+                json.dumps([error_message]),  # Start error history
             ),
         )
 
-    async def _move_to_dlq(
-        self, notification_id: str, error_message: str, total_attempts: int
-    ) -> None:
-        """Move notification to dead letter queue."""
-        try:
-            async with aiosqlite.connect(self.db_path) as db:
-                # Get original notification data
-                async with db.execute(
-                    """
-                    SELECT data FROM notifications WHERE id = ?
-                """,
-                    (notification_id,),
-                ) as cursor:
-                    row = await cursor.fetchone()
-
-                if not row:
-                    return
+        # Remove from main queue
+        await db.execute("DELETE FROM notifications WHERE id = ?", (notification_id,))
 
-                # Insert into DLQ
-                dlq_id = f"dlq_{notification_id}_{int(time.time())}"
-                await db.execute(
-                    """
-                    INSERT INTO dead_letter_queue
-                    (id, original_data, failed_at, failure_reason, total_attempts,
-                     error_history, reviewed, can_retry)
-                    VALUES (?, ?, ?, ?, ?, ?, 0, 1)
-                """,
-                    (
-                        dlq_id,
-                        row[0],  # original data
-                        datetime.utcnow().isoformat(),
-                        error_message,
-                        total_attempts,
-                        json.dumps([error_message]),  # Start error history
-                    ),
-                )
-
-                # Remove from main queue
-                await db.execute("DELETE FROM notifications WHERE id = ?", (notification_id,))
-
-                self.logger.warning(f"Notification {notification_id} moved to DLQ: {error_message}")
-
-        except Exception as e:
-            self.logger.error(f"Failed to move notification to DLQ: {e}")
+        self.logger.warning(f"Notification {notification_id} moved to DLQ: {error_message}")
 
     async def _maintenance_loop(self) -> None:
         """Background maintenance tasks."""
@@ -748,9 +886,7 @@ class NotificationQueue:
                 await self.cleanup_old_notifications()
 
                 # Incremental vacuum for space management
-                async with aiosqlite.connect(self.db_path) as db:
-                    await db.execute("PRAGMA incremental_vacuum(100)")
-                    await db.commit()
+                await self._write(lambda db: db.execute("PRAGMA incremental_vacuum(100)"))
 
             except asyncio.CancelledError:
                 break
@@ -0,0 +1,546 @@
+"""
+Incremental rollups of notification delivery logs.
+
+Delivery logs are folded into minute, hour and day buckets per channel and
+notification type as they are flushed. Each bucket keeps counts, the sum,
+minimum and maximum of delivery times, error breakdowns and a latency
+sketch. All of these merge by addition, so a query over any time range reads
+a handful of buckets: day buckets for whole days, hour buckets for whole
+hours at the edges and minute buckets for the rest.
+
+Minute and hour buckets are pruned after a retention period; range edges
+older than that are rounded out to the next coarser resolution.
+
+Example:
+    >>> rollups = NotificationRollupEngine()
+    >>> await rollups.apply(session, delivery_logs)
+    >>> by_channel = await rollups.summarize(session, start, end, key=lambda row: row.channel)
+"""
+
+import math
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models.notification import NotificationStatus
+from backend.models.notification_analytics import (
+    NotificationDeliveryLog,
+    NotificationDeliveryRollup,
+    RollupResolution,
+)
+
+RESOLUTION_STEPS = {
+    RollupResolution.MINUTE: timedelta(minutes=1),
+    RollupResolution.HOUR: timedelta(hours=1),
+    RollupResolution.DAY: timedelta(days=1),
+}
+
+# Default retention per resolution; day rollups are kept indefinitely
+DEFAULT_RETENTION = {
+    RollupResolution.MINUTE: timedelta(days=2),
+    RollupResolution.HOUR: timedelta(days=90),
+}
+
+# Distinct error codes or messages tracked per bucket; the rest count as "other"
+MAX_ERROR_KEYS = 50
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def as_utc(value: datetime) -> datetime:
+    """Return ``value`` as an aware UTC datetime (SQLite returns naive values)."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def bucket_floor(value: datetime, resolution: RollupResolution) -> datetime:
+    """Start of the ``resolution`` bucket containing ``value``."""
+    step = RESOLUTION_STEPS[resolution]
+    return _EPOCH + ((as_utc(value) - _EPOCH) // step) * step
+
+
+def bucket_ceil(value: datetime, resolution: RollupResolution) -> datetime:
+    """Start of the first ``resolution`` bucket at or after ``value``."""
+    floor = bucket_floor(value, resolution)
+    return floor if floor == as_utc(value) else floor + RESOLUTION_STEPS[resolution]
+
+
+class LatencySketch:
+    """
+    Mergeable histogram of delivery times for percentile estimates.
+
+    Values fall into logarithmic bins of ratio ``GAMMA``, so any percentile
+    is estimated within about 2% relative error, and two sketches merge by
+    adding their bin counts.
+    """
+
+    GAMMA = 1.04
+
+    __slots__ = ("bins", "zero_count")
+
+    _LOG_GAMMA = math.log(GAMMA)
+
+    def __init__(self, bins: dict[int, int] | None = None, zero_count: int = 0) -> None:
+        self.bins: dict[int, int] = bins or {}
+        self.zero_count = zero_count
+
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.bins.values())
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Record ``count`` occurrences of ``value``."""
+        if value <= 0:
+            self.zero_count += count
+            return
+        index = math.ceil(math.log(value) / self._LOG_GAMMA)
+        self.bins[index] = self.bins.get(index, 0) + count
+
+    def merge(self, other: "LatencySketch") -> None:
+        """Add the counts of ``other`` to this sketch."""
+        self.zero_count += other.zero_count
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate the ``q`` quantile (0.0-1.0), or None if the sketch is empty."""
+        total = self.count
+        if total == 0:
+            return None
+
+        rank = q * (total - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                # Midpoint of the bin, within GAMMA of every value in it
+                return 2 * self.GAMMA**index / (self.GAMMA + 1)
+        return 2 * self.GAMMA ** max(self.bins) / (self.GAMMA + 1)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"zero": self.zero_count, "bins": {str(k): v for k, v in self.bins.items()}}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> "LatencySketch":
+        if not data:
+            return cls()
+        return cls({int(k): v for k, v in data.get("bins", {}).items()}, data.get("zero", 0))
+
+
+def _count_key(counts: dict[str, int], key: str, count: int = 1) -> None:
+    if key not in counts and len(counts) >= MAX_ERROR_KEYS:
+        key = "other"
+    counts[key] = counts.get(key, 0) + count
+
+
+def _latest(first: datetime | None, second: datetime | None) -> datetime | None:
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return max(as_utc(first), as_utc(second))
+
+
+@dataclass
+class DeliveryRollup:
+    """Delivery statistics of one bucket, or of several merged buckets."""
+
+    delivery_count: int = 0
+    success_count: int = 0
+    failure_count: int = 0
+    retry_count: int = 0
+    delivery_time_count: int = 0
+    delivery_time_sum: float = 0.0
+    delivery_time_min: float | None = None
+    delivery_time_max: float | None = None
+    latency: LatencySketch = field(default_factory=LatencySketch)
+    error_codes: dict[str, int] = field(default_factory=dict)
+    error_messages: dict[str, int] = field(default_factory=dict)
+    last_success_at: datetime | None = None
+    last_failure_at: datetime | None = None
+
+    @property
+    def success_rate(self) -> float:
+        return self.success_count / max(self.delivery_count, 1)
+
+    @property
+    def average_delivery_time(self) -> float | None:
+        if not self.delivery_time_count:
+            return None
+        return self.delivery_time_sum / self.delivery_time_count
+
+    def percentiles(self) -> dict[str, float]:
+        """Estimated p50, p95 and p99 delivery times in milliseconds."""
+        if self.latency.count == 0:
+            return {}
+        return {f"p{int(q * 100)}": self.latency.quantile(q) for q in (0.5, 0.95, 0.99)}
+
+    def add_log(self, log: NotificationDeliveryLog, timestamp: datetime) -> None:
+        """Count one delivery log recorded at ``timestamp``."""
+        self.delivery_count += 1
+        self.retry_count += log.retry_count or 0
+
+        if log.status == NotificationStatus.DELIVERED.value:
+            self.success_count += 1
+            self.last_success_at = _latest(self.last_success_at, log.delivered_at or timestamp)
+        elif log.status == NotificationStatus.FAILED.value:
+            self.failure_count += 1
+            self.last_failure_at = _latest(self.last_failure_at, timestamp)
+
+        if log.delivery_time_ms is not None:
+            value = float(log.delivery_time_ms)
+            self.delivery_time_count += 1
+            self.delivery_time_sum += value
+            self.delivery_time_min = (
+                value if self.delivery_time_min is None else min(self.delivery_time_min, value)
+            )
+            self.delivery_time_max = (
+                value if self.delivery_time_max is None else max(self.delivery_time_max, value)
+            )
+            self.latency.add(value)
+
+        if log.error_code:
+            _count_key(self.error_codes, log.error_code)
+        if log.error_message:
+            _count_key(self.error_messages, log.error_message)
+
+    def merge(self, other: "DeliveryRollup") -> None:
+        """Add the statistics of ``other`` to this rollup."""
+        self.delivery_count += other.delivery_count
+        self.success_count += other.success_count
+        self.failure_count += other.failure_count
+        self.retry_count += other.retry_count
+        self.delivery_time_count += other.delivery_time_count
+        self.delivery_time_sum += other.delivery_time_sum
+        if other.delivery_time_min is not None:
+            self.delivery_time_min = (
+                other.delivery_time_min
+                if self.delivery_time_min is None
+                else min(self.delivery_time_min, other.delivery_time_min)
+            )
+        if other.delivery_time_max is not None:
+            self.delivery_time_max = (
+                other.delivery_time_max
+                if self.delivery_time_max is None
+                else max(self.delivery_time_max, other.delivery_time_max)
+            )
+        self.latency.merge(other.latency)
+        for key, count in other.error_codes.items():
+            _count_key(self.error_codes, key, count)
+        for key, count in other.error_messages.items():
+            _count_key(self.error_messages, key, count)
+        self.last_success_at = _latest(self.last_success_at, other.last_success_at)
+        self.last_failure_at = _latest(self.last_failure_at, other.last_failure_at)
+
+    @classmethod
+    def from_row(cls, row: NotificationDeliveryRollup) -> "DeliveryRollup":
+        return cls(
+            delivery_count=row.delivery_count,
+            success_count=row.success_count,
+            failure_count=row.failure_count,
+            retry_count=row.retry_count,
+            delivery_time_count=row.delivery_time_count,
+            delivery_time_sum=row.delivery_time_sum,
+            delivery_time_min=row.delivery_time_min,
+            delivery_time_max=row.delivery_time_max,
+            latency=LatencySketch.from_dict(row.latency_sketch),
+            error_codes=dict(row.error_codes or {}),
+            error_messages=dict(row.error_messages or {}),
+            last_success_at=row.last_success_at,
+            last_failure_at=row.last_failure_at,
+        )
+
+    def row_values(self) -> dict[str, Any]:
+        """Column values of a rollup row holding these statistics."""
+        return {
+            "delivery_count": self.delivery_count,
+            "success_count": self.success_count,
+            "failure_count": self.failure_count,
+            "retry_count": self.retry_count,
+            "delivery_time_count": self.delivery_time_count,
+            "delivery_time_sum": self.delivery_time_sum,
+            "delivery_time_min": self.delivery_time_min,
+            "delivery_time_max": self.delivery_time_max,
+            "latency_sketch": self.latency.to_dict(),
+            "error_codes": self.error_codes,
+            "error_messages": self.error_messages,
+            "last_success_at": self.last_success_at,
+            "last_failure_at": self.last_failure_at,
+        }
+
+
+# Identifies one rollup row by its resolution, bucket start, channel and
+# notification type
+RollupKey = tuple[str, datetime, str, str]
+
+
+class NotificationRollupEngine:
+    """
+    Maintains and queries the delivery rollup table.
+
+    ``apply`` is called with each batch of flushed delivery logs, in the same
+    session that inserts them, so rollups and raw logs commit together.
+    """
+
+    def __init__(self, retention: dict[RollupResolution, timedelta] | None = None) -> None:
+        self.retention = dict(DEFAULT_RETENTION if retention is None else retention)
+
+    async def apply(
+        self,
+        session: AsyncSession,
+        logs: Iterable[NotificationDeliveryLog],
+    ) -> None:
+        """Fold delivery logs into their minute, hour and day buckets."""
+        pending: dict[RollupKey, DeliveryRollup] = {}
+        now = datetime.now(UTC)
+        for log in logs:
+            timestamp = as_utc(log.created_at) if log.created_at else now
+            for resolution in RollupResolution:
+                key = (
+                    resolution.value,
+                    bucket_floor(timestamp, resolution),
+                    log.channel,
+                    log.notification_type,
+                )
+                rollup = pending.get(key)
+                if rollup is None:
+                    rollup = pending[key] = DeliveryRollup()
+                rollup.add_log(log, timestamp)
+
+        if not pending:
+            return
+
+        # Merge into existing buckets, one query per resolution
+        for resolution in RollupResolution:
+            starts = {key[1] for key in pending if key[0] == resolution.value}
+            if not starts:
+                continue
+            result = await session.execute(
+                select(NotificationDeliveryRollup).where(
+                    NotificationDeliveryRollup.resolution == resolution.value,
+                    NotificationDeliveryRollup.bucket_start.in_(starts),
+                )
+            )
+            for row in result.scalars().all():
+                key = (row.resolution, as_utc(row.bucket_start), row.channel, row.notification_type)
+                rollup = pending.pop(key, None)
+                if rollup is not None:
+                    merged = DeliveryRollup.from_row(row)
+                    merged.merge(rollup)
+                    for column, value in merged.row_values().items():
+                        setattr(row, column, value)
+
+        session.add_all(
+            NotificationDeliveryRollup(
+                resolution=resolution,
+                bucket_start=bucket_start,
+                channel=channel,
+                notification_type=notification_type,
+                **rollup.row_values(),
+            )
+            for (resolution, bucket_start, channel, notification_type), rollup in pending.items()
+        )
+
+    async def backfill(self, session: AsyncSession, batch_size: int = 1000) -> int:
+        """
+        Fold delivery logs written before the rollup table existed into rollups.
+
+        Only runs while the rollup table is empty: once any bucket exists,
+        every later log has been folded in by ``apply`` as it was flushed.
+
+        Returns:
+            Number of delivery logs folded into the rollups
+        """
+        if await session.scalar(select(NotificationDeliveryRollup.id).limit(1)) is not None:
+            return 0
+
+        backfilled = 0
+        last_id = 0
+        while True:
+            result = await session.execute(
+                select(NotificationDeliveryLog)
+                .where(NotificationDeliveryLog.id > last_id)
+                .order_by(NotificationDeliveryLog.id)
+                .limit(batch_size)
+            )
+            logs = result.scalars().all()
+            if not logs:
+                return backfilled
+            await self.apply(session, logs)
+            await session.flush()
+            # Keep only the current batch in the identity map
+            session.expunge_all()
+            backfilled += len(logs)
+            last_id = logs[-1].id
+
+    def cover(
+        self,
+        start: datetime,
+        end: datetime,
+        now: datetime | None = None,
+    ) -> list[tuple[RollupResolution, datetime, datetime]]:
+        """
+        Split ``[start, end)`` into segments of whole buckets.
+
+        Returns (resolution, segment_start, segment_end) tuples using the
+        coarsest buckets that fit. Edges are rounded out to minutes, or to
+        the finest resolution still retained at that time.
+        """
+        now = now or datetime.now(UTC)
+        start = bucket_floor(start, self._edge_resolution(start, now))
+        end = bucket_ceil(end, self._edge_resolution(end, now))
+        if start >= end:
+            return []
+
+        segments = []
+        hour_start = bucket_ceil(start, RollupResolution.HOUR)
+        hour_end = bucket_floor(end, RollupResolution.HOUR)
+        if hour_start >= hour_end:
+            return [(RollupResolution.MINUTE, start, end)]
+
+        day_start = bucket_ceil(hour_start, RollupResolution.DAY)
+        day_end = bucket_floor(hour_end, RollupResolution.DAY)
+        segments.append((RollupResolution.MINUTE, start, hour_start))
+        if day_start < day_end:
+            segments.append((RollupResolution.HOUR, hour_start, day_start))
+            segments.append((RollupResolution.DAY, day_start, day_end))
+            segments.append((RollupResolution.HOUR, day_end, hour_end))
+        else:
+            segments.append((RollupResolution.HOUR, hour_start, hour_end))
+        segments.append((RollupResolution.MINUTE, hour_end, end))
+        return [segment for segment in segments if segment[1] < segment[2]]
+
+    async def summarize(
+        self,
+        session: AsyncSession,
+        start: datetime,
+        end: datetime,
+        key: Callable[[NotificationDeliveryRollup], Hashable] | None = None,
+        channel: str | None = None,
+        notification_type: str | None = None,
+    ) -> dict[Hashable, DeliveryRollup]:
+        """
+        Merge the rollups covering ``[start, end)`` into groups.
+
+        Args:
+            session: Database session
+            start: Start of range
+            end: End of range
+            key: Group key of a rollup row; without one, everything is merged
+                into the ``None`` group
+            channel: Optional channel filter
+            notification_type: Optional notification type filter
+
+        Returns:
+            Merged statistics by group key
+        """
+        segments = self.cover(start, end)
+        if not segments:
+            return {}
+
+        query = select(NotificationDeliveryRollup).where(
+            or_(
+                *(
+                    and_(
+                        NotificationDeliveryRollup.resolution == resolution.value,
+                        NotificationDeliveryRollup.bucket_start >= segment_start,
+                        NotificationDeliveryRollup.bucket_start < segment_end,
+                    )
+                    for resolution, segment_start, segment_end in segments
+                )
+            )
+        )
+        return await self._merge_rows(session, query, key, channel, notification_type)
+
+    async def series(
+        self,
+        session: AsyncSession,
+        resolution: RollupResolution,
+        start: datetime,
+        end: datetime,
+        channel: str | None = None,
+        notification_type: str | None = None,
+    ) -> dict[datetime, DeliveryRollup]:
+        """Merged statistics per ``resolution`` bucket starting within ``[start, end]``."""
+        query = select(NotificationDeliveryRollup).where(
+            NotificationDeliveryRollup.resolution == resolution.value,
+            NotificationDeliveryRollup.bucket_start >= start,
+            NotificationDeliveryRollup.bucket_start <= end,
+        )
+        return await self._merge_rows(
+            session,
+            query,
+            lambda row: as_utc(row.bucket_start),
+            channel,
+            notification_type,
+        )
+
+    async def latest_outcomes(
+        self, session: AsyncSession
+    ) -> dict[str, tuple[datetime | None, datetime | None]]:
+        """Most recent success and failure time of every channel."""
+        result = await session.execute(
+            select(
+                NotificationDeliveryRollup.channel,
+                func.max(NotificationDeliveryRollup.last_success_at),
+                func.max(NotificationDeliveryRollup.last_failure_at),
+            )
+            .where(NotificationDeliveryRollup.resolution == RollupResolution.DAY.value)
+            .group_by(NotificationDeliveryRollup.channel)
+        )
+        return {
+            channel: (
+                as_utc(last_success) if last_success else None,
+                as_utc(last_failure) if last_failure else None,
+            )
+            for channel, last_success, last_failure in result.all()
+        }
+
+    async def prune(self, session: AsyncSession, now: datetime | None = None) -> None:
+        """Delete buckets older than the retention of their resolution."""
+        now = now or datetime.now(UTC)
+        for resolution, retention in self.retention.items():
+            await session.execute(
+                delete(NotificationDeliveryRollup).where(
+                    NotificationDeliveryRollup.resolution == resolution.value,
+                    NotificationDeliveryRollup.bucket_start < now - retention,
+                )
+            )
+
+    def _edge_resolution(self, value: datetime, now: datetime) -> RollupResolution:
+        """Finest resolution whose buckets are still retained at ``value``."""
+        for resolution in (RollupResolution.MINUTE, RollupResolution.HOUR):
+            retention = self.retention.get(resolution)
+            if retention is None or as_utc(value) >= now - retention:
+                return resolution
+        return RollupResolution.DAY
+
+    async def _merge_rows(
+        self,
+        session: AsyncSession,
+        query,
+        key: Callable[[NotificationDeliveryRollup], Hashable] | None,
+        channel: str | None,
+        notification_type: str | None,
+    ) -> dict[Hashable, DeliveryRollup]:
+        if channel:
+            query = query.where(NotificationDeliveryRollup.channel == channel)
+        if notification_type:
+            query = query.where(NotificationDeliveryRollup.notification_type == notification_type)
+
+        result = await session.execute(query)
+        groups: dict[Hashable, DeliveryRollup] = {}
+        for row in result.scalars().all():
+            group_key = key(row) if key else None
+            group = groups.get(group_key)
+            if group is None:
+                group = groups[group_key] = DeliveryRollup()
+            group.merge(DeliveryRollup.from_row(row))
+        return groups
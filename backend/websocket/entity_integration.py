@@ -19,9 +19,9 @@ async def notify_entity_update(entity_id: str, payload: dict[str, Any]) -> None:
     """
     Notify WebSocket clients about an entity state update.
 
-    This function:
-      1. Broadcasts the entity update to data WebSocket clients
-      2. Publishes an entity_state_updated event
+    The update is queued on the WebSocket manager, which coalesces updates per
+    entity (latest value wins) and broadcasts them to all data clients once
+    per frame interval. This never waits on a client connection.
 
     Args:
         entity_id (str): The ID of the updated entity.
@@ -32,13 +32,8 @@ async def notify_entity_update(entity_id: str, payload: dict[str, Any]) -> None:
     """
     try:
         ws_manager = get_websocket_manager()
-        broadcast_data = {
-            "type": "entity_update",
-            "entity_id": entity_id,
-            "data": payload,
-        }
-        await ws_manager.broadcast_to_data_clients(broadcast_data)
-        logger.debug(f"Entity update for {entity_id} broadcasted to WebSocket clients")
+        await ws_manager.queue_entity_update(entity_id, payload)
+        logger.debug(f"Entity update for {entity_id} queued for WebSocket clients")
     except Exception as exc:
         logger.error(f"Failed to notify entity update via WebSocket: {exc}")
 
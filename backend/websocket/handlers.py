@@ -4,6 +4,7 @@ WebSocket manager feature for CoachIQ.
 This module implements a Feature-based WebSocket manager that handles:
 - WebSocket client connection management
 - Broadcasting updates to connected clients
+- Coalesced entity updates with per-client bounded send queues
 - Log streaming via WebSockets
 - CAN sniffer data streaming
 - Network map updates streaming
@@ -28,6 +29,162 @@ from backend.websocket.auth_handler import get_websocket_auth_handler
 logger = logging.getLogger(__name__)
 
 
+class DataClientSender:
+    """
+    Bounded outbound queue and writer task for a single data WebSocket client.
+
+    Messages are pre-serialized JSON strings shared by all clients, so a
+    broadcast costs one serialization regardless of the number of clients.
+    A slow client only backs up its own queue; once the queue is full the
+    configured drop policy applies:
+
+    - ``drop_oldest``: discard the oldest queued message to make room
+    - ``disconnect``: close the connection
+
+    On shutdown ``drain`` gives the writer a bounded time to send what is
+    still queued before the sender is stopped.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_queue_size: int = 256,
+        drop_policy: str = "drop_oldest",
+        on_close: Any | None = None,
+    ) -> None:
+        """
+        Initialize the sender and start its writer task.
+
+        Args:
+            websocket (WebSocket): The client connection
+            max_queue_size (int): Maximum number of queued outbound messages
+            drop_policy (str): Slow-consumer policy ("drop_oldest" or "disconnect")
+            on_close (Callable[[WebSocket], None] | None): Called once the writer stops
+        """
+        self.websocket = websocket
+        self.drop_policy = drop_policy
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue_size)
+        self.sent = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.closed = False
+        self._on_close = on_close
+        self._task = asyncio.create_task(self._writer())
+        self._close_task: asyncio.Task | None = None
+
+    def enqueue(self, text: str) -> bool:
+        """
+        Queue a serialized message without blocking.
+
+        Args:
+            text (str): The serialized JSON message
+
+        Returns:
+            bool: False if the client is closed or was disconnected as a slow consumer
+        """
+        if self.closed:
+            return False
+
+        if self.queue.full():
+            if self.drop_policy == "disconnect":
+                logger.warning(
+                    "Disconnecting slow data WebSocket client "
+                    f"{self.websocket.client.host}:{self.websocket.client.port}"
+                )
+                self.dropped += self.queue.qsize() + 1
+                self.disconnect()
+                return False
+            self.queue.get_nowait()
+            self.dropped += 1
+
+        self.queue.put_nowait(text)
+        depth = self.queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+        return True
+
+    async def _writer(self) -> None:
+        """Send queued messages to the client until it fails or is closed."""
+        try:
+            while True:
+                text = await self.queue.get()
+                await self.websocket.send_text(text)
+                self.sent += 1
+                self.queue.task_done()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.debug(f"Data WebSocket writer stopped: {e}")
+        finally:
+            self.closed = True
+            if self._on_close:
+                self._on_close(self.websocket)
+
+    def close(self) -> None:
+        """Stop the writer task, discarding queued messages."""
+        if not self.closed:
+            self.closed = True
+            self._task.cancel()
+
+    def disconnect(self) -> None:
+        """Stop the writer task and close the connection in the background."""
+        if not self.closed:
+            self.close()
+            # Keep a reference so the close is not garbage-collected mid-flight
+            self._close_task = asyncio.create_task(self._close_websocket())
+
+    async def _close_websocket(self) -> None:
+        with contextlib.suppress(Exception):
+            await self.websocket.close(code=1013)  # Try again later
+
+    async def drain(self, max_wait: float) -> bool:
+        """
+        Wait for the queued messages to be sent.
+
+        Args:
+            max_wait (float): Maximum seconds to wait
+
+        Returns:
+            bool: True if every queued message was sent in time
+        """
+        if self.closed:
+            return False
+        sent_all = asyncio.ensure_future(self.queue.join())
+        try:
+            # A writer that fails stops draining; don't wait out the timeout
+            await asyncio.wait(
+                {sent_all, self._task}, timeout=max_wait, return_when=asyncio.FIRST_COMPLETED
+            )
+            return sent_all.done()
+        finally:
+            sent_all.cancel()
+
+    async def stop(self) -> None:
+        """Cancel the writer task and wait for it to finish."""
+        self.closed = True
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await self._task
+        if self._close_task:
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await self._close_task
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return queue metrics for this client."""
+        return {
+            "client": f"{self.websocket.client.host}:{self.websocket.client.port}",
+            "queue_depth": self.queue.qsize(),
+            "max_queue_depth": self.max_depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+        }
+
+
+def _serialize_json(data: Any) -> str:
+    """Serialize a message the same way ``WebSocket.send_json`` does."""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
 class WebSocketManager(Feature):
     """
     Feature that manages WebSocket connections and broadcasting.
@@ -92,6 +249,19 @@ class WebSocketManager(Feature):
         # For background task management
         self.background_tasks: set[asyncio.Task] = set()
 
+        # Data client send pipeline
+        cfg = self.config or {}
+        self.entity_update_interval: float = cfg.get("entity_update_interval", 0.05)  # seconds
+        self.client_queue_size: int = cfg.get("client_queue_size", 256)
+        self.slow_consumer_policy: str = cfg.get("slow_consumer_policy", "drop_oldest")
+        self.shutdown_drain_timeout: float = cfg.get("shutdown_drain_timeout", 1.0)  # seconds
+        self._data_senders: dict[WebSocket, DataClientSender] = {}
+        self._pending_entity_updates: dict[str, dict[str, Any]] = {}
+        self._entity_flush_task: asyncio.Task | None = None
+        self.entity_updates_received = 0
+        self.entity_updates_sent = 0
+        self.entity_update_batches = 0
+
     async def startup(self) -> None:
         """Initialize WebSocket handlers."""
         logger.info("Starting WebSocket manager")
@@ -107,6 +277,19 @@ class WebSocketManager(Feature):
         """Clean up WebSocket connections and background tasks."""
         logger.info("Shutting down WebSocket manager")
 
+        # Stop the entity update pipeline (flushing what is pending)
+        if self._entity_flush_task:
+            self._entity_flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._entity_flush_task
+            self._entity_flush_task = None
+        self.flush_entity_updates()
+        senders = list(self._data_senders.values())
+        await asyncio.gather(*(sender.drain(self.shutdown_drain_timeout) for sender in senders))
+        for sender in senders:
+            await sender.stop()
+        self._data_senders.clear()
+
         # Cancel any background tasks
         for task in self.background_tasks:
             task.cancel()
@@ -136,6 +319,11 @@ class WebSocketManager(Feature):
         """Return the health status of the feature."""
         return "healthy"  # WebSocket handler always healthy
 
+    @property
+    def health_details(self) -> dict[str, Any]:
+        """Return detailed health information including send queue metrics."""
+        return {"status": "healthy", "data_broadcast": self.get_broadcast_stats()}
+
     @property
     def total_connections(self) -> int:
         """Return the total number of active WebSocket connections across all client sets."""
@@ -153,17 +341,132 @@ class WebSocketManager(Feature):
         """
         Broadcast data to all connected data WebSocket clients.
 
+        The message is serialized once and placed on every client's bounded
+        send queue; this never waits for a client to receive it.
+
         Args:
             data (dict[str, Any]): The data to broadcast as JSON
         """
-        to_remove = set()
-        for client in self.data_clients:
+        try:
+            text = _serialize_json(data)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Failed to serialize data WebSocket message: {e}")
+            return
+        self._enqueue_to_data_clients([text])
+
+    async def queue_entity_update(self, entity_id: str, payload: dict[str, Any]) -> None:
+        """
+        Queue an entity update for coalesced broadcast.
+
+        Updates are merged per entity (latest value wins) and flushed to all
+        data clients once per ``entity_update_interval``. An interval of zero
+        or less sends every update immediately.
+
+        Args:
+            entity_id (str): The updated entity
+            payload (dict[str, Any]): The full entity payload
+        """
+        self.entity_updates_received += 1
+        self._pending_entity_updates[entity_id] = payload
+
+        if self.entity_update_interval <= 0:
+            self.flush_entity_updates()
+            return
+
+        if self._entity_flush_task is None or self._entity_flush_task.done():
+            self._entity_flush_task = asyncio.create_task(self._entity_flush_loop())
+
+    async def _entity_flush_loop(self) -> None:
+        """Flush coalesced entity updates once per frame interval while any are pending."""
+        while self._pending_entity_updates:
+            await asyncio.sleep(self.entity_update_interval)
+            self.flush_entity_updates()
+
+    def flush_entity_updates(self) -> int:
+        """
+        Send all pending entity updates to the data clients.
+
+        Returns:
+            int: Number of entity updates sent
+        """
+        if not self._pending_entity_updates:
+            return 0
+
+        pending = self._pending_entity_updates
+        self._pending_entity_updates = {}
+
+        messages = []
+        for entity_id, payload in pending.items():
             try:
-                await client.send_json(data)
-            except Exception:
-                to_remove.add(client)
-        for client in to_remove:
-            self.data_clients.discard(client)
+                messages.append(
+                    _serialize_json(
+                        {"type": "entity_update", "entity_id": entity_id, "data": payload}
+                    )
+                )
+            except (TypeError, ValueError) as e:
+                logger.error(f"Failed to serialize entity update for {entity_id}: {e}")
+
+        self._enqueue_to_data_clients(messages)
+        self.entity_updates_sent += len(messages)
+        self.entity_update_batches += 1
+        return len(messages)
+
+    def _enqueue_to_data_clients(self, messages: list[str]) -> None:
+        """Place serialized messages on every data client's send queue."""
+        if not messages:
+            return
+        for client in list(self.data_clients):
+            sender = self._data_senders.get(client)
+            if sender is None:
+                sender = self._add_data_sender(client)
+            for text in messages:
+                if not sender.enqueue(text):
+                    self._remove_data_client(client)
+                    break
+
+    def _add_data_sender(self, websocket: WebSocket) -> DataClientSender:
+        """Create the send queue and writer task for a data client."""
+        sender = DataClientSender(
+            websocket,
+            max_queue_size=self.client_queue_size,
+            drop_policy=self.slow_consumer_policy,
+            on_close=self._remove_data_client,
+        )
+        self._data_senders[websocket] = sender
+        return sender
+
+    def _remove_data_client(self, websocket: WebSocket) -> None:
+        """Forget a data client and stop its writer."""
+        self.data_clients.discard(websocket)
+        sender = self._data_senders.pop(websocket, None)
+        if sender:
+            sender.close()
+
+    def get_broadcast_stats(self) -> dict[str, Any]:
+        """
+        Get data broadcast pipeline metrics.
+
+        Returns:
+            dict[str, Any]: Coalescing counters and per-client queue metrics
+        """
+        clients = [sender.get_stats() for sender in self._data_senders.values()]
+        return {
+            "entity_update_interval": self.entity_update_interval,
+            "slow_consumer_policy": self.slow_consumer_policy,
+            "client_queue_size": self.client_queue_size,
+            "pending_entity_updates": len(self._pending_entity_updates),
+            "entity_updates_received": self.entity_updates_received,
+            "entity_updates_sent": self.entity_updates_sent,
+            "entity_updates_coalesced": (
+                self.entity_updates_received
+                - self.entity_updates_sent
+                - len(self._pending_entity_updates)
+            ),
+            "entity_update_batches": self.entity_update_batches,
+            "total_queue_depth": sum(c["queue_depth"] for c in clients),
+            "total_dropped": sum(c["dropped"] for c in clients),
+            "clients": clients,
+        }
 
     async def broadcast_json_to_clients(
         self, clients: set[WebSocket], data: dict[str, Any]
@@ -277,6 +580,7 @@ class WebSocketManager(Feature):
             return
 
         self.data_clients.add(websocket)
+        self._add_data_sender(websocket)
         logger.info(
             f"Data WebSocket client connected: {websocket.client.host}:{websocket.client.port} "
             f"(user: {user_info.get('username', 'unknown')})"
@@ -414,7 +718,7 @@ class WebSocketManager(Feature):
                 f"Data WebSocket error for client {websocket.client.host}:{websocket.client.port}: {e}"
             )
         finally:
-            self.data_clients.discard(websocket)
+            self._remove_data_client(websocket)
             auth_handler.remove_connection(websocket)
 
     async def handle_log_connection(self, websocket: WebSocket) -> None:
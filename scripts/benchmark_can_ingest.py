@@ -0,0 +1,780 @@
+#!/usr/bin/env python3
+"""
+End-to-end CAN ingest benchmark with synthetic coach traffic.
+
+Drives ``CANBusFeature`` through its receive loop (deduplication, sniffer log,
+priority ingest, BAM reassembly, RV-C decode, entity update and WebSocket
+fan-out) with traffic generated from ``config/rvc.json`` and a coach mapping
+(the shipped Entegra Aspire mapping unless ``--mapping`` is given, since its
+devices use numeric instances that decoded frames can match).
+Frames come from an in-process fake bus by default, or from a SocketCAN
+``vcan`` interface when ``--vcan`` is given and python-can can open it.
+
+The generated mix contains frames for mapped entities, spec DGNs with
+unmapped instances, unknown DGNs, BAM product-identification sessions and
+bridged duplicates seen on a second interface. Decodable frames use the same
+arbitration-ID convention as the feature's simulation mode (the DGN key of
+the decoder map), so they reach the decode path.
+
+Results (throughput, p50/p99 per-frame latency, retained allocations per
+frame and per-stage counters) are printed and can be written as JSON, then
+compared against a previous run to catch regressions between commits. With
+``--trace-allocations`` the run also reports the backend source lines whose
+allocations are still alive at the end, per frame, as an allocation profile
+of the ingest path.
+
+Usage:
+    poetry run python scripts/benchmark_can_ingest.py --frames 20000 --rate 0
+    poetry run python scripts/benchmark_can_ingest.py --rate 2000 --output bench.json
+    poetry run python scripts/benchmark_can_ingest.py --output new.json --compare old.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import can
+
+# Allow running as a plain script from the repository root
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from backend.can.feature import CANBusFeature  # noqa: E402
+from backend.integrations.can.message_deduplicator import CANMessageDeduplicator  # noqa: E402
+from backend.integrations.rvc import BAMHandler, load_compiled_config  # noqa: E402
+
+logger = logging.getLogger("benchmark_can_ingest")
+
+PRIMARY_INTERFACE = "can0"
+BRIDGED_INTERFACE = "can1"
+PRODUCT_ID_PGN = 0x1FEF2
+RESULT_SCHEMA_VERSION = 1
+BENCHMARK_MAPPING_PATH = REPO_ROOT / "config" / "2021_Entegra_Aspire_44R.yml"
+# Concrete instance that "default" device mappings are bound to for the run
+DEFAULT_MAPPING_INSTANCE = 1
+
+
+@dataclass
+class TrafficProfile:
+    """Relative mix of synthetic frame kinds."""
+
+    mapped: float = 0.75
+    unmapped: float = 0.10
+    unknown: float = 0.05
+    bam: float = 0.02
+    duplicate_ratio: float = 0.15
+    seed: int = 1234
+
+
+@dataclass
+class BenchmarkConfig:
+    """Parameters for a single benchmark run."""
+
+    frames: int = 20000
+    rate: float = 0.0  # frames per second, 0 = as fast as possible
+    ws_clients: int = 2
+    ws_update_interval: float = 0.05
+    batch_receive: bool = True
+    max_batch_size: int = 256
+    priority_ingest: bool = True
+    trace_allocations: bool = False
+    allocation_sites: int = 10
+    use_vcan: bool = False
+    vcan_channel: str = "vcan0"
+    rvc_spec_path: str | None = None
+    device_mapping_path: str | None = None
+    profile: TrafficProfile = field(default_factory=TrafficProfile)
+
+
+@dataclass
+class SyntheticFrame:
+    """A generated frame and the interface it arrives on."""
+
+    interface: str
+    arbitration_id: int
+    data: bytes
+    kind: str
+
+
+def _encode_entry(
+    entry: dict[str, Any], rng: random.Random, fixed: dict[str, int] | None = None
+) -> bytes:
+    """Build a payload with a random in-range raw value for every signal."""
+    length = int(entry.get("length", 8) or 8)
+    raw = int.from_bytes(b"\xff" * length, "little")
+    for signal in entry.get("signals", []):
+        try:
+            start = int(signal["start_bit"])
+            width = int(signal["length"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if width <= 0 or start + width > length * 8:
+            continue
+        mask = (1 << width) - 1
+        name = signal.get("name")
+        if fixed and name in fixed:
+            value = fixed[name] & mask
+        else:
+            # Leave the all-ones "not available" value out of the random range
+            value = rng.randrange(mask) if mask > 1 else rng.randrange(2)
+        raw = (raw & ~(mask << start)) | (value << start)
+    return raw.to_bytes(length, "little")
+
+
+def _bam_frames(source_address: int, payload: bytes) -> list[tuple[int, bytes]]:
+    """Split a payload into a BAM announce frame and its data frames."""
+    packets = (len(payload) + 6) // 7
+    # BAM frames are broadcast: destination 0xFF in the PS byte
+    cm_id = (7 << 26) | ((BAMHandler.TP_CM_PGN | 0xFF) << 8) | source_address
+    dt_id = (7 << 26) | ((BAMHandler.TP_DT_PGN | 0xFF) << 8) | source_address
+    frames = [
+        (
+            cm_id,
+            bytes(
+                [
+                    BAMHandler.BAM_CONTROL_BYTE,
+                    len(payload) & 0xFF,
+                    len(payload) >> 8,
+                    packets,
+                    0xFF,
+                ]
+            )
+            + PRODUCT_ID_PGN.to_bytes(3, "little"),
+        )
+    ]
+    for seq in range(packets):
+        chunk = payload[seq * 7 : seq * 7 + 7].ljust(7, b"\xff")
+        frames.append((dt_id, bytes([seq + 1]) + chunk))
+    return frames
+
+
+def resolve_device_lookup(compiled) -> dict[tuple[str, str], dict]:
+    """
+    Return the compiled device lookup with ``default`` instances made concrete.
+
+    The ingest path looks devices up by the decoded numeric instance, so a
+    mapping keyed by the ``default`` placeholder would never match synthetic
+    traffic. Each such entry is bound to ``DEFAULT_MAPPING_INSTANCE`` unless
+    the DGN already maps that instance explicitly.
+
+    Args:
+        compiled: CompiledConfig from ``load_compiled_config``
+
+    Returns:
+        A new lookup; the cached compiled config is left untouched
+    """
+    lookup = dict(compiled.device_lookup)
+    for (dgn_hex, instance), device in compiled.device_lookup.items():
+        if instance == "default":
+            lookup.setdefault((dgn_hex, str(DEFAULT_MAPPING_INSTANCE)), device)
+    return lookup
+
+
+def generate_traffic(compiled, count: int, profile: TrafficProfile) -> list[SyntheticFrame]:
+    """
+    Generate a realistic synthetic frame sequence.
+
+    Args:
+        compiled: CompiledConfig from ``load_compiled_config``
+        count: Number of frames to generate (before duplicates)
+        profile: Frame mix and random seed
+
+    Returns:
+        Frames in arrival order, including bridged duplicates
+    """
+    rng = random.Random(profile.seed)
+    dgn_dict = compiled.config_data[0]
+    dgn_by_hex = {
+        entry["dgn_hex"].upper().removeprefix("0X"): dgn for dgn, entry in dgn_dict.items()
+    }
+
+    mapped_targets = []
+    for (dgn_hex, instance), device in resolve_device_lookup(compiled).items():
+        dgn = dgn_by_hex.get(dgn_hex)
+        if dgn is None or not isinstance(device, dict) or not device.get("entity_id"):
+            continue
+        try:
+            mapped_targets.append((dgn, int(instance)))
+        except ValueError:
+            continue
+    spec_dgns = [dgn for dgn, entry in dgn_dict.items() if entry.get("signals")]
+
+    kinds = ["mapped", "unmapped", "unknown", "bam"]
+    weights = [profile.mapped, profile.unmapped, profile.unknown, profile.bam]
+    if not mapped_targets:
+        weights[0] = 0.0
+    if not spec_dgns:
+        weights[1] = 0.0
+
+    frames: list[SyntheticFrame] = []
+    while len(frames) < count:
+        kind = rng.choices(kinds, weights)[0]
+        generated: list[tuple[int, bytes]]
+        if kind == "mapped":
+            dgn, instance = rng.choice(mapped_targets)
+            generated = [(dgn, _encode_entry(dgn_dict[dgn], rng, {"instance": instance}))]
+        elif kind == "unmapped":
+            dgn = rng.choice(spec_dgns)
+            generated = [(dgn, _encode_entry(dgn_dict[dgn], rng, {"instance": 250}))]
+        elif kind == "unknown":
+            dgn = (6 << 18) | rng.randrange(0x1EF00, 0x1FFFF)
+            while dgn in dgn_dict:
+                dgn = (6 << 18) | rng.randrange(0x1EF00, 0x1FFFF)
+            generated = [(dgn, bytes(rng.randrange(256) for _ in range(8)))]
+        else:
+            serial = rng.randrange(10**6)
+            generated = _bam_frames(
+                rng.randrange(0x40, 0x80), f"ACME*Bench*{serial:06d}*1*".encode()
+            )
+
+        for arbitration_id, data in generated:
+            frames.append(SyntheticFrame(PRIMARY_INTERFACE, arbitration_id, data, kind))
+            if kind != "bam" and rng.random() < profile.duplicate_ratio:
+                frames.append(
+                    SyntheticFrame(BRIDGED_INTERFACE, arbitration_id, data, "duplicate")
+                )
+
+    return frames
+
+
+class _BenchReader:
+    """Minimal stand-in for ``can.AsyncBufferedReader`` fed by the fake bus."""
+
+    def __init__(self) -> None:
+        self.buffer: asyncio.Queue = asyncio.Queue()
+
+    async def get_message(self) -> can.Message:
+        return await self.buffer.get()
+
+
+class _BenchClient:
+    """Fake data WebSocket client that counts received messages."""
+
+    def __init__(self, port: int) -> None:
+        self.client = type("Address", (), {"host": "bench", "port": port})()
+        self.received = 0
+        self.received_bytes = 0
+
+    async def send_text(self, text: str) -> None:
+        self.received += 1
+        self.received_bytes += len(text)
+
+    async def close(self, code: int = 1000) -> None:
+        pass
+
+
+class _BenchEntityFeature:
+    def __init__(self, entity_manager) -> None:
+        self._entity_manager = entity_manager
+
+    def get_entity_manager(self):
+        return self._entity_manager
+
+
+class _BenchFeatureManager:
+    """Feature manager exposing only the features the ingest path looks up."""
+
+    def __init__(self, features: dict[str, Any]) -> None:
+        self._features = features
+
+    def get_feature(self, name: str) -> Any:
+        return self._features.get(name)
+
+    def is_enabled(self, name: str) -> bool:
+        return name in self._features
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _allocation_sites(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, frames: int, limit: int
+) -> list[dict[str, Any]]:
+    """
+    Backend source lines with the most allocations retained over a run.
+
+    Args:
+        before: Snapshot taken before traffic started
+        after: Snapshot taken after all frames were processed
+        frames: Number of frames processed, for per-frame figures
+        limit: Number of sites to return
+
+    Returns:
+        Sites ordered by retained blocks, with per-frame block and byte counts
+    """
+    backend_only = [tracemalloc.Filter(True, str(REPO_ROOT / "backend" / "*"))]
+    stats = after.filter_traces(backend_only).compare_to(
+        before.filter_traces(backend_only), "lineno"
+    )
+    stats.sort(key=lambda stat: stat.count_diff, reverse=True)
+    frames = max(frames, 1)
+    sites = []
+    for stat in stats[:limit]:
+        if stat.count_diff <= 0:
+            break
+        frame = stat.traceback[0]
+        sites.append(
+            {
+                "site": f"{Path(frame.filename).relative_to(REPO_ROOT)}:{frame.lineno}",
+                "blocks_per_frame": stat.count_diff / frames,
+                "bytes_per_frame": stat.size_diff / frames,
+            }
+        )
+    return sites
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def _produce_fake(
+    frames: list[SyntheticFrame], readers: dict[str, _BenchReader], rate: float
+) -> None:
+    """Feed frames into the fake readers, paced to ``rate`` frames per second."""
+    started = time.perf_counter()
+    for index, frame in enumerate(frames):
+        if rate > 0:
+            due = started + index / rate
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        message = can.Message(
+            arbitration_id=frame.arbitration_id,
+            data=frame.data,
+            is_extended_id=True,
+            timestamp=time.time(),
+            channel=frame.interface,
+        )
+        readers[frame.interface].buffer.put_nowait(message)
+
+
+async def _produce_vcan(frames: list[SyntheticFrame], channel: str, rate: float) -> None:
+    """Send frames on a vcan interface, paced to ``rate`` frames per second."""
+    bus = can.Bus(interface="socketcan", channel=channel, receive_own_messages=False)
+    try:
+        started = time.perf_counter()
+        for index, frame in enumerate(frames):
+            if rate > 0:
+                delay = started + index / rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif index % 64 == 0:
+                await asyncio.sleep(0)  # let the receive side keep up
+            bus.send(
+                can.Message(
+                    arbitration_id=frame.arbitration_id, data=frame.data, is_extended_id=True
+                )
+            )
+    finally:
+        bus.shutdown()
+
+
+async def run_benchmark(config: BenchmarkConfig) -> dict[str, Any]:
+    """
+    Run one ingest benchmark and return its results.
+
+    Args:
+        config: Benchmark parameters
+
+    Returns:
+        JSON-serializable result dictionary
+    """
+    from backend.core import state as state_module
+    from backend.core.state import AppState
+    from backend.services import feature_manager as feature_manager_module
+    from backend.websocket import handlers as ws_module
+    from backend.websocket.handlers import WebSocketManager
+
+    compiled = load_compiled_config(
+        config.rvc_spec_path, config.device_mapping_path or str(BENCHMARK_MAPPING_PATH)
+    )
+    frames = generate_traffic(compiled, config.frames, config.profile)
+
+    # Wire up the collaborators the ingest path resolves through globals
+    app_state = AppState(config={})
+    entity_configs = {
+        device["entity_id"]: device
+        for device in compiled.config_data[3].values()
+        if isinstance(device, dict) and device.get("entity_id")
+    }
+    app_state.entity_manager.bulk_load_entities(entity_configs)
+
+    ws_manager = WebSocketManager(
+        config={"entity_update_interval": config.ws_update_interval}, app_state=app_state
+    )
+    clients = [_BenchClient(port) for port in range(config.ws_clients)]
+    ws_manager.data_clients.update(clients)
+
+    saved_globals = (
+        state_module.app_state,
+        ws_module.websocket_manager,
+        feature_manager_module._feature_manager,
+    )
+    state_module.app_state = app_state
+    ws_module.websocket_manager = ws_manager
+    feature_manager_module._feature_manager = _BenchFeatureManager(
+        {
+            "app_state": app_state,
+            "entity_manager": _BenchEntityFeature(app_state.entity_manager),
+            "websocket": ws_manager,
+        }
+    )
+
+    interfaces = [PRIMARY_INTERFACE] if config.use_vcan else [PRIMARY_INTERFACE, BRIDGED_INTERFACE]
+    feature = CANBusFeature(
+        config={
+            "interfaces": interfaces,
+            "batch_receive": config.batch_receive,
+            "max_batch_size": config.max_batch_size,
+            "priority_ingest": config.priority_ingest,
+        }
+    )
+    feature.decoder_map = compiled.config_data[0]
+    feature.entity_id_lookup = compiled.config_data[5]
+    feature.pgn_hex_to_name_map = compiled.config_data[7]
+    feature.device_lookup.update(resolve_device_lookup(compiled))
+    feature.status_lookup.update(compiled.status_lookup)
+    feature._deduplicator = CANMessageDeduplicator(window_ms=50)
+    feature.bam_handler = BAMHandler(session_timeout=30.0, max_concurrent_sessions=50)
+    feature._is_running = True
+
+    # Per-frame timing around the real receive handler
+    expected = len(frames)
+    latencies_us: list[float] = []
+    service_us: list[float] = []
+    done = asyncio.Event()
+    process_received = feature._process_received_message
+
+    async def timed_process(message, interface_name, received_at=None):
+        started = time.perf_counter()
+        await process_received(message, interface_name, received_at)
+        finished = time.perf_counter()
+        service_us.append((finished - started) * 1e6)
+        latencies_us.append((time.time() - message.timestamp) * 1e6)
+        if len(service_us) >= expected:
+            done.set()
+
+    feature._process_received_message = timed_process
+
+    # Frames admitted to the priority ingest stage are decoded by its worker;
+    # count them so the run only ends once the queues have drained
+    ingest_decoded = 0
+    process_ingest_batch = feature._process_ingest_batch
+
+    async def counted_ingest_batch(batch):
+        nonlocal ingest_decoded
+        await process_ingest_batch(batch)
+        ingest_decoded += len(batch)
+
+    def ingest_drained() -> bool:
+        if feature._ingest_handler is None:
+            return True
+        admitted = sum(
+            stats["enqueued"] - stats["evicted_queue_full"]
+            for stats in feature._ingest_handler.get_class_stats().values()
+        )
+        return ingest_decoded >= admitted
+
+    feature._process_ingest_batch = counted_ingest_batch
+    if config.priority_ingest:
+        feature.start_ingest_pipeline()
+    listen = feature._can_batch_listener_task if config.batch_receive else feature._can_listener_task
+
+    notifier = None
+    vcan_bus = None
+    readers: dict[str, Any] = {}
+    if config.use_vcan:
+        vcan_bus = can.Bus(interface="socketcan", channel=config.vcan_channel)
+        reader = can.AsyncBufferedReader()
+        notifier = can.Notifier(vcan_bus, [reader], loop=asyncio.get_running_loop())
+        readers[PRIMARY_INTERFACE] = reader
+        frames = [frame for frame in frames if frame.interface == PRIMARY_INTERFACE]
+        expected = len(frames)
+    else:
+        readers = {name: _BenchReader() for name in interfaces}
+
+    snapshot_before = None
+    if config.trace_allocations:
+        tracemalloc.start()
+        snapshot_before = tracemalloc.take_snapshot()
+    blocks_before = sys.getallocatedblocks()
+    started = time.perf_counter()
+
+    listener_tasks = [asyncio.create_task(listen(name, reader)) for name, reader in readers.items()]
+    if config.use_vcan:
+        producer = asyncio.create_task(_produce_vcan(frames, config.vcan_channel, config.rate))
+    else:
+        producer = asyncio.create_task(_produce_fake(frames, readers, config.rate))
+
+    try:
+        await producer
+        await asyncio.wait_for(done.wait(), timeout=max(30.0, expected / 100))
+        while not ingest_drained():
+            await asyncio.sleep(0)
+        elapsed = time.perf_counter() - started
+
+        # Flush coalesced entity updates and let the client writers drain
+        ws_manager.flush_entity_updates()
+        for _ in range(100):
+            if all(sender.queue.empty() for sender in ws_manager._data_senders.values()):
+                break
+            await asyncio.sleep(0)
+        blocks_after = sys.getallocatedblocks()
+        traced_peak = tracemalloc.get_traced_memory()[1] if config.trace_allocations else None
+        snapshot_after = tracemalloc.take_snapshot() if config.trace_allocations else None
+    finally:
+        if config.trace_allocations:
+            tracemalloc.stop()
+        feature._is_running = False
+        await feature.stop_ingest_pipeline()
+        for task in listener_tasks:
+            task.cancel()
+        await asyncio.gather(*listener_tasks, return_exceptions=True)
+        for sender in list(ws_manager._data_senders.values()):
+            await sender.stop()
+        if ws_manager._entity_flush_task:
+            ws_manager._entity_flush_task.cancel()
+        if notifier:
+            notifier.stop()
+        if vcan_bus:
+            vcan_bus.shutdown()
+        (
+            state_module.app_state,
+            ws_module.websocket_manager,
+            feature_manager_module._feature_manager,
+        ) = saved_globals
+
+    latencies_us.sort()
+    service_us.sort()
+    kinds: dict[str, int] = {}
+    for frame in frames:
+        kinds[frame.kind] = kinds.get(frame.kind, 0) + 1
+    processed = len(service_us)
+    ingest_classes = (
+        feature._ingest_handler.get_class_stats().values() if feature._ingest_handler else []
+    )
+
+    return {
+        "schema_version": RESULT_SCHEMA_VERSION,
+        "benchmark": "can_ingest",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "git_revision": _git_revision(),
+        "environment": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "config": asdict(config),
+        "frames": processed,
+        "frame_mix": kinds,
+        "elapsed_s": elapsed,
+        "throughput_fps": processed / elapsed if elapsed > 0 else 0.0,
+        "latency_us": {
+            "p50": _percentile(latencies_us, 50),
+            "p90": _percentile(latencies_us, 90),
+            "p99": _percentile(latencies_us, 99),
+            "max": latencies_us[-1] if latencies_us else 0.0,
+        },
+        "service_us": {
+            "p50": _percentile(service_us, 50),
+            "p99": _percentile(service_us, 99),
+            "mean": statistics.fmean(service_us) if service_us else 0.0,
+        },
+        "allocations": {
+            "retained_blocks_per_frame": (blocks_after - blocks_before) / processed
+            if processed
+            else 0.0,
+            "traced_peak_kib": traced_peak / 1024 if traced_peak is not None else None,
+            "sites": _allocation_sites(
+                snapshot_before, snapshot_after, processed, config.allocation_sites
+            )
+            if snapshot_after is not None
+            else [],
+        },
+        "stages": {
+            "duplicates_dropped": feature._deduplicator.get_stats()["hits"],
+            "sniffer_entries": len(app_state.can_command_sniffer_log),
+            "entity_updates": ws_manager.entity_updates_received,
+            "ws_updates_sent": ws_manager.entity_updates_sent,
+            "ws_messages_delivered": sum(client.received for client in clients),
+            "bam_sessions_open": feature.bam_handler.get_active_session_count(),
+            "ingest_rate_limited": sum(c["dropped_rate_limited"] for c in ingest_classes),
+            "ingest_evicted": sum(c["evicted_queue_full"] for c in ingest_classes),
+        },
+    }
+
+
+# Metrics compared between runs: (path, higher_is_better)
+COMPARED_METRICS = [
+    (("throughput_fps",), True),
+    (("latency_us", "p50"), False),
+    (("latency_us", "p99"), False),
+    (("service_us", "p50"), False),
+    (("service_us", "p99"), False),
+    (("allocations", "retained_blocks_per_frame"), False),
+]
+
+
+def compare_results(
+    baseline: dict[str, Any], current: dict[str, Any], tolerance: float = 0.10
+) -> list[str]:
+    """
+    Compare two benchmark results.
+
+    Args:
+        baseline: Result dictionary from an earlier run
+        current: Result dictionary from this run
+        tolerance: Allowed relative regression before a metric is flagged
+
+    Returns:
+        Human-readable descriptions of metrics that regressed beyond tolerance
+    """
+    regressions = []
+    for path, higher_is_better in COMPARED_METRICS:
+        old, new = baseline, current
+        for key in path:
+            old = old.get(key) if isinstance(old, dict) else None
+            new = new.get(key) if isinstance(new, dict) else None
+        if not isinstance(old, int | float) or not isinstance(new, int | float) or old <= 0:
+            continue
+        change = (new - old) / old
+        regressed = change < -tolerance if higher_is_better else change > tolerance
+        if regressed:
+            regressions.append(f"{'.'.join(path)}: {old:.2f} -> {new:.2f} ({change:+.1%})")
+    return regressions
+
+
+def print_report(result: dict[str, Any]) -> None:
+    """Print a short summary of a benchmark result."""
+    latency = result["latency_us"]
+    service = result["service_us"]
+    print(f"CAN ingest benchmark ({result.get('git_revision') or 'unknown revision'})")
+    print(f"  frames:      {result['frames']} {result['frame_mix']}")
+    print(f"  throughput:  {result['throughput_fps']:.0f} frames/s")
+    print(
+        f"  latency:     p50 {latency['p50']:.1f} us, p90 {latency['p90']:.1f} us, "
+        f"p99 {latency['p99']:.1f} us, max {latency['max']:.1f} us"
+    )
+    print(f"  service:     p50 {service['p50']:.1f} us, p99 {service['p99']:.1f} us")
+    print(
+        "  retained:    "
+        f"{result['allocations']['retained_blocks_per_frame']:.2f} blocks/frame"
+    )
+    if result["allocations"]["traced_peak_kib"] is not None:
+        print(f"  traced peak: {result['allocations']['traced_peak_kib']:.0f} KiB")
+    for site in result["allocations"].get("sites", []):
+        print(
+            f"    {site['blocks_per_frame']:6.2f} blocks/frame "
+            f"{site['bytes_per_frame']:8.1f} B/frame  {site['site']}"
+        )
+    print(f"  stages:      {result['stages']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="End-to-end CAN ingest benchmark")
+    parser.add_argument("--frames", type=int, default=20000, help="Frames to generate")
+    parser.add_argument(
+        "--rate", type=float, default=0.0, help="Frames per second (0 = as fast as possible)"
+    )
+    parser.add_argument("--ws-clients", type=int, default=2, help="Fake WebSocket data clients")
+    parser.add_argument(
+        "--ws-interval", type=float, default=0.05, help="Entity update coalescing interval"
+    )
+    parser.add_argument(
+        "--no-batch", action="store_true", help="Use the single-frame receive loop"
+    )
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument(
+        "--no-priority-ingest",
+        action="store_true",
+        help="Decode inline instead of through the priority ingest stage",
+    )
+    parser.add_argument("--duplicate-ratio", type=float, default=0.15)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument(
+        "--trace-allocations",
+        action="store_true",
+        help="Record peak memory and retained allocation sites via tracemalloc",
+    )
+    parser.add_argument(
+        "--allocation-sites", type=int, default=10, help="Allocation sites to report"
+    )
+    parser.add_argument("--vcan", metavar="CHANNEL", help="Send traffic over a vcan interface")
+    parser.add_argument("--spec", help="RV-C spec JSON override")
+    parser.add_argument("--mapping", help="Coach mapping YAML override")
+    parser.add_argument("--output", type=Path, help="Write the result JSON to this path")
+    parser.add_argument("--compare", type=Path, help="Baseline result JSON to compare against")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.10, help="Relative regression tolerance"
+    )
+    parser.add_argument("--log-level", default="CRITICAL", help="Log level for backend loggers")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    logging.getLogger("backend").setLevel(args.log_level.upper())
+
+    config = BenchmarkConfig(
+        frames=args.frames,
+        rate=args.rate,
+        ws_clients=args.ws_clients,
+        ws_update_interval=args.ws_interval,
+        batch_receive=not args.no_batch,
+        max_batch_size=args.max_batch_size,
+        priority_ingest=not args.no_priority_ingest,
+        trace_allocations=args.trace_allocations,
+        allocation_sites=args.allocation_sites,
+        use_vcan=bool(args.vcan),
+        vcan_channel=args.vcan or "vcan0",
+        rvc_spec_path=args.spec,
+        device_mapping_path=args.mapping,
+        profile=TrafficProfile(duplicate_ratio=args.duplicate_ratio, seed=args.seed),
+    )
+
+    result = asyncio.run(run_benchmark(config))
+    print_report(result)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare_results(baseline, result, args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("No regressions against baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
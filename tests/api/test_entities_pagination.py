@@ -0,0 +1,93 @@
+"""
+Tests for indexed pagination, cursors and ETags on the v2 entities listing.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.domains.entities import create_entities_router
+from backend.core.entity_manager import EntityManager
+from backend.models.entity_model import EntityConfig
+from backend.services.entity_service import EntityService
+
+
+@pytest.fixture
+def entity_manager() -> EntityManager:
+    manager = EntityManager()
+    for i in range(7):
+        manager.register_entity(
+            f"light_{i}",
+            EntityConfig(
+                device_type="light",
+                suggested_area="Kitchen" if i % 2 else "Bedroom",
+                friendly_name=f"Light {i}",
+            ),
+        )
+    manager.register_entity("tank_1", EntityConfig(device_type="tank", suggested_area="Kitchen"))
+    return manager
+
+
+@pytest.fixture
+def client(entity_manager) -> TestClient:
+    app = FastAPI()
+    app.state.entity_service = EntityService(Mock(), entity_manager=entity_manager)
+    app.state.feature_manager = Mock(is_enabled=Mock(return_value=True))
+    app.include_router(create_entities_router(), prefix="/api/v2/entities")
+    return TestClient(app)
+
+
+@pytest.mark.api
+def test_pages_through_sorted_results_with_cursor(client):
+    response = client.get("/api/v2/entities", params={"device_type": "light", "page_size": 3})
+    assert response.status_code == 200
+    data = response.json()
+    assert [e["entity_id"] for e in data["entities"]] == ["light_0", "light_1", "light_2"]
+    assert data["total_count"] == 7
+    assert data["has_next"] is True
+
+    seen = [e["entity_id"] for e in data["entities"]]
+    while data["next_cursor"]:
+        data = client.get(
+            "/api/v2/entities",
+            params={"device_type": "light", "page_size": 3, "cursor": data["next_cursor"]},
+        ).json()
+        seen.extend(e["entity_id"] for e in data["entities"])
+
+    assert seen == [f"light_{i}" for i in range(7)]
+    assert data["has_next"] is False
+
+
+@pytest.mark.api
+def test_page_number_and_filters(client):
+    data = client.get(
+        "/api/v2/entities", params={"area": "Kitchen", "page": 2, "page_size": 2}
+    ).json()
+
+    assert [e["entity_id"] for e in data["entities"]] == ["light_5", "tank_1"]
+    assert data["total_count"] == 4
+    assert data["filters_applied"]["area"] == "Kitchen"
+
+
+@pytest.mark.api
+def test_if_none_match_returns_304_until_registry_changes(client, entity_manager):
+    first = client.get("/api/v2/entities")
+    etag = first.headers["ETag"]
+
+    cached = client.get("/api/v2/entities", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+
+    entity_manager.update_entity_state("light_0", {"state": "on"})
+
+    refreshed = client.get("/api/v2/entities", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+
+
+@pytest.mark.api
+def test_invalid_cursor_is_rejected(client):
+    response = client.get("/api/v2/entities", params={"cursor": "%%%"})
+    assert response.status_code == 400
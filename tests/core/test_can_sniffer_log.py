@@ -0,0 +1,114 @@
+"""Tests for the ring-buffer CAN sniffer log."""
+
+import pytest
+
+from backend.core.can_sniffer_log import CANSnifferLog
+from backend.integrations.can.frame import FrameRecord, interface_index
+
+
+def _rx(timestamp: float, can_id: int, interface: str = "can0") -> dict:
+    return {
+        "timestamp": timestamp,
+        "interface": interface,
+        "can_id": f"{can_id:08X}",
+        "data": "00",
+        "direction": "rx",
+    }
+
+
+def _tx(timestamp: float, can_id: int, iface: str = "can0") -> dict:
+    return {
+        "timestamp": timestamp,
+        "direction": "tx",
+        "arbitration_id": can_id,
+        "iface": iface,
+        "source_addr": can_id & 0xFF,
+    }
+
+
+class TestCANSnifferLog:
+    """Test cases for CANSnifferLog."""
+
+    def test_wraps_at_capacity(self):
+        log = CANSnifferLog(capacity=3)
+        entries = [_rx(100.0 + i, 0x19FEDA00 | i) for i in range(5)]
+        log.extend(entries)
+
+        assert len(log) == 3
+        assert log.to_list() == entries[2:]
+        assert entries[0] not in log
+        assert log.total_count == 5
+        assert log.get_stats()["overwritten"] == 2
+
+    def test_query_by_time_range(self):
+        log = CANSnifferLog(capacity=4)
+        log.extend([_rx(100.0 + i, 0x100 + i) for i in range(6)])  # Keeps 102..105
+
+        result = log.query(start_time=103.0, end_time=104.0)
+        assert [e["timestamp"] for e in result] == [103.0, 104.0]
+        assert log.query(end_time=101.0) == []
+        assert [e["timestamp"] for e in log.query(start_time=104.5)] == [105.0]
+
+    def test_query_by_pgn_source_and_direction(self):
+        log = CANSnifferLog()
+        log.append(_rx(1.0, 0x19FEDA42))
+        log.append(_tx(2.0, 0x19FEDBF9))
+        log.append(_rx(3.0, 0x19FEDA43, interface="can1"))
+        log.append({"timestamp": 4.0, "message": "no id"})
+
+        assert [e["timestamp"] for e in log.query(pgn=0x1FEDA)] == [1.0, 3.0]
+        assert [e["timestamp"] for e in log.query(source_addr=0xF9)] == [2.0]
+        assert [e["timestamp"] for e in log.query(direction="tx")] == [2.0]
+        assert [e["timestamp"] for e in log.query(interface="can1")] == [3.0]
+        assert [e["timestamp"] for e in log.query(interface="can0")] == [1.0, 2.0]
+
+    def test_query_limit_returns_newest(self):
+        log = CANSnifferLog()
+        log.extend([_rx(float(i), 0x100) for i in range(10)])
+
+        assert [e["timestamp"] for e in log.query(limit=3)] == [7.0, 8.0, 9.0]
+        assert log.query(limit=0) == []
+
+    def test_running_counters_and_rate(self):
+        log = CANSnifferLog(capacity=2)
+        for i in range(20):
+            log.append(_rx(1000.0 + i * 0.5, 0x100))
+        log.append(_tx(1009.9, 0x100))
+
+        stats = log.get_stats()
+        assert stats["direction_counts"] == {"rx": 20, "tx": 1}
+        assert stats["interface_counts"] == {"can0": 21}
+        # 21 messages in seconds 1000..1009
+        assert log.message_rate(10.0, now=1009.9) == pytest.approx(2.1)
+        # Old buckets fall out of the window
+        assert log.message_rate(10.0, now=1015.0) == pytest.approx(0.9)
+        assert log.message_rate(10.0, now=2000.0) == 0.0
+
+    def test_frame_records_are_materialized_on_read(self):
+        log = CANSnifferLog()
+        frame = FrameRecord(
+            0x19FEDA42, memoryview(bytearray(b"\x01\xff")), 5.0, interface_index("can1")
+        )
+        log.append(_rx(4.0, 0x19FEDB42))
+        log.append(frame)
+
+        assert frame in log
+        assert log.query(source_addr=0x42, interface="can1") == [
+            {
+                "timestamp": 5.0,
+                "interface": "can1",
+                "can_id": "19FEDA42",
+                "data": "01FF",
+                "dlc": 2,
+                "is_extended": True,
+                "direction": "rx",
+                "decoded": None,
+                "origin": "other",
+            }
+        ]
+        assert [e["timestamp"] for e in log.query(pgn=0x1FEDA)] == [5.0]
+        assert log.get_stats()["interface_counts"] == {"can0": 1, "can1": 1}
+
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            CANSnifferLog(capacity=0)
@@ -0,0 +1,68 @@
+"""Tests for the pending-command correlation index."""
+
+from backend.core.command_correlation import PendingCommandIndex
+
+
+def _cmd(timestamp: float, instance: int | None, dgn_hex: str = "1FEDB", **extra) -> dict:
+    return {"timestamp": timestamp, "instance": instance, "dgn_hex": dgn_hex, **extra}
+
+
+class TestPendingCommandIndex:
+    """Test cases for PendingCommandIndex."""
+
+    def test_mapping_match_is_preferred(self):
+        index = PendingCommandIndex()
+        heuristic = _cmd(100.0, 5, dgn_hex="1FFFF")
+        mapped = _cmd(100.1, 5)
+        index.add(heuristic)
+        index.add(mapped, status_dgn="1FEDA")
+
+        assert index.match("1FEDA", 5, 100.3) == (mapped, "high")
+        assert index.match("1FEDA", 5, 100.3) == (heuristic, "low")
+        assert index.match("1FEDA", 5, 100.3) is None
+        assert len(index) == 0
+
+    def test_match_windows(self):
+        index = PendingCommandIndex()
+        index.add(_cmd(100.0, 1), status_dgn="1FEDA")
+        index.add(_cmd(100.0, 2))
+
+        # Responses older than the command never match
+        assert index.match("1FEDA", 1, 99.9) is None
+        # Heuristic matches need a response within 0.5 s
+        assert index.match(None, 2, 100.6) is None
+        # Mapped matches allow up to 1 s
+        assert index.match("1FEDA", 1, 100.9)[1] == "high"
+
+    def test_commands_expire_in_time_order(self):
+        index = PendingCommandIndex(max_age=2.0)
+        index.add(_cmd(101.0, 1))
+        index.add(_cmd(100.0, 2))  # Logged out of order
+        index.add(_cmd(102.5, 3))
+
+        assert [cmd["instance"] for cmd in index] == [1, 3]
+        index.expire(103.5)
+        assert [cmd["instance"] for cmd in index] == [3]
+
+    def test_for_entity(self):
+        index = PendingCommandIndex()
+        index.add(_cmd(100.0, 1, entity_id="light_1"))
+        index.add(_cmd(100.2, 1, entity_id="light_1"))
+        index.add(_cmd(100.2, 2, entity_id="light_2"))
+
+        assert len(index.for_entity("light_1", 100.5)) == 2
+        index.match(None, 1, 100.3)
+        assert [cmd["timestamp"] for cmd in index.for_entity("light_1", 100.5)] == [100.2]
+        assert index.for_entity("light_1", 103.0) == []
+
+    def test_latency_histogram(self):
+        index = PendingCommandIndex()
+        index.add(_cmd(100.0, 1), status_dgn="1FEDA")
+        index.add(_cmd(100.0, 2))
+        index.match("1FEDA", 1, 100.02)
+        index.match(None, 2, 100.3)
+
+        stats = index.get_latency_stats()
+        assert stats["high"]["count"] == 1
+        assert stats["high"]["buckets"]["0.025"] == 1
+        assert stats["low"]["buckets"]["0.5"] == 1
@@ -0,0 +1,103 @@
+"""Tests for the compact entity history store."""
+
+import time
+
+import pytest
+
+from backend.models.entity_history import KEYFRAME_INTERVAL, EntityHistory
+from backend.models.entity_model import Entity
+
+FIELDS = ("state", "value")
+
+
+def _filled(count: int, max_length: int = 1000) -> EntityHistory:
+    history = EntityHistory(FIELDS, max_length=max_length)
+    for i in range(count):
+        history.append({"state": "on" if i % 2 else "off", "value": {"n": i // 3}}, float(i))
+    return history
+
+
+class TestEntityHistory:
+    """Test cases for EntityHistory."""
+
+    def test_rebuilds_full_states_from_deltas(self):
+        history = _filled(KEYFRAME_INTERVAL * 3 + 5)
+
+        entries = history.select()
+        assert len(entries) == KEYFRAME_INTERVAL * 3 + 5
+        for i, (timestamp, state) in enumerate(entries):
+            assert timestamp == float(i)
+            assert state == {"state": "on" if i % 2 else "off", "value": {"n": i // 3}}
+
+    def test_unchanged_updates_share_empty_delta(self):
+        history = EntityHistory(FIELDS)
+        for i in range(5):
+            history.append({"state": "on", "value": {}}, float(i))
+
+        assert all(delta is history._deltas[1] for delta in history._deltas[1:])
+        assert [state for _, state in history.select()] == [{"state": "on", "value": {}}] * 5
+
+    def test_time_range_and_count(self):
+        history = _filled(100)
+
+        selected = history.select(since=10.0, until=20.0)
+        assert [t for t, _ in selected] == [float(i) for i in range(10, 21)]
+        assert [t for t, _ in history.select(since=90.0, count=3)] == [97.0, 98.0, 99.0]
+        assert history.select(since=200.0) == []
+
+    def test_max_length_drops_oldest(self):
+        history = _filled(250, max_length=40)
+
+        entries = history.select()
+        assert len(history) == 40
+        assert entries[0] == (210.0, {"state": "off", "value": {"n": 70}})
+        assert entries[-1] == (249.0, {"state": "on", "value": {"n": 83}})
+
+    def test_prune_before(self):
+        history = _filled(50)
+        history.prune_before(45.0)
+
+        assert [t for t, _ in history.select()] == [45.0, 46.0, 47.0, 48.0, 49.0]
+        assert history.select()[0][1] == {"state": "on", "value": {"n": 15}}
+
+    def test_out_of_order_timestamps(self):
+        history = EntityHistory(FIELDS)
+        for timestamp in (5.0, 1.0, 2.0, 7.0):
+            history.append({"state": str(timestamp)}, timestamp)
+
+        assert [t for t, _ in history.select(since=2.0)] == [5.0, 2.0, 7.0]
+
+        history.pop_oldest()
+        assert [t for t, _ in history.select(since=2.0)] == [2.0, 7.0]
+
+    def test_downsample_keeps_newest(self):
+        history = _filled(100)
+
+        selected = history.select(max_points=5)
+        assert len(selected) == 5
+        assert selected[-1][0] == 99.0
+        assert selected[0][0] == 0.0
+
+    def test_invalid_max_length(self):
+        with pytest.raises(ValueError):
+            EntityHistory(FIELDS, max_length=0)
+
+
+class TestEntityHistoryIntegration:
+    """Entity.get_history materializes EntityState objects from the store."""
+
+    def test_get_history_returns_entity_states(self):
+        entity = Entity("light_1", {"device_type": "light", "friendly_name": "Light"})
+        now = time.time()
+        entity.update_state({"state": "on", "brightness": 80, "timestamp": now})
+        entity.update_state({"state": "off", "timestamp": now + 1})
+
+        history = entity.get_history()
+        assert [state.state for state in history] == ["unknown", "on", "off"]
+        assert history[-1].timestamp == now + 1
+        assert history[-1].friendly_name == "Light"
+        assert history[-1].model_dump() == entity.get_state().model_dump()
+        assert entity.last_known_brightness == 80
+
+        assert [state.state for state in entity.get_history(since=now + 0.5)] == ["off"]
+        assert len(entity.get_history(count=1)) == 1
@@ -422,6 +422,129 @@ class TestBulkOperations:
         assert len(entity_manager.light_entity_ids) == 0
 
 
+class TestEntityIndexes:
+    """Test indexed queries, pagination and the registry version."""
+
+    @pytest.fixture
+    def indexed_manager(self, entity_manager):
+        """Setup entities spanning several index values."""
+        for i in range(5):
+            entity_manager.register_entity(
+                f"light_{i}",
+                EntityConfig(
+                    device_type="light",
+                    suggested_area="Kitchen" if i % 2 else "Bedroom",
+                    groups=["lights", f"zone_{i % 2}"],
+                ),
+            )
+        entity_manager.register_entity(
+            "tank_1", EntityConfig(device_type="tank", suggested_area="Kitchen")
+        )
+        entity_manager.register_entity(
+            "engine_1",
+            EntityConfig(device_type="sensor", protocol="j1939", secondary_protocols=["rvc"]),
+        )
+        return entity_manager
+
+    @pytest.mark.unit
+    def test_query_entity_ids_intersects_indexes(self, indexed_manager):
+        """Test index queries return sorted IDs matching all filters."""
+        assert indexed_manager.query_entity_ids(device_type="light", area="Kitchen") == [
+            "light_1",
+            "light_3",
+        ]
+        assert indexed_manager.query_entity_ids(group="zone_0") == [
+            "light_0",
+            "light_2",
+            "light_4",
+        ]
+        assert indexed_manager.query_entity_ids(protocol="j1939") == ["engine_1"]
+        assert "engine_1" in indexed_manager.query_entity_ids(protocol="rvc")
+        assert indexed_manager.query_entity_ids(device_type="missing") == []
+        assert len(indexed_manager.query_entity_ids()) == 7
+
+    @pytest.mark.unit
+    def test_filter_entities_matches_index(self, indexed_manager):
+        """Test filter_entities uses the indexes and keeps registration order."""
+        result = indexed_manager.filter_entities(area="Kitchen")
+        assert list(result) == ["light_1", "light_3", "tank_1"]
+
+    @pytest.mark.unit
+    def test_secondary_protocol_is_indexed(self, entity_manager):
+        """Test that a deduplicated registration indexes the new protocol."""
+        entity_manager.register_entity("tank", EntityConfig(device_type="tank"), protocol="rvc")
+        entity_manager.register_entity(
+            "tank_j1939", EntityConfig(device_type="tank", physical_id="tank"), protocol="j1939"
+        )
+
+        assert entity_manager.query_entity_ids(protocol="j1939") == ["tank"]
+
+    @pytest.mark.unit
+    def test_page_entity_ids_with_cursor(self, indexed_manager):
+        """Test offset and cursor pagination over sorted IDs."""
+        ids = indexed_manager.query_entity_ids()
+
+        page, has_next = indexed_manager.page_entity_ids(ids, 3)
+        assert page == ["engine_1", "light_0", "light_1"]
+        assert has_next is True
+
+        page, has_next = indexed_manager.page_entity_ids(ids, 3, after=page[-1])
+        assert page == ["light_2", "light_3", "light_4"]
+
+        page, has_next = indexed_manager.page_entity_ids(ids, 3, after=page[-1])
+        assert page == ["tank_1"]
+        assert has_next is False
+
+    @pytest.mark.unit
+    def test_version_tracks_registrations_and_state_changes(self, indexed_manager):
+        """Test that the registry version changes on every update path."""
+        version = indexed_manager.version
+
+        indexed_manager.update_entity_state("light_0", {"state": "on"})
+        assert indexed_manager.version == version + 1
+
+        # Direct entity updates bypassing the manager are tracked too
+        indexed_manager.get_entity("light_1").update_state({"state": "on"})
+        assert indexed_manager.version == version + 2
+
+        indexed_manager.register_entity("light_9", EntityConfig(device_type="light"))
+        assert indexed_manager.version > version + 2
+        assert "light_9" in indexed_manager.query_entity_ids(device_type="light")
+
+    @pytest.mark.unit
+    def test_state_updates_reindex_entity(self, indexed_manager):
+        """Test that state updates to indexed fields move the entity in the indexes."""
+        assert indexed_manager.query_entity_ids(area="Kitchen") == ["light_1", "light_3", "tank_1"]
+
+        indexed_manager.update_entity_state(
+            "light_1", {"suggested_area": "Bedroom", "groups": ["lights", "night"]}
+        )
+        assert indexed_manager.query_entity_ids(area="Kitchen") == ["light_3", "tank_1"]
+        assert "light_1" in indexed_manager.query_entity_ids(area="Bedroom")
+        assert indexed_manager.query_entity_ids(group="night") == ["light_1"]
+        assert "light_1" not in indexed_manager.query_entity_ids(group="zone_1")
+
+        # Direct entity updates are re-indexed too
+        indexed_manager.get_entity("tank_1").update_state({"device_type": "sensor"})
+        assert indexed_manager.query_entity_ids(device_type="tank") == []
+
+    @pytest.mark.unit
+    def test_entities_without_area_are_indexed_as_unknown(self, indexed_manager):
+        """Test that a missing suggested_area matches the state default."""
+        assert indexed_manager.query_entity_ids(area="Unknown") == ["engine_1"]
+        assert indexed_manager.query_entity_ids(area=None) == indexed_manager.query_entity_ids()
+
+    @pytest.mark.unit
+    def test_bulk_load_resets_indexes(self, indexed_manager):
+        """Test bulk loading rebuilds the indexes."""
+        indexed_manager.bulk_load_entities(
+            {"lock_1": EntityConfig(device_type="lock", suggested_area="Entry")}
+        )
+
+        assert indexed_manager.query_entity_ids(device_type="light") == []
+        assert indexed_manager.query_entity_ids(area="Entry") == ["lock_1"]
+
+
 class TestLightEntityMethods:
     """Test light entity specific methods."""
 
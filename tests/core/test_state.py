@@ -100,6 +100,22 @@ class TestAppState:
         assert "recent" in commands
         assert "new" in commands
 
+    def test_try_group_response(self, app_state):
+        """Test grouping a status response with the command it answers."""
+        app_state.known_command_status_pairs["1FEDB"] = "1FEDA"
+        command = {"timestamp": 100.0, "instance": 3, "dgn_hex": "1FEDB"}
+        app_state.add_pending_command(command)
+
+        response = {"timestamp": 100.2, "instance": 3, "dgn_hex": "1FEDA"}
+        assert app_state.try_group_response(response) is True
+        assert app_state.try_group_response(response) is False
+
+        groups = app_state.get_can_sniffer_grouped()
+        assert groups == [
+            {"command": command, "response": response, "confidence": "high", "reason": "mapping"}
+        ]
+        assert app_state.pending_commands == []
+
     def test_set_broadcast_function(self, app_state):
         """Test setting broadcast function."""
         mock_func = Mock()
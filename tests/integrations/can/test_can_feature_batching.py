@@ -0,0 +1,177 @@
+"""
+Tests for the batched CAN receive loop in CANBusFeature.
+"""
+
+import asyncio
+from unittest.mock import Mock, patch
+
+import can
+import pytest
+
+from backend.can.feature import CANBusFeature
+from backend.integrations.can.performance_monitor import PerformanceMonitor
+from backend.integrations.rvc.performance import PriorityMessageHandler
+from backend.integrations.rvc.security import SecurityManager
+
+
+@pytest.fixture
+def feature() -> CANBusFeature:
+    feature = CANBusFeature(
+        config={"interfaces": ["vcan0"], "max_batch_size": 4, "max_batch_latency": 1.0}
+    )
+    feature._performance_monitor = PerformanceMonitor()
+    return feature
+
+
+def _message(index: int) -> can.Message:
+    return can.Message(arbitration_id=0x19FEDA00 | index, data=bytes([index] * 8))
+
+
+@pytest.mark.asyncio
+async def test_batch_listener_drains_queued_frames(feature):
+    reader = can.AsyncBufferedReader()
+    for i in range(10):
+        reader.on_message_received(_message(i))
+
+    seen: list[tuple[int, float]] = []
+
+    async def process(message, interface_name, received_at=None):
+        seen.append((message.arbitration_id & 0xFF, received_at))
+        if len(seen) == 10:
+            feature._is_running = False
+
+    feature._is_running = True
+    with patch.object(feature, "_process_received_message", side_effect=process):
+        await asyncio.wait_for(feature._can_batch_listener_task("vcan0", reader), timeout=2.0)
+
+    assert [index for index, _ in seen] == list(range(10))
+    # Frames in the same batch share a receive timestamp
+    assert seen[0][1] == seen[3][1]
+
+    batch_sizes = feature._performance_monitor.histograms["can_ingest_batch_size"]
+    assert batch_sizes.count == 3  # 4 + 4 + 2
+    assert batch_sizes.total == 10
+
+
+@pytest.mark.asyncio
+async def test_batch_respects_latency_bound(feature):
+    calls: list[int] = []
+
+    async def process(message, interface_name, received_at=None):
+        calls.append(message.arbitration_id & 0xFF)
+
+    with patch.object(feature, "_process_received_message", side_effect=process):
+        await feature._process_received_batch([_message(i) for i in range(5)], "vcan0", 0.0)
+
+    assert calls == list(range(5))
+    # A zero latency bound records (and yields after) every frame
+    assert feature._performance_monitor.histograms["can_ingest_batch_size"].count == 5
+
+
+@pytest.mark.asyncio
+async def test_priority_ingest_decodes_critical_frames_first(feature):
+    feature._ingest_handler = PriorityMessageHandler(Mock())
+    decoded: list[int] = []
+
+    async def process(frame):
+        decoded.append(frame.dgn)
+
+    with patch.object(feature, "_process_frame", side_effect=process):
+        feature.start_ingest_pipeline()
+        try:
+            # Tank-level chatter arrives ahead of a diagnostic alarm
+            for i in range(10):
+                tank = can.Message(arbitration_id=0x19FFFB80, data=bytes([i] * 8))
+                await feature._process_received_message(tank, "vcan0")
+            alarm = can.Message(arbitration_id=0x19FECA80, data=bytes(8))
+            await feature._process_received_message(alarm, "vcan0")
+
+            for _ in range(100):
+                if len(decoded) == 11:
+                    break
+                await asyncio.sleep(0)
+        finally:
+            await feature.stop_ingest_pipeline()
+
+    assert decoded[0] == 0x1FECA
+    assert decoded.count(0x1FFFB) == 10
+
+
+@pytest.mark.asyncio
+async def test_priority_ingest_does_not_rate_limit_status_traffic(feature):
+    decoded: list[int] = []
+
+    async def process(frame):
+        decoded.append(frame.dgn)
+
+    # One second of a busy bus: dimmer status, tank levels and product IDs,
+    # well above the handler's default per-class rates
+    traffic = [0x19FFB280] * 400 + [0x19FFFB80] * 200 + [0x19FEF280] * 20
+    with patch.object(feature, "_process_frame", side_effect=process):
+        feature.start_ingest_pipeline()
+        try:
+            for index, arbitration_id in enumerate(traffic):
+                message = can.Message(arbitration_id=arbitration_id, data=bytes([index % 256] * 8))
+                await feature._process_received_message(message, "vcan0")
+
+            for _ in range(100):
+                if len(decoded) == len(traffic):
+                    break
+                await asyncio.sleep(0)
+            stats = feature._ingest_handler.get_class_stats()
+        finally:
+            await feature.stop_ingest_pipeline()
+
+    assert len(decoded) == len(traffic)
+    assert all(
+        stats[name]["dropped_rate_limited"] == 0 and stats[name]["evicted_queue_full"] == 0
+        for name in ("NORMAL", "LOW", "BACKGROUND")
+    )
+
+
+@pytest.mark.asyncio
+async def test_priority_ingest_rate_limits_diagnostic_floods_only(feature):
+    feature.start_ingest_pipeline()
+    try:
+        handler = feature._ingest_handler
+        # A burst of product-identification requests, then brake status and
+        # alarms at a rate no bucket would admit
+        for _ in range(300):
+            handler.queue_by_priority(0x1FEF2, 0x80, b"id", 0x19FEF280)
+        for _ in range(3000):
+            handler.queue_by_priority(0x1FE56, 0x80, b"brake", 0x19FE5680)
+            handler.queue_by_priority(0x1FECA, 0x80, b"alarm", 0x19FECA80)
+        stats = handler.get_class_stats()
+    finally:
+        await feature.stop_ingest_pipeline()
+
+    assert stats["BACKGROUND"]["dropped_rate_limited"] >= 190
+    assert stats["HIGH"]["dropped_rate_limited"] == 0
+    assert stats["CRITICAL"]["dropped_rate_limited"] == 0
+    assert stats["HIGH"]["rate_limit"] is None
+
+
+@pytest.mark.asyncio
+async def test_traffic_monitor_sees_pdu1_requests_by_pgn(feature):
+    security_manager = SecurityManager(Mock(controller_source_addr="0xF9"))
+    feature._security_manager = security_manager
+    anomalies = []
+
+    def observe(*args):
+        found = SecurityManager.observe_frame(security_manager, *args)
+        anomalies.extend(found)
+        return found
+
+    # One PGN request (0xEA00, PDU1) addressed to 40 different devices
+    requests = [
+        can.Message(arbitration_id=0x18EA0080 | (destination << 8), data=bytes([0xD0, 0xFE, 0x01]))
+        for destination in range(40)
+    ]
+    with (
+        patch.object(security_manager, "observe_frame", side_effect=observe) as observed,
+        patch.object(feature, "_process_frame"),
+    ):
+        await feature._process_received_batch(requests, "vcan0", 0.0)
+
+    assert {call.args[1] for call in observed.call_args_list} == {0xEA00}
+    assert not [a for a in anomalies if a.anomaly_type == "dgn_scanning"]
@@ -0,0 +1,191 @@
+"""
+Tests for the frame decoder and worker pool behind the per-interface CAN decode workers.
+"""
+
+import asyncio
+import multiprocessing
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from backend.can.feature import CANBusFeature
+from backend.integrations.can import decode_workers
+from backend.integrations.can.decode_workers import (
+    DecodeWorkerPool,
+    FrameDecoder,
+    light_state_fields,
+)
+from backend.integrations.rvc import decode
+
+CONFIG_DIR = Path(__file__).parent.parent.parent.parent / "config"
+
+MAPPING = """
+coach_info:
+  year: "2024"
+  make: Test
+  model: Coach
+  trim: Base
+
+1FEDA:
+  25:
+    - entity_id: kitchen_light
+      friendly_name: Kitchen Light
+      device_type: light
+      suggested_area: Kitchen
+"""
+
+# DC_DIMMER_STATUS_3 (priority 6) arbitration ID, as keyed in the decoder map
+DIMMER_STATUS = 0x19FEDA
+
+
+def _dimmer_frame(instance: int, operating_status: int) -> bytes:
+    return bytes([instance, 0xFF, operating_status, 0, 0, 0, 0, 0])
+
+
+@pytest.fixture
+def frame_decoder(tmp_path, monkeypatch) -> FrameDecoder:
+    mapping_path = tmp_path / "coach_mapping.yml"
+    mapping_path.write_text(MAPPING, encoding="utf-8")
+    monkeypatch.setattr(decode, "get_cache_path", lambda: None)
+    decode.clear_config_cache()
+
+    compiled = decode.load_compiled_config(
+        rvc_spec_path_override=str(CONFIG_DIR / "rvc.json"),
+        device_mapping_path_override=str(mapping_path),
+    )
+    yield FrameDecoder(compiled.config_data[0], compiled.device_lookup)
+    decode.clear_config_cache()
+
+
+@pytest.mark.unit
+def test_only_changed_fields_are_emitted(frame_decoder):
+    entity_id, fields, timestamp = frame_decoder.decode(
+        DIMMER_STATUS, _dimmer_frame(25, 100), 1.0
+    )
+    assert entity_id == "kitchen_light"
+    assert timestamp == 1.0
+    assert fields["state"] == "on"
+    assert fields["brightness"] == 50
+    assert fields["suggested_area"] == "Kitchen"
+
+    # An identical status frame produces no delta
+    assert frame_decoder.decode(DIMMER_STATUS, _dimmer_frame(25, 100), 1.1) is None
+
+    _, changed, _ = frame_decoder.decode(DIMMER_STATUS, _dimmer_frame(25, 200), 1.2)
+    assert changed["brightness"] == 100
+    assert "state" not in changed
+    assert "suggested_area" not in changed
+
+
+@pytest.mark.unit
+def test_unchanged_status_is_resent_after_resync_interval(frame_decoder):
+    frame_decoder.decode(DIMMER_STATUS, _dimmer_frame(25, 0), 1.0)
+
+    # A command turns the light on optimistically in the main process, but the
+    # dimmer never applies it and keeps reporting off
+    assert frame_decoder.decode(DIMMER_STATUS, _dimmer_frame(25, 0), 1.5) is None
+
+    _, fields, _ = frame_decoder.decode(DIMMER_STATUS, _dimmer_frame(25, 0), 2.0)
+    assert fields["state"] == "off"
+    assert fields["brightness"] == 0
+    assert fields["suggested_area"] == "Kitchen"
+
+    # The interval restarts from the full resend
+    assert frame_decoder.decode(DIMMER_STATUS, _dimmer_frame(25, 0), 2.5) is None
+
+
+@pytest.mark.unit
+def test_unmapped_frames_are_skipped(frame_decoder):
+    assert frame_decoder.decode(DIMMER_STATUS, _dimmer_frame(7, 100), 1.0) is None
+    assert frame_decoder.decode(0x123, b"\x00" * 8, 1.0) is None
+    assert frame_decoder.frames == 2
+    assert frame_decoder.decoded == 0
+
+
+@pytest.mark.unit
+def test_light_state_fields():
+    assert light_state_fields({"operating_status": 0}) == {"state": "off", "brightness": 0}
+    assert light_state_fields({"operating_status": "150"}) == {"state": "on", "brightness": 75}
+    assert light_state_fields({"operating_status": "bad"}) == {"state": "off", "brightness": 0}
+
+
+@pytest.fixture
+def worker_pool(monkeypatch):
+    """A pool whose workers are pipes driven by the test instead of processes."""
+    monkeypatch.setattr(decode_workers, "RESPAWN_BACKOFF_INITIAL", 0.05)
+    pool = DecodeWorkerPool(["can0"], "virtual", AsyncMock())
+    pool.worker_pipes = []
+
+    def spawn(interface):
+        recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+        worker = pool._workers[interface]
+        worker["respawn"] = None
+        worker["process"] = Mock(pid=len(pool.worker_pipes) + 1)
+        worker["conn"] = recv_conn
+        asyncio.get_running_loop().add_reader(recv_conn.fileno(), pool._on_readable, interface)
+        pool.worker_pipes.append(send_conn)
+
+    monkeypatch.setattr(pool, "_spawn_worker", spawn)
+    return pool
+
+
+async def _wait_for(condition):
+    for _ in range(500):
+        if condition():
+            return
+        await asyncio.sleep(0.001)
+
+
+@pytest.mark.asyncio
+async def test_exited_worker_is_restarted_with_backoff(worker_pool):
+    worker_pool.start()
+    try:
+        worker_pool.worker_pipes[0].send([("kitchen_light", {"state": "on"}, 1.0)])
+        worker_pool.worker_pipes[0].close()
+        await _wait_for(lambda: worker_pool._workers["can0"]["restarts"] == 1)
+
+        # Reported as degraded until the restart delay has passed
+        assert worker_pool.degraded_interfaces() == ["can0"]
+        assert worker_pool.get_stats()["can0"]["alive"] is False
+
+        await _wait_for(lambda: len(worker_pool.worker_pipes) == 2)
+        assert worker_pool.degraded_interfaces() == []
+        stats = worker_pool.get_stats()["can0"]
+        assert stats["restarts"] == 1
+        assert stats["deltas"] == 1
+
+        # A worker that dies again without delivering anything waits longer
+        worker_pool.worker_pipes[1].close()
+        await _wait_for(lambda: worker_pool._workers["can0"]["restarts"] == 2)
+        assert worker_pool._workers["can0"]["backoff"] == pytest.approx(0.2)
+        await _wait_for(lambda: len(worker_pool.worker_pipes) == 3)
+        assert worker_pool.get_stats()["can0"]["restarts"] == 2
+    finally:
+        await worker_pool.stop(join_timeout=0)
+
+
+@pytest.mark.asyncio
+async def test_stopping_pool_does_not_restart_workers(worker_pool):
+    worker_pool.start()
+    worker_pool._stop_event.set()
+    worker_pool.worker_pipes[0].close()
+    await _wait_for(lambda: worker_pool._workers["can0"]["conn"] is None)
+    await asyncio.sleep(0.1)
+
+    assert len(worker_pool.worker_pipes) == 1
+    await worker_pool.stop(join_timeout=0)
+
+
+def test_feature_reports_degraded_decode_workers():
+    feature = CANBusFeature(config={"interfaces": ["can0"], "decode_workers": True})
+    feature._is_running = True
+    feature._decode_workers = Mock(
+        degraded_interfaces=Mock(return_value=["can0"]), get_stats=Mock(return_value={})
+    )
+
+    assert feature.health == "degraded"
+    assert feature.health_details["status"] == "degraded"
+
+    feature._decode_workers.degraded_interfaces.return_value = []
+    assert feature.health == "healthy"
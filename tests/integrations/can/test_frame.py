@@ -0,0 +1,41 @@
+"""
+Tests for the received CAN frame record.
+"""
+
+import can
+import pytest
+
+from backend.integrations.can.frame import FrameRecord, interface_index, interface_name
+
+
+@pytest.mark.unit
+def test_frame_wraps_message_payload_without_copying():
+    message = can.Message(arbitration_id=0x19FEDA42, data=bytes([25, 0xFF, 100]))
+    frame = FrameRecord.from_message(message, "can0", 12.5)
+
+    assert frame.data.obj is message.data
+    assert frame.pgn == frame.dgn == 0x1FEDA
+    assert frame.source_address == 0x42
+    assert frame.destination_address == 0xFF
+    assert frame.dlc == 3
+    assert frame.interface == "can0"
+    assert frame.to_dict()["data"] == "19FF64"
+
+
+@pytest.mark.unit
+def test_pdu1_frames_carry_a_destination_address():
+    frame = FrameRecord(0x1CECFF80, memoryview(bytes(8)), 0.0, interface_index("can0"))
+
+    assert frame.dgn == 0xECFF
+    assert frame.pgn == 0xEC00
+    assert frame.destination_address == 0xFF
+    assert frame.source_address == 0x80
+
+
+@pytest.mark.unit
+def test_interface_indexes_are_stable():
+    first = interface_index("can7")
+
+    assert interface_index("can7") == first
+    assert interface_name(first) == "can7"
+    assert not hasattr(FrameRecord(0x100, memoryview(b""), 0.0, first), "__dict__")
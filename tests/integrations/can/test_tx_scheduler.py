@@ -0,0 +1,151 @@
+"""
+Tests for the per-interface CAN transmit scheduler.
+"""
+
+import asyncio
+import threading
+import time
+
+import can
+import pytest
+
+from backend.integrations.can.tx_scheduler import CANTxScheduler, TxPriority
+
+
+class RecordingBus:
+    """Bus stand-in that records sends and can block to simulate a stalled interface."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.sent: list[tuple[int, float]] = []
+        self.threads: set[str] = set()
+
+    def send(self, msg: can.Message, timeout: float | None = None) -> None:
+        if self.delay:
+            time.sleep(self.delay)
+        self.threads.add(threading.current_thread().name)
+        self.sent.append((msg.arbitration_id, time.monotonic()))
+
+
+def _message(arbitration_id: int) -> can.Message:
+    return can.Message(arbitration_id=arbitration_id, data=b"\x01\x02", is_extended_id=True)
+
+
+async def _wait_for(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            msg = "condition not met in time"
+            raise AssertionError(msg)
+        await asyncio.sleep(0.005)
+
+
+@pytest.fixture
+async def scheduler_factory():
+    runners: list[asyncio.Task] = []
+
+    def start(buses, **kwargs) -> tuple[CANTxScheduler, list]:
+        scheduler = CANTxScheduler(buses, **kwargs)
+        sent_hook: list = []
+        runners.append(
+            asyncio.create_task(
+                scheduler.run(on_sent=lambda msg, iface: sent_hook.append((msg, iface)))
+            )
+        )
+        return scheduler, sent_hook
+
+    yield start
+
+    for task in runners:
+        task.cancel()
+    await asyncio.gather(*runners, return_exceptions=True)
+
+
+@pytest.mark.unit
+async def test_sends_twice_without_blocking_the_queue(scheduler_factory):
+    bus = RecordingBus()
+    scheduler, sent_hook = scheduler_factory({"can0": bus}, repeat_delay=0.05)
+    await asyncio.sleep(0)
+
+    for i in range(20):
+        await scheduler.put((_message(i), "can0"))
+
+    # First transmissions go out back to back instead of 50 ms apart
+    await _wait_for(lambda: len(bus.sent) >= 20)
+    assert [arb for arb, _ in bus.sent[:20]] == list(range(20))
+
+    await _wait_for(lambda: len(bus.sent) == 40)
+    assert sorted(arb for arb, _ in bus.sent[20:]) == list(range(20))
+    assert len(sent_hook) == 20
+    assert scheduler.get_stats()["can0"]["repeats_sent"] == 20
+    # Sends run off the event loop thread
+    assert all(name.startswith("can-tx-can0") for name in bus.threads)
+
+
+@pytest.mark.unit
+async def test_emergency_priority_jumps_the_line(scheduler_factory):
+    bus = RecordingBus(delay=0.01)
+    scheduler, _ = scheduler_factory({"can0": bus}, repeat_delay=10.0)
+    await asyncio.sleep(0)
+
+    for i in range(10):
+        await scheduler.put((_message(i), "can0", TxPriority.BULK))
+    await scheduler.put((_message(0xE5), "can0", TxPriority.EMERGENCY))
+
+    await _wait_for(lambda: len(bus.sent) == 11)
+    order = [arb for arb, _ in bus.sent]
+    # At most the frame already in flight goes before the emergency stop
+    assert order.index(0xE5) <= 1
+
+
+@pytest.mark.unit
+async def test_stalled_interface_does_not_delay_others(scheduler_factory):
+    slow = RecordingBus(delay=0.2)
+    fast = RecordingBus()
+    scheduler, _ = scheduler_factory({"can0": slow, "can1": fast}, repeat_delay=10.0)
+    await asyncio.sleep(0)
+
+    await scheduler.put((_message(1), "can0"))
+    started = time.monotonic()
+    await scheduler.put((_message(2), "can1"))
+
+    await _wait_for(lambda: fast.sent)
+    assert fast.sent[0][1] - started < 0.1
+    assert not slow.sent
+
+
+@pytest.mark.unit
+async def test_frames_queued_before_start_are_sent(scheduler_factory):
+    bus = RecordingBus()
+    scheduler = CANTxScheduler({"can0": bus}, repeat_delay=10.0)
+    scheduler.submit(_message(7), "can0", repeat=False)
+    assert scheduler.qsize() == 1
+
+    runner = asyncio.create_task(scheduler.run())
+    try:
+        await _wait_for(lambda: bus.sent)
+        assert scheduler.qsize() == 0
+        assert scheduler.get_stats()["can0"]["pending_repeats"] == 0
+    finally:
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+
+
+@pytest.mark.unit
+async def test_missing_bus_is_opened_on_demand(scheduler_factory):
+    bus = RecordingBus()
+    buses: dict = {}
+    scheduler, _ = scheduler_factory(buses, open_bus=lambda name: bus, repeat_delay=10.0)
+    await asyncio.sleep(0)
+
+    await scheduler.put((_message(3), "vcan9"))
+
+    await _wait_for(lambda: bus.sent)
+    assert buses["vcan9"] is bus
+
+
+@pytest.mark.unit
+def test_rejects_malformed_items():
+    scheduler = CANTxScheduler({})
+    with pytest.raises(TypeError):
+        scheduler.put_nowait(_message(1))
@@ -0,0 +1,132 @@
+"""
+Tests for the vectorized RV-C batch decoder.
+
+The batch decoder must agree with the per-frame DecodePlan decoder for every
+signal in the bundled RV-C specification.
+"""
+
+import json
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from backend.integrations.rvc.batch_decoder import BatchDecoder, decode_batch
+from backend.integrations.rvc.decoder_core import DecodeError, compile_decode_plan
+
+RVC_SPEC_PATH = Path(__file__).parent.parent.parent.parent / "config" / "rvc.json"
+
+
+@pytest.fixture(scope="module")
+def dgn_dict() -> dict[int, dict]:
+    """Build a DGN dictionary from the bundled spec the same way load_config_data does."""
+    with open(RVC_SPEC_PATH, encoding="utf-8") as f:
+        spec = json.load(f)
+    result = {}
+    for entry in spec["pgns"].values():
+        pgn = int(entry["pgn"], 16)
+        priority = int(entry.get("priority", "6"), 16)
+        result[(priority << 18) | pgn] = entry
+    return result
+
+
+def _arbitration_id(dgn: int, source_address: int) -> int:
+    return ((dgn >> 18) << 26) | ((dgn & 0x3FFFF) << 8) | source_address
+
+
+def test_batch_matches_per_frame_decoder(dgn_dict):
+    rng = random.Random(42)
+    dgns = list(dgn_dict)
+    frames = []
+    for _ in range(2000):
+        dgn = rng.choice(dgns)
+        frames.append((_arbitration_id(dgn, rng.randrange(256)), rng.randbytes(8)))
+
+    ids = np.array([f[0] for f in frames], dtype=np.uint32)
+    payloads = np.frombuffer(b"".join(f[1] for f in frames), dtype=np.uint8).reshape(-1, 8)
+
+    result = BatchDecoder(dgn_dict).decode(ids, payloads)
+    assert result.total_frames == len(frames)
+    assert result.decoded_frames == len(frames)
+    assert result.unknown_pgns == {}
+
+    for dgn, columns in result.groups.items():
+        plan = compile_decode_plan(dgn_dict[dgn])
+        for position, frame_index in enumerate(columns.indices.tolist()):
+            expected, _errors = plan.decode(frames[frame_index][1])
+            row = columns.row(position)
+            for name, decoded in expected.items():
+                if isinstance(decoded, DecodeError):
+                    assert name in columns.skipped_signals
+                    continue
+                assert row[name] == decoded.value
+                assert columns.raw[name][position] == decoded.raw_value
+                assert bool(columns.valid[name][position]) == decoded.valid
+
+
+def test_batch_groups_and_unknown_pgns(dgn_dict):
+    known_dgn = next(iter(dgn_dict))
+    ids = [
+        _arbitration_id(known_dgn, 0x10),
+        0x18ABCD42,  # PGN not in the spec
+        _arbitration_id(known_dgn, 0x20),
+        0x18ABCD43,
+    ]
+    payloads = [b"\x01" * 8, b"\x02" * 8, b"\x03" * 8, b"\x04" * 8]
+
+    result = decode_batch(dgn_dict, ids, payloads)
+
+    assert result.unknown_pgns == {0x0ABCD: 2}
+    columns = result.groups[known_dgn]
+    assert columns.indices.tolist() == [0, 2]
+    assert columns.source_addresses.tolist() == [0x10, 0x20]
+
+
+def test_short_payloads_are_flagged_invalid():
+    dgn_dict = {
+        0x19FEDA: {
+            "name": "TEST",
+            "pgn": "1FEDA",
+            "signals": [
+                {"name": "instance", "start_bit": 0, "length": 8},
+                {"name": "level", "start_bit": 32, "length": 8, "scale": 0.5},
+            ],
+        }
+    }
+    ids = [_arbitration_id(0x19FEDA, 1)] * 2
+    result = decode_batch(dgn_dict, ids, [b"\x05\x00\x00\x00", b"\x06\x00\x00\x00\x10"])
+
+    columns = result.groups[0x19FEDA]
+    assert columns.values["instance"].tolist() == [5, 6]
+    assert columns.valid["instance"].tolist() == [True, True]
+    assert columns.valid["level"].tolist() == [False, True]
+    assert columns.values["level"][1] == 8.0
+
+
+def test_enum_columns():
+    dgn_dict = {
+        0x19FEDA: {
+            "name": "TEST",
+            "pgn": "1FEDA",
+            "signals": [
+                {"name": "state", "start_bit": 0, "length": 2, "enum": {"0": "OFF", "1": "ON"}}
+            ],
+        }
+    }
+    ids = [_arbitration_id(0x19FEDA, 1)] * 3
+    payloads = np.array([[0] * 8, [1] * 8, [3] * 8], dtype=np.uint8)
+
+    columns = decode_batch(dgn_dict, ids, payloads).groups[0x19FEDA]
+
+    assert columns.values["state"].tolist() == ["OFF", "ON", "UNKNOWN (3)"]
+    assert columns.valid["state"].tolist() == [True, True, False]
+
+
+def test_empty_batch_and_size_mismatch(dgn_dict):
+    result = decode_batch(dgn_dict, np.array([], dtype=np.uint32), np.zeros((0, 8), np.uint8))
+    assert result.total_frames == 0
+    assert result.groups == {}
+
+    with pytest.raises(ValueError, match="Batch size mismatch"):
+        decode_batch(dgn_dict, [1, 2], [b"\x00" * 8])
@@ -0,0 +1,123 @@
+"""
+Tests for the persistent compiled RV-C config cache.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from backend.integrations.rvc import decode
+from backend.integrations.rvc.config_cache import (
+    CompiledConfig,
+    compute_cache_key,
+    read_compiled_config,
+    write_compiled_config,
+)
+
+CONFIG_DIR = Path(__file__).parent.parent.parent.parent / "config"
+
+
+@pytest.fixture
+def config_files(tmp_path) -> tuple[str, str]:
+    """Copy the bundled spec and default mapping so they can be modified."""
+    spec_path = tmp_path / "rvc.json"
+    mapping_path = tmp_path / "coach_mapping.default.yml"
+    shutil.copy(CONFIG_DIR / "rvc.json", spec_path)
+    shutil.copy(CONFIG_DIR / "coach_mapping.default.yml", mapping_path)
+    return str(spec_path), str(mapping_path)
+
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch) -> Path:
+    """Point the compiled config cache at a temporary file."""
+    path = tmp_path / "cache" / "rvc_compiled_config.pickle"
+    monkeypatch.setattr(decode, "get_cache_path", lambda: path)
+    decode.clear_config_cache()
+    yield path
+    decode.clear_config_cache()
+
+
+@pytest.mark.unit
+def test_cache_key_tracks_file_contents(config_files):
+    spec_path, mapping_path = config_files
+    key = compute_cache_key(spec_path, mapping_path)
+    assert compute_cache_key(spec_path, mapping_path) == key
+
+    with open(mapping_path, "a", encoding="utf-8") as f:
+        f.write("\n# edited\n")
+    assert compute_cache_key(spec_path, mapping_path) != key
+
+
+@pytest.mark.unit
+def test_cache_key_requires_existing_files(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        compute_cache_key(str(tmp_path / "missing.json"), str(tmp_path / "missing.yml"))
+
+
+@pytest.mark.unit
+def test_read_rejects_stale_and_corrupt_files(tmp_path):
+    path = tmp_path / "compiled.pickle"
+    compiled = CompiledConfig(key="abc", config_data=({1: {}},), device_lookup={("1", "0"): {}})
+
+    assert write_compiled_config(path, compiled) is True
+    assert read_compiled_config(path, "abc") == compiled
+    assert read_compiled_config(path, "other") is None
+
+    path.write_bytes(b"not a pickle")
+    assert read_compiled_config(path, "abc") is None
+    assert read_compiled_config(tmp_path / "missing.pickle", "abc") is None
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX file permissions")
+def test_read_rejects_files_writable_by_others(tmp_path):
+    path = tmp_path / "compiled.pickle"
+    compiled = CompiledConfig(key="abc", config_data=())
+    assert write_compiled_config(path, compiled) is True
+    assert path.stat().st_mode & 0o777 == 0o600
+
+    path.chmod(0o666)
+    assert read_compiled_config(path, "abc") is None
+
+    path.chmod(0o600)
+    assert read_compiled_config(path, "abc") == compiled
+
+
+@pytest.mark.unit
+def test_load_compiled_config_round_trips_through_cache(config_files, cache_path):
+    spec_path, mapping_path = config_files
+
+    built = decode.load_compiled_config(spec_path, mapping_path)
+    assert cache_path.exists()
+
+    decode.clear_config_cache()
+    cached = decode.load_compiled_config(spec_path, mapping_path)
+    assert cached is not built
+    assert cached.key == built.key
+    assert cached.device_lookup == built.device_lookup
+    assert cached.status_lookup == built.status_lookup
+
+    dgn_dict = cached.config_data[0]
+    assert dgn_dict.keys() == built.config_data[0].keys()
+    assert cached.config_data[1:] == built.config_data[1:]
+
+    # Decode plans survive the round trip and decode identically
+    data = bytes(range(8))
+    for dgn, entry in built.config_data[0].items():
+        assert decode.decode_payload(dgn_dict[dgn], data) == decode.decode_payload(entry, data)
+
+
+@pytest.mark.unit
+def test_load_compiled_config_rebuilds_after_edit(config_files, cache_path):
+    spec_path, mapping_path = config_files
+    first = decode.load_compiled_config(spec_path, mapping_path)
+
+    with open(mapping_path, "a", encoding="utf-8") as f:
+        f.write("\n# edited\n")
+    decode.clear_config_cache()
+
+    second = decode.load_compiled_config(spec_path, mapping_path)
+    assert second.key != first.key
+    assert read_compiled_config(cache_path, second.key) is not None
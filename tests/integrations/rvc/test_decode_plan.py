@@ -0,0 +1,155 @@
+"""
+Tests for precompiled RV-C decode plans.
+
+Verifies that DecodePlan produces exactly the same results as the uncompiled
+spec-dict decoder for every entry in the bundled RV-C spec, as well as for
+malformed and edge-case signal definitions.
+"""
+
+import copy
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from backend.integrations.rvc.decoder_core import (
+    DECODE_PLAN_KEY,
+    DecodePlan,
+    DecodedValue,
+    compile_decode_plan,
+    decode_payload,
+    decode_payload_values,
+)
+
+RVC_SPEC_PATH = Path(__file__).parent.parent.parent.parent / "config" / "rvc.json"
+
+
+def _legacy_decode(entry: dict, data: bytes):
+    """Decode with the plan stripped so the spec dict is walked directly."""
+    bare = {k: v for k, v in entry.items() if k != DECODE_PLAN_KEY}
+    return decode_payload(bare, data)
+
+
+def _assert_same(entry: dict, data: bytes) -> None:
+    plan = compile_decode_plan(entry)
+    assert plan is not None
+    assert plan.decode(data) == _legacy_decode(entry, data)
+
+
+@pytest.fixture(scope="module")
+def spec_entries() -> list[dict]:
+    with open(RVC_SPEC_PATH, encoding="utf-8") as f:
+        return list(json.load(f)["pgns"].values())
+
+
+def test_plan_matches_legacy_for_bundled_spec(spec_entries):
+    """Every spec entry decodes identically for random payloads."""
+    rng = random.Random(1234)
+    for entry in spec_entries:
+        for _ in range(25):
+            data = bytes(rng.getrandbits(8) for _ in range(8))
+            _assert_same(entry, data)
+        _assert_same(entry, b"\xff" * 8)
+        _assert_same(entry, b"\x00" * 8)
+
+
+def test_plan_matches_legacy_for_short_and_empty_payloads(spec_entries):
+    """Out-of-range signals report the same errors as the legacy decoder."""
+    for entry in spec_entries[:10]:
+        _assert_same(entry, b"\x42\x00\x00\x00")
+        _assert_same(entry, b"")
+
+
+def test_plan_enum_lookup_is_int_keyed():
+    entry = {
+        "pgn": "1FEDA",
+        "signals": [
+            {
+                "name": "state",
+                "start_bit": 0,
+                "length": 8,
+                "enum": {"0": "OFF", "1": "ON", "01": "BOGUS", "0x02": "HEX", "3": None},
+            }
+        ],
+    }
+    plan = compile_decode_plan(entry)
+    assert plan.signals[0].enum == {0: "OFF", 1: "ON"}
+
+    for raw in range(5):
+        _assert_same(entry, bytes([raw, 0, 0, 0, 0, 0, 0, 0]))
+
+    results, errors = plan.decode(b"\x01\x00\x00\x00\x00\x00\x00\x00")
+    assert results["state"].value == "ON"
+    assert results["state"].raw_value == 1
+    assert errors == []
+
+
+def test_plan_scaled_and_offset_values():
+    entry = {
+        "pgn": "1FFFF",
+        "signals": [
+            {"name": "temp", "start_bit": 0, "length": 16, "scale": 0.03125, "offset": -273},
+            {"name": "level", "start_bit": 16, "length": 8, "scale": 0.5},
+            {"name": "float_identity", "start_bit": 24, "length": 8, "scale": 1.0, "offset": 0.0},
+        ],
+    }
+    for data in (b"\x20\x25\xc8\x07\x00\x00\x00\x00", b"\xff" * 8):
+        _assert_same(entry, data)
+
+
+def test_plan_falls_back_for_invalid_signals():
+    entry = {
+        "pgn": "1FFFE",
+        "signals": [
+            {"name": "negative_start", "start_bit": -1, "length": 8},
+            {"name": "zero_length", "start_bit": 0, "length": 0},
+            {"name": "bad_offset", "start_bit": 0, "length": 8, "offset": None},
+            {"name": "wide", "start_bit": 0, "length": 72},
+            {"name": "ok", "start_bit": 8, "length": 8},
+        ],
+    }
+    plan = compile_decode_plan(entry)
+    assert [s.fallback for s in plan.signals] == [True, True, True, True, False]
+
+    for data in (b"\x01\x02\x03\x04\x05\x06\x07\x08", b"\x01" * 9, b""):
+        results, errors = plan.decode(data)
+        assert (results, errors) == _legacy_decode(entry, data)
+
+
+def _expected_values(entry: dict, data: bytes) -> tuple[dict, dict]:
+    results, _ = _legacy_decode(entry, data)
+    valid = {name: r for name, r in results.items() if isinstance(r, DecodedValue)}
+    return (
+        {name: r.value for name, r in valid.items()},
+        {name: r.raw_value for name, r in valid.items()},
+    )
+
+
+def test_decode_values_matches_decode_payload(spec_entries):
+    """Plain value decoding agrees with the DecodedValue results, errors dropped."""
+    rng = random.Random(99)
+    for entry in spec_entries:
+        plan_entry = {**entry, DECODE_PLAN_KEY: compile_decode_plan(entry)}
+        for data in (bytes(rng.getrandbits(8) for _ in range(8)), b"\x42\x00"):
+            expected = _expected_values(entry, data)
+            assert decode_payload_values(plan_entry, memoryview(data)) == expected
+            assert decode_payload_values(entry, data) == expected
+
+
+def test_plan_for_entry_without_signals():
+    plan = compile_decode_plan({"pgn": "1FEEE", "signals": []})
+    assert isinstance(plan, DecodePlan)
+    assert plan.decode(b"\x00" * 8) == ({}, [])
+
+
+def test_compile_rejects_non_dict_signals():
+    assert compile_decode_plan({"pgn": "1FEEE", "signals": ["not-a-dict"]}) is None
+
+
+def test_decode_payload_uses_attached_plan():
+    entry = {"pgn": "1FEDA", "signals": [{"name": "instance", "start_bit": 0, "length": 8}]}
+    expected = decode_payload(copy.deepcopy(entry), b"\x19" + b"\x00" * 7)
+
+    entry[DECODE_PLAN_KEY] = compile_decode_plan(entry)
+    assert decode_payload(entry, b"\x19" + b"\x00" * 7) == expected
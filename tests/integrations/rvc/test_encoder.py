@@ -0,0 +1,106 @@
+"""
+Tests for RVCEncoder command templates and the encoded-frame cache.
+"""
+
+from dataclasses import FrozenInstanceError
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from backend.integrations.rvc import decode
+from backend.integrations.rvc.encoder import EncodingError, RVCEncoder
+from backend.models.entity import ControlCommand
+
+CONFIG_DIR = Path(__file__).parent.parent.parent.parent / "config"
+
+MAPPING = """
+coach_info:
+  year: "2024"
+  make: Test
+  model: Coach
+  trim: Base
+
+dgn_pairs:
+  1FEDB: 1FEDA
+
+1FEDA:
+  25:
+    - entity_id: kitchen_light
+      friendly_name: Kitchen Light
+      device_type: light
+  default:
+    - entity_id: porch_light
+      friendly_name: Porch Light
+      device_type: light
+"""
+
+
+@pytest.fixture
+def encoder(tmp_path, monkeypatch) -> RVCEncoder:
+    mapping_path = tmp_path / "coach_mapping.yml"
+    mapping_path.write_text(MAPPING, encoding="utf-8")
+    monkeypatch.setattr(decode, "get_cache_path", lambda: None)
+    decode.clear_config_cache()
+
+    settings = SimpleNamespace(
+        rvc_spec_path=CONFIG_DIR / "rvc.json",
+        rvc_coach_mapping_path=mapping_path,
+        controller_source_addr="0xF9",
+    )
+    yield RVCEncoder(settings)
+    decode.clear_config_cache()
+
+
+@pytest.mark.unit
+def test_encodes_light_command_from_template(encoder):
+    messages = encoder.encode_entity_command(
+        "kitchen_light", ControlCommand(command="set", state="on", brightness=50)
+    )
+
+    assert len(messages) == 1
+    assert messages[0].can_id == (6 << 26) | (0x1FEDB << 8) | 0xF9
+    assert messages[0].data == bytes([25, 100, 0, 0, 0, 0, 0, 0])
+
+
+@pytest.mark.unit
+def test_repeated_commands_are_served_from_cache(encoder):
+    on = ControlCommand(command="set", state="on", brightness=100)
+    off = ControlCommand(command="set", state="off")
+
+    first = encoder.encode_entity_command("kitchen_light", on)
+    second = encoder.encode_entity_command("kitchen_light", on)
+    other = encoder.encode_entity_command("kitchen_light", off)
+
+    assert first == second
+    assert other[0].data[1] == 0
+    stats = encoder.get_encoder_info()["frame_cache"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+@pytest.mark.unit
+def test_cached_messages_cannot_be_mutated(encoder):
+    on = ControlCommand(command="set", state="on", brightness=100)
+
+    first = encoder.encode_entity_command("kitchen_light", on)
+    with pytest.raises(FrozenInstanceError):
+        first[0].data = bytes(8)
+    first.clear()
+
+    second = encoder.encode_entity_command("kitchen_light", on)
+    assert len(second) == 1
+    assert second[0].data[1] == 200
+
+
+@pytest.mark.unit
+def test_entities_without_a_template_are_rejected(encoder):
+    command = ControlCommand(command="toggle")
+
+    with pytest.raises(EncodingError, match="Invalid instance"):
+        encoder.encode_entity_command("porch_light", command)
+    with pytest.raises(EncodingError, match="Unknown entity ID"):
+        encoder.encode_entity_command("missing_light", command)
+
+    assert encoder.validate_command("kitchen_light", command) == (True, "")
+    assert encoder.validate_command("missing_light", command)[0] is False
@@ -16,7 +16,11 @@ from unittest.mock import Mock, patch
 import pytest
 
 from backend.integrations.rvc.encoder import EncodingError, RVCEncoder
-from backend.integrations.rvc.performance import MessagePriority, PriorityMessageHandler
+from backend.integrations.rvc.performance import (
+    MessagePriority,
+    PriorityMessageHandler,
+    TokenBucket,
+)
 from backend.integrations.rvc.security import SecurityManager
 from backend.integrations.rvc.validator import MessageValidator
 from backend.models.entity import ControlCommand
@@ -275,6 +279,47 @@ class TestSecurityManager:
         assert len(anomalies) > 0
         assert any(a.anomaly_type == "message_flooding" for a in anomalies)
 
+    def test_streaming_flood_detection(self, security_manager):
+        """Test flooding is detected frame by frame and reported once per window."""
+        now = 1000.0
+        anomalies = []
+        for i in range(300):
+            anomalies += security_manager.observe_frame(0x80, 0x1FFB1, 8, now + i * 0.001)
+
+        floods = [a for a in anomalies if a.anomaly_type == "message_flooding"]
+        assert len(floods) == 1
+        assert floods[0].evidence["message_rate"] == 101
+
+        # The same rate spread over several seconds is not flooding
+        assert not security_manager.observe_frames(
+            [(0x81, 0x1FFB2, 8, now + i * 0.05) for i in range(300)]
+        )
+
+    def test_streaming_dgn_scanning_detection(self, security_manager):
+        """Test scanning across many DGNs is detected within the sliding window."""
+        now = 2000.0
+        frames = [(0x80, 0x1FF00 + i, 8, now + i * 0.1) for i in range(25)]
+
+        anomalies = security_manager.observe_frames(frames)
+
+        scans = [a for a in anomalies if a.anomaly_type == "dgn_scanning"]
+        assert len(scans) == 1
+        assert scans[0].evidence["dgn_count"] == 21
+
+    def test_streaming_impersonation_detection(self, security_manager):
+        """Test a new source reusing another active source's DGNs is flagged."""
+        now = 3000.0
+        security_manager.observe_frame(0x40, 0x1FFB1, 8, now)
+        security_manager.observe_frame(0x41, 0x1FFB7, 8, now + 1)
+        anomalies = security_manager.observe_frame(0x42, 0x1FFB1, 8, now + 2)
+
+        assert [a.anomaly_type for a in anomalies] == ["potential_impersonation"]
+        assert anomalies[0].evidence["existing_source"] == 0x40
+        assert anomalies[0].evidence["overlapping_dgns"] == [0x1FFB1]
+
+        # Established sources sending shared DGNs later are not flagged
+        assert not security_manager.observe_frame(0x41, 0x1FFB1, 8, now + 30)
+
     def test_security_status(self, security_manager):
         """Test security status reporting."""
         status = security_manager.get_security_status()
@@ -419,6 +464,83 @@ class TestPriorityMessageHandler:
         # Should have processed some messages
         assert len(processed_messages) > 0
 
+    def test_token_bucket_refills_over_time(self):
+        """Test token bucket admission and refill."""
+        bucket = TokenBucket(rate=2.0, capacity=2.0, updated=0.0)
+
+        assert bucket.try_consume(now=0.0)
+        assert bucket.try_consume(now=0.0)
+        assert not bucket.try_consume(now=0.0)
+        assert bucket.try_consume(now=0.5)
+
+    def test_rate_limit_is_per_class(self, mock_settings):
+        """Test that one class hitting its limit does not throttle the others."""
+        handler = PriorityMessageHandler(mock_settings, rate_limits={MessagePriority.LOW: 5.0})
+
+        admitted = [handler.queue_by_priority(0x1FFFB, 0x80, b"tank", 0x1) for _ in range(6)]
+        assert admitted == [True] * 5 + [False]
+
+        # Back-to-back messages in other classes are still admitted
+        for _ in range(3):
+            assert handler.queue_by_priority(0x1FECA, 0x80, b"alarm", 0x2)
+            assert handler.queue_by_priority(0x1FFB1, 0x80, b"light", 0x3)
+
+        stats = handler.get_class_stats()
+        assert stats["LOW"]["dropped_rate_limited"] == 1
+        assert stats["CRITICAL"]["dropped_rate_limited"] == 0
+        assert stats["CRITICAL"]["queue_depth"] == 3
+
+    def test_critical_and_high_classes_are_never_rate_limited(self, mock_settings):
+        """Test that CRITICAL and HIGH have no token bucket, even when overridden."""
+        handler = PriorityMessageHandler(
+            mock_settings,
+            rate_limits={MessagePriority.CRITICAL: 1.0, MessagePriority.HIGH: 1.0},
+        )
+
+        for _ in range(500):
+            assert handler.queue_by_priority(0x1FECA, 0x80, b"alarm", 0x1)
+            assert handler.queue_by_priority(0x1FE56, 0x80, b"brake", 0x2)
+
+        stats = handler.get_class_stats()
+        assert stats["CRITICAL"]["rate_limit"] is None
+        assert stats["HIGH"]["dropped_rate_limited"] == 0
+
+    def test_full_class_queue_evicts_its_oldest_message(self, mock_settings):
+        """Test that each class queue is bounded independently."""
+        handler = PriorityMessageHandler(mock_settings, max_queue_size=10)  # 2 per class
+        handler.queue_by_priority(0x1FECA, 0x80, b"alarm", 0x1)
+
+        for i in range(3):
+            assert handler.queue_by_priority(0x1FFB1, 0x80, bytes([i]), 0x2)
+
+        stats = handler.get_class_stats()
+        assert stats["NORMAL"]["evicted_queue_full"] == 1
+        assert stats["NORMAL"]["queue_depth"] == 2
+        assert stats["CRITICAL"]["queue_depth"] == 1
+        assert [m.data for m in handler.get_messages_batch(10)] == [b"alarm", b"\x01", b"\x02"]
+
+    @pytest.mark.asyncio
+    async def test_worker_drains_critical_before_backlog(self, handler):
+        """Test that critical messages overtake a queued backlog."""
+        for i in range(20):
+            handler.queue_by_priority(0x1FFFB, 0x80, bytes([i]), 0x1)
+        handler.queue_by_priority(0x1FECA, 0x80, b"alarm", 0x2)
+
+        batches: list[list] = []
+
+        async def processor(batch):
+            batches.append(batch)
+            if sum(len(b) for b in batches) == 21:
+                handler.stop_processing()
+
+        await asyncio.wait_for(
+            handler.process_queue_continuously(processor, batch_size=5, sleep_interval=0),
+            timeout=2.0,
+        )
+
+        assert batches[0][0].priority == MessagePriority.CRITICAL
+        assert handler.get_class_stats()["LOW"]["dequeued"] == 20
+
 
 class TestPhase1Integration:
     """Test integration of Phase 1 components."""
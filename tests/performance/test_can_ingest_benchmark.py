@@ -0,0 +1,62 @@
+"""
+Smoke tests for the end-to-end CAN ingest benchmark harness.
+
+These run a short benchmark to make sure the harness keeps working as the
+ingest path changes; the full benchmark is run from
+``scripts/benchmark_can_ingest.py``.
+"""
+
+import json
+
+import pytest
+
+from backend.integrations.rvc import load_compiled_config
+from scripts.benchmark_can_ingest import (
+    BenchmarkConfig,
+    TrafficProfile,
+    compare_results,
+    generate_traffic,
+    run_benchmark,
+)
+
+
+@pytest.mark.performance
+def test_generate_traffic_covers_every_frame_kind():
+    compiled = load_compiled_config()
+    frames = generate_traffic(compiled, 2000, TrafficProfile(seed=7))
+
+    kinds = {frame.kind for frame in frames}
+    assert {"mapped", "unmapped", "unknown", "bam", "duplicate"} <= kinds
+    assert len(frames) >= 2000
+
+    # Same seed, same traffic
+    again = generate_traffic(compiled, 2000, TrafficProfile(seed=7))
+    assert [(f.arbitration_id, f.data) for f in again] == [
+        (f.arbitration_id, f.data) for f in frames
+    ]
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+async def test_benchmark_processes_all_frames():
+    result = await run_benchmark(BenchmarkConfig(frames=1000, ws_clients=1))
+
+    assert result["frames"] == sum(result["frame_mix"].values())
+    assert result["throughput_fps"] > 0
+    assert result["latency_us"]["p50"] <= result["latency_us"]["p99"]
+    assert result["stages"]["duplicates_dropped"] > 0
+    assert result["stages"]["entity_updates"] > 0
+    json.dumps(result)  # results must be storable as JSON
+
+
+@pytest.mark.performance
+def test_compare_results_flags_regressions():
+    baseline = {"throughput_fps": 10000.0, "latency_us": {"p50": 50.0, "p99": 400.0}}
+    current = {"throughput_fps": 8000.0, "latency_us": {"p50": 52.0, "p99": 600.0}}
+
+    regressions = compare_results(baseline, current, tolerance=0.10)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("throughput_fps")
+    assert regressions[1].startswith("latency_us.p99")
+    assert compare_results(baseline, baseline) == []
@@ -0,0 +1,100 @@
+"""
+Tests for the write-behind metric buffer of AnalyticsStorageService.
+"""
+
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.models.analytics import AnalyticsMetric
+from backend.services.analytics_storage_service import AnalyticsStorageService
+
+
+class _DatabaseManager:
+    """Minimal database manager backed by an in-memory SQLite engine."""
+
+    def __init__(self, engine):
+        self._sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def get_session(self):
+        async with self._sessions() as session:
+            yield session
+
+
+@pytest.fixture
+async def db_manager():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(AnalyticsMetric.__table__.create)
+    yield _DatabaseManager(engine)
+    await engine.dispose()
+
+
+@pytest.fixture
+def storage(db_manager):
+    core_services = SimpleNamespace(database_manager=db_manager)
+    with patch(
+        "backend.services.analytics_storage_service.get_core_services",
+        return_value=core_services,
+    ):
+        service = AnalyticsStorageService()
+    service._flush_size = 5
+    service._flush_interval = 60.0
+    return service
+
+
+async def _stored_count(db_manager) -> int:
+    async with db_manager.get_session() as session:
+        result = await session.execute(select(func.count(AnalyticsMetric.id)))
+        return result.scalar_one()
+
+
+async def test_samples_are_written_in_batches(storage, db_manager):
+    for value in range(4):
+        assert await storage.record_metric("cpu", float(value))
+    assert await _stored_count(db_manager) == 0
+
+    await storage.record_metric("cpu", 4.0)
+    assert await _stored_count(db_manager) == 5
+
+    await storage.record_metric("cpu", 5.0)
+    await storage.close()
+    assert await _stored_count(db_manager) == 6
+
+
+async def test_baselines_are_seeded_from_stored_values(storage, db_manager):
+    async with db_manager.get_session() as session:
+        session.add_all(
+            AnalyticsMetric(metric_name="cpu", value=value, timestamp=float(index))
+            for index, value in enumerate([100.0] * 5 + [10.0] * 10)
+        )
+        await session.commit()
+
+    await storage.initialize()
+    assert list(storage._baselines["cpu"]) == [10.0] * 10
+
+    await storage.record_metric("cpu", 15.0)
+    assert storage._pending_metrics[-1]["baseline_deviation"] == pytest.approx(50.0)
+
+
+async def test_recent_trend_is_served_from_memory(storage, db_manager):
+    old_timestamp = time.time() - 3 * 3600
+    async with db_manager.get_session() as session:
+        session.add(AnalyticsMetric(metric_name="cpu", value=1.0, timestamp=old_timestamp))
+        await session.commit()
+
+    await storage.record_metric("cpu", 2.0)
+    await storage.record_metric("cpu", 3.0)
+
+    recent = await storage.get_metrics_trend("cpu", hours=1)
+    assert [point.value for point in recent] == [2.0, 3.0]
+
+    # Older ranges combine stored and buffered points
+    full = await storage.get_metrics_trend("cpu", hours=24)
+    assert [point.value for point in full] == [1.0, 2.0, 3.0]
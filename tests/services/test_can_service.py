@@ -13,6 +13,7 @@ from unittest.mock import AsyncMock, Mock, PropertyMock, patch
 
 import pytest
 
+from backend.integrations.can.tx_scheduler import TxPriority
 from backend.services.can_service import CANService
 
 # ================================
@@ -298,8 +299,9 @@ class TestMessageSending:
         call_args = mock_queue.put.call_args[0]
         message_tuple = call_args[0]
 
-        assert len(message_tuple) == 2
+        assert len(message_tuple) == 3
         assert message_tuple[1] == interface  # Interface name
+        assert message_tuple[2] == TxPriority.NORMAL
 
         # Check the CAN message
         can_message = message_tuple[0]
@@ -0,0 +1,237 @@
+"""
+Tests for journaled, coalescing entity state persistence.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.core.entity_manager import EntityManager
+from backend.models.database import EntityState as EntityStateModel
+from backend.models.database import EntityStateJournal
+from backend.models.entity_model import EntityConfig
+from backend.services.entity_persistence_service import EntityPersistenceService
+
+
+class _DatabaseManager:
+    """Minimal database manager backed by an in-memory SQLite engine."""
+
+    def __init__(self, engine):
+        self._sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def get_session(self):
+        async with self._sessions() as session:
+            yield session
+
+
+@pytest.fixture
+async def db_manager():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(EntityStateModel.__table__.create)
+        await conn.run_sync(EntityStateJournal.__table__.create)
+    yield _DatabaseManager(engine)
+    await engine.dispose()
+
+
+def _entity_manager() -> EntityManager:
+    manager = EntityManager()
+    manager.register_entity(
+        "light.kitchen",
+        EntityConfig(device_type="light", suggested_area="Kitchen", capabilities=["brightness"]),
+    )
+    return manager
+
+
+async def _journal(db_manager) -> list[dict]:
+    async with db_manager.get_session() as session:
+        result = await session.execute(
+            select(EntityStateJournal.changes).order_by(EntityStateJournal.id)
+        )
+        return list(result.scalars().all())
+
+
+async def test_only_changed_fields_are_journaled(db_manager):
+    manager = _entity_manager()
+    service = EntityPersistenceService(manager, db_manager, debounce_delay=0.0)
+
+    manager.update_entity_state("light.kitchen", {"state": "on", "value": {"brightness": 40}})
+    await service._persist_batch(["light.kitchen"])
+    manager.update_entity_state("light.kitchen", {"value": {"brightness": 60}})
+    await service._persist_batch(["light.kitchen"])
+    # Timestamp-only updates are not written
+    manager.update_entity_state("light.kitchen", {"value": {"brightness": 60}})
+    await service._persist_batch(["light.kitchen"])
+
+    first, second = await _journal(db_manager)
+    assert first["state"] == "on"
+    assert set(second) == {"value", "timestamp"}
+    assert second["value"] == {"brightness": 60}
+    assert service.get_statistics()["unchanged_entities_skipped"] == 1
+
+
+async def test_restore_replays_journal_over_snapshots(db_manager):
+    manager = _entity_manager()
+    service = EntityPersistenceService(manager, db_manager, debounce_delay=0.0)
+
+    manager.update_entity_state("light.kitchen", {"state": "on", "value": {"brightness": 40}})
+    await service._persist_batch(["light.kitchen"])
+    await service._compact_journal()
+    assert await _journal(db_manager) == []
+
+    manager.update_entity_state("light.kitchen", {"value": {"brightness": 80}})
+    await service._persist_batch(["light.kitchen"])
+
+    restored_manager = _entity_manager()
+    restored = EntityPersistenceService(restored_manager, db_manager, debounce_delay=0.0)
+    await restored._load_entity_states()
+
+    state = restored_manager.get_entity("light.kitchen").get_state()
+    assert state.state == "on"
+    assert state.value == {"brightness": 80}
+    assert state.suggested_area == "Kitchen"
+
+    # Nothing changed since the restore, so nothing is rewritten
+    await restored._persist_batch(["light.kitchen"])
+    assert len(await _journal(db_manager)) == 1
+
+
+async def test_stop_compacts_journal_into_snapshots(db_manager):
+    manager = _entity_manager()
+    service = EntityPersistenceService(manager, db_manager, debounce_delay=0.01)
+    await service.start()
+
+    manager.update_entity_state("light.kitchen", {"state": "off"})
+    await service.stop()
+
+    assert await _journal(db_manager) == []
+    async with db_manager.get_session() as session:
+        snapshot = await session.get(EntityStateModel, "light.kitchen")
+    assert snapshot.state["state"] == "off"
+
+
+async def test_hot_entity_is_coalesced_and_flushed_on_demand(db_manager):
+    manager = _entity_manager()
+    service = EntityPersistenceService(
+        manager, db_manager, debounce_delay=60.0, max_staleness=60.0
+    )
+    await service.start()
+
+    for brightness in range(50):
+        manager.update_entity_state("light.kitchen", {"value": {"brightness": brightness}})
+
+    stats = service.get_statistics()
+    assert stats["dirty_count"] == 1
+    assert stats["coalesced_updates"] == 49
+
+    assert await service.flush()
+    [changes] = await _journal(db_manager)
+    assert changes["value"] == {"brightness": 49}
+    stats = service.get_statistics()
+    assert stats["dirty_count"] == 0
+    assert stats["last_flush_latency"] is not None
+    await service.stop()
+
+
+async def test_max_staleness_bounds_debounce(db_manager):
+    manager = _entity_manager()
+    service = EntityPersistenceService(
+        manager, db_manager, debounce_delay=60.0, max_staleness=0.05
+    )
+    await service.start()
+
+    # Continuous updates never leave a quiet period of debounce_delay
+    for brightness in range(30):
+        manager.update_entity_state("light.kitchen", {"value": {"brightness": brightness}})
+        await asyncio.sleep(0.01)
+
+    assert len(await _journal(db_manager)) >= 1
+    await service.stop()
+
+
+async def test_failed_writes_keep_entities_dirty(db_manager):
+    class _FailingDatabaseManager:
+        @asynccontextmanager
+        async def get_session(self):
+            raise RuntimeError("disk unavailable")
+            yield
+
+    manager = _entity_manager()
+    service = EntityPersistenceService(
+        manager, _FailingDatabaseManager(), max_retries=1, debounce_delay=60.0
+    )
+    manager.register_state_change_listener(service._on_entity_state_changed)
+
+    for state in ("on", "off", "on"):
+        manager.update_entity_state("light.kitchen", {"state": state})
+        assert not await service.flush()
+
+    stats = service.get_statistics()
+    assert stats["dirty_count"] == 1
+    assert stats["failed_writes"] == 3
+
+    service._db_manager = db_manager
+    assert await service.flush()
+    assert service.get_statistics()["dirty_count"] == 0
+
+
+async def test_compaction_keeps_changes_flushed_concurrently(db_manager):
+    manager = _entity_manager()
+    service = EntityPersistenceService(manager, db_manager, debounce_delay=60.0)
+    manager.register_state_change_listener(service._on_entity_state_changed)
+
+    manager.update_entity_state("light.kitchen", {"state": "on", "value": {"brightness": 40}})
+    assert await service.flush()
+
+    # An on-demand sync lands while the journal is being compacted
+    manager.update_entity_state("light.kitchen", {"value": {"brightness": 60}})
+    await asyncio.gather(service._compact_journal(), service.flush())
+    await service._compact_journal()
+
+    restored_manager = _entity_manager()
+    restored = EntityPersistenceService(restored_manager, db_manager, debounce_delay=0.0)
+    await restored._load_entity_states()
+    assert restored_manager.get_entity("light.kitchen").get_state().value == {"brightness": 60}
+
+
+async def test_compaction_after_failed_load_keeps_other_entities_journal(db_manager):
+    def two_lights() -> EntityManager:
+        manager = _entity_manager()
+        manager.register_entity("light.porch", EntityConfig(device_type="light"))
+        return manager
+
+    manager = two_lights()
+    service = EntityPersistenceService(manager, db_manager, debounce_delay=0.0)
+    manager.update_entity_state("light.kitchen", {"state": "on"})
+    manager.update_entity_state("light.porch", {"state": "on"})
+    await service._persist_batch(["light.kitchen", "light.porch"])
+
+    class _UnreadableDatabaseManager:
+        @asynccontextmanager
+        async def get_session(self):
+            raise RuntimeError("database locked")
+            yield
+
+    # The next start cannot read the database, then only the kitchen changes
+    restarted_manager = two_lights()
+    restarted = EntityPersistenceService(
+        restarted_manager, _UnreadableDatabaseManager(), debounce_delay=0.0
+    )
+    await restarted._load_entity_states()
+    restarted._db_manager = db_manager
+    restarted_manager.update_entity_state("light.kitchen", {"state": "off"})
+    await restarted._persist_batch(["light.kitchen"])
+    await restarted._compact_journal()
+
+    [porch_changes] = await _journal(db_manager)
+    assert porch_changes["entity_id"] == "light.porch"
+
+    restored_manager = two_lights()
+    restored = EntityPersistenceService(restored_manager, db_manager, debounce_delay=0.0)
+    await restored._load_entity_states()
+    assert restored_manager.get_entity("light.kitchen").get_state().state == "off"
+    assert restored_manager.get_entity("light.porch").get_state().state == "on"
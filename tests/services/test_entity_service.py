@@ -8,11 +8,12 @@ Tests the entity service business logic, including:
 - WebSocket integration
 """
 
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
 from backend.core.entity_manager import EntityManager
+from backend.integrations.can.tx_scheduler import TxPriority
 from backend.models.entity import ControlCommand
 from backend.models.entity_model import Entity
 from backend.services.entity_service import EntityService
@@ -192,7 +193,9 @@ class TestEntityService:
 
         # Assert
         mock_entity_manager.get_entity.assert_called_once_with(entity_id)
-        sample_entity.get_history.assert_called_once_with(count=1000, since=None)
+        sample_entity.get_history.assert_called_once_with(
+            count=1000, since=None, until=None, max_points=None
+        )
         assert len(result) == 1
         assert result[0]["timestamp"] == 1234567890
 
@@ -288,3 +291,39 @@ class TestEntityService:
         # Act & Assert
         with pytest.raises(ValueError, match="Entity 'nonexistent.light' not found"):
             await entity_service.control_light(entity_id, command)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("kwargs", "expected"),
+        [({}, TxPriority.HIGH), ({"priority": TxPriority.BULK}, TxPriority.BULK)],
+    )
+    async def test_control_entity_sends_at_priority(
+        self, entity_service, mock_entity_manager, mock_websocket_manager, sample_entity,
+        kwargs, expected,
+    ):
+        """Test entity control queues its CAN command at the requested TX priority."""
+        # Arrange
+        sample_entity.config = {**sample_entity.config, "instance": 3}
+        sample_entity.get_state = Mock(
+            return_value=Mock(model_dump=Mock(return_value={"state": "off", "raw": {}}))
+        )
+        sample_entity.update_state = Mock()
+        mock_entity_manager.get_entity.return_value = sample_entity
+        mock_websocket_manager.broadcast_to_data_clients = AsyncMock()
+        tx_queue = Mock(put=AsyncMock())
+        command = ControlCommand(command="set", state="on", brightness=40)
+
+        # Act
+        with (
+            patch("backend.services.entity_service.can_tx_queue", tx_queue),
+            patch("backend.services.entity_service.get_can_settings") as settings,
+        ):
+            settings.return_value.interface_mappings = {"house": "can0"}
+            result = await entity_service.control_entity("test.entity.1", command, **kwargs)
+
+        # Assert
+        assert result.status == "success"
+        assert result.brightness == command.brightness
+        _message, interface, priority = tx_queue.put.await_args.args[0]
+        assert interface == "can0"
+        assert priority == expected
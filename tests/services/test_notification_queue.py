@@ -638,18 +638,47 @@ class TestErrorHandling:
 
         await queue.close()
 
-    @patch("aiosqlite.connect")
-    async def test_database_operation_timeout(self, mock_connect, notification_queue, sample_notification):
+    async def test_database_operation_timeout(self, notification_queue, sample_notification):
         """Test handling of database operation timeouts."""
-        # Mock database connection to raise timeout
-        mock_connect.side_effect = asyncio.TimeoutError("Database timeout")
+        # Mock the writer connection to raise timeout
+        writer = notification_queue._writer
+        timeout = asyncio.TimeoutError("Database timeout")
+        with (
+            patch.object(writer, "execute", side_effect=timeout),
+            patch.object(writer, "executemany", side_effect=timeout),
+        ):
+            # Operations should handle timeout gracefully
+            result = await notification_queue.enqueue(sample_notification)
+            assert result == sample_notification.id  # Should still return ID even if enqueue fails
 
-        # Operations should handle timeout gracefully
-        result = await notification_queue.enqueue(sample_notification)
-        assert result == sample_notification.id  # Should still return ID even if enqueue fails
+            batch = await notification_queue.dequeue_batch(size=1)
+            assert batch == []  # Should return empty batch on error
 
+        # The failed write is kept and succeeds once the database recovers
+        assert notification_queue._write_batch == [sample_notification]
         batch = await notification_queue.dequeue_batch(size=1)
-        assert batch == []  # Should return empty batch on error
+        assert [notification.id for notification in batch] == [sample_notification.id]
+
+    async def test_dequeue_claims_each_notification_once(self, notification_queue):
+        """Test that concurrent dequeues claim disjoint batches."""
+        for i in range(12):
+            await notification_queue.enqueue(
+                NotificationPayload(
+                    message=f"Claim test {i}",
+                    level=NotificationType.INFO,
+                    channels=[NotificationChannel.SYSTEM],
+                )
+            )
+
+        batches = await asyncio.gather(
+            *(notification_queue.dequeue_batch(size=5) for _ in range(4))
+        )
+
+        claimed = [notification.id for batch in batches for notification in batch]
+        assert len(claimed) == len(set(claimed)) == 12
+        stats = await notification_queue.get_statistics()
+        assert stats.processing_count == 12
+        assert stats.pending_count == 0
 
 
 class TestConcurrency:
@@ -0,0 +1,229 @@
+"""
+Tests for incremental notification delivery rollups.
+"""
+
+import random
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.models.notification import (
+    NotificationChannel,
+    NotificationPayload,
+    NotificationStatus,
+    NotificationType,
+)
+from backend.models.notification_analytics import (
+    AggregationPeriod,
+    MetricType,
+    NotificationDeliveryLog,
+    NotificationDeliveryRollup,
+    RollupResolution,
+)
+from backend.services.notification_analytics_service import NotificationAnalyticsService
+from backend.services.notification_rollups import LatencySketch, NotificationRollupEngine
+
+
+class _DatabaseManager:
+    """Minimal database manager backed by an in-memory SQLite engine."""
+
+    def __init__(self, engine):
+        self._sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def get_session(self):
+        async with self._sessions() as session:
+            yield session
+
+
+@pytest.fixture
+async def db_manager():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(NotificationDeliveryLog.__table__.create)
+        await conn.run_sync(NotificationDeliveryRollup.__table__.create)
+    yield _DatabaseManager(engine)
+    await engine.dispose()
+
+
+@pytest.fixture
+def analytics_service(db_manager):
+    return NotificationAnalyticsService(db_manager)
+
+
+async def _track(service, status, delivery_time_ms, error_code=None, error_message=None):
+    notification = NotificationPayload(
+        id=str(uuid4()),
+        message="Test",
+        level=NotificationType.INFO,
+        channels=[NotificationChannel.SMTP],
+    )
+    await service.track_delivery(
+        notification=notification,
+        channel=NotificationChannel.SMTP,
+        status=status,
+        delivery_time_ms=delivery_time_ms,
+        error_code=error_code,
+        error_message=error_message,
+    )
+
+
+def test_latency_sketch_quantiles_and_merge():
+    values = [random.uniform(1, 5000) for _ in range(2000)]
+    first, second, combined = LatencySketch(), LatencySketch(), LatencySketch()
+    for index, value in enumerate(values):
+        (first if index % 2 else second).add(value)
+        combined.add(value)
+
+    first.merge(second)
+    assert first.bins == combined.bins
+
+    restored = LatencySketch.from_dict(first.to_dict())
+    ordered = sorted(values)
+    for q in (0.5, 0.95, 0.99):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert restored.quantile(q) == pytest.approx(exact, rel=0.03)
+
+
+def test_cover_uses_coarsest_buckets():
+    engine = NotificationRollupEngine()
+    now = datetime(2026, 3, 10, 12, 0, tzinfo=UTC)
+    start = datetime(2026, 3, 8, 22, 30, 15, tzinfo=UTC)
+    end = datetime(2026, 3, 10, 1, 45, tzinfo=UTC)
+
+    assert engine.cover(start, end, now) == [
+        (RollupResolution.MINUTE, datetime(2026, 3, 8, 22, 30, tzinfo=UTC), datetime(2026, 3, 8, 23, tzinfo=UTC)),
+        (RollupResolution.HOUR, datetime(2026, 3, 8, 23, tzinfo=UTC), datetime(2026, 3, 9, tzinfo=UTC)),
+        (RollupResolution.DAY, datetime(2026, 3, 9, tzinfo=UTC), datetime(2026, 3, 10, tzinfo=UTC)),
+        (RollupResolution.HOUR, datetime(2026, 3, 10, tzinfo=UTC), datetime(2026, 3, 10, 1, tzinfo=UTC)),
+        (RollupResolution.MINUTE, datetime(2026, 3, 10, 1, tzinfo=UTC), datetime(2026, 3, 10, 1, 45, tzinfo=UTC)),
+    ]
+
+    # Minute buckets are no longer retained a week back
+    old_start = now - timedelta(days=7, minutes=30)
+    segments = engine.cover(old_start, now - timedelta(days=6), now)
+    assert segments[0][0] == RollupResolution.HOUR
+
+
+async def test_flushes_update_rollups_incrementally(analytics_service, db_manager):
+    for delivery_time in (100, 200, 300):
+        await _track(analytics_service, NotificationStatus.DELIVERED, delivery_time)
+    await analytics_service._flush_buffer()
+
+    await _track(analytics_service, NotificationStatus.DELIVERED, 400)
+    await _track(
+        analytics_service,
+        NotificationStatus.FAILED,
+        None,
+        error_code="TIMEOUT",
+        error_message="Connection timeout",
+    )
+    await analytics_service._flush_buffer()
+
+    async with db_manager.get_session() as session:
+        result = await session.execute(
+            select(NotificationDeliveryRollup.resolution, func.count()).group_by(
+                NotificationDeliveryRollup.resolution
+            )
+        )
+        rows_per_resolution = dict(result.all())
+    # Both flushes land in the same minute, hour and day buckets (barring a
+    # minute boundary between them)
+    assert rows_per_resolution[RollupResolution.DAY.value] == 1
+    assert rows_per_resolution[RollupResolution.MINUTE.value] <= 2
+
+    [metrics] = await analytics_service.get_channel_metrics()
+    assert metrics.channel == NotificationChannel.SMTP
+    assert metrics.total_sent == 5
+    assert metrics.total_delivered == 4
+    assert metrics.total_failed == 1
+    assert metrics.average_delivery_time == pytest.approx(250.0)
+    assert metrics.error_breakdown == {"TIMEOUT": 1}
+    assert metrics.delivery_time_percentiles["p50"] == pytest.approx(200.0, rel=0.03)
+    assert metrics.last_success is not None
+    assert metrics.last_failure is not None
+
+    top_errors = await analytics_service._get_top_errors(
+        datetime.now(UTC) - timedelta(days=1), datetime.now(UTC)
+    )
+    assert top_errors == [("Connection timeout", 1)]
+
+
+async def test_aggregated_metrics_are_read_from_rollups(analytics_service):
+    for status in (NotificationStatus.DELIVERED, NotificationStatus.DELIVERED, NotificationStatus.FAILED):
+        await _track(analytics_service, status, 120)
+    await analytics_service._flush_buffer()
+
+    now = datetime.now(UTC)
+    [daily] = await analytics_service.get_aggregated_metrics(
+        metric_type=MetricType.SUCCESS_RATE,
+        aggregation_period=AggregationPeriod.DAILY,
+        start_date=now - timedelta(days=1),
+        end_date=now,
+    )
+    assert daily.timestamp == now.replace(hour=0, minute=0, second=0, microsecond=0)
+    assert daily.value == pytest.approx(2 / 3)
+    assert daily.extra_data["count"] == 3
+
+    [hourly] = await analytics_service.get_aggregated_metrics(
+        metric_type=MetricType.DELIVERY_COUNT,
+        aggregation_period=AggregationPeriod.HOURLY,
+        start_date=now - timedelta(hours=2),
+        end_date=now,
+        channel=NotificationChannel.SMTP,
+    )
+    assert hourly.value == 3
+    assert hourly.channel == NotificationChannel.SMTP
+
+
+async def test_prune_keeps_rolled_up_history(analytics_service, db_manager):
+    await _track(analytics_service, NotificationStatus.DELIVERED, 50)
+    analytics_service._metric_buffer[0].created_at = datetime.now(UTC) - timedelta(days=10)
+    await analytics_service._flush_buffer()
+
+    await analytics_service._prune_expired()
+
+    async with db_manager.get_session() as session:
+        assert await session.scalar(select(func.count(NotificationDeliveryLog.id))) == 0
+        resolutions = (
+            await session.scalars(select(NotificationDeliveryRollup.resolution))
+        ).all()
+    assert sorted(resolutions) == [RollupResolution.DAY.value, RollupResolution.HOUR.value]
+
+    [metrics] = await analytics_service.get_channel_metrics(
+        start_date=datetime.now(UTC) - timedelta(days=30)
+    )
+    assert metrics.total_sent == 1
+
+
+async def test_start_backfills_rollups_from_existing_logs(analytics_service, db_manager):
+    # Logs written before the rollup table existed
+    now = datetime.now(UTC)
+    async with db_manager.get_session() as session:
+        session.add_all(
+            NotificationDeliveryLog(
+                notification_id=str(uuid4()),
+                channel=NotificationChannel.SMTP.value,
+                notification_type=NotificationType.INFO.value,
+                status=status.value,
+                delivery_time_ms=100,
+                created_at=now - timedelta(days=3),
+            )
+            for status in (NotificationStatus.DELIVERED, NotificationStatus.FAILED)
+        )
+        await session.commit()
+
+    analytics_service._backfill_batch_size = 1  # Buckets are merged across batches
+    await analytics_service._backfill_rollups()
+    # A second start does not count the same logs again
+    await analytics_service._backfill_rollups()
+    await analytics_service._prune_expired()
+
+    [metrics] = await analytics_service.get_channel_metrics(start_date=now - timedelta(days=7))
+    assert metrics.total_sent == 2
+    assert metrics.total_delivered == 1
+    assert metrics.total_failed == 1
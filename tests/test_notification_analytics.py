@@ -23,8 +23,10 @@ from backend.models.notification_analytics import (
     ChannelMetrics,
     MetricType,
     NotificationDeliveryLog,
+    NotificationDeliveryRollup,
     NotificationMetric,
     NotificationQueueHealth,
+    RollupResolution,
 )
 from backend.services.database_manager import DatabaseManager
 from backend.services.notification_analytics_service import NotificationAnalyticsService
@@ -42,6 +44,7 @@ async def db_manager():
 
     # Mock get_session to return AsyncMock context manager
     session_mock = AsyncMock(spec=AsyncSession)
+    session_mock.execute.return_value = MagicMock()  # Result methods are synchronous
     manager.get_session.return_value.__aenter__.return_value = session_mock
     manager.get_session.return_value.__aexit__.return_value = None
 
@@ -171,17 +174,22 @@ class TestNotificationAnalyticsService:
         # Mock database results
         session_mock = db_manager.get_session.return_value.__aenter__.return_value
 
-        # Mock aggregated results
-        mock_row = MagicMock()
-        mock_row.channel = NotificationChannel.SMTP.value
-        mock_row.total = 100
-        mock_row.delivered = 95
-        mock_row.failed = 5
-        mock_row.retries = 3
-        mock_row.avg_delivery_time = 250.5
+        # Mock rollup rows
+        rollup = NotificationDeliveryRollup(
+            resolution=RollupResolution.DAY.value,
+            bucket_start=datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0),
+            channel=NotificationChannel.SMTP.value,
+            notification_type=NotificationType.INFO.value,
+            delivery_count=100,
+            success_count=95,
+            failure_count=5,
+            retry_count=3,
+            delivery_time_count=100,
+            delivery_time_sum=25050.0,
+        )
 
-        session_mock.execute.return_value.all.return_value = [mock_row]
-        session_mock.scalar.return_value = None  # No last success/failure
+        session_mock.execute.return_value.scalars.return_value.all.return_value = [rollup]
+        session_mock.execute.return_value.all.return_value = []  # No last success/failure
 
         # Get metrics
         metrics = await analytics_service.get_channel_metrics()
@@ -193,6 +201,7 @@ class TestNotificationAnalyticsService:
         assert metric.total_sent == 100
         assert metric.total_delivered == 95
         assert metric.success_rate == 0.95
+        assert metric.average_delivery_time == 250.5
 
     async def test_analyze_errors(self, analytics_service, db_manager):
         """Test error analysis."""
@@ -228,19 +237,24 @@ class TestNotificationAnalyticsService:
         # Mock database results
         session_mock = db_manager.get_session.return_value.__aenter__.return_value
 
-        # Create mock aggregates
+        # Create mock hour rollups
         now = datetime.now(timezone.utc)
-        mock_aggregates = []
-        for i in range(24):
-            mock_agg = MagicMock()
-            mock_agg.metric_type = MetricType.DELIVERY_COUNT.value
-            mock_agg.aggregation_period = AggregationPeriod.HOURLY.value
-            mock_agg.period_start = now - timedelta(hours=24-i)
-            mock_agg.value = 100 + i * 10
-            mock_agg.channel = None
-            mock_agg.notification_type = None
-            mock_agg.metadata = {}
-            mock_aggregates.append(mock_agg)
+        current_hour = now.replace(minute=0, second=0, microsecond=0)
+        mock_aggregates = [
+            NotificationDeliveryRollup(
+                resolution=RollupResolution.HOUR.value,
+                bucket_start=current_hour - timedelta(hours=23 - i),
+                channel=NotificationChannel.SMTP.value,
+                notification_type=NotificationType.INFO.value,
+                delivery_count=100 + i * 10,
+                success_count=100 + i * 10,
+                failure_count=0,
+                retry_count=0,
+                delivery_time_count=0,
+                delivery_time_sum=0.0,
+            )
+            for i in range(24)
+        ]
 
         session_mock.execute.return_value.scalars.return_value.all.return_value = mock_aggregates
 
@@ -266,10 +280,21 @@ class TestNotificationAnalyticsService:
         # Mock counts and metrics
         session_mock.scalar.side_effect = [
             50,    # pending_count
-            200,   # processed_count
-            180,   # success_count
             5.5,   # avg_wait_time
-            0.15,  # avg_processing_time (150ms)
+        ]
+        session_mock.execute.return_value.scalars.return_value.all.return_value = [
+            NotificationDeliveryRollup(
+                resolution=RollupResolution.MINUTE.value,
+                bucket_start=datetime.now(timezone.utc).replace(second=0, microsecond=0),
+                channel=NotificationChannel.SMTP.value,
+                notification_type=NotificationType.INFO.value,
+                delivery_count=200,
+                success_count=180,
+                failure_count=20,
+                retry_count=0,
+                delivery_time_count=200,
+                delivery_time_sum=30000.0,  # 150ms average
+            )
         ]
 
         # Get health
@@ -14,6 +14,7 @@ from backend.integrations.rvc.adaptive_security import (
     AdaptiveSecurityManager,
     AnomalyType,
     DeviceProfile,
+    PGNStatistics,
     SecurityEvent,
     ThreatLevel,
 )
@@ -62,13 +63,10 @@ class TestDeviceProfile:
         assert 0x1FED2 in device_profile.expected_pgns
         assert device_profile.message_count == 3
         assert device_profile.total_messages == 3
-        assert len(device_profile.message_history) == 3
 
-        # Check data patterns stored
-        assert 0x1FED1 in device_profile.data_patterns
-        assert 0x1FED2 in device_profile.data_patterns
-        assert len(device_profile.data_patterns[0x1FED1]) == 2  # Two messages for this PGN
-        assert len(device_profile.data_patterns[0x1FED2]) == 1  # One message for this PGN
+        # Check data patterns learned
+        assert device_profile.pgn_stats[0x1FED1].payload_samples == 2  # Two messages for this PGN
+        assert device_profile.pgn_stats[0x1FED2].payload_samples == 1  # One message for this PGN
 
     def test_timing_pattern_analysis(self, device_profile):
         """Test timing pattern analysis during learning."""
@@ -136,20 +134,15 @@ class TestDeviceProfile:
 
     def test_timing_anomaly_detection(self, device_profile):
         """Test detection of timing anomalies."""
-        # Setup learned patterns
-        device_profile.learning_phase = False
-        device_profile.expected_pgns = {0x1FED1}
-        device_profile.pgn_intervals[0x1FED1] = 1.0  # Expect 1 second intervals
-
-        # Add message history to simulate previous messages
         base_time = time.time()
-        device_profile.message_history.extend([
-            (0x1FED1, base_time - 2.0, 8),
-            (0x1FED1, base_time - 1.0, 8),
-        ])
-
         test_data = b"\x01\x02\x03\x04\x05\x06\x07\x08"
 
+        # Learn 1 second intervals from previous messages
+        device_profile.update_from_message(0x1FED1, base_time - 2.0, test_data)
+        device_profile.update_from_message(0x1FED1, base_time - 1.0, test_data)
+        device_profile.learning_phase = False
+        assert device_profile.pgn_intervals[0x1FED1] == pytest.approx(1.0)
+
         # Test normal timing (should be normal)
         is_anomalous, reason, confidence = device_profile.is_message_anomalous(
             0x1FED1, base_time, test_data
@@ -157,6 +150,7 @@ class TestDeviceProfile:
         assert is_anomalous is False
 
         # Test very fast timing (should be anomalous)
+        device_profile.update_from_message(0x1FED1, base_time, test_data)
         is_anomalous, reason, confidence = device_profile.is_message_anomalous(
             0x1FED1, base_time + 0.05, test_data  # Much faster than expected 1s
         )
@@ -174,9 +168,9 @@ class TestDeviceProfile:
         base_time = time.time()
         test_data = b"\x01\x02\x03\x04\x05\x06\x07\x08"
 
-        # Add many recent messages to simulate burst
+        # Record many recent messages to simulate burst
         for i in range(5):
-            device_profile.message_history.append((0x1FED1, base_time - i * 0.1, 8))
+            device_profile.update_from_message(0x1FED1, base_time - 0.5 + i * 0.1, test_data)
 
         # Test burst detection
         is_anomalous, reason, confidence = device_profile.is_message_anomalous(
@@ -194,7 +188,8 @@ class TestDeviceProfile:
 
         # Add known data patterns
         known_pattern = b"\x01\x02\x03\x04\x05\x06\x07\x08"
-        device_profile.data_patterns[0x1FED1] = [known_pattern]
+        device_profile.pgn_stats[0x1FED1] = PGNStatistics()
+        device_profile.pgn_stats[0x1FED1].learn_payload(known_pattern)
 
         timestamp = time.time()
 
@@ -214,32 +209,43 @@ class TestDeviceProfile:
         assert "Data pattern anomaly" in reason
         assert confidence == 0.6
 
-    def test_data_similarity_calculation(self, device_profile):
+    def test_data_similarity_calculation(self):
         """Test data similarity calculation accuracy."""
+        stats = PGNStatistics()
+        stats.learn_payload(b"\x01\x02\x03\x04")
+
         # Test identical data
-        data1 = b"\x01\x02\x03\x04"
-        data2 = b"\x01\x02\x03\x04"
-        assert device_profile._data_similarity(data1, data2) == 1.0
+        assert stats.payload_similarity(b"\x01\x02\x03\x04") == 1.0
 
         # Test completely different data
-        data1 = b"\x01\x02\x03\x04"
-        data2 = b"\xFF\xFE\xFD\xFC"
-        assert device_profile._data_similarity(data1, data2) == 0.0
+        assert stats.payload_similarity(b"\xFF\xFE\xFD\xFC") == 0.0
 
         # Test partially similar data
-        data1 = b"\x01\x02\x03\x04"
-        data2 = b"\x01\x02\xFF\xFF"
-        assert device_profile._data_similarity(data1, data2) == 0.5
+        assert stats.payload_similarity(b"\x01\x02\xFF\xFF") == 0.5
 
         # Test different length data
-        data1 = b"\x01\x02\x03\x04"
-        data2 = b"\x01\x02"
-        assert device_profile._data_similarity(data1, data2) == 0.0
+        assert stats.payload_similarity(b"\x01\x02") == 0.0
+
+        # Test values learned from different samples at each position
+        stats.learn_payload(b"\x05\x06\x07\x08")
+        assert stats.payload_similarity(b"\x01\x06\x03\x08") == 1.0
 
         # Test empty data
-        data1 = b""
-        data2 = b""
-        assert device_profile._data_similarity(data1, data2) == 1.0
+        stats.learn_payload(b"")
+        assert stats.payload_similarity(b"") == 1.0
+
+    def test_burst_window_slides(self):
+        """Test that the burst counter only covers the last window."""
+        stats = PGNStatistics()
+        base_time = 1000.0
+
+        for i in range(10):
+            stats.record(base_time + i * 0.5, b"\x01", learn=False)
+        assert stats.burst_size(base_time + 4.9) == 10
+
+        # Only the messages from the last 10 one-second sub-windows remain
+        assert stats.burst_size(base_time + 12.0) == 4
+        assert stats.burst_size(base_time + 30.0) == 0
 
     def test_profile_statistics(self, device_profile):
         """Test profile statistics generation."""
@@ -359,6 +365,21 @@ class TestAdaptiveSecurityManager:
         result = security_manager.validate_frame(anomalous_frame)
         # Result depends on threat level assessment
 
+    def test_unexpected_pgns_do_not_grow_profile(self, security_manager):
+        """Test that PGNs first seen after learning keep no per-PGN state."""
+        frame = MockCANFrame(0x1FED1, 0x42, b"\x01\x02\x03\x04")
+        for _ in range(10):
+            security_manager.validate_frame(frame)
+        security_manager.force_learning_completion(0x42)
+
+        for pgn in range(0x10000, 0x10000 + 5000):
+            security_manager.validate_frame(MockCANFrame(pgn, 0x42, b"\x01\x02\x03\x04"))
+
+        profile = security_manager.device_profiles[0x42]
+        assert set(profile.pgn_stats) == {0x1FED1}
+        assert profile.expected_pgns == {0x1FED1}
+        assert profile.anomaly_count == 5000
+
     def test_security_event_generation(self, security_manager):
         """Test security event generation and notification."""
         events_received = []
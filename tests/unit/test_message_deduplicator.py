@@ -0,0 +1,99 @@
+"""
+Unit Tests for CAN Message Deduplication
+
+Tests window semantics, ring-buffer expiry and counters of the deduplicator
+used for bridged (cangw) CAN interfaces.
+"""
+
+import pytest
+
+from backend.integrations.can.message_deduplicator import CANMessageDeduplicator
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance_ms(self, ms: float) -> None:
+        self.now += ms / 1000.0
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+class TestCANMessageDeduplicator:
+    """Test deduplication behaviour."""
+
+    def test_duplicate_within_window(self, clock):
+        dedup = CANMessageDeduplicator(window_ms=50, clock=clock)
+
+        assert dedup.is_duplicate(0x19FEDA42, b"\x01\x02") is False
+        clock.advance_ms(10)
+        assert dedup.is_duplicate(0x19FEDA42, bytearray(b"\x01\x02")) is True
+
+        stats = dedup.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["duplicate_rate"] == 0.5
+
+    def test_different_id_or_data_is_not_duplicate(self, clock):
+        dedup = CANMessageDeduplicator(window_ms=50, clock=clock)
+
+        assert dedup.is_duplicate(0x100, b"\x01") is False
+        assert dedup.is_duplicate(0x101, b"\x01") is False
+        assert dedup.is_duplicate(0x100, b"\x02") is False
+
+    def test_message_expires_after_window(self, clock):
+        dedup = CANMessageDeduplicator(window_ms=50, clock=clock)
+
+        assert dedup.is_duplicate(0x100, b"\x01") is False
+        clock.advance_ms(50)
+        assert dedup.is_duplicate(0x100, b"\x01") is False
+
+        stats = dedup.get_stats()
+        assert stats["expirations"] == 1
+        assert stats["cache_size"] == 1
+
+    def test_duplicates_do_not_extend_window(self, clock):
+        dedup = CANMessageDeduplicator(window_ms=50, clock=clock)
+
+        assert dedup.is_duplicate(0x100, b"\x01") is False
+        clock.advance_ms(40)
+        assert dedup.is_duplicate(0x100, b"\x01") is True
+        clock.advance_ms(20)
+        assert dedup.is_duplicate(0x100, b"\x01") is False
+
+    def test_capacity_eviction(self, clock):
+        dedup = CANMessageDeduplicator(window_ms=50, max_cache_size=2, clock=clock)
+
+        dedup.is_duplicate(0x100, b"\x01")
+        dedup.is_duplicate(0x101, b"\x01")
+        dedup.is_duplicate(0x102, b"\x01")
+
+        assert dedup.get_stats()["evictions"] == 1
+        assert len(dedup.message_cache) == 2
+        # The oldest entry was evicted, so it is no longer detected as a duplicate
+        assert dedup.is_duplicate(0x100, b"\x01") is False
+        assert dedup.is_duplicate(0x102, b"\x01") is True
+
+    def test_reset_stats(self, clock):
+        dedup = CANMessageDeduplicator(window_ms=50, clock=clock)
+        dedup.is_duplicate(0x100, b"\x01")
+        dedup.is_duplicate(0x100, b"\x01")
+
+        dedup.reset_stats()
+
+        stats = dedup.get_stats()
+        assert stats["hits"] == 0
+        assert stats["misses"] == 0
+
+    def test_invalid_cache_size(self):
+        with pytest.raises(ValueError):
+            CANMessageDeduplicator(max_cache_size=0)
@@ -15,6 +15,7 @@ import pytest
 from backend.integrations.can.performance_monitor import (
     ComponentStats,
     ComponentType,
+    HistogramStats,
     MetricType,
     PerformanceMetric,
     PerformanceMonitor,
@@ -182,6 +183,33 @@ class TestComponentStats:
         assert throughput == 0.0
 
 
+class TestHistogramStats:
+    """Test fixed-bucket histogram."""
+
+    def test_observe_and_cumulative_counts(self):
+        """Test observations land in the right buckets."""
+        histogram = HistogramStats((1, 2, 4))
+        for value in (1, 1, 3, 10):
+            histogram.observe(value)
+
+        assert histogram.count == 4
+        assert histogram.total == 15
+        assert histogram.max_value == 10
+        assert histogram.cumulative_counts() == [("1", 2), ("2", 2), ("4", 3), ("+Inf", 4)]
+
+    def test_percentiles(self):
+        """Test percentile estimation from bucket bounds."""
+        histogram = HistogramStats((1, 2, 4))
+        assert histogram.get_percentile(50.0) == 0.0
+
+        for value in (1, 1, 1, 3):
+            histogram.observe(value)
+
+        assert histogram.get_percentile(50.0) == 1
+        assert histogram.get_percentile(99.0) == 4
+        assert histogram.get_mean() == 1.5
+
+
 class TestPerformanceMonitor:
     """Test performance monitoring system."""
 
@@ -534,3 +562,20 @@ class TestPerformanceMonitor:
         prometheus_output = monitor.get_prometheus_metrics()
         assert 'environment="test"' in prometheus_output
         assert 'version="1.0"' in prometheus_output
+
+    def test_ingest_batch_histograms(self, monitor):
+        """Test batched receive loop metrics."""
+        monitor.record_ingest_batch(32, 0.002)
+        monitor.record_ingest_batch(1, 0.0001)
+
+        summary = monitor.get_performance_summary()["can_ingest"]
+        assert summary["can_ingest_batch_size"]["count"] == 2
+        assert summary["can_ingest_batch_size"]["max"] == 32
+        assert monitor.component_stats[ComponentType.CAN_INGEST].messages_processed == 33
+
+        prometheus_output = monitor.get_prometheus_metrics()
+        assert "# TYPE canbus_decoder_can_ingest_batch_size histogram" in prometheus_output
+        assert 'canbus_decoder_can_ingest_batch_size_bucket{le="+Inf"} 2' in prometheus_output
+
+        monitor.reset_metrics()
+        assert monitor.histograms["can_ingest_batch_size"].count == 0
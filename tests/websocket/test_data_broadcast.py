@@ -0,0 +1,203 @@
+"""
+Tests for coalesced data WebSocket broadcasts.
+
+Covers per-entity coalescing, single serialization per broadcast and the
+per-client send queues with their slow-consumer policies.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from backend.websocket.handlers import DataClientSender, WebSocketManager
+
+
+class FakeWebSocket:
+    """Minimal WebSocket recording sent text frames."""
+
+    def __init__(self, port: int = 1000, blocked: bool = False) -> None:
+        self.client = SimpleNamespace(host="127.0.0.1", port=port)
+        self.sent: list[str] = []
+        self.closed_with: int | None = None
+        self.release = asyncio.Event()
+        if not blocked:
+            self.release.set()
+
+    async def send_text(self, text: str) -> None:
+        await self.release.wait()
+        self.sent.append(text)
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_with = code
+
+    def messages(self) -> list[dict]:
+        return [json.loads(text) for text in self.sent]
+
+
+async def _drain() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def _manager(**config) -> WebSocketManager:
+    return WebSocketManager(config=config)
+
+
+def _connect(manager: WebSocketManager, websocket: FakeWebSocket) -> None:
+    manager.data_clients.add(websocket)
+    manager._add_data_sender(websocket)
+
+
+@pytest.mark.asyncio
+async def test_entity_updates_are_coalesced_per_entity():
+    manager = _manager(entity_update_interval=0.01)
+    client = FakeWebSocket()
+    _connect(manager, client)
+
+    for level in range(10):
+        await manager.queue_entity_update("tank_1", {"level": level})
+    await manager.queue_entity_update("light_1", {"state": "on"})
+
+    await asyncio.sleep(0.05)
+    await _drain()
+
+    messages = client.messages()
+    assert len(messages) == 2
+    by_id = {m["entity_id"]: m for m in messages}
+    assert by_id["tank_1"] == {"type": "entity_update", "entity_id": "tank_1", "data": {"level": 9}}
+    assert by_id["light_1"]["data"] == {"state": "on"}
+
+    stats = manager.get_broadcast_stats()
+    assert stats["entity_updates_received"] == 11
+    assert stats["entity_updates_sent"] == 2
+    assert stats["entity_updates_coalesced"] == 9
+    await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_zero_interval_sends_immediately():
+    manager = _manager(entity_update_interval=0)
+    client = FakeWebSocket()
+    _connect(manager, client)
+
+    await manager.queue_entity_update("tank_1", {"level": 1})
+    await manager.queue_entity_update("tank_1", {"level": 2})
+    await _drain()
+
+    assert [m["data"]["level"] for m in client.messages()] == [1, 2]
+    await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_broadcast_serializes_once_for_all_clients():
+    manager = _manager()
+    clients = [FakeWebSocket(port=port) for port in range(3)]
+    for client in clients:
+        _connect(manager, client)
+
+    await manager.broadcast_to_data_clients({"type": "status", "value": 1})
+    await _drain()
+
+    assert all(client.sent == [clients[0].sent[0]] for client in clients)
+    assert all(client.sent[0] is clients[0].sent[0] for client in clients)
+    await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_slow_client_drops_oldest_without_blocking_others():
+    manager = _manager(entity_update_interval=0, client_queue_size=2)
+    slow = FakeWebSocket(port=1, blocked=True)
+    fast = FakeWebSocket(port=2)
+    _connect(manager, slow)
+    _connect(manager, fast)
+
+    for level in range(5):
+        await manager.broadcast_to_data_clients({"level": level})
+        await _drain()
+
+    assert [m["level"] for m in fast.messages()] == [0, 1, 2, 3, 4]
+
+    slow.release.set()
+    await _drain()
+    # The first message was already in flight; the queue kept the newest two
+    assert [m["level"] for m in slow.messages()] == [0, 3, 4]
+
+    stats = manager.get_broadcast_stats()
+    assert stats["total_dropped"] == 2
+    assert slow in manager.data_clients
+    await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_slow_client_disconnect_policy():
+    manager = _manager(client_queue_size=1, slow_consumer_policy="disconnect")
+    slow = FakeWebSocket(blocked=True)
+    _connect(manager, slow)
+
+    for level in range(3):
+        await manager.broadcast_to_data_clients({"level": level})
+        await _drain()
+
+    assert slow not in manager.data_clients
+    assert slow.closed_with == 1013
+    assert manager.get_broadcast_stats()["clients"] == []
+    await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_failed_send_removes_client():
+    class BrokenWebSocket(FakeWebSocket):
+        async def send_text(self, text: str) -> None:
+            msg = "connection reset"
+            raise RuntimeError(msg)
+
+    manager = _manager()
+    broken = BrokenWebSocket()
+    _connect(manager, broken)
+
+    await manager.broadcast_to_data_clients({"type": "status"})
+    await _drain()
+
+    assert broken not in manager.data_clients
+    await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_sender_tracks_queue_depth():
+    websocket = FakeWebSocket(blocked=True)
+    sender = DataClientSender(websocket, max_queue_size=4)
+
+    for i in range(3):
+        assert sender.enqueue(str(i))
+    await _drain()
+
+    stats = sender.get_stats()
+    assert stats["queue_depth"] == 2  # One message is in flight
+    assert stats["max_queue_depth"] == 3
+    await sender.stop()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_delivers_pending_entity_updates():
+    manager = _manager(entity_update_interval=60.0)
+    client = FakeWebSocket()
+    _connect(manager, client)
+
+    await manager.queue_entity_update("tank_1", {"level": 7})
+    await manager.shutdown()
+
+    assert [m["data"] for m in client.messages()] == [{"level": 7}]
+
+
+@pytest.mark.asyncio
+async def test_shutdown_does_not_wait_on_a_stuck_client():
+    manager = _manager(entity_update_interval=0, shutdown_drain_timeout=0.01)
+    stuck = FakeWebSocket(blocked=True)
+    _connect(manager, stuck)
+
+    await manager.broadcast_to_data_clients({"level": 1})
+    await asyncio.wait_for(manager.shutdown(), timeout=1.0)
+
+    assert stuck.sent == []